@@ -50,7 +50,9 @@ if not _stream_logs_active:
         logger.setLevel(logging.CRITICAL)
         logger.disabled = True
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Callable, Awaitable
+from collections import deque
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 import aiohttp
@@ -74,6 +76,7 @@ from enum import Enum, IntEnum
 import yaml
 import webbrowser
 import threading
+import atexit
 import secrets
 import urllib.parse
 from http.server import HTTPServer, BaseHTTPRequestHandler
@@ -358,6 +361,7 @@ class DebugManager:
         self.event_count = 0
         self.error_count = 0
         self.start_time = datetime.now()
+        self.connection_latencies: Dict[str, List[float]] = {}  # Auth method -> connect times in seconds
         # ISSUE #2766: Store JSON/CI mode flags for output suppression
         self.json_mode = json_mode
         self.ci_mode = ci_mode
@@ -690,8 +694,13 @@ class DebugManager:
 
         self.debug_print(message, style=style)
 
-    def log_connection_attempt(self, method: str, url: str, success: bool = None, error: str = None):
+    def log_connection_attempt(self, method: str, url: str, success: bool = None, error: str = None,
+                               latency: Optional[float] = None):
         """Log connection attempts with details"""
+        if latency is not None:
+            self.connection_latencies.setdefault(method, []).append(latency)
+            self.debug_print(f"Connection attempt via {method} took {latency * 1000:.0f}ms", DebugLevel.VERBOSE, "dim")
+
         if success is True:
             self.debug_print(f"[PASS] Connection Success: {method} to {url}", style="green")
         elif success is False:
@@ -722,6 +731,10 @@ class DebugManager:
             "duration_seconds": duration.total_seconds(),
             "events_logged": self.event_count,
             "errors_logged": self.error_count,
+            "connection_latency_ms": {
+                method: round(sum(times) / len(times) * 1000, 1)
+                for method, times in self.connection_latencies.items()
+            },
             "log_file": str(self.log_file)
         }
 
@@ -1373,6 +1386,56 @@ class GCPErrorLookup:
             "detailed_results": all_results
         }
 
+HTTP_DNS_CACHE_TTL = 300  # Seconds a resolved backend/auth hostname is reused
+HTTP_KEEPALIVE_TIMEOUT = 30.0  # Seconds an idle connection is kept for reuse
+
+# (event loop, session) of the process-wide HTTP session; see get_http_session()
+_http_session: Optional[Tuple[asyncio.AbstractEventLoop, aiohttp.ClientSession]] = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """
+    Process-wide aiohttp session for the running event loop.
+
+    Auth, thread and health requests share one connector with keep-alive and
+    a DNS cache, so repeated requests to a host skip the DNS lookup and the
+    TCP/TLS setup. A session belongs to the loop it was created on; calling
+    from another loop creates a new one. run_async() closes it before the
+    loop ends.
+    """
+    global _http_session
+    loop = asyncio.get_running_loop()
+    if _http_session is None or _http_session[0] is not loop or _http_session[1].closed:
+        connector = aiohttp.TCPConnector(ttl_dns_cache=HTTP_DNS_CACHE_TTL, keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT)
+        _http_session = (loop, aiohttp.ClientSession(connector=connector))
+    return _http_session[1]
+
+
+@asynccontextmanager
+async def http_session():
+    """`async with` form of get_http_session(); the shared session stays open on exit."""
+    yield get_http_session()
+
+
+async def close_http_session() -> None:
+    """Close the shared HTTP session if it belongs to the running loop."""
+    global _http_session
+    if _http_session is not None and _http_session[0] is asyncio.get_running_loop():
+        session = _http_session[1]
+        _http_session = None
+        await session.close()
+
+
+def run_async(coro):
+    """asyncio.run() that closes the shared HTTP session before the loop is closed."""
+    async def runner():
+        try:
+            return await coro
+        finally:
+            await close_http_session()
+    return asyncio.run(runner())
+
+
 class HealthChecker:
     """
     Health check utilities for Agent CLI debugging
@@ -1387,7 +1450,7 @@ class HealthChecker:
         self.debug.debug_print("[CHECK] Checking backend health...")
 
         try:
-            async with aiohttp.ClientSession() as session:
+            async with http_session() as session:
                 health_url = f"{self.config.backend_url}/health"
 
                 async with session.get(health_url, timeout=10) as resp:
@@ -1430,7 +1493,7 @@ class HealthChecker:
         self.debug.debug_print("[CHECK] Checking auth service health...")
 
         try:
-            async with aiohttp.ClientSession() as session:
+            async with http_session() as session:
                 health_url = f"{self.config.auth_url}/health"
 
                 async with session.get(health_url, timeout=10) as resp:
@@ -1887,13 +1950,13 @@ class AuthManager:
         self.session: Optional[aiohttp.ClientSession] = None
 
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        # Shared with the thread and health endpoints; closed by run_async()
+        self.session = get_http_session()
         await self.load_cached_token()
         return self
 
     async def __aexit__(self, *args):
-        if self.session:
-            await self.session.close()
+        self.session = None
 
     async def load_cached_token(self) -> bool:
         """Load token from cache file"""
@@ -2625,19 +2688,329 @@ class WebSocketEvent:
         else:
             return safe_format_message(f"📡 {event_type}: {smart_truncate_json(data, None)}")
 
+@dataclass
+class EncodedPayload:
+    """A message serialized once, with the byte sizes of its log sections."""
+    data: bytes  # UTF-8 JSON, sent as-is in a text frame
+    section_sizes: Dict[str, int] = field(default_factory=dict)  # jsonl_logs / jsonl_logs_blobs bytes
+
+    PREVIEW_BYTES = 2000
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+    @property
+    def logs_size(self) -> int:
+        """Bytes taken by the logs and their blob table."""
+        return self.section_sizes.get("jsonl_logs", 0) + self.section_sizes.get("jsonl_logs_blobs", 0)
+
+    def preview(self, limit: int = PREVIEW_BYTES) -> str:
+        """Start of the message for diagnostic logging."""
+        text = self.data[:limit].decode('utf-8', errors='ignore')
+        if self.size <= limit:
+            return text
+        return f"{text}... [{self.size - limit:,} more bytes]"
+
+
+@dataclass
+class ReceiveStats:
+    """Frame queue metrics for WebSocketClient.receive_events."""
+    frames: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    total_lag: float = 0.0  # Seconds between reading a frame and finishing its processing
+    max_lag: float = 0.0
+
+    @property
+    def mean_lag(self) -> float:
+        return self.total_lag / self.frames if self.frames else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.frames} frames, queue depth max {self.max_queue_depth}, "
+            f"lag mean {self.mean_lag * 1000:.1f}ms / max {self.max_lag * 1000:.1f}ms"
+        )
+
+
+class EventStore:
+    """
+    Bounded, indexed store of received WebSocket events.
+
+    Keeps the newest `max_events` events in memory and, when `spill_path` is
+    set, appends evicted events to it as NDJSON. Positions are absolute:
+    len() counts every event ever stored and a position stays valid after
+    older events are evicted, so `len(store)` can be taken as a cursor and
+    passed to since() later.
+
+    Events are also indexed by type and by run_id, and all-time counts per
+    type are kept, so "was an agent_completed received?" or "all
+    agent_completed events" cost O(1) and O(matches) instead of a scan.
+    """
+
+    DEFAULT_MAX_EVENTS = 10000
+
+    def __init__(self, max_events: Optional[int] = DEFAULT_MAX_EVENTS, spill_path: Optional[Path] = None):
+        """
+        Args:
+            max_events: Events kept in memory, or None/0 for no limit
+            spill_path: NDJSON file receiving evicted events, if any
+        """
+        self.max_events = max_events or None
+        self.spill_path = Path(spill_path) if spill_path else None
+        self.evicted = 0
+        self._total = 0
+        self._events: deque = deque()  # (position, event)
+        self._by_type: Dict[str, deque] = {}
+        self._by_run: Dict[str, deque] = {}
+        self._type_counts: Dict[str, int] = {}
+        self._spill_file = None
+
+    @classmethod
+    def from_events(cls, events: Any) -> "EventStore":
+        """Return `events` if it is already a store, else an unbounded store holding them."""
+        if isinstance(events, cls):
+            return events
+        store = cls(max_events=None)
+        for event in events or []:
+            store.append(event)
+        return store
+
+    @staticmethod
+    def _run_id(event: WebSocketEvent) -> Optional[str]:
+        data = event.data if isinstance(event.data, dict) else {}
+        run_id = data.get('run_id')
+        if run_id is None:
+            for key in ('payload', 'data'):
+                nested = data.get(key)
+                if isinstance(nested, dict) and nested.get('run_id') is not None:
+                    run_id = nested['run_id']
+                    break
+        return str(run_id) if run_id is not None else None
+
+    def append(self, event: WebSocketEvent) -> None:
+        entry = (self._total, event)
+        self._total += 1
+        self._events.append(entry)
+        self._by_type.setdefault(event.type, deque()).append(entry)
+        self._type_counts[event.type] = self._type_counts.get(event.type, 0) + 1
+        run_id = self._run_id(event)
+        if run_id is not None:
+            self._by_run.setdefault(run_id, deque()).append(entry)
+
+        if self.max_events and len(self._events) > self.max_events:
+            self._evict()
+
+    def _evict(self) -> None:
+        entry = self._events.popleft()
+        position, event = entry
+        # The evicted event is the oldest of its type and run, so it heads those indexes too
+        self._by_type[event.type].popleft()
+        run_id = self._run_id(event)
+        if run_id is not None:
+            run_events = self._by_run[run_id]
+            run_events.popleft()
+            if not run_events:
+                del self._by_run[run_id]
+        self.evicted += 1
+
+        if self.spill_path:
+            try:
+                if self._spill_file is None:
+                    self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+                    self._spill_file = open(self.spill_path, 'a', encoding='utf-8')
+                self._spill_file.write(json.dumps({
+                    "position": position,
+                    "type": event.type,
+                    "timestamp": str(event.timestamp),
+                    "data": event.data
+                }, default=str) + "\n")
+            except (OSError, TypeError, ValueError) as e:
+                logging.getLogger(__name__).warning(f"Could not spill event to {self.spill_path}: {e}")
+
+    def close(self) -> None:
+        """Flush and close the spill file."""
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+    def __len__(self) -> int:
+        return self._total
+
+    def __bool__(self) -> bool:
+        return self._total > 0
+
+    def __iter__(self):
+        return (event for _, event in self._events)
+
+    def __getitem__(self, position: int) -> WebSocketEvent:
+        if position < 0:
+            position += self._total
+        first = self._total - len(self._events)
+        if not first <= position < self._total:
+            raise IndexError(f"event {position} is not in memory (held: {first}..{self._total - 1})")
+        return self._events[position - first][1]
+
+    @property
+    def first_position(self) -> int:
+        """Position of the oldest event still in memory."""
+        return self._total - len(self._events)
+
+    def since(self, position: int):
+        """Iterate over the events in memory at or after an absolute position."""
+        first = self.first_position
+        for index in range(max(position, first) - first, len(self._events)):
+            yield self._events[index][1]
+
+    def of_type(self, *event_types: str) -> List[WebSocketEvent]:
+        """Events in memory of the given types, in arrival order."""
+        entries = [entry for event_type in event_types for entry in self._by_type.get(event_type, ())]
+        if len(event_types) > 1:
+            entries.sort(key=lambda entry: entry[0])
+        return [event for _, event in entries]
+
+    def for_run(self, run_id: str) -> List[WebSocketEvent]:
+        """Events in memory carrying the given run_id (top level or in payload/data)."""
+        return [event for _, event in self._by_run.get(str(run_id), ())]
+
+    def count(self, event_type: str) -> int:
+        """Events of a type ever received, including evicted ones."""
+        return self._type_counts.get(event_type, 0)
+
+    def types_seen(self) -> set:
+        """Every event type ever received."""
+        return set(self._type_counts)
+
+
+class ThreadCacheStore:
+    """
+    Process-wide view of a thread_cache.json file.
+
+    Every WebSocketClient using the same file shares one store, so the file
+    is read once per process instead of once per client. Updates mark the
+    store dirty; inside a running event loop the write is deferred by
+    WRITE_DELAY so a burst of handshakes (a connection pool opening, say)
+    produces one write. Writes go to a temporary file that replaces the
+    cache atomically, and pending writes are flushed at exit.
+    """
+
+    WRITE_DELAY = 0.5  # Seconds updates are collected before one write
+
+    _stores: Dict[Path, "ThreadCacheStore"] = {}
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+        self.load_error: Optional[str] = None
+        self._write_handle: Optional[asyncio.TimerHandle] = None
+        self.load()
+
+    @classmethod
+    def for_path(cls, path: Path) -> "ThreadCacheStore":
+        """The process's store for a cache file, loading it on first use."""
+        path = Path(path)
+        store = cls._stores.get(path)
+        if store is None:
+            if not cls._stores:
+                atexit.register(cls.flush_all)
+            store = cls._stores[path] = cls(path)
+        return store
+
+    def load(self) -> None:
+        """(Re)read the file, replacing the in-memory entries."""
+        self.load_error = None
+        try:
+            if self.path.exists():
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+                self.entries.clear()
+                if isinstance(data, dict):
+                    self.entries.update(data)
+        except (OSError, ValueError) as e:
+            self.load_error = str(e)
+            self.entries.clear()
+
+    def mark_dirty(self) -> None:
+        """Schedule a write of the current entries."""
+        self.dirty = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        if self._write_handle is None:
+            self._write_handle = loop.call_later(self.WRITE_DELAY, self._scheduled_flush)
+
+    def _scheduled_flush(self) -> None:
+        self._write_handle = None
+        try:
+            self.flush()
+        except OSError:
+            pass  # Still dirty; retried on the next update or at exit
+
+    def flush(self) -> None:
+        """Write pending updates now, atomically."""
+        if self._write_handle is not None:
+            self._write_handle.cancel()
+            self._write_handle = None
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self.entries, f, indent=2)
+            os.replace(tmp_path, self.path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        self.dirty = False
+
+    @classmethod
+    def flush_all(cls) -> None:
+        """Write every store with pending updates (registered with atexit)."""
+        for store in list(cls._stores.values()):
+            try:
+                store.flush()
+            except OSError:
+                pass
+
+
 class WebSocketClient:
     """WebSocket client for agent interactions"""
 
+    CHUNK_ACK_TIMEOUT = 30.0  # Seconds to wait for agent_started after sending a chunk
+    CHUNK_RETRY_BACKOFF = 2.0  # Seconds before the first resend of a failed chunk
+    _STATE_CHANGED = "__state_changed__"  # Waiter key for any new event or connection state change
+    AUTH_METHODS = ("subprotocol", "query_param", "header")
+    RECEIVE_QUEUE_WARN_DEPTH = 1000  # Frames waiting for processing before a backlog warning
+    AUTH_RACE_STAGGER = 0.25  # Seconds between starting auth methods in race mode
+    THREAD_VALIDATION_TTL = 300.0  # Seconds a positive thread validation is trusted
+
+    # (backend_url, token, thread_id) -> monotonic expiry, shared by every client in the process
+    _validated_threads: Dict[Tuple[str, str, str], float] = {}
+
     def __init__(self, config: Config, token: str, debug_manager: Optional[DebugManager] = None, run_id: Optional[str] = None,
                  send_logs: bool = False, logs_count: int = 1, logs_project: Optional[str] = None,
                  logs_path: Optional[str] = None, logs_user: Optional[str] = None,
-                 logs_provider: str = "claude", handshake_timeout: float = 10.0):
+                 logs_provider: str = "claude", handshake_timeout: float = 10.0,
+                 logs_incremental: bool = False, logs_projection: bool = True,
+                 logs_dedup: bool = False, logs_encoding: str = "auto",
+                 chunk_cache: bool = True, chunk_cache_ttl: float = 168.0,
+                 chunk_connections: int = 4, chunk_retries: int = 2,
+                 ws_auth_race: bool = False, event_buffer_size: int = EventStore.DEFAULT_MAX_EVENTS,
+                 event_spill_path: Optional[str] = None):
         self.config = config
         self.token = token
         self.debug = debug_manager or DebugManager(config.debug_level, config.debug_log_file, config.enable_websocket_diagnostics)
         self.handshake_timeout = handshake_timeout  # Configurable handshake timeout
         self.ws: Optional[WebSocketClientProtocol] = None
-        self.events: List[WebSocketEvent] = []
+        self.events = EventStore(max_events=event_buffer_size, spill_path=event_spill_path)
+        self.receive_stats = ReceiveStats()
+        self.receiver_task: Optional[asyncio.Task] = None  # Background receive_events() started by connect()
+        # Futures resolved by _record_event/_notify_waiters, keyed by event type or _STATE_CHANGED
+        self._event_waiters: Dict[str, List[asyncio.Future]] = {}
         self.connected = False
         self.run_id: Optional[str] = run_id
 
@@ -2651,10 +3024,8 @@ class WebSocketClient:
         self.chunk_total_expected: Optional[int] = None
         self.chunk_responses: List[Dict[str, Any]] = []
 
-        # SSOT: Thread management cache for performance
+        # SSOT: Thread management cache for performance, loaded once per process
         self.thread_cache_file = self._get_platform_cache_path()
-        self.thread_cache: Dict[str, Dict[str, Any]] = {}
-        self._load_thread_cache()
 
         # Log forwarding configuration
         self.send_logs = send_logs
@@ -2663,6 +3034,22 @@ class WebSocketClient:
         self.logs_path = logs_path
         self.logs_user = logs_user
         self.logs_provider = logs_provider
+        self.logs_incremental = logs_incremental
+        self.logs_projection = logs_projection
+        self.logs_dedup = logs_dedup
+        self.logs_encoding = logs_encoding
+        self.chunk_cache = chunk_cache
+        self.chunk_cache_ttl = chunk_cache_ttl  # Hours
+        self.chunk_connections = chunk_connections
+        self.chunk_retries = chunk_retries
+        self.ws_auth_race = ws_auth_race
+        self.auth_method_used: Optional[str] = None
+        self._pending_log_cursors = None  # LogCursorStore to commit after a successful send
+
+        # Transport compression, negotiated at connect and handshake time
+        self.deflate_negotiated = False
+        self.server_log_encodings: Optional[List[str]] = None
+        self.server_max_connections: Optional[int] = None
 
         # ISSUE #2134 FIX: Cleanup coordination protocol support
         self.cleanup_in_progress = False
@@ -2690,6 +3077,94 @@ class WebSocketClient:
         self.captured_chunk_thread_id: Optional[str] = None
         self.chunk_thread_id_event: Optional[asyncio.Event] = None
 
+    # Connection state flags notify waiters when assigned, so waits never poll them
+
+    @property
+    def connection_established_received(self) -> bool:
+        return self._connection_established_received
+
+    @connection_established_received.setter
+    def connection_established_received(self, value: bool) -> None:
+        self._connection_established_received = value
+        self._notify_waiters(self._STATE_CHANGED)
+
+    @property
+    def ready_to_send_events(self) -> bool:
+        return self._ready_to_send_events
+
+    @ready_to_send_events.setter
+    def ready_to_send_events(self, value: bool) -> None:
+        self._ready_to_send_events = value
+        self._notify_waiters(self._STATE_CHANGED)
+
+    @property
+    def cleanup_complete(self) -> bool:
+        return self._cleanup_complete
+
+    @cleanup_complete.setter
+    def cleanup_complete(self, value: bool) -> None:
+        self._cleanup_complete = value
+        self._notify_waiters(self._STATE_CHANGED)
+
+    def _notify_waiters(self, key: str) -> None:
+        """Resolve every future waiting on a key."""
+        for future in self._event_waiters.pop(key, ()):
+            if not future.done():
+                future.set_result(True)
+
+    def _record_event(self, event: WebSocketEvent) -> None:
+        """Store a received event and wake the waiters for its type."""
+        self.events.append(event)
+        self._notify_waiters(event.type)
+        if event.type == "system_message":
+            nested_type = event.data.get('event')
+            if isinstance(nested_type, str):
+                self._notify_waiters(nested_type)
+        self._notify_waiters(self._STATE_CHANGED)
+
+    def has_event(self, event_type: str) -> bool:
+        """Whether an event of this (top-level) type has been received."""
+        return self.events.count(event_type) > 0
+
+    async def _wait_for_signal(self, key: str, timeout: Optional[float]) -> bool:
+        """
+        Wait until _notify_waiters(key) is called.
+
+        Returns:
+            True if notified, False on timeout
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._event_waiters.setdefault(key, []).append(future)
+        try:
+            await asyncio.wait_for(future, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            waiters = self._event_waiters.get(key)
+            if waiters and future in waiters:
+                waiters.remove(future)
+
+    async def _wait_until(self, predicate: Callable[[], bool], timeout: Optional[float]) -> bool:
+        """
+        Wait until predicate() holds, re-checking on each new event or state change.
+
+        Args:
+            predicate: Condition over the client's events and state flags
+            timeout: Maximum time to wait in seconds, or None to wait indefinitely
+
+        Returns:
+            True if the predicate holds, False on timeout
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while not predicate():
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                return False
+            await self._wait_for_signal(self._STATE_CHANGED, remaining)
+        return True
+
     def _initialize_timeouts(self) -> None:
         """Initialize WebSocket timeouts using backend timeout configuration.
 
@@ -2904,14 +3379,19 @@ class WebSocketClient:
         """Connect to WebSocket with authentication"""
         self.debug.debug_print(f"Connecting to WebSocket: {self.config.ws_url}")
 
-        # Try multiple authentication methods
-        methods = [
-            ("subprotocol", self._connect_with_subprotocol),
-            ("query_param", self._connect_with_query_param),
-            ("header", self._connect_with_header)
-        ]
+        # Try multiple authentication methods, starting with the one this backend accepted last time
+        connectors = {
+            "subprotocol": self._connect_with_subprotocol,
+            "query_param": self._connect_with_query_param,
+            "header": self._connect_with_header
+        }
+        if self.ws_auth_race:
+            methods = [("race", self._connect_with_race)]
+        else:
+            methods = [(method_name, connectors[method_name]) for method_name in self._auth_method_order()]
 
         for method_name, method in methods:
+            attempt_start = time.monotonic()
             try:
                 self.debug.debug_print(
                     f"Initiating WebSocket auth via {method_name}",
@@ -2920,7 +3400,19 @@ class WebSocketClient:
                 )
                 self.debug.log_connection_attempt(method_name, self.config.ws_url)
                 if await method():
-                    self.debug.log_connection_attempt(method_name, self.config.ws_url, success=True)
+                    if method_name != "race":
+                        self.auth_method_used = method_name
+                        self.debug.log_connection_attempt(
+                            method_name, self.config.ws_url, success=True,
+                            latency=time.monotonic() - attempt_start
+                        )
+                    self._save_auth_method(self.auth_method_used)
+                    self.deflate_negotiated = self._is_deflate_negotiated()
+                    self.debug.debug_print(
+                        f"permessage-deflate {'negotiated' if self.deflate_negotiated else 'not accepted by server'}",
+                        DebugLevel.VERBOSE,
+                        style="dim"
+                    )
                     self.debug.debug_print(
                         f"WebSocket connected using {method_name}",
                         DebugLevel.VERBOSE,
@@ -2930,24 +3422,21 @@ class WebSocketClient:
                     # SSOT: Perform handshake to get backend-provided thread_id
                     handshake_success = await self._perform_handshake()
                     if handshake_success:
-                        safe_console_print(f"✅ Connected with thread ID: {self.current_thread_id}", style="green")
+                        safe_console_print(f"✅ Connected with thread ID: {self.current_thread_id}", style="green",
+                                         json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
                         self.connected = True
 
                         # Start listening for events in background immediately
-                        asyncio.create_task(self.receive_events())
+                        self.receiver_task = asyncio.create_task(self.receive_events())
 
                         # Wait for connection_established event
-                        wait_start = asyncio.get_event_loop().time()
                         timeout = 5.0
-                        while not self.connection_established_received:
-                            if (asyncio.get_event_loop().time() - wait_start) > timeout:
-                                self.debug.debug_print(
-                                    f"⚠️ Timeout waiting for connection_established after {timeout}s",
-                                    DebugLevel.BASIC,
-                                    style="yellow"
-                                )
-                                break
-                            await asyncio.sleep(0.1)
+                        if not await self._wait_until(lambda: self.connection_established_received, timeout):
+                            self.debug.debug_print(
+                                f"⚠️ Timeout waiting for connection_established after {timeout}s",
+                                DebugLevel.BASIC,
+                                style="yellow"
+                            )
 
                         # Set ready flag if we got the event
                         if self.connection_established_received:
@@ -2985,20 +3474,16 @@ class WebSocketClient:
                             self.connected = True
 
                             # Start listening for events in background immediately
-                            asyncio.create_task(self.receive_events())
+                            self.receiver_task = asyncio.create_task(self.receive_events())
 
                             # Wait for connection_established event
-                            wait_start = asyncio.get_event_loop().time()
                             timeout = 5.0
-                            while not self.connection_established_received:
-                                if (asyncio.get_event_loop().time() - wait_start) > timeout:
-                                    self.debug.debug_print(
-                                        f"⚠️ Timeout waiting for connection_established after {timeout}s",
-                                        DebugLevel.BASIC,
-                                        style="yellow"
-                                    )
-                                    break
-                                await asyncio.sleep(0.1)
+                            if not await self._wait_until(lambda: self.connection_established_received, timeout):
+                                self.debug.debug_print(
+                                    f"⚠️ Timeout waiting for connection_established after {timeout}s",
+                                    DebugLevel.BASIC,
+                                    style="yellow"
+                                )
 
                             # Set ready flag if we got the event
                             if self.connection_established_received:
@@ -3025,7 +3510,10 @@ class WebSocketClient:
                                 await self.ws.close()
                             return False
             except Exception as e:
-                self.debug.log_connection_attempt(method_name, self.config.ws_url, success=False, error=str(e))
+                self.debug.log_connection_attempt(
+                    method_name, self.config.ws_url, success=False, error=str(e),
+                    latency=None if method_name == "race" else time.monotonic() - attempt_start
+                )
                 self.debug.debug_print(
                     f"WebSocket authentication via {method_name} failed with {type(e).__name__}: {e}",
                     DebugLevel.BASIC,
@@ -3068,65 +3556,182 @@ class WebSocketClient:
         safe_console_print("", style="", json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
         return False
 
+    def _auth_connect_args(self, method_name: str) -> Tuple[str, Dict[str, Any]]:
+        """
+        URL and websockets.connect() options for an authentication method.
+
+        Args:
+            method_name: One of AUTH_METHODS
+
+        Returns:
+            Tuple of (url, connect keyword arguments)
+        """
+        env = self.config.environment.value
+        options: Dict[str, Any] = {
+            "close_timeout": self._get_close_timeout(),
+            "max_size": 5 * 1024 * 1024,  # 5 MB max message size
+            "compression": "deflate"  # Negotiate permessage-deflate
+        }
+
+        if method_name == "subprotocol":
+            # Use the correct JWT subprotocol format supported by the backend
+            # Based on unified_jwt_protocol_handler.py, supported formats are:
+            # jwt.{token}, jwt-auth.{token}, bearer.{token}, staging-auth.{token}
+            # Add environment information to subprotocol for Issue #1906
+            options["subprotocols"] = [
+                f"jwt.{env}.{self.token}",           # Primary format with environment
+                f"jwt-auth.{env}.{self.token}",      # Alternative format with environment
+                f"bearer.{env}.{self.token}",        # Fallback format with environment
+                f"staging-auth.{self.token}",        # Legacy staging environment format
+                f"jwt.{self.token}",                 # Backward compatibility - primary format
+                f"jwt-auth.{self.token}",            # Backward compatibility - alternative format
+                f"bearer.{self.token}"                # Backward compatibility - fallback format
+            ]
+            return self.config.ws_url, options
+
+        if method_name == "query_param":
+            # Add environment parameter for Issue #1906
+            return f"{self.config.ws_url}?token={self.token}&env={env}", options
+
+        if method_name == "header":
+            # Add X-Environment header for Issue #1906
+            options["additional_headers"] = {
+                "Authorization": f"Bearer {self.token}",
+                "X-Environment": env
+            }
+            return self.config.ws_url, options
+
+        raise ValueError(f"Unknown WebSocket auth method: {method_name}")
+
     async def _connect_with_subprotocol(self) -> bool:
         """Connect using subprotocol (most reliable for Cloud Run)"""
         safe_console_print("Trying subprotocol authentication...", style="dim",
                          json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
-        # Use the correct JWT subprotocol format supported by the backend
-        # Based on unified_jwt_protocol_handler.py, supported formats are:
-        # jwt.{token}, jwt-auth.{token}, bearer.{token}, staging-auth.{token}
-        # Add environment information to subprotocol for Issue #1906
-        env = self.config.environment.value
-        subprotocols = [
-            f"jwt.{env}.{self.token}",           # Primary format with environment
-            f"jwt-auth.{env}.{self.token}",      # Alternative format with environment
-            f"bearer.{env}.{self.token}",        # Fallback format with environment
-            f"staging-auth.{self.token}",        # Legacy staging environment format
-            f"jwt.{self.token}",                 # Backward compatibility - primary format
-            f"jwt-auth.{self.token}",            # Backward compatibility - alternative format
-            f"bearer.{self.token}"                # Backward compatibility - fallback format
-        ]
+        url, options = self._auth_connect_args("subprotocol")
         safe_console_print(f"Using JWT subprotocol formats: jwt.{self.token[:20]}...", style="dim",
                          json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
-        self.ws = await websockets.connect(
-            self.config.ws_url,
-            subprotocols=subprotocols,
-            close_timeout=self._get_close_timeout(),
-            max_size=5 * 1024 * 1024  # 5 MB max message size
-        )
+        self.ws = await websockets.connect(url, **options)
         return True
 
     async def _connect_with_query_param(self) -> bool:
         """Connect using query parameter"""
         safe_console_print("Trying query parameter authentication...", style="dim",
                          json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
-        # Add environment parameter for Issue #1906
-        env = self.config.environment.value
-        url = f"{self.config.ws_url}?token={self.token}&env={env}"
-        self.ws = await websockets.connect(
-            url,
-            close_timeout=self._get_close_timeout(),
-            max_size=5 * 1024 * 1024  # 5 MB max message size
-        )
+        url, options = self._auth_connect_args("query_param")
+        self.ws = await websockets.connect(url, **options)
         return True
 
     async def _connect_with_header(self) -> bool:
         """Connect using Authorization header"""
         safe_console_print("Trying header authentication...", style="dim",
                          json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
-        # Add X-Environment header for Issue #1906
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "X-Environment": self.config.environment.value
-        }
-        self.ws = await websockets.connect(
-            self.config.ws_url,
-            additional_headers=headers,
-            close_timeout=self._get_close_timeout(),
-            max_size=5 * 1024 * 1024  # 5 MB max message size
-        )
+        url, options = self._auth_connect_args("header")
+        self.ws = await websockets.connect(url, **options)
+        return True
+
+    async def _connect_with_race(self) -> bool:
+        """
+        Start the auth methods AUTH_RACE_STAGGER apart and keep the first that connects.
+
+        The remembered method starts first, so against a known backend it
+        usually wins before any other attempt begins. Connections opened by
+        the losers are closed.
+        """
+        safe_console_print("Racing WebSocket authentication methods...", style="dim",
+                         json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
+        loop = asyncio.get_running_loop()
+
+        async def attempt(position: int, method_name: str):
+            await asyncio.sleep(position * self.AUTH_RACE_STAGGER)
+            url, options = self._auth_connect_args(method_name)
+            self.debug.log_connection_attempt(method_name, self.config.ws_url)
+            attempt_start = loop.time()
+            try:
+                ws = await websockets.connect(url, **options)
+            except Exception as e:
+                self.debug.log_connection_attempt(
+                    method_name, self.config.ws_url, success=False, error=str(e),
+                    latency=loop.time() - attempt_start
+                )
+                raise
+            self.debug.log_connection_attempt(
+                method_name, self.config.ws_url, success=True,
+                latency=loop.time() - attempt_start
+            )
+            return method_name, ws
+
+        tasks = [asyncio.create_task(attempt(position, method_name))
+                 for position, method_name in enumerate(self._auth_method_order())]
+        winner = None
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    winner = await next_done
+                    break
+                except Exception:
+                    continue
+        finally:
+            for task in tasks:
+                task.cancel()
+            for outcome in await asyncio.gather(*tasks, return_exceptions=True):
+                if isinstance(outcome, tuple) and outcome is not winner:
+                    await outcome[1].close()
+
+        if winner is None:
+            raise ConnectionError("no authentication method was accepted")
+        self.auth_method_used, self.ws = winner
         return True
 
+    def _auth_method_cache_file(self) -> Path:
+        return self.thread_cache_file.parent / "ws_auth_methods.json"
+
+    def _auth_method_cache_key(self) -> str:
+        return f"{self.config.environment.value}|{self.config.ws_url}"
+
+    def _load_auth_methods(self) -> Dict[str, Any]:
+        try:
+            with open(self._auth_method_cache_file(), 'r') as f:
+                cache = json.load(f)
+            return cache if isinstance(cache, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _auth_method_order(self) -> List[str]:
+        """Auth methods to try, the one this backend accepted last time first."""
+        remembered = self._load_auth_methods().get(self._auth_method_cache_key(), {})
+        method = remembered.get('method') if isinstance(remembered, dict) else None
+        if method in self.AUTH_METHODS:
+            self.debug.debug_print(f"Trying remembered WebSocket auth method first: {method}", DebugLevel.VERBOSE, style="dim")
+            return [method] + [name for name in self.AUTH_METHODS if name != method]
+        return list(self.AUTH_METHODS)
+
+    def _save_auth_method(self, method_name: Optional[str]) -> None:
+        """Remember the auth method this backend accepted, next to the thread cache."""
+        if method_name not in self.AUTH_METHODS:
+            return
+        cache = self._load_auth_methods()
+        key = self._auth_method_cache_key()
+        if isinstance(cache.get(key), dict) and cache[key].get('method') == method_name:
+            return
+
+        cache[key] = {"method": method_name, "updated_at": datetime.now().isoformat()}
+        cache_file = self._auth_method_cache_file()
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_name(f".{cache_file.name}.{os.getpid()}.tmp")
+            with open(tmp_file, 'w') as f:
+                json.dump(cache, f, indent=2)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            self.debug.debug_print(f"Could not save WebSocket auth method: {e}", DebugLevel.TRACE)
+
+    def _is_deflate_negotiated(self) -> bool:
+        """Check whether the server accepted permessage-deflate for the current connection."""
+        # websockets >= 14 keeps extensions on the sans-I/O protocol object
+        protocol = getattr(self.ws, 'protocol', None)
+        extensions = getattr(protocol, 'extensions', None) or getattr(self.ws, 'extensions', None) or []
+        return any(getattr(extension, 'name', None) == 'permessage-deflate' for extension in extensions)
+
     async def _perform_handshake(self) -> bool:
         """
         Wait for proactive handshake from server (as of 2025-10-09).
@@ -3272,7 +3877,7 @@ class WebSocketClient:
                         )
                         # Store the event but continue waiting
                         if hasattr(self, 'events'):
-                            self.events.append(WebSocketEvent(
+                            self._record_event(WebSocketEvent(
                                 type=response.get('type', 'unknown'),
                                 data=response
                             ))
@@ -3285,7 +3890,7 @@ class WebSocketClient:
                             style="dim"
                         )
                         if hasattr(self, 'events'):
-                            self.events.append(WebSocketEvent(
+                            self._record_event(WebSocketEvent(
                                 type=response.get('type', 'unknown'),
                                 data=response
                             ))
@@ -3416,6 +4021,21 @@ class WebSocketClient:
         self.run_id = backend_run_id  # Store run_id if provided
         self._update_thread_cache(backend_thread_id)
 
+        # Compressed jsonl_logs are only sent to backends that advertise them
+        capabilities = response.get('capabilities') or {}
+        self.server_log_encodings = capabilities.get('jsonl_logs_encodings')
+        if self.server_log_encodings:
+            self.debug.debug_print(
+                f"Backend accepts jsonl_logs encodings: {', '.join(self.server_log_encodings)}",
+                DebugLevel.VERBOSE,
+                style="cyan"
+            )
+
+        # Upper bound on concurrent chunk upload connections, if the backend sets one
+        max_connections = capabilities.get('max_chunk_connections')
+        if isinstance(max_connections, int) and max_connections > 0:
+            self.server_max_connections = max_connections
+
         self.debug.debug_print(
             f"Handshake complete - Thread ID: {backend_thread_id}",
             DebugLevel.VERBOSE,
@@ -3431,10 +4051,14 @@ class WebSocketClient:
 
         # CRITICAL: Send acknowledgment with the SAME thread_id
         # Per WebSocket Client Lifecycle Guide, use "handshake_acknowledged"
+        from agent_logs import available_log_encodings
         ack_message = {
             "type": "handshake_acknowledged",
             "thread_id": backend_thread_id,  # Echo back the same ID
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "capabilities": {
+                "jsonl_logs_encodings": available_log_encodings()
+            }
         }
 
         await self.ws.send(json.dumps(ack_message))
@@ -3490,6 +4114,19 @@ class WebSocketClient:
 
         return True
 
+    @property
+    def thread_cache_file(self) -> Path:
+        return self._thread_cache.path
+
+    @thread_cache_file.setter
+    def thread_cache_file(self, path: Path) -> None:
+        self._thread_cache = ThreadCacheStore.for_path(path)
+
+    @property
+    def thread_cache(self) -> Dict[str, Dict[str, Any]]:
+        """Thread cache entries, shared with every client using the same cache file."""
+        return self._thread_cache.entries
+
     def _get_platform_cache_path(self) -> Path:
         """
         Get platform-appropriate cache directory path.
@@ -3531,7 +4168,10 @@ class WebSocketClient:
 
     def _load_thread_cache(self) -> None:
         """
-        Load thread cache from disk for SSOT thread management.
+        Reload thread cache from disk for SSOT thread management.
+
+        Clients read the shared ThreadCacheStore, which loads the file on
+        first use; this forces a re-read.
 
         Cache structure:
         {
@@ -3543,33 +4183,24 @@ class WebSocketClient:
             }
         }
         """
-        try:
-            if self.thread_cache_file.exists():
-                with open(self.thread_cache_file, 'r') as f:
-                    self.thread_cache = json.load(f)
-                    self.debug.debug_print(
-                        f"SSOT: Loaded thread cache with {len(self.thread_cache)} entries",
-                        DebugLevel.VERBOSE
-                    )
-        except Exception as e:
+        self._thread_cache.load()
+        if self._thread_cache.load_error:
             self.debug.debug_print(
-                f"SSOT: Could not load thread cache: {e}",
+                f"SSOT: Could not load thread cache: {self._thread_cache.load_error}",
                 DebugLevel.TRACE
             )
-            self.thread_cache = {}
+        else:
+            self.debug.debug_print(
+                f"SSOT: Loaded thread cache with {len(self.thread_cache)} entries",
+                DebugLevel.VERBOSE
+            )
 
     def _save_thread_cache(self) -> None:
-        """Save thread cache to disk for persistence."""
+        """Save thread cache to disk for persistence (coalesced with other updates)."""
         try:
-            # Ensure directory exists
-            self.thread_cache_file.parent.mkdir(parents=True, exist_ok=True)
-
-            # Save cache
-            with open(self.thread_cache_file, 'w') as f:
-                json.dump(self.thread_cache, f, indent=2)
-
+            self._thread_cache.mark_dirty()
             self.debug.debug_print(
-                "SSOT: Thread cache saved successfully",
+                "SSOT: Thread cache update queued for saving",
                 DebugLevel.TRACE
             )
         except Exception as e:
@@ -3746,9 +4377,7 @@ class WebSocketClient:
                 "timestamp": datetime.now().isoformat()
             }
 
-            # Use aiohttp session if available, otherwise create one
-            import aiohttp
-            async with aiohttp.ClientSession() as session:
+            async with http_session() as session:
                 async with session.post(thread_url, json=payload, headers=headers) as response:
                     if response.status == 200 or response.status == 201:
                         data = await response.json()
@@ -3758,6 +4387,7 @@ class WebSocketClient:
                                 f"SSOT: Backend created thread with ID: {thread_id}",
                                 DebugLevel.VERBOSE
                             )
+                            self._remember_valid_thread(thread_id)
                             return thread_id
                     else:
                         error_text = await response.text()
@@ -3785,8 +4415,22 @@ class WebSocketClient:
         """
         Validate that a thread ID exists and is valid on the backend.
 
-        SSOT: Backend validates thread existence and status.
+        SSOT: Backend validates thread existence and status. A positive
+        answer is trusted for THREAD_VALIDATION_TTL seconds by every client in
+        the process with the same backend and token; negative answers are not
+        cached.
         """
+        key = (self.config.backend_url, self.token, thread_id)
+        expiry = self._validated_threads.get(key)
+        if expiry is not None:
+            if time.monotonic() < expiry:
+                self.debug.debug_print(
+                    f"SSOT: Thread {thread_id} validated recently, skipping backend check",
+                    DebugLevel.TRACE
+                )
+                return True
+            self._validated_threads.pop(key, None)
+
         try:
             # Quick validation - check if thread exists on backend
             validate_url = f"{self.config.backend_url}/api/threads/{thread_id}/validate"
@@ -3795,8 +4439,7 @@ class WebSocketClient:
                 "Authorization": f"Bearer {self.token}"
             }
 
-            import aiohttp
-            async with aiohttp.ClientSession() as session:
+            async with http_session() as session:
                 async with session.get(validate_url, headers=headers) as response:
                     if response.status == 200:
                         data = await response.json()
@@ -3806,6 +4449,7 @@ class WebSocketClient:
                                 f"SSOT: Thread {thread_id} validated successfully",
                                 DebugLevel.TRACE
                             )
+                            self._remember_valid_thread(thread_id)
                         return is_valid
                     elif response.status == 404:
                         self.debug.debug_print(
@@ -3823,6 +4467,12 @@ class WebSocketClient:
 
         return False
 
+    def _remember_valid_thread(self, thread_id: str) -> None:
+        """Record a thread as valid for THREAD_VALIDATION_TTL seconds."""
+        self._validated_threads[(self.config.backend_url, self.token, thread_id)] = (
+            time.monotonic() + self.THREAD_VALIDATION_TTL
+        )
+
     async def _flush_queued_events(self) -> None:
         """
         Flush all queued events after connection_established is received.
@@ -3882,6 +4532,80 @@ class WebSocketClient:
             style="green"
         )
 
+    @staticmethod
+    def _payload_log_count(payload_body: Dict[str, Any]) -> int:
+        """Number of log entries in a payload, whether jsonl_logs is a list or encoded."""
+        logs_field = payload_body.get("jsonl_logs")
+        if isinstance(logs_field, list):
+            return len(logs_field)
+        return payload_body.get("jsonl_logs_count", 0)
+
+    @staticmethod
+    def _encode_payload(payload: Dict[str, Any]) -> EncodedPayload:
+        """
+        Serialize a message payload once, measuring its log sections on the way.
+
+        The envelope is dumped with placeholders for jsonl_logs and
+        jsonl_logs_blobs, and each section is encoded once and spliced into a
+        single buffer. Collected entries carry their JSON bytes, so a
+        jsonl_logs list is not re-encoded at all.
+
+        Args:
+            payload: Message with optional payload.jsonl_logs / payload.jsonl_logs_blobs fields
+
+        Returns:
+            EncodedPayload with the UTF-8 message and per-section sizes
+        """
+        body = payload.get("payload")
+        if not isinstance(body, dict):
+            return EncodedPayload(json.dumps(payload).encode('utf-8'))
+
+        sections: Dict[str, bytes] = {}
+        for key in ("jsonl_logs", "jsonl_logs_blobs"):
+            if key not in body:
+                continue
+            value = body[key]
+            if isinstance(value, list):
+                from agent_logs import entries_json_bytes
+                sections[key] = entries_json_bytes(value)
+            else:
+                sections[key] = json.dumps(value).encode('utf-8')
+
+        if not sections:
+            return EncodedPayload(json.dumps(payload).encode('utf-8'))
+
+        placeholders = {key: f"__{key}_{uuid.uuid4().hex}__" for key in sections}
+        envelope = json.dumps({**payload, "payload": {**body, **placeholders}}).encode('utf-8')
+
+        # Splice the sections in the order their placeholders appear
+        parts = []
+        for key in sorted(sections, key=lambda k: envelope.index(json.dumps(placeholders[k]).encode('utf-8'))):
+            head, _, envelope = envelope.partition(json.dumps(placeholders[key]).encode('utf-8'))
+            parts.append(head)
+            parts.append(sections[key])
+        parts.append(envelope)
+
+        return EncodedPayload(b''.join(parts), {key: len(value) for key, value in sections.items()})
+
+    @staticmethod
+    def _format_byte_size(size_bytes: int) -> str:
+        """Format a byte count as bytes, KB or MB."""
+        size_kb = size_bytes / 1024
+        size_mb = size_kb / 1024
+        if size_mb >= 1:
+            return f"{size_mb:.2f} MB"
+        if size_kb >= 1:
+            return f"{size_kb:.2f} KB"
+        return f"{size_bytes} bytes"
+
+    def _display_dedup_summary(self, dedup: Any) -> None:
+        """Display the blob deduplication ratio for the logs being sent."""
+        safe_console_print(
+            f"  Dedup Ratio: {dedup.ratio:.2f}x ({dedup.repeats} repeated blobs, "
+            f"{self._format_byte_size(max(dedup.saved_bytes, 0))} saved)",
+            json_mode=self.config.json_mode, ci_mode=self.config.ci_mode
+        )
+
     def _display_log_collection_info(self, info: dict) -> None:
         """Display log collection information to the console"""
         separator = "=" * 60
@@ -3896,6 +4620,19 @@ class WebSocketClient:
         safe_console_print(f"  Files Read: {info['files_read']}", json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
         safe_console_print(f"  Payload Size: {info['size_str']}", json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
 
+        pruned_bytes = sum(file_info.get('pruned_bytes', 0) for file_info in info['file_info'])
+        if pruned_bytes:
+            safe_console_print(f"  Pruned Heavy Fields: {self._format_byte_size(pruned_bytes)}", json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
+
+        if info.get('dedup') is not None:
+            self._display_dedup_summary(info['dedup'])
+
+        if info.get('encoding'):
+            safe_console_print(
+                f"  Encoding: {info['encoding']} ({self._format_byte_size(info['raw_size_bytes'])} before compression)",
+                json_mode=self.config.json_mode, ci_mode=self.config.ci_mode
+            )
+
         if self.logs_project:
             safe_console_print(f"  Project: {self.logs_project}", json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
 
@@ -3919,8 +4656,15 @@ class WebSocketClient:
         safe_console_print(separator, style="cyan", json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
         safe_console_print("", json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
 
-    async def send_message(self, message: str, jsonl_logs: Optional[List[Dict[str, Any]]] = None) -> bool:
-        """Send a message and return the run_id"""
+    async def send_message(self, message: str, jsonl_logs: Optional[List[Dict[str, Any]]] = None,
+                           agent_context: Optional[Dict[str, Any]] = None) -> bool:
+        """Send a message and return the run_id
+
+        Args:
+            message: Message content
+            jsonl_logs: Log entries to send as-is; when given, --send-logs collection is skipped
+            agent_context: Extra agent_context fields for the backend (e.g. follow mode batch info)
+        """
         if not self.ws:
             raise RuntimeError("WebSocket not connected")
 
@@ -3989,24 +4733,19 @@ class WebSocketClient:
                 # Wait up to 30 seconds for connection_established
                 wait_timeout = 30.0
                 wait_start = time.time()
-                wait_interval = 0.1
 
-                while not self.ready_to_send_events and (time.time() - wait_start) < wait_timeout:
-                    await asyncio.sleep(wait_interval)
-                    # Check if connection_established arrived
-                    if self.ready_to_send_events:
-                        self.debug.debug_print(
-                            "✅ connection_established received - ready to send events",
-                            DebugLevel.BASIC,
-                            style="green"
-                        )
-                        safe_console_print(
-                            "✅ connection_established received - proceeding with message",
-                            style="green",
-                            json_mode=self.config.json_mode,
-                            ci_mode=self.config.ci_mode
-                        )
-                        break
+                if await self._wait_until(lambda: self.ready_to_send_events, wait_timeout):
+                    self.debug.debug_print(
+                        "✅ connection_established received - ready to send events",
+                        DebugLevel.BASIC,
+                        style="green"
+                    )
+                    safe_console_print(
+                        "✅ connection_established received - proceeding with message",
+                        style="green",
+                        json_mode=self.config.json_mode,
+                        ci_mode=self.config.ci_mode
+                    )
 
                 # If still not ready after timeout, then error
                 if not self.ready_to_send_events:
@@ -4128,33 +4867,70 @@ class WebSocketClient:
         }
         if jsonl_logs is not None:
             payload["payload"]["jsonl_logs"] = jsonl_logs
+        if agent_context:
+            payload["payload"]["agent_context"] = agent_context
 
         # Attach logs if --send-logs is enabled
-        if self.send_logs:
+        if self.send_logs and jsonl_logs is None:
             try:
-                from agent_logs import collect_recent_logs
+                from agent_logs import (
+                    LogCursorStore, LogDeduplicator, LogProjectionConfig, collect_recent_logs,
+                    compress_log_bytes, entries_json_bytes, select_log_encoding
+                )
                 from chunking_analyzer import ChunkingAnalyzer
                 from chunk_creator import ChunkCreator
 
+                cursor_store = None
+                if self.logs_incremental:
+                    cursor_store = LogCursorStore(self.thread_cache_file.parent / "log_cursors.json")
+
                 result = collect_recent_logs(
                     limit=self.logs_count,
                     project_name=self.logs_project,
                     base_path=self.logs_path,
                     username=self.logs_user,
-                    provider=self.logs_provider
+                    provider=self.logs_provider,
+                    cursor_store=cursor_store,
+                    projection=LogProjectionConfig() if self.logs_projection else None
                 )
 
+                if result and cursor_store is not None and not result[0]:
+                    self.debug.debug_print(
+                        "No new log entries since last run (--logs-incremental)",
+                        DebugLevel.BASIC,
+                        style="yellow"
+                    )
+                    result = None
+
                 if result:
                     logs, files_read, file_info = result
 
+                    # Size limits apply to encoded bytes when the backend accepts compressed logs
+                    log_encoding = select_log_encoding(self.server_log_encodings, self.logs_encoding)
+                    wire_size = (lambda raw: len(compress_log_bytes(raw, log_encoding)) + 2) if log_encoding else None
+
                     # NEW: Analyze if chunking needed
-                    analyzer = ChunkingAnalyzer()
+                    analyzer = ChunkingAnalyzer(wire_size=wire_size)
                     chunking_strategy = analyzer.analyze_files(logs, file_info)
 
                     if chunking_strategy.strategy in ('no_chunking', 'multi_file_no_chunking'):
                         # Original behavior: send all logs at once
                         payload["payload"]["jsonl_logs"] = logs
 
+                        dedup = None
+                        if self.logs_dedup:
+                            dedup = LogDeduplicator()
+                            payload["payload"]["jsonl_logs"] = list(dedup.iter_dedup(logs))
+                            payload["payload"]["jsonl_logs_blobs"] = dedup.take_blobs()
+
+                        raw_logs_size_bytes = None
+                        if log_encoding:
+                            raw_logs = entries_json_bytes(payload["payload"]["jsonl_logs"])
+                            raw_logs_size_bytes = len(raw_logs)
+                            payload["payload"]["jsonl_logs"] = compress_log_bytes(raw_logs, log_encoding)
+                            payload["payload"]["jsonl_logs_encoding"] = log_encoding
+                            payload["payload"]["jsonl_logs_count"] = len(logs)
+
                         # Add agent_context with chunk_metadata for non-chunked logs
                         # This maintains consistency with backend expectations
                         file_analysis = chunking_strategy.file_analyses[0] if chunking_strategy.file_analyses else None
@@ -4175,42 +4951,35 @@ class WebSocketClient:
                                 }
                             }
 
-                        # Calculate payload size for transmission proof
-                        import logging
-                        import sys
-
-                        # Get size of logs in payload
-                        logs_json = json.dumps(logs)
-                        logs_size_bytes = len(logs_json.encode('utf-8'))
-                        logs_size_kb = logs_size_bytes / 1024
-                        logs_size_mb = logs_size_kb / 1024
-
-                        # Format size appropriately
-                        if logs_size_mb >= 1:
-                            size_str = f"{logs_size_mb:.2f} MB"
-                        elif logs_size_kb >= 1:
-                            size_str = f"{logs_size_kb:.2f} KB"
-                        else:
-                            size_str = f"{logs_size_bytes} bytes"
-
-                        # Save log display info for later (will be displayed after "Sending message:")
+                        # Save log display info for later (will be displayed after "Sending message:");
+                        # the payload size is filled in when the message is encoded
                         self._log_display_info = {
                             'logs': logs,
                             'files_read': files_read,
                             'file_info': file_info,
-                            'size_str': size_str
+                            'size_str': None,
+                            'dedup': dedup,
+                            'encoding': log_encoding,
+                            'raw_size_bytes': raw_logs_size_bytes
                         }
                     else:
                         # NEW: Chunking required
-                        await self._send_chunked_logs(
+                        chunks_delivered = await self._send_chunked_logs(
                             logs=logs,
                             file_info=file_info,
                             chunking_strategy=chunking_strategy,
                             message=message,
-                            thread_id=thread_id
+                            thread_id=thread_id,
+                            log_encoding=log_encoding
                         )
                         # Note: Agent events are displayed as each chunk completes in parallel.
                         # No need to aggregate results here as they're already shown to the user.
+                        if not chunks_delivered:
+                            # Keep the cursors so the next incremental run resends the failed chunks' entries
+                            cursor_store = None
+
+                    # Advance log cursors once the message carrying these entries is sent
+                    self._pending_log_cursors = cursor_store
 
 
 
@@ -4236,7 +5005,7 @@ class WebSocketClient:
 
         # Proof of logs in transmission
         if "jsonl_logs" in payload["payload"]:
-            log_count = len(payload["payload"]["jsonl_logs"])
+            log_count = self._payload_log_count(payload["payload"])
             self.debug.debug_print(
                 f"✓ TRANSMISSION PROOF: Payload contains {log_count} JSONL log entries in 'jsonl_logs' key",
                 DebugLevel.BASIC,
@@ -4260,9 +5029,10 @@ class WebSocketClient:
                         "payload": {
                             "message": payload["payload"].get("message"),
                             "jsonl_logs": {
-                                "count": len(payload["payload"]["jsonl_logs"]),
-                                "sample_first": payload["payload"]["jsonl_logs"][0] if payload["payload"]["jsonl_logs"] else None,
-                                "sample_last": payload["payload"]["jsonl_logs"][-1] if payload["payload"]["jsonl_logs"] else None,
+                                "count": log_count,
+                                "encoding": payload["payload"].get("jsonl_logs_encoding"),
+                                "sample_first": payload["payload"]["jsonl_logs"][0] if isinstance(payload["payload"]["jsonl_logs"], list) and payload["payload"]["jsonl_logs"] else None,
+                                "sample_last": payload["payload"]["jsonl_logs"][-1] if isinstance(payload["payload"]["jsonl_logs"], list) and payload["payload"]["jsonl_logs"] else None,
                             }
                         }
                     }
@@ -4279,10 +5049,13 @@ class WebSocketClient:
                     # Don't fail transmission if proof saving fails
                     pass
 
-        # Validate payload size before sending
-        payload_json = json.dumps(payload)
-        payload_size_bytes = len(payload_json.encode('utf-8'))
+        # Validate payload size before sending; the message is encoded once and that buffer is sent
+        encoded_payload = self._encode_payload(payload)
+        logs_size_bytes = encoded_payload.logs_size
+        payload_size_bytes = encoded_payload.size
         payload_size_mb = payload_size_bytes / (1024 * 1024)
+        if getattr(self, '_log_display_info', None) is not None:
+            self._log_display_info['size_str'] = self._format_byte_size(logs_size_bytes)
 
         # Define size limits
         MAX_SIZE_MB = 4.5  # Maximum allowed (give 0.5MB buffer below 5MB)
@@ -4306,11 +5079,10 @@ class WebSocketClient:
   • Limit: {MAX_SIZE_MB:.1f} MB"""
 
             if "jsonl_logs" in payload["payload"]:
-                logs_json = json.dumps(payload["payload"]["jsonl_logs"])
-                logs_size_mb = len(logs_json.encode('utf-8')) / (1024 * 1024)
+                logs_size_mb = logs_size_bytes / (1024 * 1024)
                 error_msg += f"""
   • Logs contribution: {logs_size_mb:.2f} MB
-  • Log entries: {len(payload["payload"]["jsonl_logs"])}"""
+  • Log entries: {self._payload_log_count(payload["payload"])}"""
 
             error_msg += f"""
 
@@ -4344,11 +5116,10 @@ class WebSocketClient:
   • Total payload: {payload_size_mb:.2f} MB ({payload_size_bytes:,} bytes)"""
 
             if "jsonl_logs" in payload["payload"]:
-                logs_json = json.dumps(payload["payload"]["jsonl_logs"])
-                logs_size_mb = len(logs_json.encode('utf-8')) / (1024 * 1024)
+                logs_size_mb = logs_size_bytes / (1024 * 1024)
                 warning_msg += f"""
   • Logs contribution: {logs_size_mb:.2f} MB
-  • Log entries: {len(payload["payload"]["jsonl_logs"])}"""
+  • Log entries: {self._payload_log_count(payload["payload"])}"""
 
             warning_msg += f"""
 
@@ -4363,7 +5134,10 @@ class WebSocketClient:
 
         # ISSUE #1603 FIX: Add critical logging for message sending (only in diagnostic mode)
         if self.debug.debug_level >= DebugLevel.DIAGNOSTIC:
-            self.debug.debug_print(f"SENDING WEBSOCKET MESSAGE: {json.dumps(payload, indent=2)}", DebugLevel.DIAGNOSTIC)
+            self.debug.debug_print(
+                f"SENDING WEBSOCKET MESSAGE ({payload_size_bytes:,} bytes): {encoded_payload.preview()}",
+                DebugLevel.DIAGNOSTIC
+            )
 
         # Print sending message after logs section (moved from run_cli method)
         safe_console_print(f"Sending message: {payload['payload']['content']}", style="cyan", json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
@@ -4374,24 +5148,31 @@ class WebSocketClient:
             # Clean up the temporary display info
             del self._log_display_info
 
-        await self.ws.send(payload_json)
+        await self.ws.send(encoded_payload.data, text=True)
         if self.debug.debug_level >= DebugLevel.VERBOSE:
             self.debug.debug_print(f"WEBSOCKET MESSAGE SENT SUCCESSFULLY - run_id: {self.run_id}, thread_id: {thread_id}", DebugLevel.VERBOSE)
+
+        if self._pending_log_cursors is not None:
+            self._pending_log_cursors.commit()
+            self._pending_log_cursors = None
         return self.run_id
 
-    async def _wait_for_event(self, event_type: str, timeout: float = 120.0) -> Optional[WebSocketEvent]:
+    async def _wait_for_event(self, event_type: str, timeout: float = 120.0, start_index: int = 0) -> Optional[WebSocketEvent]:
         """
         Wait for a specific event type to be received.
 
         Args:
             event_type: The event type to wait for (e.g., 'agent_completed', 'agent_aggregation_complete')
             timeout: Maximum time to wait in seconds (default: 120s)
+            start_index: Ignore events received before this index in self.events
+                (for connections that carry several messages)
 
         Returns:
             The event object if received, None if timeout occurred
         """
-        start_time = asyncio.get_event_loop().time()
-        last_checked_index = 0
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        last_checked_index = start_index
 
         self.debug.debug_print(
             f"Waiting for event: {event_type} (timeout: {timeout}s)",
@@ -4400,51 +5181,45 @@ class WebSocketClient:
         )
 
         while True:
-            # Check if timeout occurred
-            elapsed = asyncio.get_event_loop().time() - start_time
-            if elapsed > timeout:
+            # Check events received since the last check; receive_events wakes us for each new one
+            current_events_len = len(self.events)
+            for event in self.events.since(last_checked_index):
+                elapsed = loop.time() - start_time
+                if event.type == event_type:
+                    self.debug.debug_print(
+                        f"Received {event_type} event after {elapsed:.1f}s",
+                        DebugLevel.VERBOSE,
+                        style="green"
+                    )
+                    return event
+
+                # Also check for nested events in system_message
+                if event.type == "system_message" and event.data.get('event') == event_type:
+                    self.debug.debug_print(
+                        f"Received {event_type} event (nested in system_message) after {elapsed:.1f}s",
+                        DebugLevel.VERBOSE,
+                        style="green"
+                    )
+                    return event
+            last_checked_index = current_events_len
+
+            remaining = timeout - (loop.time() - start_time)
+            if remaining <= 0 or not await self._wait_for_signal(event_type, remaining):
                 self.debug.debug_print(
-                    f"Timeout waiting for {event_type} after {elapsed:.1f}s",
+                    f"Timeout waiting for {event_type} after {loop.time() - start_time:.1f}s",
                     DebugLevel.BASIC,
                     style="yellow"
                 )
                 return None
 
-            # Check for new events since last check
-            current_events_len = len(self.events)
-            if current_events_len > last_checked_index:
-                for i in range(last_checked_index, current_events_len):
-                    event = self.events[i]
-                    if event.type == event_type:
-                        self.debug.debug_print(
-                            f"Received {event_type} event after {elapsed:.1f}s",
-                            DebugLevel.VERBOSE,
-                            style="green"
-                        )
-                        return event
-
-                    # Also check for nested events in system_message
-                    if event.type == "system_message" and event.data.get('event') == event_type:
-                        self.debug.debug_print(
-                            f"Received {event_type} event (nested in system_message) after {elapsed:.1f}s",
-                            DebugLevel.VERBOSE,
-                            style="green"
-                        )
-                        return event
-                last_checked_index = current_events_len # Update last checked index
-
-            # Short sleep to avoid busy waiting
-            await asyncio.sleep(0.1)
-
-
-
     async def _send_chunked_logs(
         self,
         logs: List[Dict[str, Any]],
         file_info: Dict[str, Any],
         chunking_strategy: Any,
         message: str,
-        thread_id: str
+        thread_id: str,
+        log_encoding: Optional[str] = None
     ) -> bool:
         """
         Send logs in chunks concurrently using separate threads.
@@ -4455,9 +5230,10 @@ class WebSocketClient:
             chunking_strategy: ChunkingStrategy object from analyzer
             message: Original user message
             thread_id: Thread ID for this conversation
+            log_encoding: jsonl_logs encoding selected for this connection, if any
 
         Returns:
-            bool: True if all chunks were sent successfully.
+            bool: True if every chunk has a result (from the backend or the cache).
         """
         from chunk_creator import ChunkCreator
 
@@ -4466,8 +5242,13 @@ class WebSocketClient:
         self.chunk_total_expected = None
         self.chunk_responses = []
 
-        # Create chunks
-        chunk_creator = ChunkCreator()
+        # Create chunks, sized on encoded bytes when logs are compressed. The
+        # measured ratio is discounted since small chunks compress less well.
+        compression_ratio = 1.0
+        wire_bytes = sum(fa.wire_size_bytes or 0 for fa in chunking_strategy.file_analyses)
+        if log_encoding and wire_bytes:
+            compression_ratio = 0.8 * sum(fa.size_bytes for fa in chunking_strategy.file_analyses) / wire_bytes
+        chunk_creator = ChunkCreator(compression_ratio=compression_ratio)
         all_chunks = []
         entry_offset = 0
         for file_idx, file_analysis in enumerate(chunking_strategy.file_analyses):
@@ -4484,6 +5265,27 @@ class WebSocketClient:
             entry_offset += file_analysis.entry_count
 
         total_chunks = len(all_chunks)
+        tracker = ChunkAckTracker(all_chunks)
+
+        # Content keys for the local result cache, computed before dedup rewrites entries
+        result_cache = None
+        cache_keys: List[Optional[str]] = [None] * total_chunks
+        if self.chunk_cache:
+            from chunk_result_cache import ChunkResultCache
+            result_cache = ChunkResultCache(
+                self.thread_cache_file.parent / "chunk_results",
+                ttl_seconds=self.chunk_cache_ttl * 3600
+            )
+            cache_keys = [ChunkResultCache.key_for(chunk.entries, message, scope=self.config.ws_url) for chunk in all_chunks]
+
+        # Deduplicate per chunk: each chunk is analyzed on its own, so it carries its own blob table
+        dedup = None
+        if self.logs_dedup:
+            from agent_logs import LogDeduplicator
+            dedup = LogDeduplicator()
+            for chunk in all_chunks:
+                chunk.entries = list(dedup.iter_dedup(chunk.entries))
+                chunk.blobs = dedup.take_blobs()
 
         # Display detailed chunking info (similar to non-chunked UI)
         separator = "=" * 60
@@ -4500,6 +5302,9 @@ class WebSocketClient:
         safe_console_print(f"  Files Read: {len(chunking_strategy.file_analyses)}", json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
         safe_console_print(f"  Payload Size: {total_size_kb:.2f} KB", json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
 
+        if dedup is not None:
+            self._display_dedup_summary(dedup)
+
         if self.logs_project:
             safe_console_print(f"  Project: {self.logs_project}", json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
 
@@ -4517,19 +5322,71 @@ class WebSocketClient:
         safe_console_print("", json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
         safe_console_print("  Payload Confirmation:", json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
         safe_console_print(f"    [OK] Total chunks to send: {total_chunks}", style="green", json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
+        boundary_stats = chunk_creator.stats
+        safe_console_print(
+            f"    Boundaries: {boundary_stats.turns_split} split turn(s) of {boundary_stats.turns}, "
+            f"{boundary_stats.tool_pairs_split} split tool call(s) of {boundary_stats.tool_pairs}",
+            style="green" if not boundary_stats.tool_pairs_split else "yellow",
+            json_mode=self.config.json_mode,
+            ci_mode=self.config.ci_mode
+        )
         safe_console_print(f"    [OK] First log entry timestamp: {logs[0].get('timestamp', 'N/A') if logs else 'N/A'}", style="green", json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
         safe_console_print(f"    [OK] Last log entry timestamp: {logs[-1].get('timestamp', 'N/A') if logs else 'N/A'}", style="green", json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
 
         safe_console_print(separator, style="cyan", json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
-        safe_console_print(f"\nSending {total_chunks} chunk(s) concurrently...", style="cyan", json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
-        safe_console_print("", json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
-
         # Track completion progress
         chunks_completed = 0
 
-        async def send_chunk_in_new_thread(chunk, chunk_num, main_run_id: Optional[str]):
-            """Helper to send a single chunk in a new WebSocket connection."""
+        def display_chunk_result(completion_event, chunk_num):
+            """Show a chunk's agent_completed result."""
+            result = (
+                completion_event.data.get('result')
+                or completion_event.data.get('response')
+                or completion_event.data.get('final_response')
+            )
+
+            if result is not None:
+                if isinstance(result, (dict, list)):
+                    try:
+                        pretty_result = json.dumps(result, indent=2, ensure_ascii=False)
+                    except (TypeError, ValueError):
+                        pretty_result = str(result)
+
+                    safe_console_print(
+                        Panel(
+                            Syntax(pretty_result, "json", word_wrap=True),
+                            title=f"Chunk {chunk_num}/{total_chunks} Result",
+                            border_style="green"
+                        ),
+                        json_mode=self.config.json_mode,
+                        ci_mode=self.config.ci_mode
+                    )
+                else:
+                    safe_console_print(
+                        f"✅ Chunk {chunk_num} result:",
+                        style="bold green",
+                        json_mode=self.config.json_mode,
+                        ci_mode=self.config.ci_mode
+                    )
+                    safe_console_print(
+                        str(result),
+                        style="green",
+                        json_mode=self.config.json_mode,
+                        ci_mode=self.config.ci_mode
+                    )
+            else:
+                # Fallback to formatted event display if no result found
+                formatted_event = completion_event.format_for_display(self.debug)
+                timestamp = datetime.now().strftime('%H:%M:%S')
+                safe_console_print(f"[{timestamp}] {formatted_event}", json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
+
+            safe_console_print("", json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
+
+        async def send_chunk_on_connection(ws_client: "WebSocketClient", index: int):
+            """Send one chunk on a pooled connection and wait for its result."""
             nonlocal chunks_completed
+            chunk = all_chunks[index]
+            chunk_num = index + 1
 
             # Show progress indicator when chunk starts
             safe_console_print(
@@ -4540,146 +5397,191 @@ class WebSocketClient:
             )
             sys.stdout.flush()  # Ensure output is displayed immediately in parallel execution
 
-            self.debug.debug_print(f"[CHUNK {chunk_num}] Starting to send chunk.", DebugLevel.VERBOSE, style="cyan")
-            try:
-                # Create a new WebSocket client for each chunk
-                self.debug.debug_print(f"[CHUNK {chunk_num}] Creating WebSocketClient.", DebugLevel.VERBOSE, style="cyan")
-                ws_client = WebSocketClient(
-                    self.config, self.token, self.debug, run_id=main_run_id,
-                    handshake_timeout=self.handshake_timeout
+            # Connections are reused, so only events after this send belong to this chunk
+            first_event_index = len(ws_client.events)
+
+            self.debug.debug_print(f"[CHUNK {chunk_num}] Sending chunk.", DebugLevel.VERBOSE, style="cyan")
+            tracker.sent(index)
+            await ws_client._send_single_chunk(
+                chunk=chunk,
+                chunk_num=chunk_num,
+                total_chunks=total_chunks,
+                message=message,
+                thread_id=None  # Send as a new thread
+            )
+            self.debug.debug_print(f"[CHUNK {chunk_num}] Chunk sent.", DebugLevel.VERBOSE, style="green")
+
+            # Wait for agent_started event to notify user that backend started processing
+            self.debug.debug_print(f"[CHUNK {chunk_num}] Waiting for agent_started event.", DebugLevel.VERBOSE, style="cyan")
+            started_event = await ws_client._wait_for_event('agent_started', timeout=self.CHUNK_ACK_TIMEOUT, start_index=first_event_index)
+            if not started_event and len(ws_client.events) == first_event_index:
+                # Nothing at all came back for this chunk, so treat it as lost rather than wait out the completion timeout
+                raise asyncio.TimeoutError(f"chunk {chunk_num} was not acknowledged within {self.CHUNK_ACK_TIMEOUT:.0f}s")
+            if started_event:
+                tracker.acked(index)
+                self.debug.debug_print(f"[CHUNK {chunk_num}] agent_started event received.", DebugLevel.VERBOSE, style="green")
+                safe_console_print(
+                    f"🚀 Agent started processing chunk {chunk_num}/{total_chunks}",
+                    style="cyan",
+                    json_mode=self.config.json_mode,
+                    ci_mode=self.config.ci_mode
                 )
+                sys.stdout.flush()
 
+            # Wait for agent to complete
+            self.debug.debug_print(f"[CHUNK {chunk_num}] Waiting for agent_completed event.", DebugLevel.VERBOSE, style="cyan")
+            completion_event = await ws_client._wait_for_event('agent_completed', timeout=300.0, start_index=first_event_index)
+            if not completion_event:
+                # A late result would be mistaken for the next chunk's; the pool replaces this connection
+                raise asyncio.TimeoutError(f"chunk {chunk_num} did not complete")
 
-                self.debug.debug_print(f"[CHUNK {chunk_num}] Connecting to WebSocket.", DebugLevel.VERBOSE, style="cyan")
-                if await ws_client.connect():
-                    self.debug.debug_print(f"[CHUNK {chunk_num}] WebSocket connected.", DebugLevel.VERBOSE, style="green")
+            self.debug.debug_print(f"[CHUNK {chunk_num}] agent_completed event received.", DebugLevel.VERBOSE, style="green")
 
-                    # Start receiving events in the background
-                    self.debug.debug_print(f"[CHUNK {chunk_num}] Starting event receiver.", DebugLevel.VERBOSE, style="cyan")
-                    event_task = asyncio.create_task(ws_client.receive_events())
+            # Update progress counter
+            tracker.completed(index)
+            chunks_completed += 1
 
-                    # Send the chunk
-                    self.debug.debug_print(f"[CHUNK {chunk_num}] Sending chunk.", DebugLevel.VERBOSE, style="cyan")
-                    await ws_client._send_single_chunk(
-                        chunk=chunk,
-                        chunk_num=chunk_num,
-                        total_chunks=total_chunks,
-                        message=message,
-                        thread_id=None  # Send as a new thread
-                    )
-                    self.debug.debug_print(f"[CHUNK {chunk_num}] Chunk sent.", DebugLevel.VERBOSE, style="green")
+            # Display progress header
+            safe_console_print(
+                f"✅ Chunk {chunk_num}/{total_chunks} completed ({chunks_completed}/{total_chunks} total)",
+                style="green",
+                json_mode=self.config.json_mode,
+                ci_mode=self.config.ci_mode
+            )
 
-                    # Wait for agent_started event to notify user that backend started processing
-                    self.debug.debug_print(f"[CHUNK {chunk_num}] Waiting for agent_started event.", DebugLevel.VERBOSE, style="cyan")
-                    started_event = await ws_client._wait_for_event('agent_started', timeout=30.0)
-                    if started_event:
-                        self.debug.debug_print(f"[CHUNK {chunk_num}] agent_started event received.", DebugLevel.VERBOSE, style="green")
-                        safe_console_print(
-                            f"🚀 Agent started processing chunk {chunk_num}/{total_chunks}",
-                            style="cyan",
-                            json_mode=self.config.json_mode,
-                            ci_mode=self.config.ci_mode
-                        )
-                        sys.stdout.flush()
+            display_chunk_result(completion_event, chunk_num)
+            if result_cache is not None and cache_keys[index]:
+                result_cache.put(cache_keys[index], completion_event.data)
 
-                    # Wait for agent to complete
-                    self.debug.debug_print(f"[CHUNK {chunk_num}] Waiting for agent_completed event.", DebugLevel.VERBOSE, style="cyan")
-                    completion_event = await ws_client._wait_for_event('agent_completed', timeout=300.0)
-                    if completion_event:
-                        self.debug.debug_print(f"[CHUNK {chunk_num}] agent_completed event received.", DebugLevel.VERBOSE, style="green")
+            self.debug.debug_print(f"Chunk {chunk_num}/{total_chunks} sent and processed successfully.", DebugLevel.VERBOSE, style="green")
+            return completion_event
 
-                        # Update progress counter
-                        chunks_completed += 1
+        # Chunks analyzed before with the same message are answered locally
+        results: List[Any] = [None] * total_chunks
+        pending = []
+        for index in range(total_chunks):
+            cached_data = result_cache.get(cache_keys[index]) if result_cache is not None and cache_keys[index] else None
+            if cached_data is None:
+                pending.append(index)
+                continue
 
-                        # Display progress header
+            tracker.cached(index)
+            chunks_completed += 1
+            safe_console_print(
+                f"⚡ Chunk {index + 1}/{total_chunks} completed from cache ({chunks_completed}/{total_chunks} total)",
+                style="green",
+                json_mode=self.config.json_mode,
+                ci_mode=self.config.ci_mode
+            )
+            results[index] = WebSocketEvent(type='agent_completed', data=cached_data)
+            display_chunk_result(results[index], index + 1)
+
+        # Remaining chunks are fed to a fixed pool of handshaken connections
+        if pending:
+            def pooled_client() -> "WebSocketClient":
+                client = WebSocketClient(
+                    self.config, self.token, self.debug, run_id=self.run_id,
+                    handshake_timeout=self.handshake_timeout,
+                    logs_encoding=self.logs_encoding,
+                    ws_auth_race=self.ws_auth_race
+                )
+                # Pooled connections keep their remembered auth method and thread ids with this client's
+                client.thread_cache_file = self.thread_cache_file
+                return client
+
+            pool = WebSocketConnectionPool(
+                pooled_client,
+                size=min(self.chunk_connections, len(pending)),
+                debug=self.debug
+            )
+            try:
+                opened = await pool.open()
+                if opened:
+                    safe_console_print(
+                        f"\nSending {len(pending)} chunk(s) over {opened} connection(s)...\n",
+                        style="cyan",
+                        json_mode=self.config.json_mode,
+                        ci_mode=self.config.ci_mode
+                    )
+                    def announce_retransmit(index: int, attempt: int, delay: float) -> None:
                         safe_console_print(
-                            f"✅ Chunk {chunk_num}/{total_chunks} completed ({chunks_completed}/{total_chunks} total)",
-                            style="green",
+                            f"↻ Retransmitting chunk {index + 1}/{total_chunks} in {delay:.0f}s "
+                            f"(attempt {attempt}/{self.chunk_retries + 1})",
+                            style="yellow",
                             json_mode=self.config.json_mode,
                             ci_mode=self.config.ci_mode
                         )
 
-                        # Display the completion event in boxed format
-                        result = (
-                            completion_event.data.get('result')
-                            or completion_event.data.get('response')
-                            or completion_event.data.get('final_response')
-                        )
+                    pool_results = await pool.run(
+                        pending,
+                        send_chunk_on_connection,
+                        retries=self.chunk_retries,
+                        backoff=self.CHUNK_RETRY_BACKOFF,
+                        on_retry=announce_retransmit
+                    )
+                    for index, result in zip(pending, pool_results):
+                        results[index] = result
+                else:
+                    safe_console_print(
+                        "❌ Could not open any connection for chunk upload",
+                        style="red",
+                        json_mode=self.config.json_mode,
+                        ci_mode=self.config.ci_mode
+                    )
+            finally:
+                await pool.close()
 
-                        if result is not None:
-                            if isinstance(result, (dict, list)):
-                                try:
-                                    pretty_result = json.dumps(result, indent=2, ensure_ascii=False)
-                                except (TypeError, ValueError):
-                                    pretty_result = str(result)
+        if result_cache is not None and result_cache.hits:
+            safe_console_print(
+                f"⚡ {result_cache.hits}/{total_chunks} chunk(s) answered from the local result cache (--no-chunk-cache to re-analyze)",
+                style="dim",
+                json_mode=self.config.json_mode,
+                ci_mode=self.config.ci_mode
+            )
 
-                                safe_console_print(
-                                    Panel(
-                                        Syntax(pretty_result, "json", word_wrap=True),
-                                        title=f"Chunk {chunk_num}/{total_chunks} Result",
-                                        border_style="green"
-                                    ),
-                                    json_mode=self.config.json_mode,
-                                    ci_mode=self.config.ci_mode
-                                )
-                            else:
-                                safe_console_print(
-                                    f"✅ Chunk {chunk_num} result:",
-                                    style="bold green",
-                                    json_mode=self.config.json_mode,
-                                    ci_mode=self.config.ci_mode
-                                )
-                                safe_console_print(
-                                    str(result),
-                                    style="green",
-                                    json_mode=self.config.json_mode,
-                                    ci_mode=self.config.ci_mode
-                                )
-                        else:
-                            # Fallback to formatted event display if no result found
-                            formatted_event = completion_event.format_for_display(self.debug)
-                            timestamp = datetime.now().strftime('%H:%M:%S')
-                            safe_console_print(f"[{timestamp}] {formatted_event}", json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
-
-                        safe_console_print("", json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
-
-                        # Clean up
-                        self.debug.debug_print(f"[CHUNK {chunk_num}] Closing WebSocket.", DebugLevel.VERBOSE, style="cyan")
-                        event_task.cancel()
-                        await ws_client.close()
-                        self.debug.debug_print(f"[CHUNK {chunk_num}] WebSocket closed.", DebugLevel.VERBOSE, style="green")
-                        self.debug.debug_print(f"Chunk {chunk_num}/{total_chunks} sent and processed successfully in a new thread.", DebugLevel.VERBOSE, style="green")
-                        return completion_event
-                    else:
-                        self.debug.debug_print(f"[CHUNK {chunk_num}] Timed out waiting for agent_completed event.", DebugLevel.VERBOSE, style="yellow")
-                        # Clean up even if timed out
-                        self.debug.debug_print(f"[CHUNK {chunk_num}] Closing WebSocket.", DebugLevel.VERBOSE, style="cyan")
-                        event_task.cancel()
-                        await ws_client.close()
-                        self.debug.debug_print(f"[CHUNK {chunk_num}] WebSocket closed.", DebugLevel.VERBOSE, style="green")
-                        return None # Indicate failure
-                else:
-                    self.debug.debug_print(f"[CHUNK {chunk_num}] Failed to connect WebSocket.", DebugLevel.BASIC, style="red")
-                    return None
-            except Exception as e:
-                self.debug.log_error(e, f"sending chunk {chunk_num}")
-                return False
+        missing = tracker.missing()
+        for index in missing:
+            tracker.failed(index)
 
-        # Create and run tasks for each chunk
-        tasks = [send_chunk_in_new_thread(chunk, i + 1, self.run_id) for i, chunk in enumerate(all_chunks)]
-        results = await asyncio.gather(*tasks)
+        if tracker.ack_latencies:
+            self.debug.debug_print(
+                f"Chunk acknowledgements: {len(tracker.ack_latencies)}, "
+                f"mean {sum(tracker.ack_latencies) / len(tracker.ack_latencies):.2f}s, "
+                f"max {max(tracker.ack_latencies):.2f}s",
+                DebugLevel.VERBOSE,
+                style="dim"
+            )
 
         # Display final summary
+        succeeded = total_chunks - len(missing)
+        retransmit_note = f", {tracker.retransmits} retransmitted" if tracker.retransmits else ""
         safe_console_print("", json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
-        safe_console_print(
-            "All the chunks processed successfully. Look Above",
-            style="bold green",
-            json_mode=self.config.json_mode,
-            ci_mode=self.config.ci_mode
-        )
+        if not missing:
+            safe_console_print(
+                f"All {total_chunks} chunks processed successfully{retransmit_note}. Look Above",
+                style="bold green",
+                json_mode=self.config.json_mode,
+                ci_mode=self.config.ci_mode
+            )
+        else:
+            failed_list = ", ".join(str(index + 1) for index in missing)
+            safe_console_print(
+                f"⚠️  {succeeded}/{total_chunks} chunks processed{retransmit_note}; "
+                f"failed after {self.chunk_retries + 1} attempt(s): chunk {failed_list}",
+                style="bold yellow",
+                json_mode=self.config.json_mode,
+                ci_mode=self.config.ci_mode
+            )
+            if result_cache is not None:
+                safe_console_print(
+                    "   Rerunning uploads only these chunks; completed ones are answered from the local cache",
+                    style="dim",
+                    json_mode=self.config.json_mode,
+                    ci_mode=self.config.ci_mode
+                )
         safe_console_print("", json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
 
-        return results
+        return not missing
 
     async def _send_single_chunk(
         self,
@@ -4710,6 +5612,7 @@ class WebSocketClient:
                 "jsonl_logs": chunk.entries,
                 "agent_context": {
                     "chunk_metadata": {
+                        "chunk_id": chunk.metadata.chunk_id,
                         "chunk_index": chunk.metadata.chunk_index,
                         "total_chunks": chunk.metadata.total_chunks,
                         "file_hash": chunk.metadata.file_hash,
@@ -4727,13 +5630,35 @@ class WebSocketClient:
             }
         }
 
+        if chunk.metadata.part_count:
+            # Fragment of an entry over the size limit; the backend rejoins parts by original_hash
+            payload["payload"]["agent_context"]["chunk_metadata"].update({
+                "part_index": chunk.metadata.part_index,
+                "part_count": chunk.metadata.part_count,
+                "original_hash": chunk.metadata.original_hash
+            })
+
+        if getattr(chunk, 'blobs', None):
+            payload["payload"]["jsonl_logs_blobs"] = chunk.blobs
+
+        # Each chunk has its own connection, so use what this backend advertised
+        from agent_logs import encode_log_entries, select_log_encoding
+        log_encoding = select_log_encoding(self.server_log_encodings, self.logs_encoding)
+        if log_encoding:
+            payload["payload"]["jsonl_logs"] = encode_log_entries(chunk.entries, log_encoding)
+            payload["payload"]["jsonl_logs_encoding"] = log_encoding
+            payload["payload"]["jsonl_logs_count"] = len(chunk.entries)
+
         # Display chunk info with warning if oversized
         chunk_display = (
             f"  Chunk {chunk.metadata.chunk_index + 1}/{chunk.metadata.total_chunks}: "
             f"{chunk.metadata.entries_in_chunk} entries, {chunk.metadata.chunk_size_mb:.2f} MB"
         )
 
-        # Warning if chunk exceeds recommended size (happens with large single entries)
+        if chunk.metadata.part_count:
+            chunk_display += f" (part {chunk.metadata.part_index + 1}/{chunk.metadata.part_count} of a split entry)"
+
+        # Warning if chunk exceeds recommended size (entries that could not be split)
         if chunk.metadata.chunk_size_mb > 2.5:
             chunk_display += f" ⚠️  OVERSIZED (single entry > 2.5 MB limit)"
             safe_console_print(chunk_display, style="yellow", json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
@@ -4741,8 +5666,7 @@ class WebSocketClient:
             safe_console_print(chunk_display, style="cyan", json_mode=self.config.json_mode, ci_mode=self.config.ci_mode)
 
         # Send chunk
-        payload_json = json.dumps(payload)
-        await self.ws.send(payload_json)
+        await self.ws.send(self._encode_payload(payload).data, text=True)
 
         self.debug.debug_print(
             f"Sent chunk {chunk_num}/{total_chunks}",
@@ -4791,8 +5715,7 @@ class WebSocketClient:
         )
 
         # Send file chunk
-        payload_json = json.dumps(payload)
-        await self.ws.send(payload_json)
+        await self.ws.send(self._encode_payload(payload).data, text=True)
 
         self.debug.debug_print(
             f"Sent file: {chunk.metadata.file_name}",
@@ -4801,7 +5724,15 @@ class WebSocketClient:
         )
 
     async def receive_events(self, callback=None):
-        """Receive and process events from WebSocket"""
+        """
+        Receive and process events from WebSocket.
+
+        The socket read loop only queues raw frames, so a slow render, log
+        write or callback never stalls reads (and with them ping/pong
+        handling). A single consumer task decodes, logs, stores, dispatches
+        and renders frames in arrival order. Queue depth and per-frame lag
+        are kept in self.receive_stats.
+        """
         if not self.ws:
             raise RuntimeError("WebSocket not connected")
 
@@ -4812,101 +5743,149 @@ class WebSocketClient:
             style="cyan"
         )
 
-        async for message in self.ws:
-            try:
-                # Enhanced debug logging for WebSocket messages
-                self.debug.log_websocket_event("raw_message_received", {}, raw_message=message)
+        loop = asyncio.get_running_loop()
+        frames: asyncio.Queue = asyncio.Queue()
+        consumer = asyncio.create_task(self._consume_frames(frames, callback))
+        stats = self.receive_stats
+        backlog_warned = False
 
-                data = json.loads(message)
-                event = WebSocketEvent(
-                    type=data.get('type', 'unknown'),
-                    data=data
-                )
-                # Skip duplicate connection_established events after handshake
-                if event.type == 'connection_established' and self.connected and self.current_thread_id:
+        cancelled = False
+        try:
+            async for message in self.ws:
+                frames.put_nowait((loop.time(), message))
+                stats.queue_depth = frames.qsize()
+                if stats.queue_depth > stats.max_queue_depth:
+                    stats.max_queue_depth = stats.queue_depth
+                if stats.queue_depth > self.RECEIVE_QUEUE_WARN_DEPTH and not backlog_warned:
+                    backlog_warned = True
                     self.debug.debug_print(
-                        "Ignoring duplicate connection_established (already connected with thread_id)",
-                        DebugLevel.VERBOSE,
+                        f"⚠️ {stats.queue_depth} WebSocket frames waiting for processing; rendering is falling behind",
+                        DebugLevel.BASIC,
                         style="yellow"
                     )
-                    # Don't append duplicate connection events
-                else:
-                    self.events.append(event)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            if cancelled:
+                consumer.cancel()
+            else:
+                # Process the frames already read before returning
+                frames.put_nowait(None)
+                await consumer
+            self.debug.debug_print(f"WebSocket receive queue: {stats.summary()}", DebugLevel.VERBOSE, style="dim")
+
+    async def _consume_frames(self, frames: asyncio.Queue, callback=None) -> None:
+        """Process queued frames in order until the None sentinel."""
+        loop = asyncio.get_running_loop()
+        stats = self.receive_stats
+        while True:
+            item = await frames.get()
+            if item is None:
+                return
+            received_at, message = item
+            await self._process_frame(message, callback)
+
+            lag = loop.time() - received_at
+            stats.frames += 1
+            stats.total_lag += lag
+            if lag > stats.max_lag:
+                stats.max_lag = lag
+            stats.queue_depth = frames.qsize()
+
+    async def _process_frame(self, message: Any, callback=None) -> None:
+        """Decode, log, store and dispatch one received frame."""
+        try:
+            data = json.loads(message)
+            event = WebSocketEvent(
+                type=data.get('type', 'unknown'),
+                data=data
+            )
+            # Skip duplicate connection_established events after handshake
+            if event.type == 'connection_established' and self.connected and self.current_thread_id:
+                self.debug.debug_print(
+                    "Ignoring duplicate connection_established (already connected with thread_id)",
+                    DebugLevel.VERBOSE,
+                    style="yellow"
+                )
+                # Don't append duplicate connection events
+            else:
+                self._record_event(event)
+
+            # Handle connection_established as a basic WebSocket connection event
+            # Note: handshake_response is now used for thread_id exchange, not connection_established
+            if event.type == 'connection_established':
+                # Track that connection_established was received
+                if not self.connection_established_received:
+                    self.connection_established_received = True
+                    self.debug.debug_print(
+                        "📌 connection_established event received after handshake",
+                        DebugLevel.BASIC,
+                        style="cyan"
+                    )
 
-                # Handle connection_established as a basic WebSocket connection event
-                # Note: handshake_response is now used for thread_id exchange, not connection_established
-                if event.type == 'connection_established':
-                    # Track that connection_established was received
-                    if not self.connection_established_received:
-                        self.connection_established_received = True
+                    # Check if we can now start sending events
+                    # We need BOTH handshake (self.connected) AND connection_established
+                    if self.connected and not self.ready_to_send_events:
+                        self.ready_to_send_events = True
                         self.debug.debug_print(
-                            "📌 connection_established event received after handshake",
+                            "✅ Ready to send events: Handshake ✓ | connection_established ✓",
                             DebugLevel.BASIC,
-                            style="cyan"
+                            style="green"
                         )
-
-                        # Check if we can now start sending events
-                        # We need BOTH handshake (self.connected) AND connection_established
-                        if self.connected and not self.ready_to_send_events:
-                            self.ready_to_send_events = True
-                            self.debug.debug_print(
-                                "✅ Ready to send events: Handshake ✓ | connection_established ✓",
-                                DebugLevel.BASIC,
-                                style="green"
-                            )
-                            safe_console_print(
-                                "✅ Fully connected: Handshake ✓ | connection_established ✓",
-                                style="green",
-                                json_mode=self.config.json_mode,
-                                ci_mode=self.config.ci_mode
-                            )
-
-                            # Flush any queued events
-                            await self._flush_queued_events()
-                    else:
-                        # This is a duplicate connection_established event
-                        self.debug.debug_print(
-                            f"WebSocket connection_established event received (duplicate, already tracked)",
-                            DebugLevel.VERBOSE,
-                            style="dim"
+                        safe_console_print(
+                            "✅ Fully connected: Handshake ✓ | connection_established ✓",
+                            style="green",
+                            json_mode=self.config.json_mode,
+                            ci_mode=self.config.ci_mode
                         )
 
-                self.debug.debug_print(
-                    f"Parsed WebSocket event type={event.type}",
-                    DebugLevel.BASIC,
-                    style="green"
-                )
+                        # Flush any queued events
+                        await self._flush_queued_events()
+                else:
+                    # This is a duplicate connection_established event
+                    self.debug.debug_print(
+                        f"WebSocket connection_established event received (duplicate, already tracked)",
+                        DebugLevel.VERBOSE,
+                        style="dim"
+                    )
 
-                # Log the parsed event
-                self.debug.log_websocket_event(event.type, data, raw_message=message)
+            self.debug.debug_print(
+                f"Parsed WebSocket event type={event.type}",
+                DebugLevel.BASIC,
+                style="green"
+            )
 
-                # ISSUE #1828: Handle backend_log messages if log streaming is enabled
-                if event.type == 'backend_log' and self.config.stream_logs:
-                    await self._handle_backend_log(data)
+            # Log the parsed event (once per frame, with its raw text)
+            self.debug.log_websocket_event(event.type, data, raw_message=message)
 
-                # ISSUE #2134 FIX: Handle cleanup coordination events
-                if event.type in ['cleanup_started', 'cleanup_duration_estimate', 'cleanup_complete']:
-                    await self.handle_cleanup_events(event)
+            # ISSUE #1828: Handle backend_log messages if log streaming is enabled
+            if event.type == 'backend_log' and self.config.stream_logs:
+                await self._handle_backend_log(data)
 
+            # ISSUE #2134 FIX: Handle cleanup coordination events
+            if event.type in ['cleanup_started', 'cleanup_duration_estimate', 'cleanup_complete']:
+                await self.handle_cleanup_events(event)
 
-                # ISSUE #1603 FIX: Keep original critical logging for now (can be disabled with debug level)
-                if self.debug.debug_level >= DebugLevel.TRACE:
-                    self.debug.debug_print(f"RAW WEBSOCKET MESSAGE RECEIVED: {message[:200]}...", DebugLevel.TRACE)
-                    self.debug.debug_print(f"PARSED WEBSOCKET EVENT: type={event.type}, data_keys={list(data.keys())}", DebugLevel.TRACE)
 
-                if callback:
-                    await callback(event)
+            # ISSUE #1603 FIX: Keep original critical logging for now (can be disabled with debug level)
+            if self.debug.debug_level >= DebugLevel.TRACE:
+                self.debug.debug_print(f"RAW WEBSOCKET MESSAGE RECEIVED: {message[:200]}...", DebugLevel.TRACE)
+                self.debug.debug_print(f"PARSED WEBSOCKET EVENT: type={event.type}, data_keys={list(data.keys())}", DebugLevel.TRACE)
 
-            except json.JSONDecodeError as e:
-                self.debug.log_error(e, "JSON decode of WebSocket message")
-                safe_console_print(f"WARNING: Invalid JSON received: {message}", style="yellow")
-                if self.debug.debug_level >= DebugLevel.TRACE:
-                    safe_console_print(f"🔥 RAW INVALID MESSAGE: {message}", style="red")
-            except Exception as e:
-                self.debug.log_error(e, "processing WebSocket message")
-                safe_console_print(f"ERROR: Error processing message: {e}", style="red")
-                if self.debug.debug_level >= DebugLevel.TRACE:
-                    safe_console_print(f"🔥 ERROR DETAILS: {e.__class__.__name__}: {str(e)}", style="red")
+            if callback:
+                await callback(event)
+
+        except json.JSONDecodeError as e:
+            self.debug.log_error(e, "JSON decode of WebSocket message")
+            safe_console_print(f"WARNING: Invalid JSON received: {message}", style="yellow")
+            if self.debug.debug_level >= DebugLevel.TRACE:
+                safe_console_print(f"🔥 RAW INVALID MESSAGE: {message}", style="red")
+        except Exception as e:
+            self.debug.log_error(e, "processing WebSocket message")
+            safe_console_print(f"ERROR: Error processing message: {e}", style="red")
+            if self.debug.debug_level >= DebugLevel.TRACE:
+                safe_console_print(f"🔥 ERROR DETAILS: {e.__class__.__name__}: {str(e)}", style="red")
 
     async def _handle_backend_log(self, data: Dict[str, Any]):
         """Handle backend_log message type (Issue #1828, #2417)."""
@@ -4999,6 +5978,7 @@ class WebSocketClient:
         ISSUE #2373: Captures WebSocket closure codes for test validation
         and debugging infrastructure vs business logic errors.
         """
+        self.events.close()
         if self.ws:
             try:
                 await self.ws.close()
@@ -5150,7 +6130,7 @@ class JSONOutputGenerator:
         """
         self.cli = cli
         self.config = config
-        self.events = events
+        self.events = EventStore.from_events(events)
         self.errors = errors
         self.start_time = start_time
         self.end_time = end_time
@@ -5194,17 +6174,16 @@ class JSONOutputGenerator:
             return False
 
         # Check for missing critical events
-        received_event_types = [e.type for e in self.events]
         missing_events = [
             event_type for event_type in self.EXPECTED_CRITICAL_EVENTS
-            if event_type not in received_event_types
+            if not self.events.count(event_type)
         ]
 
         if missing_events:
             return False
 
         # Check if agent_completed is present
-        if 'agent_completed' not in received_event_types:
+        if not self.events.count('agent_completed'):
             return False
 
         return True
@@ -5231,13 +6210,19 @@ class JSONOutputGenerator:
                     if run_id != "unknown":
                         break
 
-        return {
+        summary = {
             "duration_seconds": round(duration, 2),
             "event_count": len(self.events),
             "run_id": run_id,
             "environment": self.config.environment.value,
             "timestamp": datetime.now().isoformat()
         }
+        if self.events.evicted:
+            # Only the newest events are serialized; the rest are in the spill file if one was set
+            summary["events_evicted"] = self.events.evicted
+            if self.events.spill_path:
+                summary["events_spill_file"] = str(self.events.spill_path)
+        return summary
 
     def _serialize_events(self) -> List[Dict[str, Any]]:
         """Serialize WebSocket events for JSON output (Issue #2766).
@@ -5321,7 +6306,7 @@ class JSONOutputGenerator:
         received_event_types = [e.type for e in self.events]
         missing_events = [
             event_type for event_type in self.EXPECTED_CRITICAL_EVENTS
-            if event_type not in received_event_types
+            if not self.events.count(event_type)
         ]
 
         return {
@@ -5381,7 +6366,7 @@ class ExitCodeGenerator:
             errors: List of error messages encountered
             validation_passed: Whether validation passed (if enabled)
         """
-        self.events = events
+        self.events = EventStore.from_events(events)
         self.errors = errors
         self.validation_passed = validation_passed
 
@@ -5512,15 +6497,12 @@ class ExitCodeGenerator:
         Returns:
             True if required events are missing
         """
-        # Extract event types from the events list
-        event_types = [event.type for event in self.events]
-
         # Check for required starting event
-        has_agent_started = "agent_started" in event_types
+        has_agent_started = self.events.count("agent_started") > 0
 
         # Check for required completion event (either agent_completed or cleanup_complete)
-        has_agent_completed = "agent_completed" in event_types
-        has_cleanup_complete = "cleanup_complete" in event_types
+        has_agent_completed = self.events.count("agent_completed") > 0
+        has_cleanup_complete = self.events.count("cleanup_complete") > 0
         has_completion_event = has_agent_completed or has_cleanup_complete
 
         # Return True if any required event is missing
@@ -5533,6 +6515,243 @@ class ExitCodeGenerator:
         return False  # All required events present
 
 
+class ChunkAckTracker:
+    """
+    Delivery state of each chunk in a chunked upload.
+
+    Chunks are keyed by (chunk_id, chunk_index): chunk_id identifies the
+    source file, so the index is needed to tell its chunks apart. A chunk is
+    acknowledged when the backend starts on it (agent_started) and done when
+    its agent_completed arrives or its result came from the local cache.
+    """
+
+    QUEUED = "queued"
+    SENT = "sent"
+    ACKED = "acked"
+    COMPLETED = "completed"
+    CACHED = "cached"
+    FAILED = "failed"
+
+    def __init__(self, chunks: List[Any]):
+        """
+        Args:
+            chunks: Chunk objects from ChunkCreator, in upload order
+        """
+        self.keys = [(chunk.metadata.chunk_id, chunk.metadata.chunk_index) for chunk in chunks]
+        self.state: Dict[Tuple[str, int], str] = {key: self.QUEUED for key in self.keys}
+        self.attempts: Dict[Tuple[str, int], int] = {key: 0 for key in self.keys}
+        self.ack_latencies: List[float] = []
+        self._sent_at: Dict[Tuple[str, int], float] = {}
+
+    def sent(self, index: int) -> None:
+        key = self.keys[index]
+        self.state[key] = self.SENT
+        self.attempts[key] += 1
+        self._sent_at[key] = time.monotonic()
+
+    def acked(self, index: int) -> None:
+        key = self.keys[index]
+        self.state[key] = self.ACKED
+        if key in self._sent_at:
+            self.ack_latencies.append(time.monotonic() - self._sent_at[key])
+
+    def completed(self, index: int) -> None:
+        self.state[self.keys[index]] = self.COMPLETED
+
+    def cached(self, index: int) -> None:
+        self.state[self.keys[index]] = self.CACHED
+
+    def failed(self, index: int) -> None:
+        self.state[self.keys[index]] = self.FAILED
+
+    @property
+    def retransmits(self) -> int:
+        """Sends beyond the first for any chunk."""
+        return sum(max(0, attempts - 1) for attempts in self.attempts.values())
+
+    def missing(self) -> List[int]:
+        """Indexes of chunks without a result."""
+        return [
+            index for index, key in enumerate(self.keys)
+            if self.state[key] not in (self.COMPLETED, self.CACHED)
+        ]
+
+    def count(self, state: str) -> int:
+        return sum(1 for value in self.state.values() if value == state)
+
+
+class WebSocketConnectionPool:
+    """
+    Fixed set of authenticated, handshaken WebSocket connections fed from a queue.
+
+    Used for chunked log uploads. Connections are opened once: the first one
+    alone, so a max_chunk_connections capability in its handshake can cap the
+    pool, then the rest together. Each worker takes the next item as soon as
+    its connection is free, so at most `size` items are in flight and the
+    backend sees `size` handshakes instead of one per chunk.
+    """
+
+    MAX_RETRY_DELAY = 30.0
+
+    def __init__(self, client_factory: Callable[[], "WebSocketClient"], size: int, debug: DebugManager):
+        """
+        Args:
+            client_factory: Creates an unconnected WebSocketClient
+            size: Number of connections to open (at least 1)
+            debug: Debug manager for pool diagnostics
+        """
+        self.client_factory = client_factory
+        self.size = max(1, size)
+        self.debug = debug
+        self.clients: List[Optional["WebSocketClient"]] = []
+        self._receivers: Dict[int, asyncio.Task] = {}
+
+    async def _open_client(self) -> Optional["WebSocketClient"]:
+        """Connect and handshake one client and track its event receiver."""
+        client = self.client_factory()
+        try:
+            if not await client.connect():
+                return None
+        except Exception as e:
+            self.debug.log_error(e, "opening pooled connection")
+            return None
+        # connect() already runs the receiver; a second reader on the socket would fail
+        self._receivers[id(client)] = client.receiver_task or asyncio.create_task(client.receive_events())
+        return client
+
+    async def _close_client(self, client: "WebSocketClient") -> None:
+        receiver = self._receivers.pop(id(client), None)
+        if receiver:
+            receiver.cancel()
+        try:
+            await client.close()
+        except Exception as e:
+            self.debug.debug_print(f"Error closing pooled connection: {e}", DebugLevel.VERBOSE, style="yellow")
+
+    async def open(self) -> int:
+        """
+        Open the pool's connections.
+
+        Returns:
+            Number of connections opened (0 if none could be)
+        """
+        first = await self._open_client()
+        if first is None:
+            return 0
+        self.clients = [first]
+
+        target = self.size
+        if first.server_max_connections:
+            target = min(target, first.server_max_connections)
+
+        if target > 1:
+            opened = await asyncio.gather(*(self._open_client() for _ in range(target - 1)))
+            self.clients.extend(client for client in opened if client is not None)
+
+        self.size = len(self.clients)
+        self.debug.debug_print(f"Connection pool ready with {self.size} connection(s)", DebugLevel.VERBOSE, style="green")
+        return self.size
+
+    async def run(
+        self,
+        items: List[Any],
+        handler: Callable[["WebSocketClient", Any], Awaitable[Any]],
+        retries: int = 0,
+        backoff: float = 1.0,
+        on_retry: Optional[Callable[[Any, int, float], None]] = None
+    ) -> List[Any]:
+        """
+        Process items on the pooled connections.
+
+        A handler that raises fails only that attempt; the connection it used
+        is replaced, since it may be broken or still carrying that item's
+        events. The item is queued again after an exponential backoff
+        (backoff, 2 * backoff, ... up to MAX_RETRY_DELAY seconds) until it has
+        been tried retries + 1 times. Other items keep flowing meanwhile.
+
+        Args:
+            items: Work items, taken from a queue in order
+            handler: Coroutine called as handler(client, item)
+            retries: Extra attempts for an item whose handler raised
+            backoff: Delay in seconds before the first retry
+            on_retry: Called as on_retry(item, attempt, delay) when an item is requeued
+
+        Returns:
+            Handler results in item order: None for timeouts and items never
+            processed, False for items whose handler raised
+        """
+        results: List[Any] = [None] * len(items)
+        if not items:
+            return results
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        for index in range(len(items)):
+            queue.put_nowait(index)
+        attempts = [0] * len(items)
+        unfinished = len(items)
+        retry_handles: List[asyncio.TimerHandle] = []
+
+        def finish_item() -> None:
+            nonlocal unfinished
+            unfinished -= 1
+            if unfinished == 0:
+                # Wake every idle worker so it can exit
+                for _ in self.clients:
+                    queue.put_nowait(None)
+
+        async def worker(slot: int) -> None:
+            while True:
+                index = await queue.get()
+                if index is None:
+                    return
+
+                client = self.clients[slot]
+                if client is None:
+                    client = self.clients[slot] = await self._open_client()
+                    if client is None:
+                        # Leave this and the remaining items to the other connections
+                        queue.put_nowait(index)
+                        return
+
+                attempts[index] += 1
+                try:
+                    results[index] = await handler(client, items[index])
+                except Exception as e:
+                    if isinstance(e, asyncio.TimeoutError):
+                        self.debug.debug_print(f"Pooled item {index + 1} timed out: {e}", DebugLevel.BASIC, style="yellow")
+                        results[index] = None
+                    else:
+                        self.debug.log_error(e, f"processing pooled item {index + 1}")
+                        results[index] = False
+                    await self._close_client(client)
+                    self.clients[slot] = None
+
+                    if attempts[index] <= retries:
+                        delay = min(backoff * (2 ** (attempts[index] - 1)), self.MAX_RETRY_DELAY)
+                        if on_retry:
+                            on_retry(items[index], attempts[index] + 1, delay)
+                        retry_handles.append(loop.call_later(delay, queue.put_nowait, index))
+                        continue
+
+                finish_item()
+
+        try:
+            await asyncio.gather(*(worker(slot) for slot in range(len(self.clients))))
+        finally:
+            # Retries still waiting when every connection is gone are abandoned
+            for handle in retry_handles:
+                handle.cancel()
+        return results
+
+    async def close(self) -> None:
+        """Close every connection in the pool."""
+        for client in self.clients:
+            if client is not None:
+                await self._close_client(client)
+        self.clients = []
+
+
 class AgentCLI:
     """Main CLI application for agent testing"""
 
@@ -5543,7 +6762,14 @@ class AgentCLI:
                  json_mode: bool = False, ci_mode: bool = False, json_output_file: Optional[str] = None,
                  send_logs: bool = False, logs_count: int = 1, logs_project: Optional[str] = None,
                  logs_path: Optional[str] = None, logs_user: Optional[str] = None,
-                 logs_provider: str = "claude", handshake_timeout: float = 10.0):
+                 logs_provider: str = "claude", handshake_timeout: float = 10.0,
+                 logs_incremental: bool = False, logs_projection: bool = True,
+                 logs_dedup: bool = False, logs_encoding: str = "auto",
+                 chunk_cache: bool = True, chunk_cache_ttl: float = 168.0,
+                 chunk_connections: int = 4, chunk_retries: int = 2,
+                 ws_auth_race: bool = False,
+                 event_buffer_size: int = EventStore.DEFAULT_MAX_EVENTS, event_spill_path: Optional[str] = None,
+                 follow: bool = False, follow_window: float = 5.0):
         # ISSUE #2766: Store JSON/CI mode flags early for output suppression
         self.json_mode = json_mode
         self.ci_mode = ci_mode
@@ -5556,6 +6782,21 @@ class AgentCLI:
         self.logs_path = logs_path
         self.logs_user = logs_user
         self.logs_provider = logs_provider
+        self.logs_incremental = logs_incremental
+        self.logs_projection = logs_projection
+        self.logs_dedup = logs_dedup
+        self.logs_encoding = logs_encoding
+        self.chunk_cache = chunk_cache
+        self.chunk_cache_ttl = chunk_cache_ttl
+        self.chunk_connections = chunk_connections
+        self.chunk_retries = chunk_retries
+        self.ws_auth_race = ws_auth_race
+        self.event_buffer_size = event_buffer_size
+        self.event_spill_path = event_spill_path
+
+        # Live session follow mode (--follow)
+        self.follow = follow
+        self.follow_window = follow_window
 
         # Store handshake timeout
         self.handshake_timeout = handshake_timeout
@@ -5697,7 +6938,18 @@ class AgentCLI:
                 logs_path=self.logs_path,
                 logs_user=self.logs_user,
                 logs_provider=self.logs_provider,
-                handshake_timeout=self.handshake_timeout
+                handshake_timeout=self.handshake_timeout,
+                logs_incremental=self.logs_incremental,
+                logs_projection=self.logs_projection,
+                logs_dedup=self.logs_dedup,
+                logs_encoding=self.logs_encoding,
+                chunk_cache=self.chunk_cache,
+                chunk_cache_ttl=self.chunk_cache_ttl,
+                chunk_connections=self.chunk_connections,
+                chunk_retries=self.chunk_retries,
+                ws_auth_race=self.ws_auth_race,
+                event_buffer_size=self.event_buffer_size,
+                event_spill_path=self.event_spill_path
             )
             if not await self.ws_client.connect():
                 # The WebSocket client will already show detailed troubleshooting (Issue #2414)
@@ -5969,9 +7221,9 @@ class AgentCLI:
             # The WebSocketClient already has a background task receiving events
             while True:
                 # Check for new events
-                while last_event_index < len(self.ws_client.events):
-                    event = self.ws_client.events[last_event_index]
-                    last_event_index += 1
+                new_events = list(self.ws_client.events.since(last_event_index))
+                last_event_index = len(self.ws_client.events)
+                for event in new_events:
                     handle_event_with_display(event)
 
                 # Check if we should stop
@@ -6058,15 +7310,17 @@ class AgentCLI:
                 'message': 'No events received from agents. This could mean: (1) Network/WebSocket issues, (2) Backend services not responding, (3) Authentication problems. Check connection and try again.'
             }
 
+        # Only completion and activity events are inspected, via the store's type index
+        events = EventStore.from_events(events)
+
         # Track which agents we've detected from events
         detected_agents = set()
-        event_types_seen = set()
+        event_types_seen = events.types_seen()
         agents_from_response_complete = set()
         has_agent_execution = False
 
         # Analyze events to detect agent execution
-        for event in events:
-            event_types_seen.add(event.type)
+        for event in events.of_type("agent_completed", "system_message", "agent_progress"):
 
             # Check for agent_completed events (PRIMARY METHOD) - Fixed to use correct event type
             if event.type == "agent_completed":
@@ -6107,14 +7361,9 @@ class AgentCLI:
                         # Supervisor orchestrates the agent chain - indicates system working
                         detected_agents.add('orchestration')
 
-            # Track basic event types for validation
-            elif event.type == "connection_established":
-                # Indicates WebSocket system is working
-                pass
-
         # Analysis of actual execution
-        num_agent_complete_events = len([e for e in events if e.type == "agent_completed"])
-        num_agent_start_events = len([e for e in events if e.type == "system_message" and e.data.get('event') == 'agent_started'])
+        num_agent_complete_events = events.count("agent_completed")
+        num_agent_start_events = len([e for e in events.of_type("system_message") if e.data.get('event') == 'agent_started'])
 
         # Check for critical event types - Fixed to use correct event type
         critical_events = {'system_message', 'agent_progress', 'agent_completed'}
@@ -6470,7 +7719,18 @@ class AgentCLI:
                     logs_path=self.logs_path,
                     logs_user=self.logs_user,
                     logs_provider=self.logs_provider,
-                    handshake_timeout=self.handshake_timeout
+                    handshake_timeout=self.handshake_timeout,
+                    logs_incremental=self.logs_incremental,
+                    logs_projection=self.logs_projection,
+                    logs_dedup=self.logs_dedup,
+                    logs_encoding=self.logs_encoding,
+                    chunk_cache=self.chunk_cache,
+                    chunk_cache_ttl=self.chunk_cache_ttl,
+                    chunk_connections=self.chunk_connections,
+                    chunk_retries=self.chunk_retries,
+                    ws_auth_race=self.ws_auth_race,
+                    event_buffer_size=self.event_buffer_size,
+                    event_spill_path=self.event_spill_path
                 )
                 if not await self.ws_client.connect():
                     # ISSUE #2766: Track WebSocket connection failure error
@@ -6515,6 +7775,11 @@ class AgentCLI:
                 if jsonl_logs is not None:
                     return run_id
 
+                if self.follow:
+                    safe_console_print(f"SUCCESS: Message sent with run_id: {run_id}", style="green",
+                                     json_mode=self.json_mode, ci_mode=self.ci_mode)
+                    return await self._follow_session_logs(message)
+
                 # Normal flow: wait for events
                 safe_console_print(f"SUCCESS: Message sent with run_id: {run_id}", style="green",
                                  json_mode=self.json_mode, ci_mode=self.ci_mode)
@@ -6627,19 +7892,99 @@ class AgentCLI:
 
     async def _wait_for_completion(self):
         """Wait for either agent completion or cleanup completion (Issue #2134)."""
-        while True:
-            # Check if cleanup is complete
-            if self.ws_client.cleanup_complete:
-                return
+        ws_client = self.ws_client
+        await ws_client._wait_until(
+            lambda: ws_client.cleanup_complete or ws_client.has_event('agent_completed'),
+            timeout=None
+        )
 
-            # Check if we have received agent_completed event (normal completion)
-            agent_completed = any(event.type == 'agent_completed' for event in self.ws_client.events)
-            if agent_completed:
-                # Wait a bit more to see if cleanup events arrive
-                await asyncio.sleep(1)
-                return
+        # Normal completion: wait a bit more to see if cleanup events arrive
+        if not ws_client.cleanup_complete:
+            await asyncio.sleep(1)
+
+    async def _follow_session_logs(self, message: str) -> bool:
+        """Stream new entries from the active session log until interrupted.
+
+        Entries appended to the session file are batched by LogFollower and sent
+        over the existing connection as incremental user_message payloads, while
+        events from the backend keep being displayed as they arrive.
+        """
+        from agent_logs import LogFollower, LogProjectionConfig, stream_recent_logs
+
+        stream = stream_recent_logs(
+            limit=1,
+            project_name=self.logs_project,
+            base_path=self.logs_path,
+            username=self.logs_user,
+            provider=self.logs_provider
+        )
+        log_files = stream.find_files() if stream else []
+        if not log_files or log_files[0].suffix != '.jsonl':
+            error_msg = "No JSONL session log found to follow"
+            self.errors.append(error_msg)
+            safe_console_print(f"ERROR: {error_msg}", style="red", json_mode=self.json_mode, ci_mode=self.ci_mode)
+            return False
 
-            await asyncio.sleep(0.1)  # Short sleep to avoid busy waiting
+        follower = LogFollower(
+            log_files[0],
+            provider=stream.provider,
+            projection=LogProjectionConfig() if self.logs_projection else None
+        )
+        safe_console_print(
+            f"👀 Following {log_files[0].name} ({'inotify' if follower.uses_inotify else 'polling'}, "
+            f"{self.follow_window:.1f}s batches) - press Ctrl+C to stop",
+            style="cyan", json_mode=self.json_mode, ci_mode=self.ci_mode
+        )
+
+        event_display_task = asyncio.create_task(self._receive_events_with_display())
+        stop_requested = threading.Event()
+        batches = follower.batches(window_seconds=self.follow_window, should_stop=stop_requested.is_set)
+        loop = asyncio.get_event_loop()
+
+        try:
+            while not event_display_task.done():
+                # The follower blocks on file I/O, so it runs in a worker thread
+                batch = await loop.run_in_executor(None, next, batches, None)
+                if batch is None:
+                    break
+
+                await self.ws_client.send_message(
+                    message,
+                    jsonl_logs=batch,
+                    agent_context={
+                        "follow": {
+                            "batch_index": follower.batches_sent - 1,
+                            "file_name": log_files[0].name,
+                            "entries_in_batch": len(batch),
+                            "end_offset": follower.offset
+                        }
+                    }
+                )
+                self.debug.debug_print(
+                    f"Follow: sent batch {follower.batches_sent} ({len(batch)} entries, {follower.entries_read} total)",
+                    DebugLevel.BASIC,
+                    style="cyan"
+                )
+        except websockets.exceptions.ConnectionClosed as e:
+            error_msg = f"Connection closed while following session log: {e}"
+            self.errors.append(error_msg)
+            safe_console_print(f"ERROR: {error_msg}", style="red", json_mode=self.json_mode, ci_mode=self.ci_mode)
+            return False
+        finally:
+            # The follower releases its inotify watch when the batch generator finishes
+            stop_requested.set()
+            event_display_task.cancel()
+            try:
+                await event_display_task
+            except asyncio.CancelledError:
+                pass
+
+        safe_console_print(
+            f"\n📊 Follow mode sent {follower.entries_read} entries in {follower.batches_sent} batches, "
+            f"received {len(self.ws_client.events)} events",
+            style="cyan", json_mode=self.json_mode, ci_mode=self.ci_mode
+        )
+        return True
 
     async def run_test_mode(self, test_file: str):
         """Run in test mode with predefined scenarios"""
@@ -6684,7 +8029,18 @@ class AgentCLI:
                     logs_path=self.logs_path,
                     logs_user=self.logs_user,
                     logs_provider=self.logs_provider,
-                    handshake_timeout=self.handshake_timeout
+                    handshake_timeout=self.handshake_timeout,
+                    logs_incremental=self.logs_incremental,
+                    logs_projection=self.logs_projection,
+                    logs_dedup=self.logs_dedup,
+                    logs_encoding=self.logs_encoding,
+                    chunk_cache=self.chunk_cache,
+                    chunk_cache_ttl=self.chunk_cache_ttl,
+                    chunk_connections=self.chunk_connections,
+                    chunk_retries=self.chunk_retries,
+                    ws_auth_race=self.ws_auth_race,
+                    event_buffer_size=self.event_buffer_size,
+                    event_spill_path=self.event_spill_path
                 )
                 if not await self.ws_client.connect():
                     results.append({'scenario': scenario['name'], 'status': 'FAILED', 'error': 'WebSocket connection failed'})
@@ -7458,7 +8814,28 @@ def main(argv=None):
     parser.add_argument(
         "--benchmark",
         action="store_true",
-        help="ISSUE #2564: Run WebSocket performance benchmarks and display results"
+        help="ISSUE #2564: Run WebSocket performance benchmarks against a local mock backend and compare with the saved baseline"
+    )
+
+    parser.add_argument(
+        "--benchmark-iterations",
+        type=int,
+        default=5,
+        metavar="N",
+        help="Samples per benchmark metric (default: 5)"
+    )
+
+    parser.add_argument(
+        "--benchmark-baseline",
+        type=str,
+        metavar="PATH",
+        help="Baseline file to compare benchmark results with (default: benchmark_baseline.json next to the thread cache)"
+    )
+
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Save this --benchmark run's results as the new baseline"
     )
 
     # ISSUE #2218: Golden Path monitoring commands
@@ -7558,6 +8935,98 @@ def main(argv=None):
         help="AI tool provider to collect logs from: claude (default), codex (OpenAI Codex CLI), gemini (Google Gemini CLI)"
     )
 
+    parser.add_argument(
+        "--logs-incremental",
+        action="store_true",
+        help="Only send log entries added since the last successful run (cursors stored next to the thread cache)"
+    )
+
+    parser.add_argument(
+        "--no-logs-projection",
+        dest="logs_projection",
+        action="store_false",
+        help="Send log entries in full instead of truncating heavy fields (tool output, images, thinking) to byte budgets"
+    )
+
+    parser.add_argument(
+        "--logs-dedup",
+        action="store_true",
+        help="Send repeated large strings once in a blob table (jsonl_logs_blobs) instead of inline in every entry"
+    )
+
+    parser.add_argument(
+        "--no-chunk-cache",
+        dest="chunk_cache",
+        action="store_false",
+        help="Upload every log chunk instead of reusing stored results for chunks already analyzed with the same message"
+    )
+
+    parser.add_argument(
+        "--chunk-cache-ttl",
+        type=float,
+        default=168.0,
+        metavar="HOURS",
+        help="How long stored chunk results are reused (default: 168, one week)"
+    )
+
+    parser.add_argument(
+        "--chunk-connections",
+        type=int,
+        default=4,
+        metavar="N",
+        help="Connections used to upload log chunks; chunks are queued across them (default: 4, capped by the backend's max_chunk_connections)"
+    )
+
+    parser.add_argument(
+        "--chunk-retries",
+        type=int,
+        default=2,
+        metavar="N",
+        help="Times a failed or unacknowledged log chunk is resent, with backoff, before it is reported as failed (default: 2)"
+    )
+
+    parser.add_argument(
+        "--ws-auth-race",
+        action="store_true",
+        help="Start the WebSocket auth methods a moment apart and keep the first that connects, instead of trying them one by one (the method that worked is remembered per backend either way)"
+    )
+
+    parser.add_argument(
+        "--event-buffer",
+        type=int,
+        default=10000,
+        metavar="N",
+        help="Received events kept in memory; older ones are dropped or spilled with --event-spill (default: 10000, 0 for no limit)"
+    )
+
+    parser.add_argument(
+        "--event-spill",
+        type=str,
+        metavar="FILE",
+        help="Append events dropped from the in-memory buffer to this NDJSON file"
+    )
+
+    parser.add_argument(
+        "--follow",
+        action="store_true",
+        help="After the first message, keep the connection open and stream new entries from the active session log as they are written (Ctrl+C to stop)"
+    )
+
+    parser.add_argument(
+        "--follow-window",
+        type=float,
+        default=5.0,
+        metavar="SECONDS",
+        help="With --follow, longest time new entries are held before being sent as one batch (default: 5.0)"
+    )
+
+    parser.add_argument(
+        "--logs-encoding",
+        choices=["auto", "none", "gzip+b64", "zstd+b64"],
+        default="auto",
+        help="Compression for jsonl_logs (default: auto, uses the best encoding the backend advertises in its handshake)"
+    )
+
     args = parser.parse_args(argv)
 
     # FROZEN: Set default logs_count since flag is commented out
@@ -7625,7 +9094,7 @@ def main(argv=None):
                     print(f"Environment detection failed: {str(e)}", file=sys.stderr)
                     sys.exit(1)
 
-            asyncio.run(run_environment_check())
+            run_async(run_environment_check())
             sys.exit(0)
 
         except ImportError:
@@ -7825,7 +9294,20 @@ def main(argv=None):
         logs_path=args.logs_path,
         logs_user=args.logs_user,
         logs_provider=args.logs_provider,
-        handshake_timeout=args.handshake_timeout
+        handshake_timeout=args.handshake_timeout,
+        logs_incremental=args.logs_incremental,
+        logs_projection=args.logs_projection,
+        logs_dedup=args.logs_dedup,
+        logs_encoding=args.logs_encoding,
+        chunk_cache=args.chunk_cache,
+        chunk_cache_ttl=args.chunk_cache_ttl,
+        chunk_connections=args.chunk_connections,
+        chunk_retries=args.chunk_retries,
+        ws_auth_race=args.ws_auth_race,
+        event_buffer_size=args.event_buffer,
+        event_spill_path=args.event_spill,
+        follow=args.follow,
+        follow_window=args.follow_window
     )
 
     # ISSUE #2766: Store output formatter reference in CLI instance
@@ -7864,13 +9346,13 @@ def main(argv=None):
 
         # Run GCP error lookup and exit
         try:
-            asyncio.run(run_gcp_error_lookup())
+            run_async(run_gcp_error_lookup())
         except KeyboardInterrupt:
             safe_console_print("\n[FAIL] GCP error lookup interrupted", style="yellow")
         sys.exit(0)
 
     # Handle health check commands (ISSUE #2218: Added Golden Path monitoring commands)
-    if args.health_check or args.check_backend or args.check_auth or args.check_websocket or args.check_environment or args.session_stats or args.generate_troubleshooting_report or args.monitor or args.health_metrics:
+    if args.health_check or args.check_backend or args.check_auth or args.check_websocket or args.check_environment or args.benchmark or args.session_stats or args.generate_troubleshooting_report or args.monitor or args.health_metrics:
         async def run_health_checks():
             try:
                 if args.health_check:
@@ -8019,95 +9501,44 @@ def main(argv=None):
                         sys.exit(1)
 
                 elif args.benchmark:
-                    # ISSUE #2564: Run WebSocket performance benchmarks
-                    safe_console_print("[BENCHMARK] Running WebSocket Performance Benchmarks...", style="cyan")
-                    safe_console_print("This will run 5 performance benchmarks with real services", style="dim")
-                    safe_console_print("Benchmarks include: connection time, auth time, message latency, throughput, agent execution", style="dim")
-                    safe_console_print("")
-
-                    # Import subprocess to run pytest
-                    import subprocess
-
-                    # Path to benchmark test file
-                    benchmark_file = Path(__file__).parent.parent / "tests" / "performance" / "test_websocket_performance_benchmarks.py"
-
-                    if not benchmark_file.exists():
-                        safe_console_print(f"[red]ERROR: Benchmark file not found: {benchmark_file}[/red]")
-                        sys.exit(1)
-
-                    # Run pytest on benchmark file
-                    safe_console_print(f"[cyan]Running pytest on: {benchmark_file}[/cyan]")
-                    result = subprocess.run(
-                        [sys.executable, "-m", "pytest", str(benchmark_file), "-v", "--tb=short", "-m", "performance"],
-                        capture_output=True,
-                        text=True
+                    # ISSUE #2564: Run WebSocket performance benchmarks against the in-repo mock backend
+                    from benchmark_agent_cli import (
+                        REGRESSION_TOLERANCE, default_baseline_path, format_results, load_baseline,
+                        regressions, run_benchmarks, save_baseline
                     )
+                    from mock_backend import MockBackendConfig
 
-                    # Display pytest output
-                    if result.stdout:
-                        safe_console_print("\n--- Benchmark Output ---", style="bold")
-                        safe_console_print(result.stdout)
-
-                    if result.stderr:
-                        safe_console_print("\n--- Errors/Warnings ---", style="yellow")
-                        safe_console_print(result.stderr)
-
-                    # Load and display results from baseline file
-                    baseline_file = Path(__file__).parent.parent / "tests" / "performance" / "baseline_results.json"
-
-                    if baseline_file.exists():
-                        try:
-                            with open(baseline_file, "r") as f:
-                                baseline_data = json.load(f)
-
-                            safe_console_print("\n[RESULTS] Performance Benchmark Results: ", style="bold green")
-
-                            if "baselines" in baseline_data:
-                                results_table = Table(title="Benchmark Metrics")
-                                results_table.add_column("Benchmark", style="cyan")
-                                results_table.add_column("Mean", style="bold")
-                                results_table.add_column("P95", style="yellow")
-                                results_table.add_column("Baseline", style="dim")
-                                results_table.add_column("Status", style="green")
-
-                                for metric_name, metric_data in baseline_data["baselines"].items():
-                                    mean_val = metric_data.get("mean", metric_data.get("messages_per_second", 0))
-                                    p95_val = metric_data.get("p95", "-")
-                                    baseline_val = metric_data.get("baseline_ms", metric_data.get("baseline_msg_per_sec", 0))
-
-                                    # Format values based on metric type
-                                    if metric_name == "throughput":
-                                        mean_str = f"{mean_val:.1f} msg/s"
-                                        p95_str = "-"
-                                        baseline_str = f"{baseline_val:.0f} msg/s"
-                                    else:
-                                        mean_str = f"{mean_val:.2f}ms"
-                                        p95_str = f"{p95_val:.2f}ms" if isinstance(p95_val, (int, float)) else p95_val
-                                        baseline_str = f"{baseline_val:.0f}ms"
-
-                                    # Status indicator
-                                    status = "[green]✓[/green]" if result.returncode == 0 else "[yellow]⚠[/yellow]"
-
-                                    results_table.add_row(
-                                        metric_name.replace("_", " ").title(),
-                                        mean_str,
-                                        p95_str,
-                                        baseline_str,
-                                        status
-                                    )
-
-                                safe_console_print(results_table)
-
-                            # Display last updated time
-                            if "last_updated" in baseline_data:
-                                safe_console_print(f"\n[dim]Last updated: {baseline_data['last_updated']}[/dim]")
-
-                        except (json.JSONDecodeError, IOError) as e:
-                            safe_console_print(f"[yellow]Warning: Could not load baseline results: {e}[/yellow]")
-
-                    # Exit with pytest exit code
-                    safe_console_print(f"\n[bold]Benchmark suite {'PASSED' if result.returncode == 0 else 'FAILED'}[/bold]")
-                    sys.exit(result.returncode)
+                    safe_console_print("[BENCHMARK] Running WebSocket Performance Benchmarks...", style="cyan")
+                    safe_console_print("Runs against a local mock backend: connect latency, time to first event, "
+                                       "chunk upload throughput, events/s", style="dim")
+
+                    backend_config = MockBackendConfig()
+                    baseline_path = args.benchmark_baseline or default_baseline_path()
+                    baseline_data = load_baseline(baseline_path)
+                    results = await run_benchmarks(iterations=args.benchmark_iterations, backend_config=backend_config)
+
+                    results_table = Table(title=f"Benchmark Metrics ({args.benchmark_iterations} iterations)")
+                    results_table.add_column("Benchmark", style="cyan")
+                    results_table.add_column("Mean", style="bold")
+                    results_table.add_column("P95", style="yellow")
+                    results_table.add_column("Baseline", style="dim")
+                    results_table.add_column("Change", style="green")
+                    for row in format_results(results, baseline_data):
+                        results_table.add_row(row[0].title(), *row[1:])
+                    safe_console_print(results_table)
+
+                    if baseline_data and "last_updated" in baseline_data:
+                        safe_console_print(f"\n[dim]Baseline from {baseline_data['last_updated']} ({baseline_path})[/dim]")
+                    regressed = regressions(results, baseline_data)
+                    if regressed:
+                        safe_console_print(f"⚠️ Regressed by more than {REGRESSION_TOLERANCE:.0%}: {', '.join(regressed)}",
+                                           style="yellow")
+                    if args.save_baseline:
+                        save_baseline(results, baseline_path, backend_config)
+                        safe_console_print(f"Baseline saved to {baseline_path}", style="green")
+
+                    safe_console_print(f"\n[bold]Benchmark suite {'FAILED' if regressed else 'PASSED'}[/bold]")
+                    sys.exit(1 if regressed else 0)
 
                 elif args.session_stats:
                     safe_console_print("[STATS] Debug session statistics...", style="cyan")
@@ -8147,7 +9578,7 @@ def main(argv=None):
 
         # Run health checks and exit
         try:
-            asyncio.run(run_health_checks())
+            run_async(run_health_checks())
         except KeyboardInterrupt:
             safe_console_print("\n[FAIL] Health check interrupted", style="yellow")
         sys.exit(0)
@@ -8228,7 +9659,7 @@ def main(argv=None):
 
     # Run
     try:
-        asyncio.run(run())
+        run_async(run())
     except KeyboardInterrupt:
         safe_console_print("\n Goodbye!", style="yellow")
 
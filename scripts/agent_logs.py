@@ -5,18 +5,75 @@ Collects recent JSONL logs from .claude/Projects for agent CLI integration
 Supports multiple AI CLI tools: Claude, Codex, Gemini
 """
 
+import base64
+import ctypes
+import ctypes.util
+import fnmatch
+import gzip
 import hashlib
+import heapq
 import json
 import logging
+import marshal
 import os
 import platform
+import select
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, BinaryIO, Callable, Generator, Iterable, Iterator, Tuple
+
+# zstd is optional; gzip+b64 is always available
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 # Configure module logger
 logger = logging.getLogger(__name__)
 
+# Block size for single-pass hash and parse of log files
+READ_BUFFER_SIZE = 1024 * 1024
+
+# Parallel parsing crossover: below this many bytes, process pool start-up
+# costs more than parsing across cores saves
+PARALLEL_MIN_BYTES = 32 * 1024 * 1024
+
+# Target shard size when splitting one large JSONL file across workers
+PARALLEL_SHARD_BYTES = 8 * 1024 * 1024
+
+# Older date partitions (e.g. Codex sessions/YYYY/MM/DD) still scanned after the
+# top-N files are found, so sessions that started before midnight are not missed
+DISCOVERY_GRACE_PARTITIONS = 1
+
+# Strings at least this large are stored once in the payload blob table and
+# replaced by {"$blob": <hash>} references
+DEDUP_MIN_BYTES = 512
+
+# Compressed jsonl_logs encodings, in client preference order
+LOG_ENCODINGS = ("zstd+b64", "gzip+b64")
+
+# Follow mode: new entries are batched until this much time has passed since
+# the first pending entry, or until the batch reaches the size/entry caps
+FOLLOW_BATCH_SECONDS = 5.0
+FOLLOW_BATCH_BYTES = 512 * 1024
+FOLLOW_BATCH_ENTRIES = 250
+FOLLOW_POLL_INTERVAL = 0.5
+
+# Linux inotify event masks used by follow mode
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVE_SELF = 0x00000800
+_IN_DELETE_SELF = 0x00000400
+
+# Bytes fingerprinted at the head of a file and just before a saved cursor to
+# confirm the file has only been appended to since the last run
+CURSOR_WINDOW_BYTES = 4096
+
 
 class LogProvider(Enum):
     """Supported AI CLI tool providers."""
@@ -183,6 +240,52 @@ def _get_log_file_patterns(provider: LogProvider) -> List[str]:
     return patterns.get(provider, ["*.jsonl"])
 
 
+class RawLogEntry(dict):
+    """
+    Normalized log entry that carries its own JSON serialization.
+
+    ``raw`` holds the UTF-8 JSON bytes of the entry, built by splicing the
+    normalization fields onto the line read from disk, so sizing, hashing and
+    payload assembly never have to re-encode it. Anything that changes the
+    entry after collection must reset ``raw`` to None.
+    """
+
+    __slots__ = ('raw',)
+
+
+def _raw_log_entry(log_entry: Dict[str, Any], line: bytes, provider: LogProvider, file_path: Path) -> Dict[str, Any]:
+    """
+    Normalize a Claude/Codex JSONL entry, keeping the line bytes for serialization.
+
+    Produces the same entry as _parse_provider_log(). The spliced bytes are
+    only kept when they serialize exactly that entry.
+    """
+    entry = RawLogEntry(log_entry)
+    entry['_provider'] = provider.value
+    entry['_source_file'] = file_path.name
+    entry.raw = None
+
+    # Existing keys would keep their position and be duplicated by the splice
+    if line.endswith(b'}') and '_provider' not in log_entry and '_source_file' not in log_entry:
+        suffix = f'"_provider": "{provider.value}", "_source_file": {json.dumps(file_path.name)}}}'.encode('utf-8')
+        entry.raw = line[:-1] + (b', ' + suffix if log_entry else suffix)
+
+    return entry
+
+
+def entry_json_bytes(entry: Dict[str, Any]) -> bytes:
+    """JSON bytes of a log entry, reusing the collected line bytes when available."""
+    raw = getattr(entry, 'raw', None)
+    if raw is not None:
+        return raw
+    return json.dumps(entry).encode('utf-8')
+
+
+def entries_json_bytes(entries: List[Dict[str, Any]]) -> bytes:
+    """JSON array bytes of log entries, assembled from per-entry bytes."""
+    return b'[' + b', '.join(entry_json_bytes(entry) for entry in entries) + b']'
+
+
 def _parse_provider_log(log_entry: Dict[str, Any], provider: LogProvider, file_path: Path) -> List[Dict[str, Any]]:
     """
     Parse and normalize log entries from different providers.
@@ -239,6 +342,371 @@ def _parse_provider_log(log_entry: Dict[str, Any], provider: LogProvider, file_p
     return normalized_logs
 
 
+@dataclass
+class LogProjectionConfig:
+    """Byte budgets for heavy fields kept when projecting log entries for upload."""
+    # Tool output (file contents, command output) in tool_result blocks
+    TOOL_RESULT_BYTES: int = 2048
+    # toolUseResult duplicates the tool_result content on Claude entries
+    TOOL_USE_RESULT_BYTES: int = 512
+    # Model reasoning blocks
+    THINKING_BYTES: int = 4096
+    # User prompts, assistant text and system entries
+    TEXT_BYTES: int = 16384
+    # Base64 image data is dropped entirely by default
+    IMAGE_BYTES: int = 0
+
+
+# Declarative projection rules per provider: (field path, budget attribute,
+# value type the rule applies to). Paths are dotted keys; "[]" iterates a list
+# and "[type=x]" iterates list items whose "type" is x. Fields not listed are
+# kept untouched, so metadata such as usage, model, tool names and ids always
+# survives projection.
+PROJECTION_RULES: Dict[LogProvider, List[Tuple[str, str, type]]] = {
+    LogProvider.CLAUDE: [
+        ("toolUseResult", "TOOL_USE_RESULT_BYTES", object),
+        ("message.content[type=tool_result].content", "TOOL_RESULT_BYTES", object),
+        ("message.content[type=thinking].thinking", "THINKING_BYTES", str),
+        ("message.content[type=text].text", "TEXT_BYTES", str),
+        ("message.content[type=image].source.data", "IMAGE_BYTES", str),
+        ("message.content", "TEXT_BYTES", str),
+        ("content", "TEXT_BYTES", str),
+    ],
+    LogProvider.CODEX: [
+        ("payload.output", "TOOL_RESULT_BYTES", object),
+        ("payload.content[].text", "TEXT_BYTES", str),
+        ("output", "TOOL_RESULT_BYTES", object),
+        ("content[].text", "TEXT_BYTES", str),
+    ],
+    LogProvider.GEMINI: [
+        ("content", "TEXT_BYTES", object),
+    ],
+}
+
+
+def _truncate_utf8(value: str, budget: int) -> Tuple[str, int, int]:
+    """
+    Truncate a string to a UTF-8 byte budget without splitting characters.
+
+    Returns:
+        Tuple of (possibly truncated string, original bytes, kept bytes)
+    """
+    encoded = value.encode('utf-8')
+    if len(encoded) <= budget:
+        return value, len(encoded), len(encoded)
+
+    kept = encoded[:budget].decode('utf-8', errors='ignore')
+    kept_bytes = len(kept.encode('utf-8'))
+    marker = f"...[truncated {len(encoded) - kept_bytes} bytes]" if kept_bytes else ""
+    return kept + marker, len(encoded), kept_bytes
+
+
+def _prune_node(
+    node: Any,
+    budget: int,
+    config: LogProjectionConfig,
+    field: str,
+    pruned: List[Dict[str, Any]]
+) -> Any:
+    """
+    Bound every string inside a field to the budget, keeping its structure.
+
+    Base64 image sources use IMAGE_BYTES regardless of the field budget. Every
+    truncated string is recorded in ``pruned`` with its original size and hash.
+
+    Returns:
+        The pruned value (lists and dicts are modified in place)
+    """
+    if isinstance(node, str):
+        kept, original_bytes, kept_bytes = _truncate_utf8(node, budget)
+        if kept_bytes < original_bytes:
+            pruned.append({
+                'field': field,
+                'original_bytes': original_bytes,
+                'kept_bytes': kept_bytes,
+                'sha256': hashlib.sha256(node.encode('utf-8')).hexdigest()[:16],
+            })
+        return kept
+
+    if isinstance(node, dict):
+        is_base64 = node.get('type') == 'base64'
+        for key, value in node.items():
+            key_budget = config.IMAGE_BYTES if is_base64 and key == 'data' else budget
+            node[key] = _prune_node(value, key_budget, config, f"{field}.{key}", pruned)
+        return node
+
+    if isinstance(node, list):
+        for index, value in enumerate(node):
+            node[index] = _prune_node(value, budget, config, f"{field}[{index}]", pruned)
+        return node
+
+    return node
+
+
+def _apply_projection_rule(
+    node: Any,
+    segments: List[str],
+    budget: int,
+    value_type: type,
+    config: LogProjectionConfig,
+    field: str,
+    pruned: List[Dict[str, Any]]
+) -> None:
+    """Walk one rule path and prune the fields of value_type it selects."""
+    if not isinstance(node, dict) or not segments:
+        return
+
+    segment = segments[0]
+    key, _, selector = segment.partition('[')
+    if key not in node:
+        return
+
+    path = f"{field}.{key}" if field else key
+
+    if not selector:
+        if len(segments) > 1:
+            _apply_projection_rule(node[key], segments[1:], budget, value_type, config, path, pruned)
+        elif isinstance(node[key], value_type):
+            node[key] = _prune_node(node[key], budget, config, path, pruned)
+        return
+
+    items = node[key]
+    if not isinstance(items, list):
+        return
+
+    wanted_type = selector.rstrip(']').partition('type=')[2] or None
+    for index, item in enumerate(items):
+        if wanted_type and not (isinstance(item, dict) and item.get('type') == wanted_type):
+            continue
+        item_path = f"{path}[{index}]"
+        if len(segments) > 1:
+            _apply_projection_rule(item, segments[1:], budget, value_type, config, item_path, pruned)
+        elif isinstance(item, value_type):
+            items[index] = _prune_node(item, budget, config, item_path, pruned)
+
+
+def project_log_entry(
+    entry: Dict[str, Any],
+    provider: LogProvider,
+    config: Optional[LogProjectionConfig] = None
+) -> Dict[str, Any]:
+    """
+    Truncate heavy fields of a normalized log entry to their byte budgets.
+
+    The entry is modified in place. Each truncated string is listed under
+    ``_pruned_fields`` with its path, original size, kept size and a hash of the
+    original content, so size and identity signals survive projection.
+
+    Args:
+        entry: Normalized log entry
+        provider: Provider that generated the log (selects PROJECTION_RULES)
+        config: Byte budgets (default: LogProjectionConfig())
+
+    Returns:
+        The projected entry
+    """
+    config = config or LogProjectionConfig()
+    pruned: List[Dict[str, Any]] = []
+
+    for path, budget_name, value_type in PROJECTION_RULES.get(provider, []):
+        budget = getattr(config, budget_name)
+        _apply_projection_rule(entry, path.split('.'), budget, value_type, config, "", pruned)
+
+    if pruned:
+        entry['_pruned_fields'] = pruned
+        if isinstance(entry, RawLogEntry):
+            entry.raw = None
+
+    return entry
+
+
+class LogDeduplicator:
+    """
+    Content-addressed deduplication of large strings in log entries.
+
+    Every string of at least ``min_bytes`` is stored once in a blob table keyed
+    by a truncated SHA-256 and replaced in the entry by ``{"$blob": <hash>}``.
+    Entries are processed one at a time, and the table only holds blobs
+    referenced since the last take_blobs() call, so memory is bounded by the
+    unique content of one payload or chunk.
+    """
+
+    def __init__(self, min_bytes: int = DEDUP_MIN_BYTES):
+        """
+        Args:
+            min_bytes: Smallest UTF-8 string size worth replacing with a reference
+        """
+        self.min_bytes = min_bytes
+        self.blobs: Dict[str, str] = {}
+
+        # Totals across all payloads, for reporting
+        self.strings_seen = 0
+        self.repeats = 0
+        self.input_bytes = 0
+        self.output_bytes = 0
+
+    @property
+    def ratio(self) -> float:
+        """Size of large strings before dedup divided by their size after."""
+        return self.input_bytes / self.output_bytes if self.output_bytes else 1.0
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.input_bytes - self.output_bytes
+
+    def dedup_entry(self, entry: Any) -> Any:
+        """
+        Return a copy of an entry with large strings replaced by blob references.
+
+        Containers are rebuilt; the original entry is not modified.
+        """
+        if isinstance(entry, str):
+            size = len(entry.encode('utf-8'))
+            if size < self.min_bytes:
+                return entry
+
+            blob_hash = hashlib.sha256(entry.encode('utf-8')).hexdigest()[:16]
+            reference = {"$blob": blob_hash}
+            reference_bytes = len(blob_hash) + 12
+
+            self.strings_seen += 1
+            self.input_bytes += size
+            self.output_bytes += reference_bytes
+            if blob_hash in self.blobs:
+                self.repeats += 1
+            else:
+                self.blobs[blob_hash] = entry
+                self.output_bytes += size
+            return reference
+
+        if isinstance(entry, dict):
+            return {key: self.dedup_entry(value) for key, value in entry.items()}
+
+        if isinstance(entry, list):
+            return [self.dedup_entry(value) for value in entry]
+
+        return entry
+
+    def iter_dedup(self, entries: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Lazily deduplicate a stream of entries."""
+        for entry in entries:
+            yield self.dedup_entry(entry)
+
+    def take_blobs(self) -> Dict[str, str]:
+        """Return the blob table for the entries processed so far and start a new one."""
+        blobs, self.blobs = self.blobs, {}
+        return blobs
+
+
+def resolve_blob_refs(entry: Any, blobs: Dict[str, str]) -> Any:
+    """
+    Inverse of LogDeduplicator.dedup_entry(): expand {"$blob": hash} references.
+
+    Args:
+        entry: Deduplicated log entry (or any nested value)
+        blobs: Blob table sent alongside the entries
+
+    Returns:
+        The entry with every reference replaced by its content
+    """
+    if isinstance(entry, dict):
+        if len(entry) == 1 and "$blob" in entry and entry["$blob"] in blobs:
+            return blobs[entry["$blob"]]
+        return {key: resolve_blob_refs(value, blobs) for key, value in entry.items()}
+
+    if isinstance(entry, list):
+        return [resolve_blob_refs(value, blobs) for value in entry]
+
+    return entry
+
+
+def available_log_encodings() -> List[str]:
+    """Return the jsonl_logs encodings this client can produce, most preferred first."""
+    return [encoding for encoding in LOG_ENCODINGS if encoding != "zstd+b64" or zstandard is not None]
+
+
+def select_log_encoding(server_encodings: Optional[Iterable[str]], requested: str = "auto") -> Optional[str]:
+    """
+    Choose the jsonl_logs encoding for a connection.
+
+    Args:
+        server_encodings: Encodings the backend advertised in its handshake, or
+            None if it advertised no capabilities
+        requested: "auto" to pick the best mutually supported encoding, "none"
+            to send plain JSON, or an explicit encoding to force
+
+    Returns:
+        Encoding name, or None to send jsonl_logs as a plain JSON list
+    """
+    if requested == "none":
+        return None
+
+    local = available_log_encodings()
+    if requested != "auto":
+        if requested not in LOG_ENCODINGS:
+            raise ValueError(f"Unknown log encoding: {requested}")
+        if requested not in local:
+            logger.warning(f"Log encoding {requested} unavailable (zstandard not installed), using gzip+b64")
+            return "gzip+b64"
+        return requested
+
+    supported = set(server_encodings or ())
+    for encoding in local:
+        if encoding in supported:
+            return encoding
+    return None
+
+
+def compress_log_bytes(raw: bytes, encoding: str) -> str:
+    """
+    Compress serialized log JSON and base64 it for embedding in a JSON payload.
+
+    Args:
+        raw: UTF-8 JSON bytes
+        encoding: One of LOG_ENCODINGS
+
+    Returns:
+        ASCII base64 string
+    """
+    if encoding == "zstd+b64":
+        if zstandard is None:
+            raise ValueError("zstd+b64 requires the zstandard package")
+        compressed = zstandard.ZstdCompressor(level=3).compress(raw)
+    elif encoding == "gzip+b64":
+        compressed = gzip.compress(raw, compresslevel=6, mtime=0)
+    else:
+        raise ValueError(f"Unknown log encoding: {encoding}")
+    return base64.b64encode(compressed).decode('ascii')
+
+
+def encode_log_entries(entries: List[Dict[str, Any]], encoding: str) -> str:
+    """Serialize log entries to JSON and compress them with the given encoding."""
+    return compress_log_bytes(entries_json_bytes(entries), encoding)
+
+
+def decode_log_entries(data: str, encoding: str) -> List[Dict[str, Any]]:
+    """
+    Inverse of encode_log_entries().
+
+    Args:
+        data: Base64 string from a jsonl_logs field
+        encoding: Value of the accompanying jsonl_logs_encoding field
+
+    Returns:
+        List of log entries
+    """
+    compressed = base64.b64decode(data)
+    if encoding == "zstd+b64":
+        if zstandard is None:
+            raise ValueError("zstd+b64 requires the zstandard package")
+        raw = zstandard.ZstdDecompressor().decompressobj().decompress(compressed)
+    elif encoding == "gzip+b64":
+        raw = gzip.decompress(compressed)
+    else:
+        raise ValueError(f"Unknown log encoding: {encoding}")
+    return json.loads(raw)
+
+
 def _get_default_user() -> Optional[str]:
     """
     Get default username for Windows path resolution.
@@ -319,12 +787,40 @@ def _sanitize_project_name(project_name: str) -> str:
     return sanitized
 
 
-def _find_most_recent_project(projects_root: Path) -> Optional[Path]:
+@dataclass
+class DiscoveryStats:
+    """Counts and timing breakdown for the log discovery phase."""
+    dirs_scanned: int = 0
+    entries_seen: int = 0
+    files_matched: int = 0
+    partitions_pruned: int = 0
+    project_seconds: float = 0.0
+    scan_seconds: float = 0.0
+    stat_seconds: float = 0.0
+    select_seconds: float = 0.0
+
+    @property
+    def total_seconds(self) -> float:
+        return self.project_seconds + self.scan_seconds + self.stat_seconds + self.select_seconds
+
+    def summary(self) -> str:
+        """One-line human readable breakdown."""
+        return (
+            f"discovery {self.total_seconds * 1000:.1f}ms "
+            f"(project {self.project_seconds * 1000:.1f}ms, scan {self.scan_seconds * 1000:.1f}ms, "
+            f"stat {self.stat_seconds * 1000:.1f}ms, select {self.select_seconds * 1000:.1f}ms); "
+            f"{self.dirs_scanned} dirs, {self.entries_seen} entries, {self.files_matched} matched, "
+            f"{self.partitions_pruned} partitions pruned"
+        )
+
+
+def _find_most_recent_project(projects_root: Path, stats: Optional[DiscoveryStats] = None) -> Optional[Path]:
     """
     Find the most recently modified project directory.
 
     Args:
         projects_root: Path to .claude/Projects directory
+        stats: Optional discovery stats to record timing into
 
     Returns:
         Path to most recent project directory or None if no projects found
@@ -333,159 +829,990 @@ def _find_most_recent_project(projects_root: Path) -> Optional[Path]:
         logger.warning(f"Projects root does not exist: {projects_root}")
         return None
 
+    started = time.perf_counter()
     try:
-        # Get all subdirectories
-        project_dirs = [p for p in projects_root.iterdir() if p.is_dir()]
+        newest = None
+        newest_mtime = None
+
+        with os.scandir(projects_root) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                mtime = entry.stat().st_mtime
+                if newest_mtime is None or mtime > newest_mtime:
+                    newest, newest_mtime = entry.path, mtime
 
-        if not project_dirs:
+        if newest is None:
             logger.warning(f"No project directories found in {projects_root}")
             return None
 
-        # Sort by modification time, most recent first
-        project_dirs.sort(key=lambda p: p.stat().st_mtime, reverse=True)
-
-        return project_dirs[0]
+        return Path(newest)
 
     except Exception as e:
         logger.error(f"Error finding most recent project: {e}")
         return None
 
+    finally:
+        if stats is not None:
+            stats.project_seconds += time.perf_counter() - started
 
-def _collect_jsonl_files(project_path: Path, limit: int, provider: LogProvider = LogProvider.CLAUDE) -> tuple[List[Dict[str, Any]], int, List[Dict[str, str]]]:
+
+def _compile_log_patterns(patterns: List[str]) -> Tuple[List[Tuple[bool, List[str]]], Optional[int]]:
     """
-    Collect and parse log files from directory (supports recursive patterns and multiple formats).
+    Split glob patterns into matchers for the scandir walker.
+
+    Only the subset of glob syntax used by _get_log_file_patterns() is
+    supported: an optional leading "**/" followed by fnmatch path components.
+
+    Args:
+        patterns: Glob patterns relative to the search root
+
+    Returns:
+        Tuple of (list of (recursive, components) matchers, maximum directory
+        depth to descend or None for unlimited)
+    """
+    matchers = []
+    max_depth: Optional[int] = 0
+
+    for pattern in patterns:
+        parts = pattern.split('/')
+        recursive = parts[0] == '**'
+        components = parts[1:] if recursive else parts
+        matchers.append((recursive, components))
+
+        if recursive:
+            max_depth = None
+        elif max_depth is not None:
+            max_depth = max(max_depth, len(components) - 1)
+
+    return matchers, max_depth
+
+
+def _matches_log_patterns(rel_parts: Tuple[str, ...], matchers: List[Tuple[bool, List[str]]]) -> bool:
+    """Return True if a relative file path matches any compiled pattern."""
+    for recursive, components in matchers:
+        if recursive:
+            if len(rel_parts) < len(components):
+                continue
+            candidate = rel_parts[len(rel_parts) - len(components):]
+        else:
+            if len(rel_parts) != len(components):
+                continue
+            candidate = rel_parts
+
+        if all(fnmatch.fnmatch(name, part) for name, part in zip(candidate, components)):
+            return True
+
+    return False
+
+
+def _scan_log_files(
+    root: Path,
+    patterns: List[str],
+    limit: int,
+    stats: Optional[DiscoveryStats] = None
+) -> List[Path]:
+    """
+    Walk a log directory with os.scandir and return the newest matching files.
+
+    Each file is stat'ed once through its DirEntry and offered to a bounded
+    min-heap, so only the top ``limit`` candidates are kept. Date-partitioned
+    layouts (all-numeric directory names such as YYYY/MM/DD) are walked
+    newest-first; once ``limit`` files are held, DISCOVERY_GRACE_PARTITIONS
+    further leaf partitions are scanned and the rest of the tree is pruned.
+
+    Args:
+        root: Directory to search
+        patterns: Glob patterns from _get_log_file_patterns()
+        limit: Number of files to return
+        stats: Optional discovery stats to record counts and timing into
+
+    Returns:
+        Matching file paths, most recently modified first
+    """
+    stats = stats if stats is not None else DiscoveryStats()
+    matchers, max_depth = _compile_log_patterns(patterns)
+    heap: List[Tuple[float, str]] = []
+    grace_remaining = DISCOVERY_GRACE_PARTITIONS
+
+    def walk(directory: str, rel_parts: Tuple[str, ...]) -> bool:
+        """Scan one directory; returns True once the walk should stop."""
+        nonlocal grace_remaining
+
+        started = time.perf_counter()
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    stats.entries_seen += 1
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry)
+                            continue
+                        if not entry.is_file():
+                            continue
+                    except OSError:
+                        continue
+
+                    if not _matches_log_patterns(rel_parts + (entry.name,), matchers):
+                        continue
+
+                    stat_started = time.perf_counter()
+                    try:
+                        mtime = entry.stat().st_mtime
+                    except OSError:
+                        continue
+                    finally:
+                        stats.stat_seconds += time.perf_counter() - stat_started
+
+                    stats.files_matched += 1
+                    if len(heap) < limit:
+                        heapq.heappush(heap, (mtime, entry.path))
+                    elif mtime > heap[0][0]:
+                        heapq.heapreplace(heap, (mtime, entry.path))
+        except OSError as e:
+            logger.debug(f"Skipping unreadable directory {directory}: {e}")
+            return False
+        finally:
+            stats.dirs_scanned += 1
+            stats.scan_seconds += time.perf_counter() - started
+
+        if max_depth is not None and len(rel_parts) >= max_depth:
+            subdirs = []
+
+        partitioned = bool(subdirs) and all(entry.name.isdigit() for entry in subdirs)
+        if partitioned:
+            # Date partitions: newest first so the walk can stop early
+            subdirs.sort(key=lambda entry: int(entry.name), reverse=True)
+
+        for index, entry in enumerate(subdirs):
+            if walk(entry.path, rel_parts + (entry.name,)) and partitioned:
+                # Only date-partitioned levels are pruned; other siblings are still scanned
+                stats.partitions_pruned += len(subdirs) - index - 1
+                return True
+
+        is_leaf_partition = bool(rel_parts) and rel_parts[-1].isdigit() and not partitioned
+        if is_leaf_partition and len(heap) >= limit:
+            if grace_remaining <= 0:
+                return True
+            grace_remaining -= 1
+
+        return False
+
+    walk(str(root), ())
+
+    started = time.perf_counter()
+    selected = [Path(path) for _, path in sorted(heap, reverse=True)]
+    stats.select_seconds += time.perf_counter() - started
+    return selected
+
+
+def _find_log_files(
+    project_path: Path,
+    limit: int,
+    provider: LogProvider = LogProvider.CLAUDE,
+    stats: Optional[DiscoveryStats] = None
+) -> List[Path]:
+    """
+    Find the most recent log files in a directory without reading them.
 
     Args:
         project_path: Path to project/logs directory
-        limit: Maximum number of log files to read
+        limit: Maximum number of log files to return
         provider: AI tool provider (affects file patterns)
+        stats: Optional discovery stats to record counts and timing into
 
     Returns:
-        Tuple of (list of parsed log entries, number of files read, list of file info dicts)
+        List of log file paths, most recently modified first
     """
     if not project_path.exists() or not project_path.is_dir():
         logger.warning(f"Project path does not exist: {project_path}")
-        return [], 0, []
+        return []
 
     try:
         # Get provider-specific file patterns
         patterns = _get_log_file_patterns(provider)
 
-        # Find all matching log files
-        log_files = []
-        for pattern in patterns:
-            log_files.extend(project_path.glob(pattern))
+        log_files = _scan_log_files(project_path, patterns, limit, stats)
 
         if not log_files:
             logger.info(f"No log files found in {project_path} for provider {provider.value}")
-            return [], 0, []
+            return []
 
-        # Remove duplicates and sort by modification time (most recent first)
-        log_files = list(set(log_files))
-        log_files.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+        return log_files
 
-        # Limit number of files to read
-        log_files = log_files[:limit]
-        files_read = len(log_files)
+    except Exception as e:
+        logger.error(f"Error collecting log files for {provider.value}: {e}")
+        return []
 
-        all_logs = []
-        file_info = []
 
-        for log_file in log_files:
-            try:
-                # Calculate file hash
-                hasher = hashlib.sha256()
-                entry_count = 0
+def _iter_hashed_lines(f: BinaryIO, hasher: Any) -> Iterator[Tuple[int, bytes, bool]]:
+    """
+    Split a binary file into lines while feeding every byte to a hash.
+
+    The file is read in READ_BUFFER_SIZE blocks; each block updates the hash and
+    is split on newlines, with the trailing partial line carried into the next
+    block.
+
+    Args:
+        f: File opened in binary mode
+        hasher: hashlib object updated with the raw file bytes
 
-                with open(log_file, 'rb') as f:
-                    for chunk in iter(lambda: f.read(4096), b''):
-                        hasher.update(chunk)
-
-                file_hash = hasher.hexdigest()[:8]
-
-                # Parse based on file extension
-                if log_file.suffix == '.jsonl':
-                    # JSONL format - one JSON object per line (Claude, Codex)
-                    with open(log_file, 'r', encoding='utf-8') as f:
-                        for line_num, line in enumerate(f, 1):
-                            line = line.strip()
-                            if not line:
-                                continue
-
-                            try:
-                                log_entry = json.loads(line)
-                                # Parse and normalize based on provider
-                                normalized = _parse_provider_log(log_entry, provider, log_file)
-                                all_logs.extend(normalized)
-                                entry_count += len(normalized)
-                            except json.JSONDecodeError as e:
-                                logger.debug(
-                                    f"Skipping malformed JSON in {log_file.name}:{line_num}: {e}"
-                                )
-                                continue
-
-                elif log_file.suffix == '.json':
-                    # Single JSON file (Gemini format)
-                    with open(log_file, 'r', encoding='utf-8') as f:
-                        try:
-                            log_entry = json.load(f)
-                            # Parse and normalize - may return multiple entries
-                            normalized = _parse_provider_log(log_entry, provider, log_file)
-                            all_logs.extend(normalized)
-                            entry_count = len(normalized)
-                        except json.JSONDecodeError as e:
-                            logger.warning(f"Could not parse JSON file {log_file.name}: {e}")
-
-                # Calculate relative path for better tracking
+    Yields:
+        Tuples of (1-based line number, raw line bytes without the newline,
+        whether the line was newline-terminated)
+    """
+    line_num = 0
+    remainder = b''
+
+    for block in iter(lambda: f.read(READ_BUFFER_SIZE), b''):
+        hasher.update(block)
+        lines = (remainder + block).split(b'\n') if remainder else block.split(b'\n')
+        remainder = lines.pop()
+        for line in lines:
+            line_num += 1
+            yield line_num, line, True
+
+    if remainder:
+        yield line_num + 1, remainder, False
+
+
+def _iter_log_file(
+    log_file: Path,
+    provider: LogProvider,
+    project_path: Optional[Path] = None,
+    start_offset: Optional[int] = None
+) -> Generator[Dict[str, Any], None, Dict[str, Any]]:
+    """
+    Stream normalized log entries from a single log file.
+
+    Entries are yielded as each line is parsed, so callers never hold more than
+    the current entry. The file info dict is the generator's return value and is
+    available once the file has been fully consumed.
+
+    Args:
+        log_file: Path to the .jsonl or .json log file
+        provider: Provider that generated the log
+        project_path: Directory the file was discovered in; when given, the file
+            info also carries the relative path and format
+        start_offset: Byte offset to resume a JSONL file from. When given, a
+            trailing line that is not yet complete is left unread and the file
+            info carries start_offset/end_offset, with the hash covering only
+            the bytes read in this pass
+
+    Yields:
+        Normalized log entry dicts
+
+    Returns:
+        File info dict with name, hash and entry count
+    """
+    # Hash and parse from the same bytes so each file is read exactly once
+    hasher = hashlib.sha256()
+    entry_count = 0
+
+    with open(log_file, 'rb', buffering=0) as f:
+        if log_file.suffix == '.jsonl':
+            # JSONL format - one JSON object per line (Claude, Codex)
+            end_offset = f.seek(start_offset) if start_offset else 0
+            for line_num, raw_line, terminated in _iter_hashed_lines(f, hasher):
+                line = raw_line.strip()
+                if line:
+                    try:
+                        log_entry = json.loads(line)
+                    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                        if start_offset is not None and not terminated:
+                            # Session still being written; resume from this line next time
+                            break
+                        logger.debug(
+                            f"Skipping malformed JSON in {log_file.name}:{line_num}: {e}"
+                        )
+                        log_entry = None
+
+                    if isinstance(log_entry, dict) and provider in (LogProvider.CLAUDE, LogProvider.CODEX):
+                        # One entry per line; keep the line bytes so it is never re-serialized
+                        entry_count += 1
+                        yield _raw_log_entry(log_entry, line, provider, log_file)
+                    elif log_entry is not None:
+                        # Parse and normalize based on provider
+                        for normalized in _parse_provider_log(log_entry, provider, log_file):
+                            entry_count += 1
+                            yield normalized
+
+                end_offset += len(raw_line) + (1 if terminated else 0)
+
+            if start_offset is not None:
+                info = _build_file_info(log_file, hasher.hexdigest()[:8], entry_count, project_path)
+                info['start_offset'] = start_offset
+                info['end_offset'] = end_offset
+                return info
+
+        else:
+            data = f.read()
+            hasher.update(data)
+
+            if log_file.suffix == '.json':
+                # Single JSON file (Gemini format)
                 try:
-                    relative_path = str(log_file.relative_to(project_path))
-                except ValueError:
-                    relative_path = log_file.name
-
-                file_info.append({
-                    'name': log_file.name,
-                    'path': relative_path,
-                    'hash': file_hash,
-                    'entries': entry_count,
-                    'format': 'jsonl' if log_file.suffix == '.jsonl' else 'json'
-                })
+                    log_entry = json.loads(data)
+                except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                    logger.warning(f"Could not parse JSON file {log_file.name}: {e}")
+                    log_entry = None
+
+                if log_entry is not None:
+                    # Parse and normalize - may return multiple entries
+                    for normalized in _parse_provider_log(log_entry, provider, log_file):
+                        entry_count += 1
+                        yield normalized
+
+    return _build_file_info(log_file, hasher.hexdigest()[:8], entry_count, project_path)
+
+
+def _build_file_info(
+    log_file: Path,
+    file_hash: str,
+    entry_count: int,
+    project_path: Optional[Path] = None
+) -> Dict[str, Any]:
+    """
+    Build the file info dict reported alongside collected entries.
+
+    Args:
+        log_file: Path to the log file
+        file_hash: Truncated SHA-256 of the file contents
+        entry_count: Number of normalized entries produced from the file
+        project_path: Directory the file was discovered in, or None for a
+            directly requested file
+
+    Returns:
+        File info dict with name, hash and entries (plus path and format when
+        project_path is given)
+    """
+    if project_path is None:
+        return {
+            'name': log_file.name,
+            'hash': file_hash,
+            'entries': entry_count
+        }
+
+    # Calculate relative path for better tracking
+    try:
+        relative_path = str(log_file.relative_to(project_path))
+    except ValueError:
+        relative_path = log_file.name
+
+    return {
+        'name': log_file.name,
+        'path': relative_path,
+        'hash': file_hash,
+        'entries': entry_count,
+        'format': 'jsonl' if log_file.suffix == '.jsonl' else 'json'
+    }
+
+
+def _hash_file(log_file: Path) -> str:
+    """Return the truncated SHA-256 used in file info for a whole file."""
+    hasher = hashlib.sha256()
+    with open(log_file, 'rb', buffering=0) as f:
+        for block in iter(lambda: f.read(READ_BUFFER_SIZE), b''):
+            hasher.update(block)
+    return hasher.hexdigest()[:8]
+
+
+def _should_parse_parallel(total_bytes: int, task_count: int, cpu_count: Optional[int] = None) -> bool:
+    """
+    Decide whether a process pool is worth starting for a parse job.
+
+    Worker start-up and result transfer cost roughly as much as serially
+    parsing PARALLEL_MIN_BYTES, so smaller jobs stay in-process.
+
+    Args:
+        total_bytes: Combined size of the files to parse
+        task_count: Number of independent parse tasks (files or shards)
+        cpu_count: Available CPUs, or None to detect
+
+    Returns:
+        True if parsing should use a process pool
+    """
+    cpu_count = cpu_count if cpu_count is not None else (os.cpu_count() or 1)
+    return cpu_count > 1 and task_count > 1 and total_bytes >= PARALLEL_MIN_BYTES
+
+
+def _shard_ranges(log_file: Path, file_size: int, shard_bytes: Optional[int] = None) -> List[Tuple[int, int]]:
+    """
+    Split a JSONL file into byte ranges that start and end on line boundaries.
+
+    Args:
+        log_file: Path to the JSONL file
+        file_size: Size of the file in bytes
+        shard_bytes: Target size of each range (default: PARALLEL_SHARD_BYTES)
+
+    Returns:
+        List of (start, end) byte offsets covering the whole file
+    """
+    shard_bytes = shard_bytes or PARALLEL_SHARD_BYTES
+    boundaries = [0]
+
+    with open(log_file, 'rb') as f:
+        target = shard_bytes
+        while target < file_size:
+            f.seek(target)
+            f.readline()  # Advance to the start of the next line
+            position = f.tell()
+            if position >= file_size:
+                break
+            boundaries.append(position)
+            target = position + shard_bytes
+
+    boundaries.append(file_size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def _pruned_bytes(entry: Dict[str, Any]) -> int:
+    """Return how many bytes projection removed from an entry."""
+    return sum(
+        record['original_bytes'] - record['kept_bytes']
+        for record in entry.get('_pruned_fields', ())
+    )
+
+
+def _parse_log_task(
+    log_file: str,
+    provider_value: str,
+    project_path: Optional[str],
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    projection: Optional[LogProjectionConfig] = None
+) -> Tuple[bytes, int, Optional[Dict[str, Any]], int]:
+    """
+    Process pool worker: parse a whole log file or a byte range of a JSONL file.
+
+    Entries are returned as a single marshal buffer, which is far cheaper to
+    transfer and load than pickling each dict or re-encoding as JSON. Projection
+    runs in the worker so heavy fields never cross the process boundary.
+
+    Args:
+        log_file: Path to the log file
+        provider_value: LogProvider value
+        project_path: Directory the file was discovered in, or None
+        start: First byte of the shard, or None for the whole file
+        end: End byte (exclusive) of the shard
+        projection: Byte budgets to project entries with, or None
+
+    Returns:
+        Tuple of (marshalled entry list and their JSON bytes, entry count, file
+        info dict or None for shards, bytes removed by projection)
+    """
+    path = Path(log_file)
+    provider = LogProvider(provider_value)
+    entries = []
+    pruned_bytes = 0
+    info = None
+
+    if start is None:
+        stream = _iter_log_file(path, provider, Path(project_path) if project_path else None)
+        while True:
+            try:
+                entries.append(next(stream))
+            except StopIteration as stop:
+                info = stop.value
+                break
+    else:
+        with open(path, 'rb') as f:
+            f.seek(start)
+            data = f.read(end - start)
+
+        for line in data.split(b'\n'):
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                log_entry = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                logger.debug(f"Skipping malformed JSON in {path.name} (bytes {start}-{end}): {e}")
+                continue
+
+            if isinstance(log_entry, dict) and provider in (LogProvider.CLAUDE, LogProvider.CODEX):
+                entries.append(_raw_log_entry(log_entry, line, provider, path))
+            else:
+                entries.extend(_parse_provider_log(log_entry, provider, path))
+
+    if projection is not None:
+        for entry in entries:
+            project_log_entry(entry, provider, projection)
+            pruned_bytes += _pruned_bytes(entry)
+
+    # marshal only handles exact dicts, so line bytes travel in a parallel list
+    buffer = marshal.dumps((
+        [dict(entry) for entry in entries],
+        [getattr(entry, 'raw', None) for entry in entries]
+    ))
+    return buffer, len(entries), info, pruned_bytes
+
+
+def _prefix_fingerprint(log_file: Path, offset: int) -> str:
+    """
+    Fingerprint the bytes before a cursor offset without re-reading them all.
+
+    Hashes the first and last CURSOR_WINDOW_BYTES of the prefix together with
+    its length. An appended-to file keeps its fingerprint; a rewritten or
+    replaced file almost never does.
+
+    Args:
+        log_file: Path to the log file
+        offset: Length of the prefix to fingerprint
+
+    Returns:
+        Hex SHA-256 fingerprint
+    """
+    hasher = hashlib.sha256(str(offset).encode('ascii'))
+    with open(log_file, 'rb') as f:
+        hasher.update(f.read(min(CURSOR_WINDOW_BYTES, offset)))
+        tail_start = max(0, offset - CURSOR_WINDOW_BYTES)
+        f.seek(tail_start)
+        hasher.update(f.read(offset - tail_start))
+    return hasher.hexdigest()
+
+
+class LogCursorStore:
+    """
+    Persistent per-file read positions for incremental log shipping.
+
+    Each JSONL file is tracked by resolved path with its inode, size at the last
+    run, the byte offset already shipped and a fingerprint of the bytes before
+    that offset. A file that was truncated, rotated or rewritten is read again
+    from the start.
+
+    Cursors advanced during collection are staged and only written to disk by
+    commit(), so a failed upload is retried in full on the next run.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: JSON file holding the cursors
+        """
+        self.path = Path(path)
+        self.cursors: Dict[str, Dict[str, Any]] = self._load()
+        self.staged: Dict[str, Dict[str, Any]] = {}
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load log cursors from {self.path}: {e}")
+            return {}
+
+    @staticmethod
+    def _key(log_file: Path) -> str:
+        return str(log_file.resolve())
+
+    def resume_offset(self, log_file: Path, stat_result: Optional[os.stat_result] = None) -> int:
+        """
+        Return the offset to resume reading from, or 0 to re-read the whole file.
+
+        Args:
+            log_file: Path to the JSONL log file
+            stat_result: Current stat of the file, if already known
+
+        Returns:
+            Byte offset of the first unshipped line
+        """
+        cursor = self.cursors.get(self._key(log_file))
+        if not cursor:
+            return 0
+
+        stat_result = stat_result or log_file.stat()
+        offset = cursor.get('offset', 0)
+
+        if cursor.get('inode') != stat_result.st_ino:
+            logger.info(f"Log file {log_file.name} was rotated; reading from start")
+            return 0
+        if stat_result.st_size < offset:
+            logger.info(f"Log file {log_file.name} was truncated; reading from start")
+            return 0
+
+        try:
+            if _prefix_fingerprint(log_file, offset) != cursor.get('fingerprint'):
+                logger.info(f"Log file {log_file.name} was rewritten; reading from start")
+                return 0
+        except OSError as e:
+            logger.debug(f"Could not verify cursor for {log_file.name}: {e}")
+            return 0
+
+        return offset
+
+    def stage(self, log_file: Path, stat_result: os.stat_result, offset: int) -> None:
+        """
+        Record a new cursor position to be persisted by commit().
+
+        Args:
+            log_file: Path to the JSONL log file
+            stat_result: Stat of the file taken before it was read
+            offset: Byte offset just after the last shipped line
+        """
+        self.staged[self._key(log_file)] = {
+            'inode': stat_result.st_ino,
+            'size': stat_result.st_size,
+            'offset': offset,
+            'fingerprint': _prefix_fingerprint(log_file, offset),
+        }
+
+    def commit(self) -> None:
+        """Persist staged cursors atomically."""
+        if not self.staged:
+            return
+
+        self.cursors.update(self.staged)
+        self.staged = {}
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.cursors, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save log cursors to {self.path}: {e}")
+
 
+class LogStream:
+    """
+    Lazily-read sequence of normalized log entries.
+
+    Iterating a LogStream reads one file at a time and yields entries as they
+    are parsed, so peak memory is bounded by a single entry rather than the
+    whole log set. ``files_read`` and ``file_info`` are filled in as each file
+    completes and are final once iteration is exhausted.
+
+    When several search roots are given (Codex/Gemini provider paths), roots are
+    tried in order and iteration stops after the first root that yields entries.
+
+    Large jobs are parsed in a process pool: whole files, or newline-aligned
+    shards of one large JSONL file, are parsed in parallel and yielded in the
+    same order as serial parsing.
+    """
+
+    def __init__(
+        self,
+        provider: LogProvider = LogProvider.CLAUDE,
+        limit: int = 1,
+        roots: Optional[List[Path]] = None,
+        log_file: Optional[Path] = None,
+        on_file_complete: Optional[Callable[[Dict[str, Any]], None]] = None,
+        parallel: Optional[bool] = None,
+        max_workers: Optional[int] = None,
+        cursor_store: Optional[LogCursorStore] = None,
+        discovery_stats: Optional[DiscoveryStats] = None,
+        projection: Optional[LogProjectionConfig] = None
+    ):
+        """
+        Args:
+            provider: AI tool provider (affects file patterns and normalization)
+            limit: Maximum number of log files to read per root
+            roots: Directories to search, in priority order
+            log_file: A specific log file to read instead of searching roots
+            on_file_complete: Called with each file info dict as soon as that
+                file has been fully streamed
+            parallel: True to force the process pool, False to disable it, or
+                None to decide from file sizes (see _should_parse_parallel)
+            max_workers: Process pool size (default: one per CPU, capped at task count)
+            cursor_store: When given, JSONL files are read from their last shipped
+                offset and the new offsets are staged in the store
+            discovery_stats: Stats to accumulate file discovery timing into
+            projection: Byte budgets to truncate heavy fields to (see
+                project_log_entry); None keeps entries in full
+        """
+        self.provider = provider
+        self.limit = limit
+        self.roots = roots or []
+        self.log_file = log_file
+        self.on_file_complete = on_file_complete
+        self.parallel = parallel
+        self.max_workers = max_workers
+        self.cursor_store = cursor_store
+        self.discovery_stats = discovery_stats if discovery_stats is not None else DiscoveryStats()
+        self.projection = projection
+
+        self.files_read = 0
+        self.file_info: List[Dict[str, Any]] = []
+        self.entry_count = 0
+
+    @property
+    def is_single_file(self) -> bool:
+        """True when streaming a specific log file rather than searching roots."""
+        return self.log_file is not None
+
+    def find_files(self) -> List[Path]:
+        """
+        Resolve the log files this stream would read, without reading them.
+
+        Returns:
+            Files from the first root that has any, most recent first
+        """
+        if self.log_file is not None:
+            return [self.log_file]
+
+        for root in self.roots:
+            log_files = _find_log_files(root, self.limit, self.provider, self.discovery_stats)
+            if log_files:
+                return log_files
+        return []
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        self.files_read = 0
+        self.file_info = []
+        self.entry_count = 0
+
+        if self.log_file is not None:
+            # Errors on an explicitly requested file propagate to the caller
+            tasks = self._plan_parallel([self.log_file])
+            if tasks:
+                yield from self._stream_parallel([self.log_file], tasks, None, strict=True)
+            else:
+                self.files_read = 1
+                yield from self._stream_file(self.log_file, None)
+            return
+
+        for root in self.roots:
+            self.files_read = 0
+            self.file_info = []
+
+            log_files = _find_log_files(root, self.limit, self.provider, self.discovery_stats)
+            logger.debug(f"Log discovery in {root}: {self.discovery_stats.summary()}")
+            tasks = self._plan_parallel(log_files)
+            if tasks:
+                yield from self._stream_parallel(log_files, tasks, root)
+            else:
+                yield from self._stream_serial(log_files, root)
+
+            if log_files:
+                logger.info(
+                    f"Collected {self.entry_count} log entries from {self.files_read} files "
+                    f"for provider {self.provider.value}"
+                )
+
+            if self.entry_count:
+                break
+
+    def _stream_serial(self, log_files: List[Path], project_path: Path) -> Iterator[Dict[str, Any]]:
+        """Parse files one after another in this process."""
+        for log_file in log_files:
+            self.files_read += 1
+            try:
+                yield from self._stream_file(log_file, project_path)
             except Exception as e:
                 logger.warning(f"Error reading {log_file.name}: {e}")
                 continue
 
-        logger.info(f"Collected {len(all_logs)} log entries from {files_read} files for provider {provider.value}")
-        return all_logs, files_read, file_info
+    def _plan_parallel(self, log_files: List[Path]) -> Optional[List[Tuple[int, Optional[int], Optional[int]]]]:
+        """
+        Split files into parse tasks if parallel parsing is worthwhile.
 
-    except Exception as e:
-        logger.error(f"Error collecting log files for {provider.value}: {e}")
-        return [], 0, []
+        Returns:
+            List of (file index, shard start, shard end) tasks, or None to parse
+            serially. Whole-file tasks have None offsets.
+        """
+        if self.parallel is False or not log_files or self.cursor_store is not None:
+            # Incremental reads only cover new bytes and stay in-process
+            return None
 
+        try:
+            sizes = [log_file.stat().st_size for log_file in log_files]
+            tasks = []
+            for index, (log_file, size) in enumerate(zip(log_files, sizes)):
+                if log_file.suffix == '.jsonl' and size >= 2 * PARALLEL_SHARD_BYTES:
+                    tasks.extend((index, start, end) for start, end in _shard_ranges(log_file, size))
+                else:
+                    tasks.append((index, None, None))
+        except OSError as e:
+            logger.debug(f"Falling back to serial parsing: {e}")
+            return None
 
-def collect_recent_logs(
+        if len(tasks) < 2:
+            return None
+        if self.parallel is None and not _should_parse_parallel(sum(sizes), len(tasks)):
+            return None
+
+        return tasks
+
+    def _stream_parallel(
+        self,
+        log_files: List[Path],
+        tasks: List[Tuple[int, Optional[int], Optional[int]]],
+        project_path: Optional[Path],
+        strict: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Parse tasks in a process pool and yield entries in file order.
+
+        Every task is submitted up front; sharded files are hashed in this
+        process while the workers parse. If the pool cannot be used, the
+        remaining files are parsed serially.
+        """
+        max_workers = self.max_workers or min(len(tasks), os.cpu_count() or 1)
+        project_arg = str(project_path) if project_path else None
+        sharded = {index for index, start, _ in tasks if start is not None}
+
+        try:
+            executor = ProcessPoolExecutor(max_workers=max_workers)
+            futures_by_file: Dict[int, list] = {}
+            for index, start, end in tasks:
+                future = executor.submit(
+                    _parse_log_task, str(log_files[index]), self.provider.value, project_arg,
+                    start, end, self.projection
+                )
+                futures_by_file.setdefault(index, []).append(future)
+        except (OSError, RuntimeError, NotImplementedError) as e:
+            logger.debug(f"Process pool unavailable, parsing serially: {e}")
+            if strict:
+                self.files_read = 1
+                yield from self._stream_file(log_files[0], project_path)
+            else:
+                yield from self._stream_serial(log_files, project_path)
+            return
+
+        logger.debug(f"Parsing {len(log_files)} files as {len(tasks)} tasks on {max_workers} workers")
+
+        try:
+            for index, log_file in enumerate(log_files):
+                futures = futures_by_file[index]
+                self.files_read += 1
+
+                try:
+                    file_hash = _hash_file(log_file) if index in sharded else None
+                    results = [future.result() for future in futures]
+                except BrokenProcessPool as e:
+                    logger.debug(f"Process pool failed, parsing remaining files serially: {e}")
+                    self.files_read -= 1
+                    if strict:
+                        self.files_read = 1
+                        yield from self._stream_file(log_file, project_path)
+                    else:
+                        yield from self._stream_serial(log_files[index:], project_path)
+                    return
+                except Exception as e:
+                    if strict:
+                        raise
+                    logger.warning(f"Error reading {log_file.name}: {e}")
+                    continue
+
+                entry_count = 0
+                pruned_bytes = 0
+                for buffer, count, _, task_pruned_bytes in results:
+                    entry_count += count
+                    pruned_bytes += task_pruned_bytes
+                    entries, raws = marshal.loads(buffer)
+                    for entry, raw in zip(entries, raws):
+                        if raw is not None:
+                            entry = RawLogEntry(entry)
+                            entry.raw = raw
+                        self.entry_count += 1
+                        yield entry
+
+                info = results[0][2] if file_hash is None else _build_file_info(
+                    log_file, file_hash, entry_count, project_path
+                )
+                if self.projection is not None:
+                    info['pruned_bytes'] = pruned_bytes
+                self.file_info.append(info)
+                if self.on_file_complete:
+                    self.on_file_complete(info)
+        finally:
+            if sys.version_info >= (3, 9):
+                executor.shutdown(wait=False, cancel_futures=True)
+            else:
+                executor.shutdown(wait=False)
+
+    def _stream_file(self, log_file: Path, project_path: Optional[Path]) -> Iterator[Dict[str, Any]]:
+        """Yield entries from one file, then record its file info."""
+        stat_result = None
+        start_offset = None
+        if self.cursor_store is not None and log_file.suffix == '.jsonl':
+            stat_result = log_file.stat()
+            start_offset = self.cursor_store.resume_offset(log_file, stat_result)
+
+        entries = _iter_log_file(log_file, self.provider, project_path, start_offset)
+        pruned_bytes = 0
+        while True:
+            try:
+                entry = next(entries)
+            except StopIteration as stop:
+                info = stop.value
+                break
+            if self.projection is not None:
+                project_log_entry(entry, self.provider, self.projection)
+                pruned_bytes += _pruned_bytes(entry)
+            self.entry_count += 1
+            yield entry
+
+        if self.projection is not None:
+            info['pruned_bytes'] = pruned_bytes
+
+        if stat_result is not None:
+            self.cursor_store.stage(log_file, stat_result, info['end_offset'])
+
+        self.file_info.append(info)
+        if self.on_file_complete:
+            self.on_file_complete(info)
+
+
+def _collect_jsonl_files(project_path: Path, limit: int, provider: LogProvider = LogProvider.CLAUDE) -> tuple[List[Dict[str, Any]], int, List[Dict[str, str]]]:
+    """
+    Collect and parse log files from directory (supports recursive patterns and multiple formats).
+
+    Args:
+        project_path: Path to project/logs directory
+        limit: Maximum number of log files to read
+        provider: AI tool provider (affects file patterns)
+
+    Returns:
+        Tuple of (list of parsed log entries, number of files read, list of file info dicts)
+    """
+    stream = LogStream(provider=provider, limit=limit, roots=[project_path])
+    all_logs = list(stream)
+    return all_logs, stream.files_read, stream.file_info
+
+
+def stream_recent_logs(
     limit: int = 1,
     project_name: Optional[str] = None,
     base_path: Optional[str] = None,
     username: Optional[str] = None,
     platform_name: Optional[str] = None,
-    provider: str = "claude"
-) -> Optional[tuple[List[Dict[str, Any]], int, List[Dict[str, str]]]]:
+    provider: str = "claude",
+    on_file_complete: Optional[Callable[[Dict[str, Any]], None]] = None,
+    parallel: Optional[bool] = None,
+    cursor_store: Optional[LogCursorStore] = None,
+    projection: Optional[LogProjectionConfig] = None
+) -> Optional[LogStream]:
     """
-    Collect recent logs from AI CLI tools (Claude, Codex, Gemini).
+    Resolve recent logs from AI CLI tools and return a lazy stream over them.
+
+    Path resolution is identical to collect_recent_logs(); no log file is read
+    until the returned stream is iterated.
 
     Args:
-        limit: Maximum number of log files to read (default: 1). For best results, use 1 log at a time for focused analysis.
+        limit: Maximum number of log files to read (default: 1)
         project_name: Specific project name or None for most recent (Claude only)
         base_path: Direct path override to logs directory OR a specific log file
         username: Windows username override
         platform_name: Platform override for testing ('Darwin', 'Windows', 'Linux')
         provider: AI tool provider ('claude', 'codex', 'gemini')
+        on_file_complete: Called with each file info dict as files finish streaming
+        parallel: Force (True) or disable (False) process pool parsing; None decides by size
+        cursor_store: Only read JSONL entries added since the cursors in this store
+        projection: Truncate heavy fields to these byte budgets before returning entries
 
     Returns:
-        Tuple of (list of log entry dicts, number of files read, list of file info) or None if no logs found
+        LogStream over the resolved log files, or None if no log location was found
 
     Raises:
-        ValueError: If limit is not positive or project_name is invalid
+        ValueError: If limit is not positive
     """
     if limit < 1:
         raise ValueError(f"Limit must be positive, got {limit}")
@@ -502,74 +1829,20 @@ def collect_recent_logs(
         if base_path:
             base_path_obj = Path(base_path)
             if base_path_obj.is_file():
-                # Handle direct file path
                 logger.info(f"Reading specific log file: {base_path_obj}")
-
-                if not base_path_obj.exists():
-                    logger.warning(f"Specified log file does not exist: {base_path_obj}")
-                    return None
-
-                # Read the single file
-                all_logs = []
-                file_info = []
-
-                try:
-                    # Calculate file hash
-                    hasher = hashlib.sha256()
-                    entry_count = 0
-
-                    with open(base_path_obj, 'rb') as f:
-                        for chunk in iter(lambda: f.read(4096), b''):
-                            hasher.update(chunk)
-
-                    file_hash = hasher.hexdigest()[:8]
-
-                    # Parse based on file extension
-                    if base_path_obj.suffix == '.jsonl':
-                        # JSONL format
-                        with open(base_path_obj, 'r', encoding='utf-8') as f:
-                            for line_num, line in enumerate(f, 1):
-                                line = line.strip()
-                                if not line:
-                                    continue
-
-                                try:
-                                    log_entry = json.loads(line)
-                                    normalized = _parse_provider_log(log_entry, provider_enum, base_path_obj)
-                                    all_logs.extend(normalized)
-                                    entry_count += len(normalized)
-                                except json.JSONDecodeError as e:
-                                    logger.debug(
-                                        f"Skipping malformed JSON in {base_path_obj.name}:{line_num}: {e}"
-                                    )
-                                    continue
-
-                    elif base_path_obj.suffix == '.json':
-                        # Single JSON file
-                        with open(base_path_obj, 'r', encoding='utf-8') as f:
-                            try:
-                                log_entry = json.load(f)
-                                normalized = _parse_provider_log(log_entry, provider_enum, base_path_obj)
-                                all_logs.extend(normalized)
-                                entry_count = len(normalized)
-                            except json.JSONDecodeError as e:
-                                logger.warning(f"Could not parse JSON file {base_path_obj.name}: {e}")
-
-                    file_info.append({
-                        'name': base_path_obj.name,
-                        'hash': file_hash,
-                        'entries': entry_count
-                    })
-
-                    logger.info(f"Collected {len(all_logs)} log entries from {base_path_obj.name}")
-                    return all_logs, 1, file_info
-
-                except Exception as e:
-                    logger.error(f"Error reading log file {base_path_obj}: {e}")
-                    return None
+                return LogStream(
+                    provider=provider_enum,
+                    limit=1,
+                    log_file=base_path_obj,
+                    on_file_complete=on_file_complete,
+                    parallel=parallel,
+                    cursor_store=cursor_store,
+                    projection=projection
+                )
 
         # Provider-based path resolution
         platform_name = platform_name or platform.system()
+        discovery_stats = DiscoveryStats()
 
         if provider_enum == LogProvider.CLAUDE:
             # Original Claude logic with project-based structure
@@ -590,23 +1863,16 @@ def collect_recent_logs(
                     return None
             else:
                 # Auto-detect most recent project
-                project_path = _find_most_recent_project(projects_root)
+                project_path = _find_most_recent_project(projects_root, discovery_stats)
                 if not project_path:
                     return None
 
-            # Collect logs
-            logs, files_read, file_info = _collect_jsonl_files(project_path, limit, provider_enum)
+            roots = [project_path]
 
         else:
-            # For Codex and Gemini, use provider-specific paths
-            provider_paths = _get_provider_paths(provider_enum, platform_name)
-
-            logs = None
-            files_read = 0
-            file_info = []
-
-            # Try each provider path until we find logs
-            for provider_path in provider_paths:
+            # For Codex and Gemini, try each provider-specific path until one has logs
+            roots = []
+            for provider_path in _get_provider_paths(provider_enum, platform_name):
                 if base_path:
                     # Override with custom base path
                     provider_path = Path(base_path)
@@ -615,21 +1881,282 @@ def collect_recent_logs(
                     logger.debug(f"Path does not exist: {provider_path}")
                     continue
 
+                if provider_path in roots:
+                    continue
+
                 logger.info(f"Searching for {provider_enum.value} logs in: {provider_path}")
-                logs, files_read, file_info = _collect_jsonl_files(provider_path, limit, provider_enum)
+                roots.append(provider_path)
+
+        return LogStream(
+            provider=provider_enum,
+            limit=limit,
+            roots=roots,
+            on_file_complete=on_file_complete,
+            parallel=parallel,
+            cursor_store=cursor_store,
+            discovery_stats=discovery_stats,
+            projection=projection
+        )
+
+    except Exception as e:
+        logger.error(f"Failed to collect logs: {e}")
+        return None
+
+
+def collect_recent_logs(
+    limit: int = 1,
+    project_name: Optional[str] = None,
+    base_path: Optional[str] = None,
+    username: Optional[str] = None,
+    platform_name: Optional[str] = None,
+    provider: str = "claude",
+    parallel: Optional[bool] = None,
+    cursor_store: Optional[LogCursorStore] = None,
+    projection: Optional[LogProjectionConfig] = None
+) -> Optional[tuple[List[Dict[str, Any]], int, List[Dict[str, str]]]]:
+    """
+    Collect recent logs from AI CLI tools (Claude, Codex, Gemini).
+
+    Materializes stream_recent_logs() into a list; prefer the stream for large
+    log sets that can be processed incrementally.
+
+    Args:
+        limit: Maximum number of log files to read (default: 1). For best results, use 1 log at a time for focused analysis.
+        project_name: Specific project name or None for most recent (Claude only)
+        base_path: Direct path override to logs directory OR a specific log file
+        username: Windows username override
+        platform_name: Platform override for testing ('Darwin', 'Windows', 'Linux')
+        provider: AI tool provider ('claude', 'codex', 'gemini')
+        parallel: Force (True) or disable (False) process pool parsing; None decides by size
+        cursor_store: Only collect JSONL entries added since the cursors in this
+            store; new positions are staged and persisted by cursor_store.commit()
+        projection: Truncate heavy fields to these byte budgets; file info then
+            reports pruned_bytes per file
 
-                if logs:
-                    break
+    Returns:
+        Tuple of (list of log entry dicts, number of files read, list of file info) or None if no logs found
 
-            if not logs:
-                logger.warning(f"No logs found for provider {provider_enum.value}")
-                return None
+    Raises:
+        ValueError: If limit is not positive or project_name is invalid
+    """
+    stream = stream_recent_logs(
+        limit=limit,
+        project_name=project_name,
+        base_path=base_path,
+        username=username,
+        platform_name=platform_name,
+        provider=provider,
+        parallel=parallel,
+        cursor_store=cursor_store,
+        projection=projection
+    )
+    if stream is None:
+        return None
 
-        if not logs:
+    if stream.is_single_file:
+        try:
+            all_logs = list(stream)
+        except Exception as e:
+            logger.error(f"Error reading log file {stream.log_file}: {e}")
             return None
 
-        return logs, files_read, file_info
+        logger.info(f"Collected {len(all_logs)} log entries from {stream.log_file.name}")
+        return all_logs, stream.files_read, stream.file_info
 
+    try:
+        logs = list(stream)
     except Exception as e:
         logger.error(f"Failed to collect logs: {e}")
         return None
+
+    if not logs:
+        if stream.provider != LogProvider.CLAUDE:
+            logger.warning(f"No logs found for provider {stream.provider.value}")
+        return None
+
+    return logs, stream.files_read, stream.file_info
+
+
+def _open_inotify(path: Path) -> Optional[int]:
+    """
+    Watch a file for writes with Linux inotify.
+
+    Returns:
+        Non-blocking inotify file descriptor, or None where inotify is unavailable
+    """
+    if not sys.platform.startswith('linux'):
+        return None
+
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        mask = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVE_SELF | _IN_DELETE_SELF
+        if libc.inotify_add_watch(fd, os.fsencode(str(path)), mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except (OSError, AttributeError) as e:
+        logger.debug(f"inotify unavailable, polling instead: {e}")
+        return None
+
+
+class LogFollower:
+    """
+    Tail a log file that is still being written and batch new entries.
+
+    Reading resumes from the last complete line, so a line the writer has only
+    half flushed is picked up on the next read. On Linux, waits wake up on
+    inotify write events; elsewhere (or if inotify is unavailable) the file
+    size is polled. A file that shrinks is assumed to have been replaced and is
+    re-read from the start.
+    """
+
+    def __init__(
+        self,
+        log_file: Path,
+        provider: LogProvider = LogProvider.CLAUDE,
+        from_start: bool = False,
+        poll_interval: float = FOLLOW_POLL_INTERVAL,
+        projection: Optional[LogProjectionConfig] = None
+    ):
+        """
+        Args:
+            log_file: JSONL session file to follow
+            provider: Provider that writes the file
+            from_start: Read entries already in the file; by default only
+                entries appended after construction are returned
+            poll_interval: Longest wait between size checks
+            projection: Byte budgets to truncate heavy fields to
+        """
+        self.log_file = Path(log_file)
+        self.provider = provider
+        self.poll_interval = poll_interval
+        self.projection = projection
+
+        try:
+            self.offset = 0 if from_start else self.log_file.stat().st_size
+        except OSError:
+            self.offset = 0
+
+        self.entries_read = 0
+        self.batches_sent = 0
+        self._inotify_fd = _open_inotify(self.log_file)
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self._inotify_fd is not None
+
+    def read_new(self) -> List[Dict[str, Any]]:
+        """
+        Return entries appended since the last read.
+
+        Returns:
+            Normalized (and projected, if configured) entries, oldest first
+        """
+        try:
+            size = self.log_file.stat().st_size
+        except OSError:
+            return []
+
+        if size < self.offset:
+            logger.info(f"{self.log_file.name} shrank from {self.offset} to {size} bytes, re-reading from start")
+            self.offset = 0
+        if size == self.offset:
+            return []
+
+        entries = []
+        reader = _iter_log_file(self.log_file, self.provider, start_offset=self.offset)
+        while True:
+            try:
+                entry = next(reader)
+            except StopIteration as done:
+                self.offset = done.value['end_offset']
+                break
+            if self.projection is not None:
+                project_log_entry(entry, self.provider, self.projection)
+            entries.append(entry)
+
+        self.entries_read += len(entries)
+        return entries
+
+    def wait(self, timeout: float) -> None:
+        """Block until the file may have changed or the timeout elapses."""
+        timeout = max(0.0, min(timeout, self.poll_interval))
+        if self._inotify_fd is None:
+            time.sleep(timeout)
+            return
+
+        readable, _, _ = select.select([self._inotify_fd], [], [], timeout)
+        if readable:
+            try:
+                # Drain queued events; their content does not matter, only that the file changed
+                while os.read(self._inotify_fd, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def batches(
+        self,
+        window_seconds: float = FOLLOW_BATCH_SECONDS,
+        max_bytes: int = FOLLOW_BATCH_BYTES,
+        max_entries: int = FOLLOW_BATCH_ENTRIES,
+        should_stop: Optional[Callable[[], bool]] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield batches of new entries as they are written.
+
+        A batch is emitted once window_seconds have passed since its first
+        entry arrived, or as soon as it reaches max_bytes or max_entries.
+        Entries still pending when should_stop() turns true are flushed as a
+        final batch. The inotify watch is released when the generator finishes.
+
+        Args:
+            window_seconds: Longest time an entry waits before being sent
+            max_bytes: Serialized size at which a batch is sent immediately
+            max_entries: Entry count at which a batch is sent immediately
+            should_stop: Checked between reads; follow forever when None
+
+        Yields:
+            Non-empty lists of entries
+        """
+        pending: List[Dict[str, Any]] = []
+        pending_bytes = 0
+        first_pending_at = 0.0
+
+        try:
+            while should_stop is None or not should_stop():
+                for entry in self.read_new():
+                    if not pending:
+                        first_pending_at = time.monotonic()
+                    pending.append(entry)
+                    pending_bytes += len(json.dumps(entry).encode('utf-8'))
+
+                    if len(pending) >= max_entries or pending_bytes >= max_bytes:
+                        self.batches_sent += 1
+                        yield pending
+                        pending, pending_bytes = [], 0
+
+                if pending:
+                    waited = time.monotonic() - first_pending_at
+                    if waited >= window_seconds:
+                        self.batches_sent += 1
+                        yield pending
+                        pending, pending_bytes = [], 0
+                        continue
+                    self.wait(window_seconds - waited)
+                else:
+                    self.wait(self.poll_interval)
+
+            if pending:
+                self.batches_sent += 1
+                yield pending
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Release the inotify watch, if any."""
+        if self._inotify_fd is not None:
+            os.close(self._inotify_fd)
+            self._inotify_fd = None
@@ -0,0 +1,517 @@
+#!/usr/bin/env python3
+"""
+Apex Daemon
+Keeps an authenticated backend session warm between `zen --apex` runs: a
+token that is refreshed before it expires, the thread cache, and a small pool
+of handshaken WebSocket connections. CLI invocations talk to it over a Unix
+domain socket, so a repeated analysis skips interpreter start-up, the heavy
+agent_cli imports, authentication and the connect/handshake round trips.
+
+Usage:
+    zen apex-daemon start [--env staging] [--connections 2] [--idle-timeout 1800]
+    zen apex-daemon status | stop
+    zen --apex --daemon --message "triage this incident"
+
+Protocol: one newline-delimited JSON request per socket connection. A "run"
+request is answered with one {"event": ..., "text": ...} line per backend
+event and a final {"done": true, ...} line; "status" and "stop" are answered
+with a single line.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add parent directory to path; agent_cli imports its sibling modules flat
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+DEFAULT_CONNECTIONS = 2
+DEFAULT_IDLE_TIMEOUT = 1800.0  # Seconds without requests before the daemon exits
+MAINTENANCE_INTERVAL = 15.0  # Seconds between token refresh / reconnect passes
+START_TIMEOUT = 60.0  # Seconds `start` waits for the daemon to answer (auth may open a browser)
+
+
+def default_socket_path(env: str = "staging") -> Path:
+    """
+    Platform-appropriate socket location, next to the CLI's other local state.
+
+    macOS: ~/Library/Application Support/Netra/CLI/apex-daemon-<env>.sock
+    Linux: $XDG_DATA_HOME/netra/cli/apex-daemon-<env>.sock or ~/.local/share/netra/cli/apex-daemon-<env>.sock
+    """
+    if platform.system() == "Darwin":
+        base = Path.home() / "Library" / "Application Support" / "Netra" / "CLI"
+    else:
+        base = Path(os.environ.get('XDG_DATA_HOME') or Path.home() / ".local" / "share") / "netra" / "cli"
+    return base / f"apex-daemon-{env}.sock"
+
+
+def _event_completes_run(event_type: str, data: Dict[str, Any]) -> bool:
+    """Whether an event ends a run (agent_completed, top level or wrapped in a system_message)."""
+    if event_type == "agent_completed":
+        return True
+    return event_type == "system_message" and data.get('event') == "agent_completed"
+
+
+class ApexDaemon:
+    """
+    Unix socket server holding a warm, authenticated backend session.
+
+    Connections are opened once through a WebSocketConnectionPool and leased to
+    one run at a time. A maintenance pass every MAINTENANCE_INTERVAL seconds
+    refreshes the token (recycling idle connections opened with the old one),
+    replaces connections the backend has closed and exits after idle_timeout
+    seconds without requests.
+    """
+
+    def __init__(self, env: str = "staging", socket_path: Optional[Path] = None,
+                 connections: int = DEFAULT_CONNECTIONS, idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+                 auth_method: str = "auto", backend_url: Optional[str] = None):
+        """
+        Args:
+            env: Backend environment (local, staging, production, development)
+            socket_path: Unix socket to listen on (default: default_socket_path(env))
+            connections: Warm connections to keep open
+            idle_timeout: Seconds without requests before exiting (0 disables)
+            auth_method: Authentication method preference passed to AuthManager
+            backend_url: Custom backend URL for the development environment
+        """
+        self.env = env
+        self.socket_path = Path(socket_path) if socket_path else default_socket_path(env)
+        self.connections = max(1, connections)
+        self.idle_timeout = idle_timeout
+        self.auth_method = auth_method
+        self.backend_url = backend_url
+
+        self.config = None
+        self.debug = None
+        self.auth_manager = None
+        self.token: Optional[str] = None
+        self.pool = None
+        self.idle: List[Any] = []  # Warm clients not leased to a run
+        self._client_tokens: Dict[int, str] = {}  # id(client) -> token it authenticated with
+        self.active_runs = 0
+        self.runs_served = 0
+        self.started_at = time.time()
+        self.last_activity = time.monotonic()
+        self._stopped: Optional[asyncio.Event] = None
+
+    def _client_factory(self):
+        from agent_cli import WebSocketClient
+        return WebSocketClient(self.config, self.token, self.debug)
+
+    async def _refresh_token(self) -> bool:
+        """Get a valid token, re-authenticating if the cached one is about to expire."""
+        use_oauth = self.auth_method == "oauth"
+        token = await self.auth_manager.get_valid_token(use_oauth=use_oauth, auth_method=self.auth_method)
+        if not token:
+            return False
+        if token != self.token:
+            self.token = token
+            if self.auth_manager.token:
+                await self.auth_manager.save_token()
+        return True
+
+    def _is_alive(self, client) -> bool:
+        """A warm client is usable while its receiver task is still reading."""
+        receiver = self.pool._receivers.get(id(client))
+        return bool(client.connected and receiver and not receiver.done())
+
+    async def _add_client(self) -> bool:
+        client = await self.pool._open_client()
+        if client is None:
+            return False
+        self._client_tokens[id(client)] = self.token
+        self.idle.append(client)
+        return True
+
+    async def _discard(self, client) -> None:
+        self._client_tokens.pop(id(client), None)
+        await self.pool._close_client(client)
+
+    async def _maintain(self) -> None:
+        """Refresh the token, drop dead or stale idle connections and top the pool up."""
+        try:
+            await self._refresh_token()
+        except Exception as e:
+            self.debug.log_error(e, "refreshing daemon token")
+
+        for client in list(self.idle):
+            if not self._is_alive(client) or self._client_tokens.get(id(client)) != self.token:
+                self.idle.remove(client)
+                await self._discard(client)
+
+        while len(self.idle) + self.active_runs < self.connections:
+            if not await self._add_client():
+                break
+
+    async def _lease(self):
+        """Take a live warm client, opening one if none is idle."""
+        while self.idle:
+            client = self.idle.pop()
+            if self._is_alive(client):
+                return client
+            await self._discard(client)
+        client = await self.pool._open_client()
+        if client is not None:
+            self._client_tokens[id(client)] = self.token
+        return client
+
+    async def _release(self, client) -> None:
+        if self._is_alive(client) and len(self.idle) < self.connections:
+            self.idle.append(client)
+        else:
+            await self._discard(client)
+
+    def status(self) -> Dict[str, Any]:
+        token_expires = None
+        if self.auth_manager and self.auth_manager.token and self.auth_manager.token.expires_at:
+            token_expires = self.auth_manager.token.expires_at.isoformat()
+        return {
+            "pid": os.getpid(),
+            "env": self.env,
+            "ws_url": self.config.ws_url if self.config else None,
+            "socket": str(self.socket_path),
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "idle_seconds": round(time.monotonic() - self.last_activity, 1),
+            "idle_timeout": self.idle_timeout,
+            "warm_connections": sum(1 for client in self.idle if self._is_alive(client)),
+            "active_runs": self.active_runs,
+            "runs_served": self.runs_served,
+            "token_expires_at": token_expires,
+        }
+
+    async def _run(self, request: Dict[str, Any], writer: asyncio.StreamWriter) -> None:
+        """Send one message on a warm connection and stream its events back."""
+        from agent_cli import ExitCodeGenerator
+
+        async def emit(record: Dict[str, Any]) -> None:
+            writer.write(json.dumps(record, default=str).encode("utf-8") + b"\n")
+            await writer.drain()
+
+        client = await self._lease()
+        if client is None:
+            await emit({"ok": False, "error": "Failed to connect WebSocket"})
+            return
+
+        client.send_logs = request.get("send_logs", True)
+        client.logs_project = request.get("logs_project")
+        client.logs_path = request.get("logs_path")
+        client.logs_user = request.get("logs_user")
+        client.logs_provider = request.get("logs_provider", "claude")
+        client.cleanup_complete = False
+
+        start = len(client.events)
+        run_events = []
+        errors: List[str] = []
+        run_id = None
+        try:
+            run_id = await client.send_message(request["message"])
+            await emit({"run_id": run_id})
+
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + float(request.get("wait", 300))
+            position = start
+            completed = False
+            while not completed:
+                for event in client.events.since(position):
+                    run_events.append(event)
+                    await emit({
+                        "event": {"type": event.type, "data": event.data, "timestamp": event.timestamp.isoformat()},
+                        "text": event.format_for_display()
+                    })
+                    completed = completed or _event_completes_run(event.type, event.data)
+                position = len(client.events)
+                remaining = deadline - loop.time()
+                if completed or client.cleanup_complete or not self._is_alive(client):
+                    break
+                if remaining <= 0:
+                    errors.append(f"Timeout after {request.get('wait', 300)}s")
+                    break
+                await client._wait_for_signal(client._STATE_CHANGED, remaining)
+        except (ConnectionError, OSError) as e:
+            errors.append(f"Connection lost: {e}")
+        except Exception as e:
+            self.debug.log_error(e, "daemon run")
+            errors.append(str(e))
+        finally:
+            await self._release(client)
+
+        exit_code = ExitCodeGenerator(run_events, errors).determine_exit_code()
+        await emit({"done": True, "run_id": run_id, "events": len(run_events), "errors": errors,
+                    "exit_code": exit_code})
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.last_activity = time.monotonic()
+        try:
+            line = await reader.readline()
+            try:
+                request = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                request = {}
+            op = request.get("op")
+
+            if op == "status":
+                writer.write(json.dumps({"ok": True, "status": self.status()}).encode("utf-8") + b"\n")
+            elif op == "stop":
+                writer.write(b'{"ok": true}\n')
+                self._stopped.set()
+            elif op == "run" and request.get("message"):
+                self.active_runs += 1
+                try:
+                    await self._run(request, writer)
+                finally:
+                    self.active_runs -= 1
+                self.runs_served += 1
+            else:
+                writer.write(json.dumps({"ok": False, "error": f"Unknown request: {op!r}"}).encode("utf-8") + b"\n")
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            # The CLI went away mid-run; the connection goes back to the pool regardless
+            pass
+        finally:
+            self.last_activity = time.monotonic()
+            writer.close()
+
+    async def _maintenance_loop(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                await asyncio.wait_for(self._stopped.wait(), timeout=MAINTENANCE_INTERVAL)
+                return
+            except asyncio.TimeoutError:
+                pass
+            idle_for = time.monotonic() - self.last_activity
+            if self.idle_timeout and self.active_runs == 0 and idle_for >= self.idle_timeout:
+                print(f"Idle for {idle_for:.0f}s, shutting down")
+                self._stopped.set()
+                return
+            await self._maintain()
+
+    async def serve(self) -> int:
+        """Authenticate, open the warm pool and serve requests until stopped or idle."""
+        from agent_cli import AuthManager, Config, DebugManager, DebugLevel, Environment, WebSocketConnectionPool
+
+        self._stopped = asyncio.Event()
+        # JSON mode keeps the client's console output out of the daemon log
+        self.config = Config(environment=Environment(self.env), custom_backend_url=self.backend_url, json_mode=True)
+        self.debug = DebugManager(debug_level=DebugLevel.SILENT)
+
+        async with AuthManager(self.config) as auth_manager:
+            self.auth_manager = auth_manager
+            if not await self._refresh_token():
+                print("Authentication failed", file=sys.stderr)
+                return 2
+
+            self.pool = WebSocketConnectionPool(self._client_factory, self.connections, self.debug)
+            if await self.pool.open() == 0:
+                print(f"Could not connect to {self.config.ws_url}", file=sys.stderr)
+                return 2
+            self.idle = list(self.pool.clients)
+            self.pool.clients = []
+            for client in self.idle:
+                self._client_tokens[id(client)] = self.token
+
+            self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+            if self.socket_path.exists():
+                self.socket_path.unlink()
+            server = await asyncio.start_unix_server(self._handle, path=str(self.socket_path))
+            os.chmod(self.socket_path, 0o600)
+            print(f"apex daemon ready on {self.socket_path} ({len(self.idle)} warm connection(s) to {self.config.ws_url})",
+                  flush=True)
+
+            maintenance = asyncio.create_task(self._maintenance_loop())
+            try:
+                await self._stopped.wait()
+            finally:
+                maintenance.cancel()
+                server.close()
+                await server.wait_closed()
+                for client in self.idle:
+                    await self._discard(client)
+                self.idle = []
+                if self.socket_path.exists():
+                    self.socket_path.unlink()
+        return 0
+
+
+def request(socket_path: Path, payload: Dict[str, Any], timeout: Optional[float] = 5.0):
+    """
+    Send one request to the daemon and yield its response lines as dicts.
+
+    Raises:
+        OSError: If the daemon is not listening on socket_path
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(socket_path))
+        sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as stream:
+            for line in stream:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def run_via_daemon(argv: List[str]) -> Optional[int]:
+    """
+    Run a `zen --apex --message ...` invocation through a running daemon.
+
+    Returns:
+        The run's exit code, or None when the daemon cannot serve it (not
+        running, or options it does not support) and the full CLI should run
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--message", "-m")
+    parser.add_argument("--env", default="staging")
+    parser.add_argument("--wait", "-w", type=int, default=300)
+    parser.add_argument("--send-logs", "--logs", dest="send_logs", action="store_true", default=True)
+    parser.add_argument("--no-send-logs", "--no-logs", dest="send_logs", action="store_false")
+    parser.add_argument("--logs-project")
+    parser.add_argument("--logs-path")
+    parser.add_argument("--logs-user")
+    parser.add_argument("--logs-provider", default="claude")
+    parser.add_argument("--json", action="store_true")
+    args, unsupported = parser.parse_known_args(argv)
+
+    if not args.message or unsupported or not hasattr(socket, "AF_UNIX"):
+        return None
+    socket_path = default_socket_path(args.env)
+    if not socket_path.exists():
+        return None
+
+    payload = {
+        "op": "run",
+        "message": args.message,
+        "wait": args.wait,
+        "send_logs": args.send_logs,
+        "logs_project": args.logs_project,
+        "logs_path": os.path.expanduser(args.logs_path) if args.logs_path else None,
+        "logs_user": args.logs_user,
+        "logs_provider": args.logs_provider,
+    }
+    exit_code = None
+    try:
+        for record in request(socket_path, payload, timeout=None):
+            if args.json:
+                print(json.dumps(record))
+            elif "text" in record:
+                print(record["text"], flush=True)
+            elif "run_id" in record and "done" not in record:
+                print(f"SUCCESS: Message sent with run_id: {record['run_id']}")
+            elif record.get("done"):
+                for error in record.get("errors", []):
+                    print(f"ERROR: {error}", file=sys.stderr)
+                print(f"\n📊 Received {record.get('events', 0)} events")
+            elif record.get("ok") is False:
+                print(f"ERROR: {record.get('error')}", file=sys.stderr)
+                return 2
+            if record.get("done"):
+                exit_code = record.get("exit_code", 1)
+    except OSError:
+        if exit_code is None:
+            # Stale socket from a daemon that died; let the full CLI handle this run
+            return None
+    return exit_code if exit_code is not None else 2
+
+
+def _start(args) -> int:
+    socket_path = Path(args.socket) if args.socket else default_socket_path(args.env)
+    try:
+        status = next(request(socket_path, {"op": "status"}))
+        print(f"apex daemon already running (pid {status['status']['pid']}) on {socket_path}")
+        return 0
+    except (OSError, StopIteration):
+        pass
+
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    log_path = socket_path.with_suffix(".log")
+    command = [sys.executable, str(Path(__file__).resolve()), "serve", "--env", args.env,
+               "--socket", str(socket_path), "--connections", str(args.connections),
+               "--idle-timeout", str(args.idle_timeout), "--auth-method", args.auth_method]
+    if args.backend_url:
+        command += ["--backend-url", args.backend_url]
+    with open(log_path, "ab") as log:
+        process = subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+                                   start_new_session=True)
+
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            print(f"apex daemon exited with code {process.returncode}; see {log_path}", file=sys.stderr)
+            return 1
+        try:
+            next(request(socket_path, {"op": "status"}))
+            print(f"apex daemon started (pid {process.pid}) on {socket_path}")
+            return 0
+        except (OSError, StopIteration):
+            time.sleep(0.2)
+    print(f"apex daemon did not become ready within {START_TIMEOUT:.0f}s; see {log_path}", file=sys.stderr)
+    return 1
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="zen apex-daemon",
+                                     description="Keep an authenticated apex backend session warm for zen --apex --daemon")
+    parser.add_argument("--env", choices=["local", "staging", "production", "development"], default="staging",
+                        help="Environment to connect to (default: staging)")
+    parser.add_argument("--socket", metavar="PATH", help="Unix socket path (default: next to the thread cache)")
+    subparsers = parser.add_subparsers(dest="action", required=True)
+
+    for name, help_text in (("start", "Start the daemon in the background"),
+                            ("serve", "Run the daemon in the foreground")):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("--env", dest="sub_env", choices=["local", "staging", "production", "development"])
+        sub.add_argument("--socket", dest="sub_socket", metavar="PATH")
+        sub.add_argument("--connections", type=int, default=DEFAULT_CONNECTIONS,
+                         help=f"Warm WebSocket connections to keep open (default: {DEFAULT_CONNECTIONS})")
+        sub.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT,
+                         help=f"Exit after this many seconds without requests, 0 to never (default: {DEFAULT_IDLE_TIMEOUT:.0f})")
+        sub.add_argument("--auth-method", choices=["auto", "e2e", "oauth"], default="auto",
+                         help="Authentication method preference (default: auto)")
+        sub.add_argument("--backend-url", help="Custom backend URL for --env development")
+    subparsers.add_parser("status", help="Show the running daemon's state")
+    subparsers.add_parser("stop", help="Stop the running daemon")
+
+    args = parser.parse_args(argv)
+    args.env = getattr(args, "sub_env", None) or args.env
+    args.socket = getattr(args, "sub_socket", None) or args.socket
+
+    if not hasattr(socket, "AF_UNIX"):
+        print("zen apex-daemon needs Unix domain sockets, which this platform does not provide", file=sys.stderr)
+        return 1
+
+    if args.action == "start":
+        return _start(args)
+    if args.action == "serve":
+        daemon = ApexDaemon(env=args.env, socket_path=args.socket, connections=args.connections,
+                            idle_timeout=args.idle_timeout, auth_method=args.auth_method,
+                            backend_url=args.backend_url)
+        from agent_cli import run_async
+
+        try:
+            return run_async(daemon.serve())
+        except KeyboardInterrupt:
+            return 0
+
+    socket_path = Path(args.socket) if args.socket else default_socket_path(args.env)
+    try:
+        response = next(request(socket_path, {"op": args.action}))
+    except (OSError, StopIteration):
+        print(f"No apex daemon running on {socket_path}")
+        return 1
+    if args.action == "status":
+        print(json.dumps(response["status"], indent=2))
+    else:
+        print("apex daemon stopping")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+agent_cli benchmark against the local mock backend
+
+Starts scripts/mock_backend.py in-process and drives the real WebSocketClient
+against it, so results reflect client-side cost plus the injected backend
+behaviour, not network or service variance:
+
+- connect latency: connect, auth and handshake of a fresh client
+- time to first event: send_message until the run's first event arrives
+- chunk upload throughput: MB of log entries per second through a chunked
+  upload over the connection pool (pool open included)
+- events/s: rate at which a long agent event stream is sent for and received
+
+Results can be saved as a baseline and compared against on later runs.
+
+Usage:
+    python scripts/benchmark_agent_cli.py --iterations 5 --save-baseline
+    zen --apex --benchmark
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import string
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+# Add parent and scripts directories to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from mock_backend import MockBackend, MockBackendConfig
+
+# Relative change against the baseline, in the worse direction, reported as a regression
+REGRESSION_TOLERANCE = 0.20
+
+BENCHMARK_TOKEN = "mock-benchmark-token"
+
+
+@dataclass
+class BenchmarkResult:
+    """Samples of one benchmark metric."""
+    name: str
+    unit: str
+    higher_is_better: bool
+    noise_floor: float = 0.0  # Absolute change in unit never reported as a regression
+    samples: List[float] = field(default_factory=list)
+
+    @property
+    def mean(self) -> float:
+        return statistics.fmean(self.samples) if self.samples else 0.0
+
+    @property
+    def p95(self) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "unit": self.unit,
+            "higher_is_better": self.higher_is_better,
+            "mean": round(self.mean, 3),
+            "p95": round(self.p95, 3),
+            "samples": len(self.samples),
+        }
+
+    def change_from(self, baseline: Dict[str, Any]) -> Optional[float]:
+        """Relative change of the mean against a baseline entry (positive is better)."""
+        base = baseline.get("mean")
+        if not base:
+            return None
+        change = (self.mean - base) / base
+        return change if self.higher_is_better else -change
+
+
+def default_baseline_path() -> Path:
+    """
+    Platform-appropriate location of the saved baseline, next to the CLI's
+    other local state.
+    """
+    system = platform.system()
+    if system == "Windows":
+        base = Path(os.environ.get('LOCALAPPDATA') or Path.home() / "AppData" / "Local") / "Netra" / "CLI"
+    elif system == "Darwin":
+        base = Path.home() / "Library" / "Application Support" / "Netra" / "CLI"
+    else:
+        base = Path(os.environ.get('XDG_DATA_HOME') or Path.home() / ".local" / "share") / "netra" / "cli"
+    return base / "benchmark_baseline.json"
+
+
+def load_baseline(path: Union[str, Path]) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def save_baseline(results: Dict[str, BenchmarkResult], path: Union[str, Path], backend_config: MockBackendConfig) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "last_updated": datetime.now().isoformat(),
+        "backend": asdict(backend_config),
+        "baselines": {name: result.to_dict() for name, result in results.items()},
+    }
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def regressions(results: Dict[str, BenchmarkResult], baseline: Optional[Dict[str, Any]]) -> List[str]:
+    """Names of metrics worse than the baseline by more than REGRESSION_TOLERANCE."""
+    if not baseline:
+        return []
+    regressed = []
+    for name, result in results.items():
+        base = baseline.get("baselines", {}).get(name, {})
+        change = result.change_from(base)
+        if change is not None and change < -REGRESSION_TOLERANCE and abs(result.mean - base["mean"]) > result.noise_floor:
+            regressed.append(name)
+    return regressed
+
+
+def synthetic_logs(entries: int, entry_bytes: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Claude-style log entries of roughly entry_bytes each, with text that compresses like prose."""
+    rng = random.Random(seed)
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9))) for _ in range(2000)]
+    logs = []
+    for index in range(entries):
+        text = " ".join(rng.choices(words, k=max(1, (entry_bytes - 200) // 6)))
+        role = "assistant" if index % 2 else "user"
+        logs.append({
+            "type": role,
+            "uuid": f"bench-{index}",
+            "timestamp": f"2025-01-01T00:{index // 60 % 60:02d}:{index % 60:02d}Z",
+            "message": {"role": role, "content": text},
+        })
+    return logs
+
+
+async def run_benchmarks(
+    iterations: int = 5,
+    backend_config: Optional[MockBackendConfig] = None,
+    stream_events: int = 500,
+    chunk_entries: int = 1000,
+    entry_bytes: int = 2048,
+    chunk_connections: int = 4
+) -> Dict[str, BenchmarkResult]:
+    """
+    Run every benchmark against a fresh mock backend.
+
+    Args:
+        iterations: Samples per metric
+        backend_config: Mock backend behaviour (latency, throughput, failures)
+        stream_events: agent_thinking events in the events/s stream
+        chunk_entries: Log entries in the chunked upload (over 250 forces chunking)
+        entry_bytes: Approximate size of each log entry
+        chunk_connections: Connections in the chunk upload pool
+
+    Returns:
+        Results keyed by metric name
+    """
+    from agent_cli import Config, DebugLevel, DebugManager, Environment, WebSocketClient
+    from chunking_analyzer import ChunkingAnalyzer
+
+    backend_config = backend_config or MockBackendConfig()
+    results = {
+        "connect_latency": BenchmarkResult("connect_latency", "ms", higher_is_better=False, noise_floor=5.0),
+        "time_to_first_event": BenchmarkResult("time_to_first_event", "ms", higher_is_better=False, noise_floor=5.0),
+        "chunk_throughput": BenchmarkResult("chunk_throughput", "MB/s", higher_is_better=True),
+        "events_per_second": BenchmarkResult("events_per_second", "events/s", higher_is_better=True),
+    }
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        async with MockBackend(backend_config) as backend:
+            config = Config(environment=Environment.DEVELOPMENT, custom_backend_url=backend.backend_url,
+                            json_mode=True, ci_mode=True)
+            debug = DebugManager(debug_level=DebugLevel.SILENT)
+
+            def new_client(**kwargs) -> "WebSocketClient":
+                client = WebSocketClient(config, BENCHMARK_TOKEN, debug, **kwargs)
+                # Keep the mock's thread ids and auth method out of the user's cache
+                client.thread_cache_file = Path(cache_dir) / "thread_cache.json"
+                return client
+
+            async def send_and_wait(client, message: str):
+                """Send a message; return (send time, first event time, completion time, events)."""
+                start_index = len(client.events)
+                started = time.perf_counter()
+                await client.send_message(message)
+                first = await client._wait_for_event("agent_started", timeout=30.0, start_index=start_index)
+                first_at = time.perf_counter()
+                completed = await client._wait_for_event("agent_completed", timeout=300.0, start_index=start_index)
+                if first is None or completed is None:
+                    raise TimeoutError("mock backend did not complete the run")
+                return started, first_at, time.perf_counter(), len(client.events) - start_index
+
+            for _ in range(iterations):
+                client = new_client()
+                started = time.perf_counter()
+                connected = await client.connect()
+                elapsed = time.perf_counter() - started
+                await client.close()
+                if connected:
+                    results["connect_latency"].samples.append(elapsed * 1000)
+
+            client = new_client()
+            if not await client.connect():
+                raise ConnectionError(f"Could not connect to mock backend at {backend.ws_url}")
+            try:
+                for _ in range(iterations):
+                    started, first_at, _, _ = await send_and_wait(client, "benchmark ttfe")
+                    results["time_to_first_event"].samples.append((first_at - started) * 1000)
+
+                thinking_events = backend.config.thinking_events
+                backend.config.thinking_events = stream_events
+                try:
+                    for _ in range(iterations):
+                        started, _, completed_at, count = await send_and_wait(client, "benchmark stream")
+                        results["events_per_second"].samples.append(count / (completed_at - started))
+                finally:
+                    backend.config.thinking_events = thinking_events
+            finally:
+                await client.close()
+
+            logs = synthetic_logs(chunk_entries, entry_bytes)
+            logs_mb = len(json.dumps(logs).encode("utf-8")) / (1024 * 1024)
+            file_info = [{"name": "benchmark.jsonl", "entries": len(logs)}]
+            strategy = ChunkingAnalyzer().analyze_files(logs, file_info)
+            for _ in range(iterations):
+                client = new_client(chunk_cache=False, chunk_connections=chunk_connections, chunk_retries=0)
+                if not await client.connect():
+                    continue
+                try:
+                    started = time.perf_counter()
+                    delivered = await client._send_chunked_logs(
+                        logs=logs, file_info=file_info, chunking_strategy=strategy,
+                        message="benchmark chunks", thread_id=client.current_thread_id
+                    )
+                    elapsed = time.perf_counter() - started
+                finally:
+                    await client.close()
+                if delivered:
+                    results["chunk_throughput"].samples.append(logs_mb / elapsed)
+
+    return results
+
+
+def format_results(results: Dict[str, BenchmarkResult], baseline: Optional[Dict[str, Any]]) -> List[List[str]]:
+    """Rows of metric, mean, p95, baseline mean and change for display."""
+    rows = []
+    baselines = (baseline or {}).get("baselines", {})
+    for name, result in results.items():
+        base = baselines.get(name, {})
+        change = result.change_from(base)
+        rows.append([
+            name.replace("_", " "),
+            f"{result.mean:.2f} {result.unit}",
+            f"{result.p95:.2f} {result.unit}",
+            f"{base['mean']:.2f} {result.unit}" if base.get("mean") else "-",
+            f"{change * 100:+.1f}%" if change is not None else "-",
+        ])
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark agent_cli against the local mock backend")
+    parser.add_argument("--iterations", type=int, default=5, help="Samples per metric (default: 5)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mock backend reply latency in seconds")
+    parser.add_argument("--throughput", type=float, help="Mock backend inbound bytes/second")
+    parser.add_argument("--baseline", type=Path, default=None,
+                        help=f"Baseline file (default: {default_baseline_path()})")
+    parser.add_argument("--save-baseline", action="store_true", help="Save these results as the new baseline")
+    args = parser.parse_args(argv)
+
+    backend_config = MockBackendConfig(latency=args.latency, throughput=args.throughput)
+    baseline_path = args.baseline or default_baseline_path()
+    baseline = load_baseline(baseline_path)
+    from agent_cli import run_async
+
+    results = run_async(run_benchmarks(args.iterations, backend_config))
+
+    print("=" * 90)
+    print(f"agent_cli benchmark against mock backend, {args.iterations} iterations")
+    print("=" * 90)
+    print(f"  {'metric':<22}{'mean':>20}{'p95':>20}{'baseline':>20}{'change':>8}")
+    for row in format_results(results, baseline):
+        print(f"  {row[0]:<22}{row[1]:>20}{row[2]:>20}{row[3]:>20}{row[4]:>8}")
+
+    regressed = regressions(results, baseline)
+    if regressed:
+        print(f"\nRegressed by more than {REGRESSION_TOLERANCE:.0%}: {', '.join(regressed)}")
+    if args.save_baseline:
+        save_baseline(results, baseline_path, backend_config)
+        print(f"\nBaseline saved to {baseline_path}")
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for agent log parsing
+
+Generates a synthetic Claude-style JSONL session of the requested size and
+times the log collection path used by zen --apex --send-logs against the
+previous two-pass approach (hash read followed by a separate text-mode parse)
+and against process pool parsing of newline-aligned shards.
+
+Usage:
+    python scripts/benchmark_log_parsing.py --size-mb 50 --runs 3
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.agent_logs import LogProvider, LogStream, _collect_jsonl_files, _parse_provider_log
+
+
+def generate_session(path: Path, size_mb: float) -> int:
+    """
+    Write a synthetic JSONL session of roughly size_mb megabytes.
+
+    Args:
+        path: Output file path
+        size_mb: Target file size in megabytes
+
+    Returns:
+        Number of lines written
+    """
+    target_bytes = int(size_mb * 1024 * 1024)
+    written = 0
+    lines = 0
+
+    with open(path, 'w', encoding='utf-8') as f:
+        while written < target_bytes:
+            if lines % 3 == 2:
+                entry = {
+                    "type": "user",
+                    "uuid": f"uuid-{lines}",
+                    "message": {"content": [{
+                        "type": "tool_result",
+                        "tool_use_id": f"toolu_{lines}",
+                        "content": "def handler(event):\n    return process(event)\n" * 40
+                    }]}
+                }
+            else:
+                entry = {
+                    "type": "assistant",
+                    "uuid": f"uuid-{lines}",
+                    "message": {
+                        "id": f"msg_{lines}",
+                        "content": [{"type": "text", "text": "Reviewing the handler module. " * 10}],
+                        "usage": {"input_tokens": 12, "output_tokens": 340}
+                    }
+                }
+            line = json.dumps(entry) + "\n"
+            f.write(line)
+            written += len(line.encode('utf-8'))
+            lines += 1
+
+    return lines
+
+
+def two_pass_collect(log_file: Path) -> int:
+    """Reference implementation of the previous hash-then-parse approach."""
+    hasher = hashlib.sha256()
+    with open(log_file, 'rb') as f:
+        for chunk in iter(lambda: f.read(4096), b''):
+            hasher.update(chunk)
+    hasher.hexdigest()
+
+    entries = []
+    with open(log_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.extend(_parse_provider_log(json.loads(line), LogProvider.CLAUDE, log_file))
+            except json.JSONDecodeError:
+                continue
+    return len(entries)
+
+
+def single_pass_collect(log_file: Path) -> int:
+    """Current collection path."""
+    logs, _, _ = _collect_jsonl_files(log_file.parent, limit=1)
+    return len(logs)
+
+
+def parallel_collect(log_file: Path) -> int:
+    """Process pool path, sharding the file across workers."""
+    return sum(1 for _ in LogStream(log_file=log_file, parallel=True))
+
+
+def time_runs(func, log_file: Path, runs: int) -> float:
+    """Return the best wall-clock time over the given number of runs."""
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(log_file)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark agent log parsing throughput")
+    parser.add_argument("--size-mb", type=float, default=50.0, help="Synthetic session size in MB (default: 50)")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per implementation, best time is reported (default: 3)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file = Path(tmp) / "session.jsonl"
+        line_count = generate_session(log_file, args.size_mb)
+        size_mb = log_file.stat().st_size / (1024 * 1024)
+
+        print("=" * 60)
+        print(f"Log parsing benchmark: {size_mb:.1f} MB, {line_count:,} lines, best of {args.runs}")
+        print("=" * 60)
+
+        results = [
+            ("two-pass (legacy)", time_runs(two_pass_collect, log_file, args.runs)),
+            ("single-pass", time_runs(single_pass_collect, log_file, args.runs)),
+            (f"parallel ({os.cpu_count() or 1} cpus)", time_runs(parallel_collect, log_file, args.runs)),
+        ]
+
+        for label, seconds in results:
+            print(f"  {label:<20} {seconds:8.3f}s  {size_mb / seconds:8.1f} MB/s")
+
+        for label, seconds in results[1:]:
+            print(f"  {label} speedup: {results[0][1] / seconds:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
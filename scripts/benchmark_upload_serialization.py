@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark for log upload preparation
+
+Collects a synthetic Claude-style JSONL session once and times what happens
+between collection and the WebSocket send: chunking analysis (size and file
+hash), chunk splitting and building each chunk's message. The current path
+reuses the JSON bytes carried by collected entries; the legacy path re-encodes
+entries at every step as the previous implementation did.
+
+Usage:
+    python scripts/benchmark_upload_serialization.py --size-mb 50 --runs 3
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent and scripts directories to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from scripts.benchmark_log_parsing import generate_session
+from agent_logs import LogStream
+from chunking_analyzer import ChunkingAnalyzer
+from chunk_creator import ChunkCreator
+from agent_cli import WebSocketClient
+
+
+def _message(entries):
+    return {"type": "user_message", "payload": {"content": "Analyze these logs", "jsonl_logs": entries}}
+
+
+def legacy_prepare(logs, file_name: str) -> int:
+    """Reference implementation that serializes entries at every step."""
+    len(json.dumps(logs).encode('utf-8'))
+    hashlib.sha256((file_name + json.dumps(logs, sort_keys=True)).encode('utf-8')).hexdigest()
+
+    max_size_bytes = int(ChunkCreator.MAX_CHUNK_SIZE_MB * 1024 * 1024)
+    chunks, current, current_size = [], [], 0
+    for entry in logs:
+        entry_size = len(json.dumps(entry).encode('utf-8'))
+        if current and (current_size + entry_size > max_size_bytes or len(current) >= ChunkCreator.MAX_ENTRIES_PER_CHUNK):
+            chunks.append(current)
+            current, current_size = [], 0
+        current.append(entry)
+        current_size += entry_size
+    if current:
+        chunks.append(current)
+
+    return sum(len(json.dumps(_message(chunk))) for chunk in chunks)
+
+
+def current_prepare(logs, file_name: str) -> int:
+    """Current path: size, hash, split and splice from the entries' JSON bytes."""
+    analysis = ChunkingAnalyzer().analyze_files(logs, [{'name': file_name, 'entries': len(logs)}]).file_analyses[0]
+    chunks = ChunkCreator().create_chunks(logs, file_name, analysis.file_hash)
+    return sum(WebSocketClient._encode_payload(_message(chunk.entries)).size for chunk in chunks)
+
+
+def time_runs(func, logs, file_name: str, runs: int) -> float:
+    """Return the best wall-clock time over the given number of runs."""
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(logs, file_name)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark log upload serialization")
+    parser.add_argument("--size-mb", type=float, default=50.0, help="Synthetic session size in MB (default: 50)")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per implementation, best time is reported (default: 3)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file = Path(tmp) / "session.jsonl"
+        line_count = generate_session(log_file, args.size_mb)
+        size_mb = log_file.stat().st_size / (1024 * 1024)
+        logs = list(LogStream(log_file=log_file))
+
+    print("=" * 60)
+    print(f"Upload serialization benchmark: {size_mb:.1f} MB, {line_count:,} lines, best of {args.runs}")
+    print("=" * 60)
+
+    results = [
+        ("re-encode (legacy)", time_runs(legacy_prepare, logs, log_file.name, args.runs)),
+        ("raw line bytes", time_runs(current_prepare, logs, log_file.name, args.runs)),
+    ]
+
+    for label, seconds in results:
+        print(f"  {label:<20} {seconds:8.3f}s  {size_mb / seconds:8.1f} MB/s")
+
+    print(f"  speedup: {results[0][1] / results[1][1]:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,34 @@
 """
 Chunk Creator - Splits log files into chunks.
 
-Implements intelligent chunking that respects both:
+Implements intelligent chunking that respects:
 1. Size limits (max 2.5 MB per chunk)
 2. Entry limits (max 250 entries per chunk)
+3. Estimated token limits (max 1M tokens per chunk)
 
-Ensures no entry is split across chunks.
+Entries are grouped into conversational turns and whole turns are packed into
+chunks, so a tool call and its result are analyzed together. Entries are never
+split across chunks, except a single entry larger than the size limit, which is
+segmented into fragments (see split_oversized_entry).
 """
 
 from dataclasses import dataclass
-from typing import List, Dict, Any, Tuple, Optional
-import json
+from typing import List, Dict, Any, Tuple, Optional, Union
 import hashlib
+import json
+import logging
+
+from agent_logs import entry_json_bytes
+
+logger = logging.getLogger(__name__)
+
+# Room left in each fragment for its _fragment metadata and identity fields
+FRAGMENT_OVERHEAD_BYTES = 4096
+
+# Fields copied onto continuation fragments so they can be attributed without reassembly
+FRAGMENT_IDENTITY_KEYS = ('type', 'uuid', 'parentUuid', 'sessionId', 'timestamp', '_provider', '_source_file')
+
+Path = List[Union[str, int]]
 
 
 @dataclass
@@ -30,6 +47,20 @@ class ChunkMetadata:
     is_multi_file: bool  # Part of multi-file analysis
     file_index: Optional[int]  # Index if multi-file (0-based)
     aggregation_required: bool  # True if backend should aggregate
+    part_index: Optional[int] = None  # Fragment index if the chunk holds part of a split entry
+    part_count: Optional[int] = None  # Number of fragments the entry was split into
+    original_hash: Optional[str] = None  # Hash of the split entry's full JSON
+
+
+@dataclass
+class ChunkBoundaryStats:
+    """Boundary quality of the chunks a ChunkCreator has produced"""
+    chunks: int = 0
+    turns: int = 0
+    turns_split: int = 0  # Chunk boundaries that fall inside a turn
+    tool_pairs: int = 0  # tool_use/tool_result pairs seen
+    tool_pairs_split: int = 0  # Pairs whose result landed in a different chunk than the call
+    max_chunk_tokens: int = 0  # Largest estimated token count of a chunk
 
 
 @dataclass
@@ -37,28 +68,286 @@ class Chunk:
     """A chunk of log entries with metadata"""
     entries: List[Dict[str, Any]]  # Log entries in this chunk
     metadata: ChunkMetadata
+    blobs: Optional[Dict[str, str]] = None  # Blob table for deduplicated entries, if any
+
+
+def _string_leaves(node: Any, path: Path) -> List[Tuple[Path, str]]:
+    """All string values in a JSON structure with their key/index paths."""
+    if isinstance(node, str):
+        return [(path, node)]
+    if isinstance(node, dict):
+        return [leaf for key, value in node.items() for leaf in _string_leaves(value, path + [key])]
+    if isinstance(node, list):
+        return [leaf for index, value in enumerate(node) for leaf in _string_leaves(value, path + [index])]
+    return []
+
+
+def _set_path(node: Any, path: Path, value: Any) -> None:
+    """Replace the value at a key/index path."""
+    for step in path[:-1]:
+        node = node[step]
+    node[path[-1]] = value
+
+
+def _json_slice_end(value: str, start: int, capacity: int) -> int:
+    """End of the longest slice from start whose JSON encoding fits in capacity bytes."""
+    end = min(len(value), start + capacity)
+    while end > start:
+        size = len(json.dumps(value[start:end])) - 2
+        if size <= capacity:
+            return end
+        # Escapes make the encoding longer than the slice; shrink proportionally
+        end = min(end - 1, start + (end - start) * capacity // size)
+    return start
+
+
+# Shared result for entries without tool calls, so grouping allocates nothing for them
+_NO_LINKS: Tuple[Tuple[str, ...], Tuple[str, ...]] = ((), ())
+
+
+def _tool_links(entry: Dict[str, Any]) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Tool call IDs an entry opens and closes.
+
+    Covers Claude content blocks (tool_use.id / tool_result.tool_use_id) and
+    Codex response items (function_call / function_call_output call_id).
+
+    Returns:
+        Tuple of (tool call IDs started, tool call IDs answered)
+    """
+    uses: Tuple[str, ...] = ()
+    results: Tuple[str, ...] = ()
+
+    message = entry.get('message')
+    content = message.get('content') if isinstance(message, dict) else None
+    if isinstance(content, list):
+        for block in content:
+            if not isinstance(block, dict):
+                continue
+            block_type = block.get('type')
+            if block_type == 'tool_use' and block.get('id'):
+                uses += (block['id'],)
+            elif block_type == 'tool_result' and block.get('tool_use_id'):
+                results += (block['tool_use_id'],)
+
+    payload = entry.get('payload')
+    if isinstance(payload, dict) and payload.get('call_id'):
+        if payload.get('type') in ('function_call', 'custom_tool_call'):
+            uses += (payload['call_id'],)
+        elif payload.get('type') in ('function_call_output', 'custom_tool_call_output'):
+            results += (payload['call_id'],)
+
+    return (uses, results) if uses or results else _NO_LINKS
+
+
+def _starts_turn(entry: Dict[str, Any], results: Tuple[str, ...]) -> bool:
+    """True if an entry is a user prompt rather than a tool result or model output."""
+    if entry.get('type') == 'user':
+        return not results
+    payload = entry.get('payload')
+    return isinstance(payload, dict) and payload.get('type') == 'message' and payload.get('role') == 'user'
+
+
+def group_turns(entries: List[Dict[str, Any]]) -> Tuple[List[Tuple[int, int]], List[Tuple[Tuple[str, ...], Tuple[str, ...]]]]:
+    """
+    Group consecutive entries into conversational turns.
+
+    A user prompt opens a new turn. Every other entry joins the current turn,
+    and when it links back to an earlier turn (its parentUuid, or the tool call
+    a tool_result answers) all turns since then are merged into one, so linked
+    entries always share a turn. Each merge removes turn starts permanently,
+    so grouping is linear in the number of entries.
+
+    Args:
+        entries: Log entries in file order
+
+    Returns:
+        Tuple of (list of (start, end) entry index ranges, tool links per entry)
+    """
+    turn_starts: List[int] = []
+    index_of_uuid: Dict[str, int] = {}
+    index_of_tool: Dict[str, int] = {}
+    links = []
+
+    for index, entry in enumerate(entries):
+        uses, results = tool_links = _tool_links(entry) if isinstance(entry, dict) else _NO_LINKS
+        links.append(tool_links)
+
+        if not isinstance(entry, dict):
+            linked = []
+        else:
+            linked = [index_of_tool[tool_id] for tool_id in results if tool_id in index_of_tool]
+            if not linked and _starts_turn(entry, results):
+                turn_starts.append(index)
+            elif entry.get('parentUuid') in index_of_uuid:
+                linked.append(index_of_uuid[entry['parentUuid']])
+
+        if not turn_starts:
+            turn_starts.append(index)
+        if linked:
+            # Merge every turn opened after the earliest linked entry
+            earliest = min(linked)
+            while turn_starts[-1] > earliest:
+                turn_starts.pop()
+
+        if isinstance(entry, dict) and isinstance(entry.get('uuid'), str):
+            index_of_uuid[entry['uuid']] = index
+        for tool_id in uses:
+            index_of_tool[tool_id] = index
+
+    ends = turn_starts[1:] + [len(entries)]
+    return list(zip(turn_starts, ends)), links
+
+
+def split_oversized_entry(entry: Dict[str, Any], max_bytes: int) -> List[Dict[str, Any]]:
+    """
+    Segment an entry larger than max_bytes into fragments that each fit.
+
+    The largest string fields are cut out of the entry. The first fragment is
+    the entry itself with those fields holding their leading segment, so a
+    reader unaware of fragments still sees a truncated but valid entry. The
+    remaining text follows in continuation fragments that carry the entry's
+    identity fields and ``_fragment.segments`` ({"path", "data"} pairs). Every
+    fragment has ``_fragment`` with part_index, part_count and original_hash
+    (SHA-256 of the full entry JSON, first 16 chars); see reassemble_entry().
+
+    Args:
+        entry: Log entry whose JSON exceeds max_bytes
+        max_bytes: Size limit for each fragment's JSON
+
+    Returns:
+        List of fragment entries, or [entry] if its non-string content alone
+        exceeds the limit and it cannot be split
+    """
+    original = entry_json_bytes(entry)
+    original_hash = hashlib.sha256(original).hexdigest()[:16]
+    budget = max_bytes - FRAGMENT_OVERHEAD_BYTES
+
+    # Cut the largest strings out until the rest of the entry takes at most half the budget
+    skeleton = json.loads(original)
+    skeleton_size = len(json.dumps(skeleton))
+    leaves = sorted(
+        ((path, value, len(json.dumps(value)) - 2) for path, value in _string_leaves(skeleton, [])),
+        key=lambda leaf: leaf[2],
+        reverse=True
+    )
+    extracted = []
+    for path, value, size in leaves:
+        if skeleton_size <= budget // 2:
+            break
+        _set_path(skeleton, path, "")
+        skeleton_size -= size
+        extracted.append((path, value))
+
+    if skeleton_size > budget:
+        logger.warning(
+            f"Entry {original_hash} is {len(original):,} bytes without its strings; "
+            f"sending it unsplit over the {max_bytes:,} byte limit"
+        )
+        return [entry]
+
+    identity = {key: entry[key] for key in FRAGMENT_IDENTITY_KEYS if key in entry}
+    identity_size = len(json.dumps(identity))
+    fragments = [skeleton]
+    segments: List[Dict[str, Any]] = []
+    capacity = budget - skeleton_size
+
+    for path, value in extracted:
+        start = 0
+        while start < len(value):
+            segment_overhead = 0 if len(fragments) == 1 else len(json.dumps({"path": path, "data": ""})) + 2
+            end = _json_slice_end(value, start, capacity - segment_overhead)
+            if end == start:
+                if len(fragments) > 1 and not segments:
+                    logger.warning(f"Entry {original_hash} cannot be split under {max_bytes:,} bytes; sending it unsplit")
+                    return [entry]
+                # Current fragment is full; open a continuation fragment
+                segments = []
+                fragments.append({**identity, "_fragment": {"segments": segments}})
+                capacity = budget - identity_size
+                continue
+
+            piece = value[start:end]
+            if len(fragments) == 1:
+                # The first fragment holds a prefix of the field
+                _set_path(skeleton, path, value[:end])
+                capacity -= len(json.dumps(piece)) - 2
+            else:
+                segments.append({"path": path, "data": piece})
+                capacity -= len(json.dumps(segments[-1])) + 2
+            start = end
+
+    part_count = len(fragments)
+    skeleton["_fragment"] = {}
+    for part_index, fragment in enumerate(fragments):
+        fragment["_fragment"].update({
+            "part_index": part_index,
+            "part_count": part_count,
+            "original_hash": original_hash
+        })
+    return fragments
+
+
+def reassemble_entry(fragments: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Rebuild an entry from the fragments produced by split_oversized_entry().
+
+    Args:
+        fragments: All fragments of one entry, in any order
+
+    Returns:
+        The original entry
+    """
+    ordered = sorted(fragments, key=lambda fragment: fragment["_fragment"]["part_index"])
+    entry = json.loads(json.dumps(ordered[0]))
+    del entry["_fragment"]
+
+    for fragment in ordered[1:]:
+        for segment in fragment["_fragment"]["segments"]:
+            node = entry
+            for step in segment["path"][:-1]:
+                node = node[step]
+            node[segment["path"][-1]] += segment["data"]
+    return entry
 
 
 class ChunkCreator:
     """
-    Creates chunks from log entries respecting size and entry limits.
+    Creates chunks from log entries respecting size, entry and token limits.
 
     Algorithm:
-    1. Iterate through entries
-    2. Add entry to current chunk
-    3. Check if adding next entry would exceed limits
-    4. If yes: close current chunk, start new chunk
-    5. If no: continue adding
-    6. Repeat until all entries processed
+    1. Group entries into conversational turns (group_turns)
+    2. Add whole turns to the current chunk while all limits hold
+    3. If the next turn does not fit: close current chunk, start a new one
+    4. A turn too large for any chunk is split between entries, preferring
+       points where no tool call is waiting for its result
+    5. Repeat until all entries processed
+
+    Boundary quality is accumulated in ``stats`` across create_chunks() calls.
     """
 
     # Configuration
     MAX_CHUNK_SIZE_MB = 2.5
     MAX_ENTRIES_PER_CHUNK = 250
+    MAX_TOKENS_PER_CHUNK = 1_000_000
+    BYTES_PER_TOKEN = 4  # Rough estimate for log JSON
 
-    def __init__(self):
-        """Initialize chunk creator"""
-        pass
+    def __init__(self, compression_ratio: float = 1.0, max_tokens: Optional[int] = None):
+        """
+        Initialize chunk creator
+
+        Args:
+            compression_ratio: Expected plain JSON size divided by encoded size
+                when chunks are compressed for transport. The size limit applies
+                to encoded bytes, so each chunk may hold this many times more
+                plain JSON.
+            max_tokens: Estimated token budget per chunk (default:
+                MAX_TOKENS_PER_CHUNK). This bounds the content of compressed
+                chunks, whose byte limit grows with compression_ratio.
+        """
+        self.compression_ratio = max(compression_ratio, 1.0)
+        self.max_tokens = max_tokens or self.MAX_TOKENS_PER_CHUNK
+        self.stats = ChunkBoundaryStats()
 
     def create_chunks(
         self,
@@ -82,80 +371,108 @@ class ChunkCreator:
             List of Chunk objects
 
         Algorithm:
-        - Uses two-pass approach:
-          1. Try to chunk by entry count
-          2. Validate each chunk doesn't exceed size
-          3. If any chunk exceeds size, split it further
+        - Whole turns are packed greedily; entry sizes and token estimates
+          are prefix-summed, so every limit check is constant time and the
+          whole pass is linear in the number of entries
+        - An entry larger than the size limit is segmented with
+          split_oversized_entry() and each fragment gets its own chunk,
+          with part_index/part_count/original_hash in its metadata
         """
 
         if not entries:
             return []
 
-        chunks = []
-        current_chunk_entries = []
-        current_chunk_size = 0
-
-        max_size_bytes = int(self.MAX_CHUNK_SIZE_MB * 1024 * 1024)
+        max_size_bytes = int(self.MAX_CHUNK_SIZE_MB * 1024 * 1024 * self.compression_ratio)
+        turns, links = group_turns(entries)
 
+        # Prefix sums of entry sizes and estimated tokens
+        size_prefix = [0]
+        token_prefix = [0]
         for entry in entries:
-            # Calculate size of this entry
-            entry_json = json.dumps(entry)
-            entry_size = len(entry_json.encode('utf-8'))
-
-            # Check if this single entry exceeds max size
-            if entry_size > max_size_bytes:
-                # CRITICAL: Single entry larger than chunk size limit
-                # This happens with large tool results, file contents, etc.
-                # We cannot split a single JSON object, so we create a warning chunk
-
-                # Save current chunk first if it has entries
-                if current_chunk_entries:
-                    chunks.append((current_chunk_entries, current_chunk_size))
-                    current_chunk_entries = []
-                    current_chunk_size = 0
-
-                # Create oversized single-entry chunk with warning
-                # The backend will need to handle this specially
-                chunks.append(([entry], entry_size))
-
-                # Warning will be logged when chunk is sent
+            entry_size = len(entry_json_bytes(entry))
+            size_prefix.append(size_prefix[-1] + entry_size)
+            token_prefix.append(token_prefix[-1] + -(-entry_size // self.BYTES_PER_TOKEN))
+
+        def fits(start: int, end: int) -> bool:
+            return (
+                end - start <= self.MAX_ENTRIES_PER_CHUNK
+                and size_prefix[end] - size_prefix[start] <= max_size_bytes
+                and token_prefix[end] - token_prefix[start] <= self.max_tokens
+            )
+
+        # Chunks as (start, end, fragment): entries[start:end], or a fragment of entries[start]
+        ranges: List[Tuple[int, int, Optional[Dict[str, Any]]]] = []
+        current_start = current_end = 0
+
+        for turn_start, turn_end in turns:
+            if current_end > current_start and fits(current_start, turn_end):
+                current_end = turn_end
                 continue
 
-            # Check if adding this entry would exceed limits
-            would_exceed_count = len(current_chunk_entries) >= self.MAX_ENTRIES_PER_CHUNK
-            would_exceed_size = (current_chunk_size + entry_size) > max_size_bytes
+            # Save current chunk
+            if current_end > current_start:
+                ranges.append((current_start, current_end, None))
 
-            if would_exceed_count or would_exceed_size:
-                # Save current chunk
-                if current_chunk_entries:
-                    chunks.append((current_chunk_entries, current_chunk_size))
+            current_start = current_end = turn_start
+            if fits(turn_start, turn_end):
+                current_end = turn_end
+                continue
 
-                # Start new chunk with this entry
-                current_chunk_entries = [entry]
-                current_chunk_size = entry_size
-            else:
-                # Add to current chunk
-                current_chunk_entries.append(entry)
-                current_chunk_size += entry_size
+            # Turn larger than one chunk: split it between entries
+            open_tools = set()
+            safe_end = None
+            for entry_index in range(turn_start, turn_end):
+                uses, results = links[entry_index]
+
+                if size_prefix[entry_index + 1] - size_prefix[entry_index] > max_size_bytes:
+                    # Single entry larger than chunk size limit (large tool results,
+                    # file contents, etc.): segment it into fragments, one per chunk
+                    if current_end > current_start:
+                        ranges.append((current_start, current_end, None))
+
+                    # Fragments are sized on plain JSON so they fit even if compression does not help
+                    fragments = split_oversized_entry(entries[entry_index], int(self.MAX_CHUNK_SIZE_MB * 1024 * 1024))
+                    for fragment in fragments:
+                        ranges.append((entry_index, entry_index + 1, fragment))
+
+                    current_start = current_end = entry_index + 1
+                    safe_end = None
+                else:
+                    while current_end > current_start and not fits(current_start, entry_index + 1):
+                        # Prefer the last point where every tool call had its result
+                        cut = safe_end if safe_end is not None and safe_end > current_start else current_end
+                        ranges.append((current_start, cut, None))
+                        current_start = cut
+                        safe_end = None
+                    current_end = entry_index + 1
+
+                open_tools.update(uses)
+                open_tools.difference_update(results)
+                if not open_tools:
+                    safe_end = current_end
 
         # Save last chunk
-        if current_chunk_entries:
-            chunks.append((current_chunk_entries, current_chunk_size))
+        if current_end > current_start:
+            ranges.append((current_start, current_end, None))
+
+        self._record_stats(ranges, turns, links, token_prefix)
 
         # Generate unique chunk_id for this file
         session_chunk_id = self._generate_chunk_id(file_hash, file_name)
 
         # Create Chunk objects with metadata
-        total_chunks = len(chunks)
+        total_chunks = len(ranges)
         chunk_objects = []
 
-        # Track entry indices across chunks
-        entry_offset = 0
-
-        for idx, (chunk_entries, chunk_size) in enumerate(chunks):
-            num_entries = len(chunk_entries)
-            start_entry_index = entry_offset
-            end_entry_index = entry_offset + num_entries - 1
+        for idx, (start_entry_index, end, fragment) in enumerate(ranges):
+            # Entry indices refer to the original file; all fragments of an entry share its index
+            if fragment is not None:
+                chunk_entries = [fragment]
+                chunk_size = len(entry_json_bytes(fragment))
+            else:
+                chunk_entries = entries[start_entry_index:end]
+                chunk_size = size_prefix[end] - size_prefix[start_entry_index]
+            fragment_info = fragment.get('_fragment') if fragment is not None and fragment is not entries[start_entry_index] else None
 
             metadata = ChunkMetadata(
                 chunk_id=session_chunk_id,
@@ -163,23 +480,58 @@ class ChunkCreator:
                 total_chunks=total_chunks,
                 file_hash=file_hash,
                 file_name=file_name,
-                entries_in_chunk=num_entries,
+                entries_in_chunk=len(chunk_entries),
                 chunk_size_bytes=chunk_size,
                 chunk_size_mb=chunk_size / (1024 * 1024),
                 start_entry_index=start_entry_index,
-                end_entry_index=end_entry_index,
+                end_entry_index=start_entry_index + len(chunk_entries) - 1,
                 is_multi_file=is_multi_file,
                 file_index=file_index,
-                aggregation_required=True  # Backend should aggregate
+                aggregation_required=True,  # Backend should aggregate
+                part_index=fragment_info['part_index'] if fragment_info else None,
+                part_count=fragment_info['part_count'] if fragment_info else None,
+                original_hash=fragment_info['original_hash'] if fragment_info else None
             )
 
             chunk_objects.append(Chunk(entries=chunk_entries, metadata=metadata))
 
-            # Update offset for next chunk
-            entry_offset += num_entries
-
         return chunk_objects
 
+    def _record_stats(
+        self,
+        ranges: List[Tuple[int, int, Optional[Dict[str, Any]]]],
+        turns: List[Tuple[int, int]],
+        links: List[Tuple[Tuple[str, ...], Tuple[str, ...]]],
+        token_prefix: List[int]
+    ) -> None:
+        """Add the boundary quality of one file's chunks to self.stats."""
+        turn_of = [0] * len(links)
+        for turn_index, (start, end) in enumerate(turns):
+            turn_of[start:end] = [turn_index] * (end - start)
+
+        chunk_of = [0] * len(links)
+        for chunk_index, (start, end, fragment) in enumerate(ranges):
+            chunk_of[start:end] = [chunk_index] * (end - start)
+            if fragment is None:
+                self.stats.max_chunk_tokens = max(self.stats.max_chunk_tokens, token_prefix[end] - token_prefix[start])
+
+        self.stats.chunks += len(ranges)
+        self.stats.turns += len(turns)
+        self.stats.turns_split += sum(
+            1 for previous, following in zip(ranges, ranges[1:])
+            if turn_of[previous[1] - 1] == turn_of[following[0]]
+        )
+
+        chunk_of_tool: Dict[str, int] = {}
+        for entry_index, (uses, results) in enumerate(links):
+            for tool_id in uses:
+                chunk_of_tool[tool_id] = chunk_of[entry_index]
+            for tool_id in results:
+                if tool_id in chunk_of_tool:
+                    self.stats.tool_pairs += 1
+                    if chunk_of_tool[tool_id] != chunk_of[entry_index]:
+                        self.stats.tool_pairs_split += 1
+
     def _generate_chunk_id(self, file_hash: str, file_name: str) -> str:
         """
         Generate unique chunk_id for a file's chunks.
@@ -0,0 +1,180 @@
+"""
+Chunk Result Cache - Reuses backend results for chunks already analyzed.
+
+Each chunk's agent_completed data is stored on disk under a content key: a
+SHA-256 of the backend URL, the user message and the chunk's log entries.
+Re-running on the same or an overlapping session answers unchanged chunks
+locally, and only new or changed chunks are uploaded.
+
+Entries expire after a TTL, and the cache is kept under a byte budget by
+evicting the least recently used entries (file mtime is refreshed on every hit).
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import logging
+import os
+import time
+
+from agent_logs import entry_json_bytes
+
+logger = logging.getLogger(__name__)
+
+
+class ChunkResultCache:
+    """
+    On-disk cache of chunk results keyed by chunk content.
+
+    One JSON file per result, written atomically, so concurrent chunk tasks and
+    concurrent zen processes never see a partial entry.
+    """
+
+    DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        """
+        Args:
+            cache_dir: Directory holding the cached results
+            ttl_seconds: Age after which a stored result is ignored and removed
+            max_bytes: Total size of stored results before LRU eviction
+        """
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_for(entries: List[Dict[str, Any]], message: str, scope: str = "") -> str:
+        """
+        Content key of a chunk.
+
+        Args:
+            entries: The chunk's log entries (before deduplication or encoding)
+            message: User message sent with the chunk
+            scope: Backend identifier, so results from different environments never mix
+
+        Returns:
+            Hex SHA-256 key
+        """
+        hasher = hashlib.sha256()
+        for part in (scope, message):
+            encoded = part.encode('utf-8')
+            hasher.update(len(encoded).to_bytes(8, 'big'))
+            hasher.update(encoded)
+        for entry in entries:
+            hasher.update(entry_json_bytes(entry))
+            hasher.update(b'\n')
+        return hasher.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the stored agent_completed data for a key, or None.
+
+        Args:
+            key: Key from key_for()
+
+        Returns:
+            Event data dict, or None on a miss or expired entry
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                record = json.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable chunk cache entry {path.name}: {e}")
+            self.misses += 1
+            return None
+
+        if time.time() - record.get('created_at', 0) > self.ttl_seconds:
+            self._remove(path)
+            self.misses += 1
+            return None
+
+        try:
+            # Mark as recently used for LRU eviction
+            os.utime(path)
+        except OSError:
+            pass
+
+        self.hits += 1
+        return record.get('data')
+
+    def put(self, key: str, data: Dict[str, Any]) -> None:
+        """
+        Store agent_completed data for a key and evict old entries if over budget.
+
+        Args:
+            key: Key from key_for()
+            data: Event data to store
+        """
+        path = self._path(key)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'created_at': time.time(), 'data': data}, f, default=str)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not save chunk result to cache: {e}")
+            return
+
+        self.evict()
+
+    def evict(self) -> int:
+        """
+        Remove expired entries, then least recently used ones until under max_bytes.
+
+        Returns:
+            Number of entries removed
+        """
+        try:
+            entries = []
+            for path in self.cache_dir.glob("*.json"):
+                stat_result = path.stat()
+                entries.append((stat_result.st_mtime, stat_result.st_size, path))
+        except OSError as e:
+            logger.debug(f"Could not scan chunk cache {self.cache_dir}: {e}")
+            return 0
+
+        removed = 0
+        now = time.time()
+        total = 0
+        live = []
+        for mtime, size, path in entries:
+            # mtime is at least the creation time, so this only drops certainly expired entries
+            if now - mtime > self.ttl_seconds:
+                removed += self._remove(path)
+            else:
+                live.append((mtime, size, path))
+                total += size
+
+        for mtime, size, path in sorted(live):
+            if total <= self.max_bytes:
+                break
+            removed += self._remove(path)
+            total -= size
+
+        return removed
+
+    @staticmethod
+    def _remove(path: Path) -> int:
+        try:
+            path.unlink()
+            return 1
+        except OSError:
+            return 0
@@ -13,10 +13,11 @@ Implements three main scenarios:
 """
 
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
-import json
+from typing import List, Dict, Any, Callable, Optional
 import hashlib
 
+from agent_logs import entry_json_bytes
+
 
 @dataclass
 class FileAnalysis:
@@ -29,6 +30,7 @@ class FileAnalysis:
     file_hash: str  # SHA256 first 16 chars
     needs_chunking: bool
     reason: str  # Why chunking is/isn't needed
+    wire_size_bytes: Optional[int] = None  # Size after payload encoding, if encoded
 
 
 @dataclass
@@ -51,6 +53,10 @@ class ChunkingAnalyzer:
     - ENTRY_THRESHOLD: 250 entries (LLM performance limit)
     - CHUNK_SIZE_MB: 2.5 MB (target chunk size)
     - CHUNK_ENTRY_COUNT: 250 (target entries per chunk)
+
+    Size thresholds apply to the bytes actually sent. When logs are compressed
+    for transport (jsonl_logs_encoding), pass wire_size to measure each file
+    after encoding instead of as plain JSON.
     """
 
     # Configuration constants
@@ -59,9 +65,15 @@ class ChunkingAnalyzer:
     CHUNK_SIZE_MB = 2.5
     CHUNK_ENTRY_COUNT = 250
 
-    def __init__(self):
-        """Initialize analyzer"""
-        pass
+    def __init__(self, wire_size: Optional[Callable[[bytes], int]] = None):
+        """
+        Initialize analyzer
+
+        Args:
+            wire_size: Maps serialized JSON bytes to their encoded size on the
+                wire; None means logs are sent as plain JSON
+        """
+        self.wire_size = wire_size
 
     def analyze_files(
         self,
@@ -108,31 +120,35 @@ class ChunkingAnalyzer:
             file_entries = logs[entry_offset:entry_offset + file_entries_count]
             entry_offset += file_entries_count
 
-            # Calculate file size (serialize to JSON to get accurate size)
-            file_json = json.dumps(file_entries)
-            file_size_bytes = len(file_json.encode('utf-8'))
+            # Calculate file size from the JSON bytes that will be sent
+            file_bytes = b'[' + b', '.join(entry_json_bytes(entry) for entry in file_entries) + b']'
+            file_size_bytes = len(file_bytes)
             file_size_mb = file_size_bytes / (1024 * 1024)
 
+            # Thresholds are evaluated on what is actually transmitted
+            wire_size_bytes = self.wire_size(file_bytes) if self.wire_size else None
+            limit_size_mb = wire_size_bytes / (1024 * 1024) if wire_size_bytes is not None else file_size_mb
+
             # Generate file hash
-            file_hash = self._generate_file_hash(file_entries, file_meta['name'])
+            file_hash = self._generate_file_hash(file_bytes, file_meta['name'])
 
             # Determine if chunking needed
             needs_chunking = (
-                file_size_mb > self.SIZE_THRESHOLD_MB or
+                limit_size_mb > self.SIZE_THRESHOLD_MB or
                 file_entries_count > self.ENTRY_THRESHOLD
             )
 
             # Reason for decision
             if needs_chunking:
                 reasons = []
-                if file_size_mb > self.SIZE_THRESHOLD_MB:
-                    reasons.append(f"size {file_size_mb:.2f} MB > {self.SIZE_THRESHOLD_MB} MB")
+                if limit_size_mb > self.SIZE_THRESHOLD_MB:
+                    reasons.append(f"size {limit_size_mb:.2f} MB > {self.SIZE_THRESHOLD_MB} MB")
                 if file_entries_count > self.ENTRY_THRESHOLD:
                     reasons.append(f"entries {file_entries_count} > {self.ENTRY_THRESHOLD}")
                 reason = "Chunking required: " + ", ".join(reasons)
                 files_needing_chunking += 1
             else:
-                reason = f"No chunking needed (size: {file_size_mb:.2f} MB, entries: {file_entries_count})"
+                reason = f"No chunking needed (size: {limit_size_mb:.2f} MB, entries: {file_entries_count})"
 
             analysis = FileAnalysis(
                 file_name=file_meta['name'],
@@ -142,7 +158,8 @@ class ChunkingAnalyzer:
                 entry_count=file_entries_count,
                 file_hash=file_hash,
                 needs_chunking=needs_chunking,
-                reason=reason
+                reason=reason,
+                wire_size_bytes=wire_size_bytes
             )
 
             file_analyses.append(analysis)
@@ -171,20 +188,19 @@ class ChunkingAnalyzer:
             file_analyses=file_analyses
         )
 
-    def _generate_file_hash(self, entries: List[Dict], filename: str) -> str:
+    def _generate_file_hash(self, file_bytes: bytes, filename: str) -> str:
         """
         Generate deterministic hash for file.
 
         Args:
-            entries: List of log entries
+            file_bytes: JSON bytes of the file's log entries
             filename: Name of the file
 
         Returns:
             First 16 characters of SHA256 hash
         """
-        # Create deterministic string from entries + filename
-        hash_input = filename + json.dumps(entries, sort_keys=True)
-        hash_bytes = hashlib.sha256(hash_input.encode('utf-8')).hexdigest()
+        # Entry bytes come from the log lines, so they are stable for the same file content
+        hash_bytes = hashlib.sha256(filename.encode('utf-8') + file_bytes).hexdigest()
         return hash_bytes[:16]  # First 16 chars sufficient for uniqueness
 
 
@@ -0,0 +1,607 @@
+#!/usr/bin/env python3
+"""
+Local Log Index
+Ingests AI CLI logs (Claude, Codex, Gemini) into a local SQLite database with
+FTS5 full-text search and structured columns, so cost and tool-usage questions
+can be answered without re-scanning JSONL files.
+
+Usage:
+    zen logs index [--provider claude] [--path DIR]
+    zen logs query --top-cost --since 7d
+    zen logs query --tool Bash --search pytest
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sqlite3
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.agent_logs import (
+    LogProvider,
+    _get_log_file_patterns,
+    _get_provider_paths,
+    _iter_log_file,
+    _prefix_fingerprint,
+    _resolve_projects_root,
+    _scan_log_files,
+)
+from token_transparency.claude_pricing_engine import ClaudePricingEngine, TokenUsageData
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Searchable text kept per entry; longer tool output is cut at this many characters
+INDEX_TEXT_CHARS = 64 * 1024
+
+# Upper bound on files considered per provider root in one indexing run
+INDEX_MAX_FILES = 100_000
+
+# Keys whose string values are identifiers or binary payloads, not searchable text
+SKIP_TEXT_KEYS = frozenset({
+    'uuid', 'parentUuid', 'id', 'tool_use_id', 'requestId', 'sessionId', 'session_id',
+    'signature', 'data', 'cwd', 'version', 'gitBranch', 'timestamp', '_provider', '_source_file',
+    'type', 'role', 'model', 'stop_reason', 'userType', 'media_type',
+})
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    provider TEXT NOT NULL,
+    inode INTEGER,
+    size INTEGER,
+    mtime REAL,
+    offset INTEGER NOT NULL DEFAULT 0,
+    fingerprint TEXT,
+    indexed_at REAL
+);
+
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id),
+    provider TEXT NOT NULL,
+    project TEXT,
+    session_id TEXT,
+    timestamp TEXT,
+    entry_type TEXT,
+    model TEXT,
+    message_id TEXT,
+    input_tokens INTEGER,
+    output_tokens INTEGER,
+    cache_read_tokens INTEGER,
+    cache_creation_tokens INTEGER,
+    cost_usd REAL,
+    text TEXT
+);
+
+CREATE TABLE IF NOT EXISTS tool_calls (
+    entry_id INTEGER NOT NULL REFERENCES entries(id),
+    tool_name TEXT NOT NULL,
+    tool_use_id TEXT,
+    input TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_entries_file ON entries(file_id);
+CREATE INDEX IF NOT EXISTS idx_entries_timestamp ON entries(timestamp);
+CREATE INDEX IF NOT EXISTS idx_entries_session ON entries(session_id);
+CREATE INDEX IF NOT EXISTS idx_entries_message ON entries(message_id);
+CREATE INDEX IF NOT EXISTS idx_tool_calls_name ON tool_calls(tool_name);
+CREATE INDEX IF NOT EXISTS idx_tool_calls_entry ON tool_calls(entry_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+    text, content='entries', content_rowid='id'
+);
+
+-- Streamed Claude responses repeat one message's usage on every content
+-- block line; a turn is one API message with its final (largest) usage
+CREATE VIEW IF NOT EXISTS turns AS
+SELECT
+    COALESCE(message_id, 'entry-' || id) AS turn_id,
+    MIN(id) AS first_entry_id,
+    provider, project, session_id, model,
+    MIN(timestamp) AS timestamp,
+    MAX(input_tokens) AS input_tokens,
+    MAX(output_tokens) AS output_tokens,
+    MAX(cache_read_tokens) AS cache_read_tokens,
+    MAX(cache_creation_tokens) AS cache_creation_tokens,
+    MAX(cost_usd) AS cost_usd
+FROM entries
+WHERE cost_usd IS NOT NULL
+GROUP BY turn_id;
+"""
+
+
+def default_index_path() -> Path:
+    """
+    Platform-appropriate location of the index database, next to the CLI's
+    other local state.
+
+    Windows: %LOCALAPPDATA%/Netra/CLI/log_index.db
+    macOS: ~/Library/Application Support/Netra/CLI/log_index.db
+    Linux: $XDG_DATA_HOME/netra/cli/log_index.db or ~/.local/share/netra/cli/log_index.db
+    """
+    system = platform.system()
+    if system == "Windows":
+        base = Path(os.environ.get('LOCALAPPDATA') or Path.home() / "AppData" / "Local") / "Netra" / "CLI"
+    elif system == "Darwin":
+        base = Path.home() / "Library" / "Application Support" / "Netra" / "CLI"
+    else:
+        base = Path(os.environ.get('XDG_DATA_HOME') or Path.home() / ".local" / "share") / "netra" / "cli"
+    return base / "log_index.db"
+
+
+def parse_since(value: str, now: Optional[datetime] = None) -> str:
+    """
+    Convert a --since value to an ISO-8601 UTC timestamp for comparison.
+
+    Args:
+        value: Relative age such as "30m", "24h", "7d", "2w", or an ISO date/datetime
+        now: Reference time (default: current UTC time)
+
+    Returns:
+        Timestamp string comparable with log entry timestamps
+
+    Raises:
+        ValueError: If the value cannot be parsed
+    """
+    now = now or datetime.now(timezone.utc)
+    units = {'m': 'minutes', 'h': 'hours', 'd': 'days', 'w': 'weeks'}
+    value = value.strip()
+
+    if value[:-1].isdigit() and value[-1:] in units:
+        cutoff = now - timedelta(**{units[value[-1]]: int(value[:-1])})
+    else:
+        cutoff = datetime.fromisoformat(value)
+        if cutoff.tzinfo is None:
+            cutoff = cutoff.replace(tzinfo=timezone.utc)
+
+    return cutoff.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def _collect_text(value: Any, parts: List[str], budget: List[int]) -> None:
+    """Append searchable strings from a nested value until the character budget is spent."""
+    if budget[0] <= 0:
+        return
+
+    if isinstance(value, str):
+        text = value[:budget[0]]
+        parts.append(text)
+        budget[0] -= len(text)
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            if key not in SKIP_TEXT_KEYS:
+                _collect_text(item, parts, budget)
+    elif isinstance(value, list):
+        for item in value:
+            _collect_text(item, parts, budget)
+
+
+def _entry_text(entry: Dict[str, Any]) -> str:
+    """Searchable text of a normalized entry: prompts, responses, tool inputs and output."""
+    parts: List[str] = []
+    _collect_text(entry, parts, [INDEX_TEXT_CHARS])
+    return "\n".join(part for part in parts if part)
+
+
+def _entry_tool_calls(entry: Dict[str, Any]) -> List[Tuple[str, Optional[str], str]]:
+    """
+    Extract tool invocations from a normalized entry.
+
+    Returns:
+        List of (tool name, tool use id, JSON-encoded input)
+    """
+    calls = []
+
+    content = (entry.get('message') or {}).get('content') if isinstance(entry.get('message'), dict) else None
+    if isinstance(content, list):
+        # Claude: tool_use blocks in assistant messages
+        for block in content:
+            if isinstance(block, dict) and block.get('type') == 'tool_use' and block.get('name'):
+                calls.append((block['name'], block.get('id'), json.dumps(block.get('input', {}))))
+
+    payload = entry.get('payload')
+    if isinstance(payload, dict) and payload.get('type') in ('function_call', 'custom_tool_call') and payload.get('name'):
+        # Codex: function calls in response items
+        arguments = payload.get('arguments', payload.get('input', ''))
+        calls.append((payload['name'], payload.get('call_id'), arguments if isinstance(arguments, str) else json.dumps(arguments)))
+
+    return calls
+
+
+@dataclass
+class IndexStats:
+    """Counters for one indexing run."""
+    files_seen: int = 0
+    files_updated: int = 0
+    files_reset: int = 0
+    entries_added: int = 0
+    seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+    def summary(self) -> str:
+        return (
+            f"{self.entries_added} entries added from {self.files_updated}/{self.files_seen} changed files "
+            f"({self.files_reset} re-indexed from start) in {self.seconds:.2f}s"
+        )
+
+
+class LogIndex:
+    """
+    SQLite-backed index of normalized log entries.
+
+    JSONL files are indexed incrementally: each file's byte offset, inode and a
+    fingerprint of the indexed prefix are stored, so later runs only parse
+    appended lines. Rotated, truncated or rewritten files (and whole-file JSON
+    logs that changed) are dropped and indexed again. Each file is committed in
+    its own transaction.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Args:
+            path: Database file (default: default_index_path())
+        """
+        self.path = Path(path) if path else default_index_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.pricing = ClaudePricingEngine()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "LogIndex":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    # Indexing
+
+    def index_paths(self, roots: List[Path], provider: LogProvider, patterns: Optional[List[str]] = None) -> IndexStats:
+        """
+        Index every matching log file under the given roots.
+
+        Args:
+            roots: Directories to search, or individual log files
+            provider: Provider that wrote the logs
+            patterns: Glob patterns relative to each root (default: provider patterns)
+
+        Returns:
+            IndexStats for the run
+        """
+        stats = IndexStats()
+        start = time.perf_counter()
+
+        for root in roots:
+            if root.is_file():
+                log_files = [root]
+            elif root.is_dir():
+                log_files = _scan_log_files(root, patterns or _get_log_file_patterns(provider), INDEX_MAX_FILES)
+            else:
+                logger.debug(f"Index root does not exist: {root}")
+                continue
+
+            for log_file in log_files:
+                stats.files_seen += 1
+                try:
+                    self.index_file(log_file, provider, stats)
+                except (OSError, sqlite3.Error) as e:
+                    self.conn.rollback()
+                    stats.errors.append(f"{log_file}: {e}")
+                    logger.warning(f"Could not index {log_file}: {e}")
+
+        stats.seconds = time.perf_counter() - start
+        return stats
+
+    def index_file(self, log_file: Path, provider: LogProvider, stats: Optional[IndexStats] = None) -> int:
+        """
+        Index entries added to one file since the last run.
+
+        Args:
+            log_file: Log file to index
+            provider: Provider that wrote it
+            stats: Run counters to update
+
+        Returns:
+            Number of entries added
+        """
+        stats = stats if stats is not None else IndexStats()
+        stat_result = log_file.stat()
+        key = str(log_file.resolve())
+        row = self.conn.execute("SELECT * FROM files WHERE path = ?", (key,)).fetchone()
+
+        if row is not None and row['size'] == stat_result.st_size and row['mtime'] == stat_result.st_mtime \
+                and row['inode'] == stat_result.st_ino:
+            return 0
+
+        offset = self._resume_offset(row, log_file, stat_result)
+        is_jsonl = log_file.suffix == '.jsonl'
+
+        with self.conn:
+            if row is None:
+                file_id = self.conn.execute(
+                    "INSERT INTO files (path, provider) VALUES (?, ?)", (key, provider.value)
+                ).lastrowid
+            else:
+                file_id = row['id']
+                if offset == 0:
+                    self._delete_file_entries(file_id)
+                    stats.files_reset += 1
+
+            reader = _iter_log_file(log_file, provider, start_offset=offset if is_jsonl else None)
+            added = 0
+            while True:
+                try:
+                    entry = next(reader)
+                except StopIteration as done:
+                    info = done.value
+                    break
+                self._insert_entry(file_id, provider, log_file, entry)
+                added += 1
+
+            end_offset = info.get('end_offset', stat_result.st_size) if is_jsonl else stat_result.st_size
+            self.conn.execute(
+                "UPDATE files SET inode = ?, size = ?, mtime = ?, offset = ?, fingerprint = ?, indexed_at = ? "
+                "WHERE id = ?",
+                (stat_result.st_ino, stat_result.st_size, stat_result.st_mtime, end_offset,
+                 _prefix_fingerprint(log_file, end_offset) if is_jsonl else None, time.time(), file_id)
+            )
+
+        stats.files_updated += 1
+        stats.entries_added += added
+        return added
+
+    def _resume_offset(self, row: Optional[sqlite3.Row], log_file: Path, stat_result: os.stat_result) -> int:
+        """Offset to continue a JSONL file from, or 0 to index it again from the start."""
+        if row is None or log_file.suffix != '.jsonl':
+            return 0
+        if row['inode'] != stat_result.st_ino or stat_result.st_size < row['offset']:
+            return 0
+        try:
+            if _prefix_fingerprint(log_file, row['offset']) != row['fingerprint']:
+                return 0
+        except OSError:
+            return 0
+        return row['offset']
+
+    def _delete_file_entries(self, file_id: int) -> None:
+        for entry_id, text in self.conn.execute("SELECT id, text FROM entries WHERE file_id = ?", (file_id,)).fetchall():
+            # External-content FTS rows are removed by replaying the indexed text
+            self.conn.execute(
+                "INSERT INTO entries_fts (entries_fts, rowid, text) VALUES ('delete', ?, ?)", (entry_id, text)
+            )
+        self.conn.execute("DELETE FROM tool_calls WHERE entry_id IN (SELECT id FROM entries WHERE file_id = ?)", (file_id,))
+        self.conn.execute("DELETE FROM entries WHERE file_id = ?", (file_id,))
+
+    def _insert_entry(self, file_id: int, provider: LogProvider, log_file: Path, entry: Dict[str, Any]) -> None:
+        message = entry.get('message') if isinstance(entry.get('message'), dict) else {}
+        usage = message.get('usage') if isinstance(message.get('usage'), dict) else None
+
+        model = message.get('model') or entry.get('model')
+        tokens = (None, None, None, None)
+        cost = None
+        if usage:
+            tokens = (
+                usage.get('input_tokens', 0),
+                usage.get('output_tokens', 0),
+                usage.get('cache_read_input_tokens', 0),
+                usage.get('cache_creation_input_tokens', 0),
+            )
+            if provider == LogProvider.CLAUDE:
+                usage_data = TokenUsageData(
+                    input_tokens=tokens[0],
+                    output_tokens=tokens[1],
+                    cache_read_tokens=tokens[2],
+                    cache_creation_tokens=tokens[3],
+                    model=self.pricing.detect_model_from_response(message)
+                )
+                cost = self.pricing.calculate_cost(usage_data).total_cost
+
+        text = _entry_text(entry)
+        entry_id = self.conn.execute(
+            "INSERT INTO entries (file_id, provider, project, session_id, timestamp, entry_type, model, message_id, "
+            "input_tokens, output_tokens, cache_read_tokens, cache_creation_tokens, cost_usd, text) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                file_id, provider.value, log_file.parent.name,
+                entry.get('sessionId') or entry.get('session_id') or log_file.stem,
+                entry.get('timestamp'), entry.get('type') or entry.get('role'), model,
+                message.get('id'), *tokens, cost, text
+            )
+        ).lastrowid
+
+        self.conn.execute("INSERT INTO entries_fts (rowid, text) VALUES (?, ?)", (entry_id, text))
+        for tool_name, tool_use_id, tool_input in _entry_tool_calls(entry):
+            self.conn.execute(
+                "INSERT INTO tool_calls (entry_id, tool_name, tool_use_id, input) VALUES (?, ?, ?, ?)",
+                (entry_id, tool_name, tool_use_id, tool_input)
+            )
+
+    # Queries
+
+    def query(
+        self,
+        search: Optional[str] = None,
+        tool: Optional[str] = None,
+        since: Optional[str] = None,
+        session: Optional[str] = None,
+        model: Optional[str] = None,
+        top_cost: bool = False,
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """
+        Find entries, or the most expensive turns, matching all given filters.
+
+        Args:
+            search: FTS5 query over entry text (e.g. 'pytest', '"connection refused"')
+            tool: Only entries that invoked this tool
+            since: Only entries at or after this timestamp (see parse_since)
+            session: Only entries from this session id
+            model: Only entries whose model contains this string
+            top_cost: Rank turns by cost instead of listing entries newest first
+            limit: Maximum rows to return
+
+        Returns:
+            List of row dicts
+        """
+        joins, where, params = [], [], []
+
+        if search:
+            joins.append("JOIN entries_fts ON entries_fts.rowid = e.id")
+            where.append("entries_fts MATCH ?")
+            params.append(search)
+        if tool:
+            where.append("e.id IN (SELECT entry_id FROM tool_calls WHERE tool_name = ?)")
+            params.append(tool)
+        if since:
+            where.append("e.timestamp >= ?")
+            params.append(since)
+        if session:
+            where.append("e.session_id = ?")
+            params.append(session)
+        if model:
+            where.append("e.model LIKE ?")
+            params.append(f"%{model}%")
+
+        where_sql = f"WHERE {' AND '.join(where)}" if where else ""
+
+        if top_cost:
+            # A turn matches when any of its entries does
+            turn_filter = (
+                f"WHERE turn_id IN (SELECT COALESCE(e.message_id, 'entry-' || e.id) FROM entries e "
+                f"{' '.join(joins)} {where_sql})"
+            ) if where else ""
+            sql = (
+                "SELECT turn_id, timestamp, session_id, project, model, input_tokens, output_tokens, "
+                "cache_read_tokens, cache_creation_tokens, ROUND(cost_usd, 6) AS cost_usd "
+                f"FROM turns {turn_filter} ORDER BY cost_usd DESC LIMIT ?"
+            )
+        else:
+            snippet = "snippet(entries_fts, 0, '[', ']', '...', 16)" if search else "substr(replace(e.text, char(10), ' '), 1, 120)"
+            sql = (
+                f"SELECT e.id, e.timestamp, e.session_id, e.project, e.entry_type, e.model, "
+                f"(SELECT GROUP_CONCAT(tool_name, ',') FROM tool_calls WHERE entry_id = e.id) AS tools, "
+                f"ROUND(e.cost_usd, 6) AS cost_usd, {snippet} AS text "
+                f"FROM entries e {' '.join(joins)} {where_sql} ORDER BY e.timestamp DESC LIMIT ?"
+            )
+
+        return [dict(row) for row in self.conn.execute(sql, (*params, limit))]
+
+    def execute(self, sql: str) -> List[Dict[str, Any]]:
+        """Run a read-only SQL statement against the index."""
+        if not sql.lstrip().lower().startswith(('select', 'with')):
+            raise ValueError("Only SELECT queries are allowed")
+        self.conn.execute("PRAGMA query_only = ON")
+        try:
+            return [dict(row) for row in self.conn.execute(sql)]
+        finally:
+            self.conn.execute("PRAGMA query_only = OFF")
+
+
+def _provider_roots(provider: LogProvider, path: Optional[str], project: Optional[str]) -> Tuple[List[Path], Optional[List[str]]]:
+    """Resolve directories (and patterns) to index for a provider."""
+    if provider == LogProvider.CLAUDE:
+        root = _resolve_projects_root(base_path=Path(path) if path else None)
+        if project:
+            return [root / project], None
+        # Every project directory under .claude/Projects
+        return [root], ["*/*.jsonl"]
+
+    if path:
+        return [Path(path)], None
+    return [p for p in _get_provider_paths(provider, platform.system()) if p.exists()], None
+
+
+def _print_rows(rows: List[Dict[str, Any]]) -> None:
+    """Print rows as an aligned text table."""
+    if not rows:
+        print("No matching entries.")
+        return
+
+    columns = list(rows[0].keys())
+    cells = [[("" if row[c] is None else str(row[c])) for c in columns] for row in rows]
+    widths = [min(max(len(c), *(len(r[i]) for r in cells)), 80) for i, c in enumerate(columns)]
+
+    print("  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    print("  ".join("-" * w for w in widths))
+    for r in cells:
+        print("  ".join(v[:w].ljust(w) for v, w in zip(r, widths)))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="zen logs", description="Index and query local AI CLI logs")
+    parser.add_argument("--db", type=Path, default=None, help=f"Index database (default: {default_index_path()})")
+    subparsers = parser.add_subparsers(dest="action", required=True)
+
+    index_parser = subparsers.add_parser("index", help="Ingest new log entries into the index")
+    index_parser.add_argument("--provider", choices=[p.value for p in LogProvider], default="claude",
+                              help="AI tool whose logs to index (default: claude)")
+    index_parser.add_argument("--path", help="Logs directory or file to index instead of the provider default")
+    index_parser.add_argument("--project", help="Only index this Claude project directory")
+
+    query_parser = subparsers.add_parser("query", help="Search the index")
+    query_parser.add_argument("--search", "-s", help="Full-text (FTS5) query over prompts, responses and tool I/O")
+    query_parser.add_argument("--tool", help="Only entries that called this tool (e.g. Bash)")
+    query_parser.add_argument("--since", help="Only entries newer than this (e.g. 24h, 7d, 2025-10-01)")
+    query_parser.add_argument("--session", help="Only entries from this session id")
+    query_parser.add_argument("--model", help="Only entries whose model contains this string")
+    query_parser.add_argument("--top-cost", action="store_true", help="Rank turns by cost, most expensive first")
+    query_parser.add_argument("--limit", type=int, default=20, help="Maximum rows (default: 20)")
+    query_parser.add_argument("--sql", help="Run a raw SELECT against the entries, tool_calls, turns and files tables")
+    query_parser.add_argument("--json", action="store_true", help="Print rows as JSON")
+
+    args = parser.parse_args(argv)
+
+    with LogIndex(args.db) as index:
+        if args.action == "index":
+            provider = LogProvider(args.provider)
+            roots, patterns = _provider_roots(provider, args.path, args.project)
+            stats = index.index_paths(roots, provider, patterns)
+            print(f"Indexed {provider.value} logs into {index.path}: {stats.summary()}")
+            for error in stats.errors:
+                print(f"  warning: {error}", file=sys.stderr)
+            return 1 if stats.errors and not stats.files_updated else 0
+
+        start = time.perf_counter()
+        try:
+            if args.sql:
+                rows = index.execute(args.sql)
+            else:
+                rows = index.query(
+                    search=args.search,
+                    tool=args.tool,
+                    since=parse_since(args.since) if args.since else None,
+                    session=args.session,
+                    model=args.model,
+                    top_cost=args.top_cost,
+                    limit=args.limit
+                )
+        except (ValueError, sqlite3.Error) as e:
+            print(f"Query failed: {e}", file=sys.stderr)
+            return 1
+
+        if args.json:
+            print(json.dumps(rows, indent=2))
+        else:
+            _print_rows(rows)
+            print(f"\n{len(rows)} rows in {(time.perf_counter() - start) * 1000:.1f} ms")
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Local Mock Backend
+A self-contained stand-in for the apex WebSocket backend, built on the
+websockets server API. It speaks the protocol agent_cli expects:
+connection_established and a proactive handshake_response with capabilities,
+handshake_acknowledged -> handshake_complete, and for every user_message
+(chunked or not) an agent_started / agent_thinking / agent_completed stream.
+
+Latency, inbound throughput and failures (rejected handshakes, dropped
+messages, dropped connections) can be injected to exercise the client's
+timeout, retry and pool code without real services.
+
+Usage:
+    python scripts/mock_backend.py --port 8765 --latency 0.05 --drop-rate 0.1
+    zen --apex --env development --backend-url http://127.0.0.1:8765 --message "hi"
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from websockets.asyncio.server import serve
+from websockets.exceptions import ConnectionClosed
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+@dataclass
+class MockBackendConfig:
+    """Behaviour of the mock backend."""
+    latency: float = 0.0  # Seconds before the backend reacts to each message
+    event_interval: float = 0.0  # Seconds between streamed agent events
+    thinking_events: int = 3  # agent_thinking events per run
+    throughput: Optional[float] = None  # Inbound bytes/second; larger messages take longer to "receive"
+    reject_rate: float = 0.0  # Probability a connection is closed before the handshake
+    drop_rate: float = 0.0  # Probability a user_message gets no reply at all
+    disconnect_rate: float = 0.0  # Probability the connection is closed instead of replying
+    max_chunk_connections: Optional[int] = None  # Advertised in handshake capabilities
+    log_encodings: List[str] = field(default_factory=lambda: ["gzip+b64"])
+    seed: Optional[int] = None
+
+
+@dataclass
+class MockBackendStats:
+    """What the mock backend has seen and sent."""
+    connections: int = 0
+    rejected: int = 0
+    messages: int = 0
+    chunks: int = 0
+    bytes_received: int = 0
+    events_sent: int = 0
+    dropped: int = 0
+    disconnected: int = 0
+
+
+class MockBackend:
+    """
+    In-process mock of the apex WebSocket backend.
+
+    Use as an async context manager; ws_url and backend_url point a Config at
+    it (Environment.DEVELOPMENT with custom_backend_url=backend_url).
+    """
+
+    def __init__(self, config: Optional[MockBackendConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or MockBackendConfig()
+        self.host = host
+        self.port = port
+        self.stats = MockBackendStats()
+        self._random = random.Random(self.config.seed)
+        self._server = None
+
+    @property
+    def backend_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def ws_url(self) -> str:
+        return f"ws://{self.host}:{self.port}/ws"
+
+    async def start(self) -> "MockBackend":
+        # Accept whatever auth subprotocol the client offers first
+        self._server = await serve(
+            self._handle, self.host, self.port,
+            select_subprotocol=lambda connection, subprotocols: subprotocols[0] if subprotocols else None,
+            max_size=None
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "MockBackend":
+        return await self.start()
+
+    async def __aexit__(self, *args) -> None:
+        await self.stop()
+
+    def _roll(self, rate: float) -> bool:
+        return rate > 0 and self._random.random() < rate
+
+    async def _send(self, websocket, message: Dict[str, Any]) -> None:
+        message.setdefault("timestamp", _now())
+        await websocket.send(json.dumps(message))
+        self.stats.events_sent += 1
+
+    async def _handle(self, websocket) -> None:
+        self.stats.connections += 1
+        if self._roll(self.config.reject_rate):
+            self.stats.rejected += 1
+            await websocket.close(1011, "injected failure")
+            return
+
+        thread_id = f"thread_{uuid.uuid4().hex[:12]}"
+        capabilities: Dict[str, Any] = {"jsonl_logs_encodings": list(self.config.log_encodings)}
+        if self.config.max_chunk_connections:
+            capabilities["max_chunk_connections"] = self.config.max_chunk_connections
+
+        runs = set()
+        try:
+            await self._send(websocket, {
+                "type": "connection_established",
+                "data": {"connection_id": f"conn_{uuid.uuid4().hex[:12]}"}
+            })
+            await self._send(websocket, {
+                "type": "handshake_response",
+                "thread_id": thread_id,
+                "run_id": None,
+                "capabilities": capabilities,
+                "message": "Mock backend handshake"
+            })
+
+            async for raw in websocket:
+                try:
+                    message = json.loads(raw)
+                except (TypeError, json.JSONDecodeError):
+                    continue
+                message_type = message.get("type")
+
+                if message_type == "handshake_acknowledged":
+                    await self._send(websocket, {"type": "handshake_complete", "thread_id": thread_id})
+                elif message_type == "user_message":
+                    size = len(raw.encode("utf-8") if isinstance(raw, str) else raw)
+                    self.stats.messages += 1
+                    self.stats.bytes_received += size
+                    run = asyncio.create_task(self._run(websocket, message.get("payload") or {}, size))
+                    runs.add(run)
+                    run.add_done_callback(runs.discard)
+        except ConnectionClosed:
+            pass
+        finally:
+            for run in runs:
+                run.cancel()
+
+    async def _run(self, websocket, payload: Dict[str, Any], size: int) -> None:
+        """Answer one user_message with an agent event stream."""
+        config = self.config
+        chunk_metadata = (payload.get("agent_context") or {}).get("chunk_metadata")
+        if chunk_metadata and chunk_metadata.get("total_chunks", 1) > 1:
+            self.stats.chunks += 1
+
+        delay = config.latency
+        if config.throughput:
+            delay += size / config.throughput
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self._roll(config.drop_rate):
+            self.stats.dropped += 1
+            return
+        if self._roll(config.disconnect_rate):
+            self.stats.disconnected += 1
+            await websocket.close(1011, "injected failure")
+            return
+
+        run_id = payload.get("run_id")
+        thread_id = payload.get("thread_id")
+        base = {"run_id": run_id, "thread_id": thread_id, "agent_name": "MockAgent"}
+        try:
+            await self._send(websocket, {"type": "agent_started", **base})
+            for step in range(config.thinking_events):
+                if config.event_interval:
+                    await asyncio.sleep(config.event_interval)
+                await self._send(websocket, {
+                    "type": "agent_thinking", **base,
+                    "thought": f"Analyzing step {step + 1}/{config.thinking_events}"
+                })
+            if config.event_interval:
+                await asyncio.sleep(config.event_interval)
+
+            result: Dict[str, Any] = {"summary": "Mock analysis complete", "bytes_received": size}
+            if chunk_metadata:
+                result["chunk_index"] = chunk_metadata.get("chunk_index")
+                result["total_chunks"] = chunk_metadata.get("total_chunks")
+            await self._send(websocket, {"type": "agent_completed", **base, "result": result})
+        except ConnectionClosed:
+            pass
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the mock apex WebSocket backend")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before reacting to each message")
+    parser.add_argument("--event-interval", type=float, default=0.0, help="Seconds between streamed events")
+    parser.add_argument("--thinking-events", type=int, default=3, help="agent_thinking events per run")
+    parser.add_argument("--throughput", type=float, help="Simulated inbound bytes/second")
+    parser.add_argument("--reject-rate", type=float, default=0.0, help="Probability of closing before the handshake")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Probability of never answering a message")
+    parser.add_argument("--disconnect-rate", type=float, default=0.0, help="Probability of closing instead of answering")
+    parser.add_argument("--max-chunk-connections", type=int, help="Advertise a chunk connection limit")
+    parser.add_argument("--seed", type=int, help="Seed for failure injection")
+    args = parser.parse_args(argv)
+
+    config = MockBackendConfig(
+        latency=args.latency,
+        event_interval=args.event_interval,
+        thinking_events=args.thinking_events,
+        throughput=args.throughput,
+        reject_rate=args.reject_rate,
+        drop_rate=args.drop_rate,
+        disconnect_rate=args.disconnect_rate,
+        max_chunk_connections=args.max_chunk_connections,
+        seed=args.seed
+    )
+
+    async def run() -> None:
+        async with MockBackend(config, args.host, args.port) as backend:
+            print(f"Mock backend listening on {backend.ws_url} (use --env development --backend-url {backend.backend_url})")
+            await asyncio.Future()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
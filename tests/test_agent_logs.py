@@ -33,7 +33,27 @@ from agent_logs import (
     _sanitize_project_name,
     _find_most_recent_project,
     _collect_jsonl_files,
-    collect_recent_logs
+    collect_recent_logs,
+    stream_recent_logs,
+    LogStream,
+    LogProvider,
+    _should_parse_parallel,
+    _shard_ranges,
+    LogCursorStore,
+    DiscoveryStats,
+    _find_log_files,
+    _scan_log_files,
+    LogProjectionConfig,
+    project_log_entry,
+    LogDeduplicator,
+    resolve_blob_refs,
+    available_log_encodings,
+    select_log_encoding,
+    encode_log_entries,
+    decode_log_entries,
+    LogFollower,
+    entry_json_bytes,
+    entries_json_bytes
 )
 
 
@@ -656,6 +676,699 @@ class TestCollectRecentLogs:
         assert result[2]["seq"] == 3
 
 
+class TestStreamRecentLogs:
+    """Test the lazy streaming API"""
+
+    def test_stream_yields_same_entries_as_collect(self, tmp_path):
+        """Test that streaming produces the same entries as collect_recent_logs"""
+        projects_root = tmp_path / ".claude" / "Projects"
+        project = projects_root / "test-project"
+        project.mkdir(parents=True)
+        (project / "a.jsonl").write_text('{"seq": 1}\n{"seq": 2}\n')
+        time.sleep(0.01)
+        (project / "b.jsonl").write_text('{"seq": 3}\n')
+
+        stream = stream_recent_logs(limit=5, base_path=str(projects_root))
+        streamed = list(stream)
+        logs, files_read, file_info = collect_recent_logs(limit=5, base_path=str(projects_root))
+
+        assert streamed == logs
+        assert stream.files_read == files_read == 2
+        assert stream.file_info == file_info
+
+    def test_stream_is_lazy(self, tmp_path):
+        """Test that no file is read until the stream is iterated"""
+        projects_root = tmp_path / ".claude" / "Projects"
+        project = projects_root / "test-project"
+        project.mkdir(parents=True)
+        (project / "log.jsonl").write_text('{"seq": 1}\n')
+
+        with patch('agent_logs._iter_log_file') as mock_iter:
+            stream = stream_recent_logs(limit=5, base_path=str(projects_root))
+            assert isinstance(stream, LogStream)
+            mock_iter.assert_not_called()
+
+    def test_file_info_reported_as_files_complete(self, tmp_path):
+        """Test that file info is available per file before iteration ends"""
+        projects_root = tmp_path / ".claude" / "Projects"
+        project = projects_root / "test-project"
+        project.mkdir(parents=True)
+        (project / "old.jsonl").write_text('{"seq": 1}\n')
+        time.sleep(0.01)
+        (project / "new.jsonl").write_text('{"seq": 2}\n{"seq": 3}\n')
+
+        completed = []
+        stream = stream_recent_logs(
+            limit=5,
+            base_path=str(projects_root),
+            on_file_complete=completed.append
+        )
+        iterator = iter(stream)
+        next(iterator)
+        assert completed == []
+
+        next(iterator)
+        next(iterator)
+        assert [info['name'] for info in completed] == ['new.jsonl']
+        assert completed[0]['entries'] == 2
+
+        assert list(iterator) == []
+        assert [info['name'] for info in stream.file_info] == ['new.jsonl', 'old.jsonl']
+
+    def test_stream_single_file(self, tmp_path):
+        """Test streaming a specific log file"""
+        log_file = tmp_path / "session.jsonl"
+        log_file.write_text('{"seq": 1}\nnot json\n{"seq": 2}\n')
+
+        stream = stream_recent_logs(base_path=str(log_file))
+        assert stream.is_single_file
+        assert [entry["seq"] for entry in stream] == [1, 2]
+        assert stream.files_read == 1
+        assert stream.file_info[0]['entries'] == 2
+
+    def test_stream_falls_through_empty_roots(self, tmp_path):
+        """Test that roots without entries are skipped"""
+        empty_root = tmp_path / "empty"
+        empty_root.mkdir()
+        full_root = tmp_path / "full"
+        full_root.mkdir()
+        (full_root / "rollout-1.jsonl").write_text('{"seq": 1}\n')
+
+        stream = LogStream(provider=LogProvider.CODEX, limit=5, roots=[empty_root, full_root])
+        assert [entry["seq"] for entry in stream] == [1]
+        assert stream.file_info[0]['path'] == "rollout-1.jsonl"
+
+    def test_stream_invalid_limit(self):
+        """Test that limit is validated eagerly"""
+        with pytest.raises(ValueError, match="Limit must be positive"):
+            stream_recent_logs(limit=0)
+
+    def test_stream_nonexistent_project(self, tmp_path):
+        """Test that unresolvable projects return None"""
+        projects_root = tmp_path / ".claude" / "Projects"
+        projects_root.mkdir(parents=True)
+
+        assert stream_recent_logs(project_name="missing", base_path=str(projects_root)) is None
+
+
+class TestSinglePassParsing:
+    """Test that log files are hashed and parsed in one read"""
+
+    def test_lines_split_across_buffer_boundaries(self, tmp_path):
+        """Test that lines spanning read blocks are reassembled"""
+        log_file = tmp_path / "log.jsonl"
+        lines = [json.dumps({"seq": i, "text": "x" * i}) for i in range(50)]
+        log_file.write_text("\n".join(lines))  # No trailing newline
+
+        with patch('agent_logs.READ_BUFFER_SIZE', 7):
+            logs, files_read, file_info = _collect_jsonl_files(tmp_path, limit=1)
+
+        assert [entry["seq"] for entry in logs] == list(range(50))
+        assert file_info[0]['entries'] == 50
+
+    def test_hash_matches_full_file_digest(self, tmp_path):
+        """Test that the incremental hash covers every byte of the file"""
+        import hashlib
+
+        log_file = tmp_path / "log.jsonl"
+        log_file.write_bytes(b'{"a": 1}\r\n\n{"b": "\xc3\xa9"}\n')
+
+        with patch('agent_logs.READ_BUFFER_SIZE', 5):
+            logs, _, file_info = _collect_jsonl_files(tmp_path, limit=1)
+
+        assert file_info[0]['hash'] == hashlib.sha256(log_file.read_bytes()).hexdigest()[:8]
+        assert logs[1]["b"] == "\u00e9"
+
+    def test_file_opened_once(self, tmp_path):
+        """Test that each file is opened a single time"""
+        (tmp_path / "log.jsonl").write_text('{"seq": 1}\n')
+
+        with patch('builtins.open', wraps=open) as mock_open:
+            _collect_jsonl_files(tmp_path, limit=1)
+
+        assert mock_open.call_count == 1
+
+    def test_invalid_utf8_line_skipped(self, tmp_path):
+        """Test that undecodable lines are skipped like malformed JSON"""
+        (tmp_path / "log.jsonl").write_bytes(b'{"seq": 1}\n\xff\xfe\n{"seq": 2}\n')
+
+        logs, _, _ = _collect_jsonl_files(tmp_path, limit=1)
+
+        assert [entry["seq"] for entry in logs] == [1, 2]
+
+
+class TestParallelParsing:
+    """Test process pool parsing of files and shards"""
+
+    def _write_session(self, path, start, count):
+        path.write_text("".join(json.dumps({"seq": i, "pad": "p" * 40}) + "\n" for i in range(start, start + count)))
+
+    def test_crossover_heuristic(self):
+        """Test that small jobs and single-CPU hosts stay serial"""
+        assert not _should_parse_parallel(1024, 4, cpu_count=8)
+        assert not _should_parse_parallel(1 << 30, 1, cpu_count=8)
+        assert not _should_parse_parallel(1 << 30, 4, cpu_count=1)
+        assert _should_parse_parallel(1 << 30, 4, cpu_count=8)
+
+    def test_shard_ranges_align_to_lines(self, tmp_path):
+        """Test that shards cover the file and start at line boundaries"""
+        log_file = tmp_path / "log.jsonl"
+        self._write_session(log_file, 0, 100)
+        data = log_file.read_bytes()
+
+        ranges = _shard_ranges(log_file, len(data), shard_bytes=500)
+
+        assert len(ranges) > 1
+        assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            assert end == start
+            assert data[start - 1:start] == b"\n"
+
+    def test_parallel_files_preserve_order(self, tmp_path):
+        """Test that parallel parsing matches serial output and order"""
+        for name, start in (("a.jsonl", 0), ("b.jsonl", 10), ("c.jsonl", 20)):
+            self._write_session(tmp_path / name, start, 10)
+            time.sleep(0.01)
+
+        serial = LogStream(limit=5, roots=[tmp_path], parallel=False)
+        parallel = LogStream(limit=5, roots=[tmp_path], parallel=True, max_workers=2)
+
+        assert list(parallel) == list(serial)
+        assert parallel.file_info == serial.file_info
+        assert parallel.files_read == 3
+
+    def test_parallel_shards_single_file(self, tmp_path):
+        """Test that one large file is sharded and reassembled in order"""
+        log_file = tmp_path / "session.jsonl"
+        self._write_session(log_file, 0, 200)
+
+        serial = LogStream(log_file=log_file, parallel=False)
+        expected = list(serial)
+
+        with patch('agent_logs.PARALLEL_SHARD_BYTES', 1000):
+            stream = LogStream(log_file=log_file, parallel=True, max_workers=2)
+            entries = list(stream)
+
+        assert entries == expected
+        assert stream.file_info == serial.file_info
+        assert stream.files_read == 1
+
+
+class TestIncrementalCursors:
+    """Test cursor-based incremental collection"""
+
+    def _collect(self, log_file, store):
+        result = collect_recent_logs(base_path=str(log_file), cursor_store=store)
+        store.commit()
+        return [entry["seq"] for entry in result[0]], result[2][0]
+
+    def test_only_new_entries_after_commit(self, tmp_path):
+        """Test that a second run only returns appended entries"""
+        log_file = tmp_path / "session.jsonl"
+        log_file.write_text('{"seq": 1}\n{"seq": 2}\n')
+        cursor_path = tmp_path / "cursors.json"
+
+        seqs, info = self._collect(log_file, LogCursorStore(cursor_path))
+        assert seqs == [1, 2]
+        assert info['start_offset'] == 0
+
+        with open(log_file, 'a') as f:
+            f.write('{"seq": 3}\n')
+
+        seqs, info = self._collect(log_file, LogCursorStore(cursor_path))
+        assert seqs == [3]
+        assert info['end_offset'] == log_file.stat().st_size
+
+    def test_uncommitted_cursor_not_persisted(self, tmp_path):
+        """Test that cursors only advance on commit"""
+        log_file = tmp_path / "session.jsonl"
+        log_file.write_text('{"seq": 1}\n')
+        cursor_path = tmp_path / "cursors.json"
+
+        collect_recent_logs(base_path=str(log_file), cursor_store=LogCursorStore(cursor_path))
+
+        seqs, _ = self._collect(log_file, LogCursorStore(cursor_path))
+        assert seqs == [1]
+
+    def test_partial_trailing_line_deferred(self, tmp_path):
+        """Test that a line still being written is picked up next run"""
+        log_file = tmp_path / "session.jsonl"
+        log_file.write_text('{"seq": 1}\n{"seq": ')
+        cursor_path = tmp_path / "cursors.json"
+
+        seqs, _ = self._collect(log_file, LogCursorStore(cursor_path))
+        assert seqs == [1]
+
+        with open(log_file, 'a') as f:
+            f.write('2}\n')
+
+        seqs, _ = self._collect(log_file, LogCursorStore(cursor_path))
+        assert seqs == [2]
+
+    def test_truncation_resets_cursor(self, tmp_path):
+        """Test that a truncated file is re-read from the start"""
+        log_file = tmp_path / "session.jsonl"
+        log_file.write_text('{"seq": 1}\n{"seq": 2}\n')
+        cursor_path = tmp_path / "cursors.json"
+        self._collect(log_file, LogCursorStore(cursor_path))
+
+        log_file.write_text('{"seq": 9}\n')
+
+        seqs, _ = self._collect(log_file, LogCursorStore(cursor_path))
+        assert seqs == [9]
+
+    def test_rewrite_resets_cursor(self, tmp_path):
+        """Test that a same-size rewrite is detected by the fingerprint"""
+        log_file = tmp_path / "session.jsonl"
+        log_file.write_text('{"seq": 1}\n')
+        cursor_path = tmp_path / "cursors.json"
+        self._collect(log_file, LogCursorStore(cursor_path))
+
+        with open(log_file, 'r+') as f:
+            f.write('{"seq": 5}\n{"seq": 6}\n')
+
+        seqs, _ = self._collect(log_file, LogCursorStore(cursor_path))
+        assert seqs == [5, 6]
+
+    def test_corrupt_cursor_file_ignored(self, tmp_path):
+        """Test that an unreadable cursor file starts from scratch"""
+        cursor_path = tmp_path / "cursors.json"
+        cursor_path.write_text("not json")
+
+        assert LogCursorStore(cursor_path).cursors == {}
+
+
+class TestLogDiscovery:
+    """Test scandir-based log file discovery"""
+
+    def _touch(self, path, mtime):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('{"event": "test"}\n')
+        os.utime(path, (mtime, mtime))
+
+    def test_top_n_by_mtime(self, tmp_path):
+        """Test that only the newest files are returned, newest first"""
+        for i in range(10):
+            self._touch(tmp_path / f"session{i}.jsonl", 1000 + i)
+        (tmp_path / "notes.txt").write_text("ignored")
+
+        result = _find_log_files(tmp_path, limit=3)
+
+        assert [p.name for p in result] == ["session9.jsonl", "session8.jsonl", "session7.jsonl"]
+
+    def test_claude_pattern_not_recursive(self, tmp_path):
+        """Test that Claude discovery stays at the top level"""
+        self._touch(tmp_path / "top.jsonl", 1000)
+        self._touch(tmp_path / "nested" / "deep.jsonl", 2000)
+
+        assert [p.name for p in _find_log_files(tmp_path, limit=5)] == ["top.jsonl"]
+
+    def test_gemini_patterns(self, tmp_path):
+        """Test that Gemini chat and logs files are found at any depth"""
+        self._touch(tmp_path / "abc123" / "chats" / "session-1.json", 1000)
+        self._touch(tmp_path / "abc123" / "logs.json", 1001)
+        self._touch(tmp_path / "abc123" / "other.json", 1002)
+
+        result = _find_log_files(tmp_path, limit=5, provider=LogProvider.GEMINI)
+
+        assert sorted(p.name for p in result) == ["logs.json", "session-1.json"]
+
+    def test_codex_date_partitions_pruned(self, tmp_path):
+        """Test that older date partitions are skipped once limit is met"""
+        days = [("2024", "12", "30"), ("2024", "12", "31"), ("2025", "01", "01"), ("2025", "01", "02")]
+        for index, (year, month, day) in enumerate(days):
+            self._touch(tmp_path / year / month / day / f"rollout-{index}.jsonl", 1000 + index)
+
+        stats = DiscoveryStats()
+        result = _scan_log_files(tmp_path, ["**/*.jsonl", "**/rollout-*.jsonl"], 1, stats)
+
+        assert [p.name for p in result] == ["rollout-3.jsonl"]
+        # Newest day plus one grace partition scanned; 2024 never visited
+        assert stats.files_matched == 2
+        assert stats.partitions_pruned >= 1
+
+    def test_grace_partition_catches_overnight_session(self, tmp_path):
+        """Test that a session started the previous day but updated later is found"""
+        self._touch(tmp_path / "2025" / "01" / "02" / "rollout-new.jsonl", 1000)
+        self._touch(tmp_path / "2025" / "01" / "01" / "rollout-overnight.jsonl", 2000)
+
+        result = _find_log_files(tmp_path, limit=1, provider=LogProvider.CODEX)
+
+        assert [p.name for p in result] == ["rollout-overnight.jsonl"]
+
+    def test_matches_glob_results(self, tmp_path):
+        """Test that discovery finds the same files as pathlib glob when nothing is pruned"""
+        for index, rel in enumerate(["a.jsonl", "x/b.jsonl", "x/y/rollout-c.jsonl", "z/d.json"]):
+            self._touch(tmp_path / rel, 1000 + index)
+
+        expected = set(tmp_path.glob("**/*.jsonl"))
+        result = _find_log_files(tmp_path, limit=10, provider=LogProvider.CODEX)
+
+        assert set(result) == expected
+        assert len(result) == len(expected)
+
+    def test_stream_records_discovery_stats(self, tmp_path):
+        """Test that the stream exposes the discovery timing breakdown"""
+        projects_root = tmp_path / ".claude" / "Projects"
+        self._touch(projects_root / "project" / "log.jsonl", 1000)
+
+        stream = stream_recent_logs(base_path=str(projects_root))
+        list(stream)
+
+        assert stream.discovery_stats.dirs_scanned == 1
+        assert stream.discovery_stats.files_matched == 1
+        assert "discovery" in stream.discovery_stats.summary()
+
+
+class TestLogProjection:
+    """Test per-provider field projection of heavy content"""
+
+    def _tool_result_entry(self, content):
+        return {
+            "type": "user",
+            "uuid": "u1",
+            "message": {"role": "user", "content": [
+                {"type": "tool_result", "tool_use_id": "toolu_1", "content": content}
+            ]},
+            "toolUseResult": {"stdout": content if isinstance(content, str) else "", "interrupted": False},
+        }
+
+    def test_tool_result_truncated_with_record(self):
+        """Test that tool output is cut to budget and its original size recorded"""
+        entry = self._tool_result_entry("x" * 10000)
+        config = LogProjectionConfig(TOOL_RESULT_BYTES=100, TOOL_USE_RESULT_BYTES=50)
+
+        project_log_entry(entry, LogProvider.CLAUDE, config)
+
+        block = entry["message"]["content"][0]
+        assert block["content"].startswith("x" * 100)
+        assert "truncated 9900 bytes" in block["content"]
+        assert block["tool_use_id"] == "toolu_1"
+        assert entry["toolUseResult"]["interrupted"] is False
+
+        records = {record["field"]: record for record in entry["_pruned_fields"]}
+        assert records["message.content[0].content"]["original_bytes"] == 10000
+        assert records["message.content[0].content"]["kept_bytes"] == 100
+        assert records["toolUseResult.stdout"]["kept_bytes"] == 50
+
+    def test_metadata_untouched(self):
+        """Test that usage, model and small fields survive projection"""
+        entry = {
+            "type": "assistant",
+            "message": {
+                "model": "claude-sonnet-4",
+                "usage": {"input_tokens": 10, "output_tokens": 20},
+                "content": [{"type": "tool_use", "name": "Read", "input": {"file_path": "/a.py"}}],
+            },
+        }
+        original = json.loads(json.dumps(entry))
+
+        project_log_entry(entry, LogProvider.CLAUDE)
+
+        assert entry == original
+
+    def test_images_dropped(self):
+        """Test that base64 image data is removed, keeping media type"""
+        image = {"type": "image", "source": {"type": "base64", "media_type": "image/png", "data": "A" * 5000}}
+        entry = self._tool_result_entry([image, {"type": "text", "text": "ok"}])
+        entry["message"]["content"].append(json.loads(json.dumps(image)))
+
+        project_log_entry(entry, LogProvider.CLAUDE)
+
+        nested = entry["message"]["content"][0]["content"][0]["source"]
+        top_level = entry["message"]["content"][1]["source"]
+        assert nested["data"] == "" and nested["media_type"] == "image/png"
+        assert top_level["data"] == ""
+        assert entry["message"]["content"][0]["content"][1]["text"] == "ok"
+
+    def test_utf8_boundary_respected(self):
+        """Test that truncation never splits a multi-byte character"""
+        entry = {"type": "system", "content": "é" * 100}
+
+        project_log_entry(entry, LogProvider.CLAUDE, LogProjectionConfig(TEXT_BYTES=11))
+
+        kept = entry["content"].split("...")[0]
+        assert kept == "é" * 5
+        assert entry["_pruned_fields"][0]["kept_bytes"] == 10
+
+    def test_stream_reports_pruned_bytes(self, tmp_path):
+        """Test that projection through the stream reports savings per file"""
+        log_file = tmp_path / "session.jsonl"
+        log_file.write_text(json.dumps(self._tool_result_entry("y" * 5000)) + "\n")
+
+        result = collect_recent_logs(base_path=str(log_file), projection=LogProjectionConfig())
+
+        logs, _, file_info = result
+        assert len(json.dumps(logs)) < 5000
+        assert file_info[0]["pruned_bytes"] > 0
+
+    def test_no_projection_by_default(self, tmp_path):
+        """Test that entries are returned in full unless projection is requested"""
+        log_file = tmp_path / "session.jsonl"
+        log_file.write_text(json.dumps(self._tool_result_entry("y" * 5000)) + "\n")
+
+        logs, _, file_info = collect_recent_logs(base_path=str(log_file))
+
+        assert logs[0]["message"]["content"][0]["content"] == "y" * 5000
+        assert "pruned_bytes" not in file_info[0]
+
+
+class TestLogDeduplication:
+    """Test content-addressed deduplication of large strings"""
+
+    @staticmethod
+    def _read_entry(content):
+        return {"type": "user", "message": {"content": [
+            {"type": "tool_result", "tool_use_id": "toolu_1", "content": content}
+        ]}}
+
+    def test_repeated_strings_replaced(self):
+        """Test that a repeated large string is stored once"""
+        dedup = LogDeduplicator(min_bytes=100)
+        body = "x" * 1000
+
+        entries = list(dedup.iter_dedup([self._read_entry(body) for _ in range(3)]))
+        blobs = dedup.take_blobs()
+
+        assert len(blobs) == 1
+        reference = entries[0]["message"]["content"][0]["content"]
+        assert set(reference) == {"$blob"}
+        assert all(entry == entries[0] for entry in entries)
+        assert dedup.repeats == 2
+        assert dedup.ratio > 2.5
+
+    def test_round_trip(self):
+        """Test that resolving references restores the original entries"""
+        dedup = LogDeduplicator(min_bytes=100)
+        originals = [self._read_entry("a" * 500), self._read_entry("b" * 500), self._read_entry("a" * 500)]
+
+        entries = list(dedup.iter_dedup(originals))
+        blobs = dedup.take_blobs()
+
+        assert [resolve_blob_refs(entry, blobs) for entry in entries] == originals
+
+    def test_small_strings_kept_inline(self):
+        """Test that strings under the threshold are not replaced"""
+        dedup = LogDeduplicator(min_bytes=100)
+        entry = self._read_entry("short")
+
+        assert dedup.dedup_entry(entry) == entry
+        assert dedup.take_blobs() == {}
+        assert dedup.ratio == 1.0
+
+    def test_take_blobs_starts_new_table(self):
+        """Test that each chunk gets a self-contained blob table"""
+        dedup = LogDeduplicator(min_bytes=100)
+        body = "z" * 500
+
+        first = dedup.dedup_entry(self._read_entry(body))
+        first_blobs = dedup.take_blobs()
+        second = dedup.dedup_entry(self._read_entry(body))
+        second_blobs = dedup.take_blobs()
+
+        assert first == second
+        assert first_blobs == second_blobs
+        assert resolve_blob_refs(second, second_blobs) == self._read_entry(body)
+
+    def test_input_not_modified(self):
+        """Test that deduplication returns copies"""
+        dedup = LogDeduplicator(min_bytes=100)
+        entry = self._read_entry("q" * 500)
+
+        dedup.dedup_entry(entry)
+
+        assert entry["message"]["content"][0]["content"] == "q" * 500
+
+
+class TestLogEncoding:
+    """Test compressed jsonl_logs encodings and negotiation"""
+
+    def test_gzip_round_trip(self):
+        """Test that gzip+b64 restores the original entries"""
+        entries = [{"type": "assistant", "message": {"content": "Reviewing the handler. " * 50}} for _ in range(20)]
+
+        encoded = encode_log_entries(entries, "gzip+b64")
+
+        assert isinstance(encoded, str)
+        assert len(encoded) < len(json.dumps(entries)) / 5
+        assert decode_log_entries(encoded, "gzip+b64") == entries
+
+    def test_zstd_round_trip(self):
+        """Test that zstd+b64 restores the original entries when zstandard is installed"""
+        if "zstd+b64" not in available_log_encodings():
+            pytest.skip("zstandard not installed")
+        entries = [{"type": "user", "content": "x" * 1000}]
+
+        assert decode_log_entries(encode_log_entries(entries, "zstd+b64"), "zstd+b64") == entries
+
+    def test_auto_requires_server_support(self):
+        """Test that auto only compresses when the backend advertises an encoding"""
+        assert select_log_encoding(None) is None
+        assert select_log_encoding([]) is None
+        assert select_log_encoding(["gzip+b64"]) == "gzip+b64"
+        assert select_log_encoding(["brotli"]) is None
+
+    def test_auto_prefers_client_order(self):
+        """Test that the most preferred mutually supported encoding is chosen"""
+        expected = available_log_encodings()[0]
+        assert select_log_encoding(["gzip+b64", "zstd+b64"]) == expected
+
+    def test_explicit_choices(self):
+        """Test that none and explicit encodings override negotiation"""
+        assert select_log_encoding(["gzip+b64"], "none") is None
+        assert select_log_encoding(None, "gzip+b64") == "gzip+b64"
+        with pytest.raises(ValueError):
+            select_log_encoding(None, "lz4")
+
+
+class TestLogFollower:
+    """Test live tailing of a session log"""
+
+    @staticmethod
+    def _append(log_file, *entries, terminate=True):
+        with open(log_file, 'a') as f:
+            f.write("\n".join(json.dumps(entry) for entry in entries) + ("\n" if terminate else ""))
+
+    def test_only_new_entries_by_default(self, tmp_path):
+        """Test that entries already in the file are skipped unless from_start"""
+        log_file = tmp_path / "session.jsonl"
+        self._append(log_file, {"type": "user", "n": 1})
+
+        follower = LogFollower(log_file)
+        assert follower.read_new() == []
+        self._append(log_file, {"type": "user", "n": 2})
+        assert [entry["n"] for entry in follower.read_new()] == [2]
+        assert [entry["n"] for entry in LogFollower(log_file, from_start=True).read_new()] == [1, 2]
+        follower.close()
+
+    def test_partial_line_deferred(self, tmp_path):
+        """Test that a half-written line is read once it is complete"""
+        log_file = tmp_path / "session.jsonl"
+        log_file.write_text("")
+        follower = LogFollower(log_file)
+
+        with open(log_file, 'a') as f:
+            f.write('{"type": "user", "n": ')
+        assert follower.read_new() == []
+
+        with open(log_file, 'a') as f:
+            f.write('3}\n')
+        assert [entry["n"] for entry in follower.read_new()] == [3]
+        follower.close()
+
+    def test_replaced_file_reread(self, tmp_path):
+        """Test that a file that shrinks is read again from the start"""
+        log_file = tmp_path / "session.jsonl"
+        self._append(log_file, *[{"type": "user", "n": i} for i in range(5)])
+        follower = LogFollower(log_file)
+
+        log_file.write_text(json.dumps({"type": "user", "n": 99}) + "\n")
+
+        assert [entry["n"] for entry in follower.read_new()] == [99]
+        follower.close()
+
+    def test_batches_split_at_entry_cap(self, tmp_path):
+        """Test that full batches are sent without waiting for the window"""
+        log_file = tmp_path / "session.jsonl"
+        log_file.write_text("")
+        follower = LogFollower(log_file, poll_interval=0.01)
+        self._append(log_file, *[{"type": "user", "n": i} for i in range(5)])
+
+        checks = iter([False, True])
+        batches = list(follower.batches(window_seconds=60, max_entries=2, should_stop=lambda: next(checks)))
+
+        assert [[entry["n"] for entry in batch] for batch in batches] == [[0, 1], [2, 3], [4]]
+        assert follower.batches_sent == 3
+        assert not follower.uses_inotify
+
+    def test_window_flushes_pending(self, tmp_path):
+        """Test that a partial batch is sent once the time window passes"""
+        log_file = tmp_path / "session.jsonl"
+        log_file.write_text("")
+        follower = LogFollower(log_file, poll_interval=0.01)
+        self._append(log_file, {"type": "user", "n": 1})
+
+        batches = follower.batches(window_seconds=0.05)
+
+        assert [entry["n"] for entry in next(batches)] == [1]
+        batches.close()
+
+
+class TestRawEntryBytes:
+    """Test that collected entries carry their serialized JSON bytes"""
+
+    @staticmethod
+    def _write(log_file, entries):
+        log_file.write_text("".join(json.dumps(entry) + "\n" for entry in entries), encoding='utf-8')
+
+    def test_raw_bytes_match_entry(self, tmp_path):
+        """Test that spliced line bytes decode to the normalized entry"""
+        log_file = tmp_path / "session.jsonl"
+        self._write(log_file, [{"type": "user", "text": "héllo"}, {}])
+
+        entries = list(LogStream(log_file=log_file))
+
+        assert all(entry.raw is not None for entry in entries)
+        assert [json.loads(entry_json_bytes(entry)) for entry in entries] == entries
+        assert entries[1] == {"_provider": "claude", "_source_file": "session.jsonl"}
+        assert json.loads(entries_json_bytes(entries)) == entries
+
+    def test_existing_provider_key_not_spliced(self, tmp_path):
+        """Test that entries already holding normalization keys fall back to json.dumps"""
+        log_file = tmp_path / "session.jsonl"
+        self._write(log_file, [{"_provider": "other", "type": "user"}])
+
+        entry = next(iter(LogStream(log_file=log_file)))
+
+        assert entry.raw is None
+        assert json.loads(entry_json_bytes(entry)) == {"_provider": "claude", "type": "user", "_source_file": "session.jsonl"}
+
+    def test_projection_invalidates_raw(self, tmp_path):
+        """Test that pruned entries are re-serialized rather than sent from stale bytes"""
+        log_file = tmp_path / "session.jsonl"
+        self._write(log_file, [
+            {"type": "user", "message": {"content": [{"type": "tool_result", "content": "x" * 100000}]}},
+            {"type": "user", "message": {"content": "short"}}
+        ])
+
+        pruned, kept = list(LogStream(log_file=log_file, projection=LogProjectionConfig()))
+
+        assert pruned.raw is None and "_pruned_fields" in json.loads(entry_json_bytes(pruned))
+        assert kept.raw is not None
+
+    def test_parallel_path_keeps_raw(self, tmp_path):
+        """Test that line bytes survive the process pool transfer"""
+        log_file = tmp_path / "session.jsonl"
+        self._write(log_file, [{"type": "user", "n": i} for i in range(50)])
+
+        sequential = list(LogStream(log_file=log_file))
+        with patch('agent_logs.PARALLEL_SHARD_BYTES', 200):
+            parallel = list(LogStream(log_file=log_file, parallel=True, max_workers=2))
+
+        assert parallel == sequential
+        assert [entry.raw for entry in parallel] == [entry.raw for entry in sequential]
+
+
 class TestIntegrationScenarios:
     """Integration tests for realistic usage scenarios"""
 
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Unit tests for scripts/apex_daemon.py
+
+The daemon leases warm connections to runs requested over its Unix socket,
+streams the run's events back and keeps the pool topped up; the CLI side
+falls back to the full agent_cli when no daemon can serve the run.
+"""
+
+import asyncio
+import json
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+# Add parent and scripts directories to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from scripts.apex_daemon import ApexDaemon, run_via_daemon
+from agent_cli import WebSocketClient, WebSocketEvent, DebugManager, DebugLevel, Environment
+
+pytestmark = pytest.mark.skipif(not hasattr(__import__("socket"), "AF_UNIX"), reason="needs Unix domain sockets")
+
+
+class FakeClient(WebSocketClient):
+    """Connected client whose backend answers every message with a short run."""
+
+    def __init__(self):
+        config = MagicMock()
+        config.ws_url = "ws://localhost:8000/ws"
+        config.environment = Environment.LOCAL
+        config.json_mode = True
+        config.ci_mode = False
+        super().__init__(config, "token-1", DebugManager(debug_level=DebugLevel.SILENT))
+        self.connected = True
+        self.messages = []
+
+    async def send_message(self, message, jsonl_logs=None, agent_context=None):
+        self.messages.append((message, self.logs_project))
+        loop = asyncio.get_running_loop()
+        run_id = f"run-{len(self.messages)}"
+        loop.call_later(0.01, self._record_event, WebSocketEvent(type="agent_started", data={"run_id": run_id}))
+        loop.call_later(0.02, self._record_event, WebSocketEvent(type="agent_thinking", data={"thought": "hmm"}))
+        loop.call_later(0.03, self._record_event, WebSocketEvent(type="agent_completed", data={"run_id": run_id}))
+        return run_id
+
+
+class FakePool:
+    """Stands in for WebSocketConnectionPool: hands out FakeClients with a live receiver."""
+
+    def __init__(self):
+        self._receivers = {}
+        self.opened = []
+
+    async def _open_client(self):
+        client = FakeClient()
+        self._receivers[id(client)] = asyncio.get_running_loop().create_future()
+        self.opened.append(client)
+        return client
+
+    async def _close_client(self, client):
+        receiver = self._receivers.pop(id(client), None)
+        if receiver:
+            receiver.cancel()
+
+
+def _daemon(tmp_path, connections=1):
+    daemon = ApexDaemon(env="local", socket_path=tmp_path / "d.sock", connections=connections, idle_timeout=0)
+    daemon.debug = DebugManager(debug_level=DebugLevel.SILENT)
+    daemon.pool = FakePool()
+    daemon.token = "token-1"
+    daemon.auth_manager = MagicMock()
+    daemon.auth_manager.token = None
+    daemon._stopped = asyncio.Event()
+    return daemon
+
+
+async def _ask(path, payload):
+    reader, writer = await asyncio.open_unix_connection(str(path))
+    writer.write(json.dumps(payload).encode() + b"\n")
+    await writer.drain()
+    records = [json.loads(line) async for line in reader if line.strip()]
+    writer.close()
+    return records
+
+
+class TestApexDaemon:
+    """Test runs served over the socket"""
+
+    def test_runs_reuse_the_warm_connection(self, tmp_path):
+        """Test that consecutive runs stream only their own events on the same connection"""
+        async def scenario():
+            daemon = _daemon(tmp_path)
+            await daemon._add_client()
+            server = await asyncio.start_unix_server(daemon._handle, path=str(daemon.socket_path))
+            first = await _ask(daemon.socket_path, {"op": "run", "message": "one", "wait": 5, "logs_project": "p"})
+            second = await _ask(daemon.socket_path, {"op": "run", "message": "two", "wait": 5})
+            status = await _ask(daemon.socket_path, {"op": "status"})
+            server.close()
+            await server.wait_closed()
+            return daemon, first, second, status
+
+        daemon, first, second, status = asyncio.run(scenario())
+
+        assert len(daemon.pool.opened) == 1
+        assert daemon.pool.opened[0].messages == [("one", "p"), ("two", None)]
+        for records, run_id in ((first, "run-1"), (second, "run-2")):
+            assert records[0] == {"run_id": run_id}
+            assert [record["event"]["type"] for record in records[1:-1]] == [
+                "agent_started", "agent_thinking", "agent_completed"
+            ]
+            assert records[-1]["done"] is True
+            assert records[-1]["exit_code"] == 0
+        assert status[0]["status"]["runs_served"] == 2
+        assert status[0]["status"]["warm_connections"] == 1
+
+    def test_maintain_replaces_dead_and_stale_connections(self, tmp_path):
+        """Test that closed connections and ones opened with an old token are recycled"""
+        async def scenario():
+            daemon = _daemon(tmp_path, connections=2)
+            daemon._refresh_token = MagicMock(side_effect=lambda: asyncio.sleep(0, True))
+            await daemon._add_client()
+            await daemon._add_client()
+            dead, stale = daemon.idle
+            daemon.pool._receivers[id(dead)].set_result(None)
+            daemon._client_tokens[id(stale)] = "token-0"
+            await daemon._maintain()
+            return daemon, dead, stale
+
+        daemon, dead, stale = asyncio.run(scenario())
+        assert len(daemon.idle) == 2
+        assert dead not in daemon.idle and stale not in daemon.idle
+        assert len(daemon.pool.opened) == 4
+
+
+class TestRunViaDaemon:
+    """Test the CLI-side fallbacks"""
+
+    def test_falls_back_without_daemon(self, tmp_path, monkeypatch):
+        """Test that the full CLI runs when no daemon socket exists"""
+        monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path))
+        assert run_via_daemon(["--message", "hi", "--env", "local"]) is None
+
+    def test_falls_back_for_unsupported_options(self, tmp_path, monkeypatch):
+        """Test that options the daemon cannot honour send the run to the full CLI"""
+        monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path))
+        socket_path = tmp_path / "netra" / "cli" / "apex-daemon-local.sock"
+        socket_path.parent.mkdir(parents=True)
+        socket_path.touch()
+        assert run_via_daemon(["--message", "hi", "--env", "local", "--logs-incremental"]) is None
+        assert run_via_daemon(["--env", "local"]) is None
+        # A stale socket file with no daemon behind it also falls back
+        assert run_via_daemon(["--message", "hi", "--env", "local"]) is None
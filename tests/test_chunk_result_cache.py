@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Unit tests for scripts/chunk_result_cache.py
+
+Covers content keys, hits and misses, TTL expiry and LRU eviction under the
+byte budget.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add scripts directory to path
+scripts_dir = Path(__file__).parent.parent / "scripts"
+sys.path.insert(0, str(scripts_dir))
+
+from chunk_result_cache import ChunkResultCache
+
+
+ENTRIES = [{"type": "user", "uuid": "u1", "message": {"content": "Run the tests"}}]
+
+
+class TestChunkResultKeys:
+    """Test content keys"""
+
+    def test_key_depends_on_message_scope_and_entries(self):
+        """Test that any change to what the backend analyzes changes the key"""
+        key = ChunkResultCache.key_for(ENTRIES, "analyze", scope="wss://api")
+
+        assert key == ChunkResultCache.key_for([dict(ENTRIES[0])], "analyze", scope="wss://api")
+        assert key != ChunkResultCache.key_for(ENTRIES, "summarize", scope="wss://api")
+        assert key != ChunkResultCache.key_for(ENTRIES, "analyze", scope="wss://staging")
+        assert key != ChunkResultCache.key_for(ENTRIES + ENTRIES, "analyze", scope="wss://api")
+
+
+class TestChunkResultCache:
+    """Test storage, expiry and eviction"""
+
+    def test_round_trip(self, tmp_path):
+        """Test that a stored result is returned and counted as a hit"""
+        cache = ChunkResultCache(tmp_path)
+        key = ChunkResultCache.key_for(ENTRIES, "analyze")
+
+        assert cache.get(key) is None
+        cache.put(key, {"result": {"findings": 3}})
+
+        assert cache.get(key) == {"result": {"findings": 3}}
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_expired_entry_removed(self, tmp_path):
+        """Test that results older than the TTL are ignored and deleted"""
+        cache = ChunkResultCache(tmp_path, ttl_seconds=0.05)
+        cache.put("k1", {"result": "old"})
+
+        time.sleep(0.1)
+
+        assert cache.get("k1") is None
+        assert not (tmp_path / "k1.json").exists()
+
+    def test_lru_eviction(self, tmp_path):
+        """Test that the least recently used results are evicted over the byte budget"""
+        cache = ChunkResultCache(tmp_path, max_bytes=10 ** 6)
+        for index, key in enumerate(("a", "b", "c")):
+            cache.put(key, {"result": "x" * 1000})
+            os.utime(tmp_path / f"{key}.json", (1000 + index, time.time() - 100 + index))
+        assert cache.get("a") is not None  # Refreshes "a"
+
+        cache.max_bytes = 2500
+        cache.evict()
+
+        assert sorted(path.stem for path in tmp_path.glob("*.json")) == ["a", "c"]
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Unit tests for scripts/chunking_analyzer.py and scripts/chunk_creator.py
+
+Covers chunking decisions on plain JSON size and on encoded (compressed)
+wire size, sizing from the JSON bytes carried by collected entries,
+splitting of entries larger than the chunk size limit, and turn-aware chunk
+boundaries.
+"""
+
+import gzip
+import json
+import sys
+from pathlib import Path
+
+# Add scripts directory to path
+scripts_dir = Path(__file__).parent.parent / "scripts"
+sys.path.insert(0, str(scripts_dir))
+
+from chunking_analyzer import ChunkingAnalyzer
+from chunk_creator import ChunkCreator, group_turns, split_oversized_entry, reassemble_entry
+from agent_logs import LogStream
+
+
+def _entries(count, text_bytes):
+    return [{"type": "assistant", "uuid": f"uuid-{i}", "text": "a" * text_bytes} for i in range(count)]
+
+
+class TestChunkingAnalyzerWireSize:
+    """Test that size thresholds follow the bytes actually sent"""
+
+    def test_plain_size_over_threshold(self):
+        """Test that a large file needs chunking when sent as plain JSON"""
+        logs = _entries(100, 60 * 1024)
+
+        strategy = ChunkingAnalyzer().analyze_files(logs, [{'name': 'big.jsonl', 'entries': 100}])
+
+        assert strategy.strategy == 'single_file_chunking'
+        assert strategy.file_analyses[0].wire_size_bytes is None
+
+    def test_compressed_size_under_threshold(self):
+        """Test that the same file fits in one message once compressed"""
+        logs = _entries(100, 60 * 1024)
+        analyzer = ChunkingAnalyzer(wire_size=lambda raw: len(gzip.compress(raw)))
+
+        strategy = analyzer.analyze_files(logs, [{'name': 'big.jsonl', 'entries': 100}])
+
+        analysis = strategy.file_analyses[0]
+        assert strategy.strategy == 'no_chunking'
+        assert analysis.wire_size_bytes < analysis.size_bytes
+
+    def test_entry_threshold_unaffected(self):
+        """Test that the entry limit still applies to compressed logs"""
+        logs = _entries(300, 10)
+        analyzer = ChunkingAnalyzer(wire_size=lambda raw: len(gzip.compress(raw)))
+
+        strategy = analyzer.analyze_files(logs, [{'name': 'many.jsonl', 'entries': 300}])
+
+        assert strategy.strategy == 'single_file_chunking'
+
+
+class TestChunkCreatorCompressionRatio:
+    """Test chunk sizing when chunks are compressed for transport"""
+
+    def test_ratio_allows_larger_chunks(self):
+        """Test that fewer chunks are created when the size limit applies to compressed bytes"""
+        entries = _entries(200, 60 * 1024)
+
+        plain = ChunkCreator().create_chunks(entries, 'big.jsonl', 'abc123')
+        compressed = ChunkCreator(compression_ratio=4.0).create_chunks(entries, 'big.jsonl', 'abc123')
+
+        assert len(compressed) < len(plain)
+        assert sum(chunk.metadata.entries_in_chunk for chunk in compressed) == 200
+
+    def test_ratio_never_below_one(self):
+        """Test that incompressible data does not shrink chunks below the plain limit"""
+        assert ChunkCreator(compression_ratio=0.5).compression_ratio == 1.0
+
+
+def _turn(turn, tools=1):
+    """A user prompt followed by tool calls, their results and a final answer."""
+    entries = [{"type": "user", "uuid": f"t{turn}-prompt", "message": {"role": "user", "content": "Run the tests"}}]
+    parent = entries[0]["uuid"]
+    for tool in range(tools):
+        tool_id = f"toolu_{turn}_{tool}"
+        entries.append({"type": "assistant", "uuid": f"{tool_id}-call", "parentUuid": parent,
+                        "message": {"content": [{"type": "tool_use", "id": tool_id, "name": "Bash"}]}})
+        entries.append({"type": "user", "uuid": f"{tool_id}-result", "parentUuid": f"{tool_id}-call",
+                        "message": {"content": [{"type": "tool_result", "tool_use_id": tool_id, "content": "ok"}]}})
+        parent = f"{tool_id}-result"
+    entries.append({"type": "assistant", "uuid": f"t{turn}-answer", "parentUuid": parent,
+                    "message": {"content": [{"type": "text", "text": "All tests pass"}]}})
+    return entries
+
+
+class TestTurnAwareChunking:
+    """Test that chunk boundaries follow conversational turns"""
+
+    def test_group_turns_by_prompt(self):
+        """Test that each user prompt opens a turn"""
+        entries = _turn(0) + _turn(1, tools=2)
+
+        turns, _ = group_turns(entries)
+
+        assert turns == [(0, 4), (4, 10)]
+
+    def test_late_tool_result_merges_turns(self):
+        """Test that a tool result arriving after a new prompt joins the call's turn"""
+        entries = _turn(0)[:2] + _turn(1) + _turn(0)[2:]
+
+        turns, _ = group_turns(entries)
+
+        assert turns == [(0, len(entries))]
+
+    def test_codex_call_ids_linked(self):
+        """Test that Codex function calls and outputs are linked by call_id"""
+        entries = [
+            {"type": "response_item", "payload": {"type": "message", "role": "user", "content": "fix it"}},
+            {"type": "response_item", "payload": {"type": "function_call", "call_id": "call_1"}},
+            {"type": "response_item", "payload": {"type": "message", "role": "user", "content": "and this"}},
+            {"type": "response_item", "payload": {"type": "function_call_output", "call_id": "call_1"}},
+        ]
+
+        turns, links = group_turns(entries)
+
+        assert turns == [(0, 4)]
+        assert links[1] == (("call_1",), ()) and links[3] == ((), ("call_1",))
+
+    def test_whole_turns_packed(self):
+        """Test that chunks end on turn boundaries when turns fit"""
+        entries = [entry for turn in range(6) for entry in _turn(turn)]
+        creator = ChunkCreator()
+        creator.MAX_ENTRIES_PER_CHUNK = 10
+
+        chunks = creator.create_chunks(entries, 'session.jsonl', 'abc123')
+
+        assert [chunk.metadata.entries_in_chunk for chunk in chunks] == [8, 8, 8]
+        assert creator.stats.turns == 6
+        assert creator.stats.turns_split == 0
+        assert creator.stats.tool_pairs == 6 and creator.stats.tool_pairs_split == 0
+
+    def test_large_turn_split_between_tool_pairs(self):
+        """Test that a turn too large for one chunk is cut where no tool call is open"""
+        entries = _turn(0, tools=10)
+        creator = ChunkCreator()
+        creator.MAX_ENTRIES_PER_CHUNK = 6
+
+        chunks = creator.create_chunks(entries, 'session.jsonl', 'abc123')
+
+        assert sum(chunk.metadata.entries_in_chunk for chunk in chunks) == len(entries)
+        assert creator.stats.turns_split == len(chunks) - 1
+        assert creator.stats.tool_pairs_split == 0
+
+    def test_token_budget(self):
+        """Test that the estimated token budget limits chunk content"""
+        entries = _entries(20, 4000)
+        creator = ChunkCreator(max_tokens=5000)
+
+        chunks = creator.create_chunks(entries, 'big.jsonl', 'abc123')
+
+        assert len(chunks) == 5
+        assert creator.stats.max_chunk_tokens <= 5000
+
+
+class TestOversizedEntrySplitting:
+    """Test that entries over the size limit are segmented into fragments"""
+
+    @staticmethod
+    def _big_entry():
+        return {
+            "type": "user", "uuid": "uuid-big", "sessionId": "s1",
+            "message": {"content": [
+                {"type": "tool_result", "content": 'line "quoted" é\n' * 20000},
+                {"type": "text", "text": "b" * 150000}
+            ]}
+        }
+
+    def test_fragments_fit_and_reassemble(self):
+        """Test that every fragment fits and the parts rebuild the entry"""
+        entry = self._big_entry()
+
+        fragments = split_oversized_entry(entry, 64 * 1024)
+
+        assert len(fragments) > 1
+        assert all(len(json.dumps(fragment)) <= 64 * 1024 for fragment in fragments)
+        assert [fragment["_fragment"]["part_index"] for fragment in fragments] == list(range(len(fragments)))
+        assert {fragment["_fragment"]["part_count"] for fragment in fragments} == {len(fragments)}
+        assert len({fragment["_fragment"]["original_hash"] for fragment in fragments}) == 1
+        assert all(fragment["uuid"] == "uuid-big" for fragment in fragments)
+        assert reassemble_entry(list(reversed(fragments))) == entry
+
+    def test_first_fragment_is_truncated_entry(self):
+        """Test that the first fragment keeps the entry's structure"""
+        first = split_oversized_entry(self._big_entry(), 64 * 1024)[0]
+
+        assert first["message"]["content"][0]["type"] == "tool_result"
+        assert first["message"]["content"][0]["content"].startswith('line "quoted"')
+
+    def test_unsplittable_entry_returned_whole(self):
+        """Test that an entry too large without its strings is left as is"""
+        entry = {"type": "user", "values": list(range(50000))}
+
+        assert split_oversized_entry(entry, 64 * 1024) == [entry]
+
+    def test_chunks_around_split_entry_unchanged(self):
+        """Test that fragments get their own chunks and other chunks are unaffected"""
+        small = _entries(10, 10)
+        big = {"type": "user", "uuid": "uuid-big", "text": "x" * (6 * 1024 * 1024)}
+
+        chunks = ChunkCreator().create_chunks(small + [big] + small, 'big.jsonl', 'abc123')
+
+        fragments = [chunk for chunk in chunks if chunk.metadata.part_count]
+        assert chunks[0].entries == small and chunks[-1].entries == small
+        assert (chunks[-1].metadata.start_entry_index, chunks[-1].metadata.end_entry_index) == (11, 20)
+        assert len(fragments) == fragments[0].metadata.part_count == 3
+        assert all(chunk.metadata.start_entry_index == 10 for chunk in fragments)
+        assert all(chunk.metadata.chunk_size_mb <= ChunkCreator.MAX_CHUNK_SIZE_MB for chunk in chunks)
+        assert reassemble_entry([chunk.entries[0] for chunk in fragments]) == big
+
+
+class TestEntryBytes:
+    """Test that sizing and hashing use each entry's JSON bytes"""
+
+    def test_size_matches_serialized_logs(self, tmp_path):
+        """Test that collected and plain entries are sized as the JSON sent"""
+        log_file = tmp_path / "session.jsonl"
+        log_file.write_text("".join(json.dumps(entry) + "\n" for entry in _entries(20, 100)))
+        collected = list(LogStream(log_file=log_file))
+
+        for logs in (collected, [dict(entry) for entry in collected]):
+            analysis = ChunkingAnalyzer().analyze_files(logs, [{'name': 'session.jsonl', 'entries': 20}]).file_analyses[0]
+            assert analysis.size_bytes == len(json.dumps(logs))
+
+    def test_hash_depends_on_content_and_name(self):
+        """Test that the file hash is deterministic and distinguishes files"""
+        analyzer = ChunkingAnalyzer()
+
+        def file_hash(logs, name):
+            return analyzer.analyze_files(logs, [{'name': name, 'entries': len(logs)}]).file_analyses[0].file_hash
+
+        assert file_hash(_entries(3, 10), 'a.jsonl') == file_hash(_entries(3, 10), 'a.jsonl')
+        assert file_hash(_entries(3, 10), 'a.jsonl') != file_hash(_entries(3, 10), 'b.jsonl')
+        assert file_hash(_entries(3, 10), 'a.jsonl') != file_hash(_entries(3, 11), 'a.jsonl')
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Unit tests for WebSocketConnectionPool in scripts/agent_cli.py
+
+Covers pool sizing from the server's max_chunk_connections capability, queue
+dispatch across connections, replacement of connections whose item failed or
+timed out, retransmission with backoff, and ChunkAckTracker bookkeeping.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.agent_cli import WebSocketConnectionPool, ChunkAckTracker, DebugManager, DebugLevel
+
+
+class FakeClient:
+    """Stands in for a WebSocketClient: connect/receive_events/close only."""
+
+    created = []
+
+    def __init__(self, server_max_connections=None, connect_ok=True):
+        self.server_max_connections = server_max_connections
+        self.connect_ok = connect_ok
+        self.closed = False
+        self.handled = []
+        self.receiver_task = None  # Set by the real connect(); the pool then starts receive_events itself
+        FakeClient.created.append(self)
+
+    async def connect(self):
+        return self.connect_ok
+
+    async def receive_events(self):
+        await asyncio.Event().wait()
+
+    async def close(self):
+        self.closed = True
+
+
+def _pool(size, **client_kwargs):
+    FakeClient.created = []
+    return WebSocketConnectionPool(lambda: FakeClient(**client_kwargs), size=size,
+                                   debug=DebugManager(debug_level=DebugLevel.SILENT))
+
+
+class TestConnectionPool:
+    """Test pooled chunk dispatch"""
+
+    def test_pool_capped_by_server(self):
+        """Test that max_chunk_connections from the handshake caps the pool"""
+        async def scenario():
+            pool = _pool(8, server_max_connections=3)
+            opened = await pool.open()
+            await pool.close()
+            return opened
+
+        assert asyncio.run(scenario()) == 3
+        assert len(FakeClient.created) == 3
+        assert all(client.closed for client in FakeClient.created)
+
+    def test_items_spread_over_connections(self):
+        """Test that every item is processed, in order, over the open connections"""
+        async def handler(client, item):
+            client.handled.append(item)
+            await asyncio.sleep(0.01)
+            return item * 10
+
+        async def scenario():
+            pool = _pool(2)
+            await pool.open()
+            results = await pool.run(list(range(6)), handler)
+            await pool.close()
+            return results
+
+        assert asyncio.run(scenario()) == [0, 10, 20, 30, 40, 50]
+        assert len(FakeClient.created) == 2
+        assert all(client.handled for client in FakeClient.created)
+
+    def test_failed_and_timed_out_items_replace_connection(self):
+        """Test that a raising handler fails only its item and its connection is replaced"""
+        async def handler(client, item):
+            if item == "boom":
+                raise RuntimeError("connection dropped")
+            if item == "slow":
+                raise asyncio.TimeoutError("no agent_completed")
+            return item
+
+        async def scenario():
+            pool = _pool(1)
+            await pool.open()
+            results = await pool.run(["a", "boom", "b", "slow", "c"], handler)
+            await pool.close()
+            return results
+
+        assert asyncio.run(scenario()) == ["a", False, "b", None, "c"]
+        # Initial connection plus one replacement per failure
+        assert len(FakeClient.created) == 3
+        assert all(client.closed for client in FakeClient.created)
+
+    def test_no_connection(self):
+        """Test that a pool whose first connection fails reports zero connections"""
+        async def scenario():
+            pool = _pool(4, connect_ok=False)
+            return await pool.open()
+
+        assert asyncio.run(scenario()) == 0
+
+    def test_failed_items_retransmitted_with_backoff(self):
+        """Test that only failing items are resent, with growing delays, until retries run out"""
+        calls = {}
+        retries_seen = []
+
+        async def handler(client, item):
+            calls[item] = calls.get(item, 0) + 1
+            if item == "flaky" and calls[item] < 3:
+                raise asyncio.TimeoutError("not acknowledged")
+            if item == "broken":
+                raise RuntimeError("rejected")
+            return item
+
+        async def scenario():
+            pool = _pool(2)
+            await pool.open()
+            results = await pool.run(
+                ["a", "flaky", "broken", "b"], handler, retries=2, backoff=0.01,
+                on_retry=lambda item, attempt, delay: retries_seen.append((item, attempt, delay))
+            )
+            await pool.close()
+            return results
+
+        assert asyncio.run(scenario()) == ["a", "flaky", False, "b"]
+        assert calls == {"a": 1, "flaky": 3, "broken": 3, "b": 1}
+        assert sorted(retries_seen) == [
+            ("broken", 2, 0.01), ("broken", 3, 0.02),
+            ("flaky", 2, 0.01), ("flaky", 3, 0.02),
+        ]
+
+
+def _chunk(chunk_id, chunk_index):
+    return SimpleNamespace(metadata=SimpleNamespace(chunk_id=chunk_id, chunk_index=chunk_index))
+
+
+class TestChunkAckTracker:
+    """Test per-chunk delivery state"""
+
+    def test_tally(self):
+        """Test that chunks of different files are tracked apart and resends are counted"""
+        tracker = ChunkAckTracker([_chunk("file-a", 0), _chunk("file-a", 1), _chunk("file-b", 0)])
+
+        tracker.cached(0)
+        tracker.sent(1)
+        tracker.sent(1)
+        tracker.acked(1)
+        tracker.completed(1)
+        tracker.sent(2)
+
+        assert tracker.missing() == [2]
+        assert tracker.retransmits == 1
+        assert len(tracker.ack_latencies) == 1
+        assert tracker.count(ChunkAckTracker.CACHED) == 1
+        assert tracker.count(ChunkAckTracker.COMPLETED) == 1
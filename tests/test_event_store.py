@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Unit tests for EventStore in scripts/agent_cli.py
+
+Covers the in-memory ring with absolute positions, the type and run_id
+indexes, NDJSON spill of evicted events, and the output generators querying
+the store.
+"""
+
+import json
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.agent_cli import EventStore, ExitCodeGenerator, WebSocketEvent
+
+
+def _event(event_type, **data):
+    return WebSocketEvent(type=event_type, data=data)
+
+
+class TestEventStore:
+    """Test bounded storage and indexes"""
+
+    def test_ring_keeps_absolute_positions(self):
+        """Test that eviction keeps len() and positions stable for cursors"""
+        store = EventStore(max_events=3)
+        for number in range(5):
+            store.append(_event("agent_thinking", n=number))
+
+        assert len(store) == 5
+        assert store.evicted == 2
+        assert store.first_position == 2
+        assert [event.data["n"] for event in store] == [2, 3, 4]
+        assert store[4].data["n"] == 4
+        assert [event.data["n"] for event in store.since(0)] == [2, 3, 4]
+        assert [event.data["n"] for event in store.since(4)] == [4]
+        try:
+            store[1]
+        except IndexError:
+            pass
+        else:
+            raise AssertionError("evicted position should raise IndexError")
+
+    def test_indexes_follow_eviction(self):
+        """Test that type and run indexes only return events in memory while counts stay all-time"""
+        store = EventStore(max_events=3)
+        store.append(_event("agent_started", run_id="r1"))
+        store.append(_event("agent_thinking", payload={"run_id": "r1"}))
+        store.append(_event("agent_completed", run_id="r2"))
+        store.append(_event("agent_completed", run_id="r1"))
+
+        assert store.of_type("agent_started") == []
+        assert store.count("agent_started") == 1
+        assert [event.data["run_id"] for event in store.of_type("agent_completed")] == ["r2", "r1"]
+        assert [event.type for event in store.of_type("agent_completed", "agent_thinking")] == [
+            "agent_thinking", "agent_completed", "agent_completed"
+        ]
+        assert [event.type for event in store.for_run("r1")] == ["agent_thinking", "agent_completed"]
+        assert store.types_seen() == {"agent_started", "agent_thinking", "agent_completed"}
+
+    def test_spill_evicted_events(self, tmp_path):
+        """Test that evicted events are appended to the NDJSON spill file"""
+        spill_path = tmp_path / "events.ndjson"
+        store = EventStore(max_events=2, spill_path=spill_path)
+        for number in range(4):
+            store.append(_event("backend_log", n=number))
+        store.close()
+
+        spilled = [json.loads(line) for line in spill_path.read_text().splitlines()]
+        assert [(record["position"], record["data"]["n"]) for record in spilled] == [(0, 0), (1, 1)]
+
+    def test_unbounded(self):
+        """Test that a zero limit keeps every event"""
+        store = EventStore(max_events=0)
+        for _ in range(50):
+            store.append(_event("agent_thinking"))
+        assert store.evicted == 0
+        assert len(list(store)) == 50
+
+
+class TestGeneratorsWithStore:
+    """Test output generators on lists and stores"""
+
+    def test_exit_code_from_list_and_store(self):
+        """Test that ExitCodeGenerator answers the same for a list and an evicting store"""
+        events = [_event("agent_started"), _event("agent_thinking"), _event("agent_completed")]
+        store = EventStore(max_events=1)
+        for event in events:
+            store.append(event)
+
+        assert ExitCodeGenerator(events, []).determine_exit_code() == 0
+        assert ExitCodeGenerator(store, []).determine_exit_code() == 0
+        assert ExitCodeGenerator(events[1:], []).determine_exit_code() == 1
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the event waiter registry in WebSocketClient.
+
+Waits on events and connection state are woken by receive_events instead of
+polling, so a wait returns as soon as the event or state change arrives.
+"""
+
+import asyncio
+import os
+import sys
+from unittest.mock import MagicMock
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.agent_cli import WebSocketClient, WebSocketEvent, Environment
+
+
+def _client():
+    config = MagicMock()
+    config.ws_url = "ws://localhost:8000/ws"
+    config.environment = Environment.LOCAL
+    config.json_mode = False
+    config.ci_mode = False
+    return WebSocketClient(config, "test_token", MagicMock())
+
+
+class TestEventWaiters:
+    """Test event-driven waits"""
+
+    def test_wait_for_event_wakes_on_arrival(self):
+        """Test that a waiter returns the matching event as soon as it is recorded"""
+        async def scenario():
+            client = _client()
+            loop = asyncio.get_running_loop()
+            loop.call_later(0.02, client._record_event, WebSocketEvent(type="agent_thinking", data={}))
+            loop.call_later(0.03, client._record_event, WebSocketEvent(type="agent_completed", data={"result": 1}))
+
+            start = loop.time()
+            event = await client._wait_for_event("agent_completed", timeout=5.0)
+            return event, loop.time() - start, client._event_waiters
+
+        event, elapsed, waiters = asyncio.run(scenario())
+        assert event.data == {"result": 1}
+        assert elapsed < 1.0
+        assert not any(waiters.values())
+
+    def test_wait_for_event_nested_and_start_index(self):
+        """Test that nested system_message events match and earlier events are skipped"""
+        async def scenario():
+            client = _client()
+            client._record_event(WebSocketEvent(type="agent_started", data={"run": "old"}))
+            start_index = len(client.events)
+            asyncio.get_running_loop().call_later(
+                0.01, client._record_event,
+                WebSocketEvent(type="system_message", data={"event": "agent_started", "run": "new"})
+            )
+            return await client._wait_for_event("agent_started", timeout=5.0, start_index=start_index)
+
+        assert asyncio.run(scenario()).data["run"] == "new"
+
+    def test_wait_for_event_timeout(self):
+        """Test that a wait with no matching event returns None after the timeout"""
+        async def scenario():
+            client = _client()
+            result = await client._wait_for_event("agent_completed", timeout=0.05)
+            return result, client._event_waiters
+
+        result, waiters = asyncio.run(scenario())
+        assert result is None
+        assert not any(waiters.values())
+
+    def test_state_flags_wake_waiters(self):
+        """Test that assigning a connection flag wakes _wait_until"""
+        async def scenario():
+            client = _client()
+            asyncio.get_running_loop().call_later(0.01, setattr, client, "ready_to_send_events", True)
+            ready = await client._wait_until(lambda: client.ready_to_send_events, timeout=5.0)
+            never = await client._wait_until(lambda: client.cleanup_complete, timeout=0.05)
+            return ready, never
+
+        assert asyncio.run(scenario()) == (True, False)
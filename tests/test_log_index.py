@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Unit tests for scripts/log_index.py
+
+Covers incremental indexing by file offset, re-indexing of rewritten files,
+cost attribution per turn, tool/full-text filters and --since parsing.
+"""
+
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.agent_logs import LogProvider
+from scripts.log_index import LogIndex, parse_since
+
+
+def _assistant(message_id, timestamp, blocks, output_tokens, model="claude-sonnet-4-20250514"):
+    return {"type": "assistant", "sessionId": "s1", "timestamp": timestamp, "message": {
+        "id": message_id, "model": model, "content": blocks,
+        "usage": {"input_tokens": 100, "output_tokens": output_tokens, "cache_read_input_tokens": 1000}
+    }}
+
+
+def _bash(command):
+    return {"type": "tool_use", "id": f"toolu_{abs(hash(command))}", "name": "Bash", "input": {"command": command}}
+
+
+def _write(log_file, entries, mode='w'):
+    with open(log_file, mode) as f:
+        f.write("".join(json.dumps(entry) + "\n" for entry in entries))
+
+
+@pytest.fixture
+def session(tmp_path):
+    project = tmp_path / "projects" / "my-project"
+    project.mkdir(parents=True)
+    log_file = project / "s1.jsonl"
+    _write(log_file, [
+        {"type": "user", "sessionId": "s1", "timestamp": "2026-10-10T09:00:00Z",
+         "message": {"role": "user", "content": "Please run the test suite"}},
+        _assistant("msg_1", "2026-10-10T09:00:05Z", [_bash("pytest -q tests/")], 40),
+        _assistant("msg_2", "2026-10-10T09:01:00Z", [{"type": "text", "text": "Found a flaky test."}], 5),
+        # Streamed continuation of msg_2 with its final usage
+        _assistant("msg_2", "2026-10-10T09:01:01Z", [_bash("git diff")], 4000),
+    ])
+    return log_file
+
+
+@pytest.fixture
+def index(tmp_path):
+    with LogIndex(tmp_path / "index.db") as log_index:
+        yield log_index
+
+
+class TestIndexing:
+    """Test incremental ingestion"""
+
+    def test_index_directory(self, index, session):
+        stats = index.index_paths([session.parent.parent], LogProvider.CLAUDE, ["*/*.jsonl"])
+
+        assert stats.files_seen == 1
+        assert stats.entries_added == 4
+        row = index.conn.execute("SELECT project, session_id FROM entries LIMIT 1").fetchone()
+        assert (row["project"], row["session_id"]) == ("my-project", "s1")
+
+    def test_unchanged_file_skipped(self, index, session):
+        index.index_file(session, LogProvider.CLAUDE)
+
+        assert index.index_file(session, LogProvider.CLAUDE) == 0
+
+    def test_appended_entries_only(self, index, session):
+        index.index_file(session, LogProvider.CLAUDE)
+        _write(session, [_assistant("msg_3", "2026-10-10T09:05:00Z", [_bash("pytest -x")], 10)], mode='a')
+
+        assert index.index_file(session, LogProvider.CLAUDE) == 1
+        assert index.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0] == 5
+
+    def test_rewritten_file_reindexed(self, index, session):
+        index.index_file(session, LogProvider.CLAUDE)
+        _write(session, [_assistant("msg_9", "2026-10-11T09:00:00Z", [_bash("make build")], 10)])
+
+        assert index.index_file(session, LogProvider.CLAUDE) == 1
+        assert index.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0] == 1
+        assert index.query(search="pytest") == []
+        assert len(index.query(search="make")) == 1
+
+
+class TestQueries:
+    """Test structured and full-text queries"""
+
+    def test_top_cost_counts_streamed_message_once(self, index, session):
+        index.index_file(session, LogProvider.CLAUDE)
+
+        turns = index.query(top_cost=True)
+
+        assert [turn["turn_id"] for turn in turns] == ["msg_2", "msg_1"]
+        assert turns[0]["output_tokens"] == 4000
+
+    def test_tool_and_search(self, index, session):
+        index.index_file(session, LogProvider.CLAUDE)
+
+        rows = index.query(tool="Bash", search="pytest")
+
+        assert len(rows) == 1
+        assert rows[0]["tools"] == "Bash"
+        assert "[pytest]" in rows[0]["text"]
+
+    def test_since_filter(self, index, session):
+        index.index_file(session, LogProvider.CLAUDE)
+
+        assert len(index.query(since="2026-10-10T09:00:30")) == 2
+        assert len(index.query(top_cost=True, since="2026-10-10T09:00:30")) == 1
+
+    def test_raw_sql_read_only(self, index, session):
+        index.index_file(session, LogProvider.CLAUDE)
+
+        assert index.execute("SELECT COUNT(*) AS n FROM tool_calls")[0]["n"] == 2
+        with pytest.raises(ValueError):
+            index.execute("DELETE FROM entries")
+
+
+class TestParseSince:
+    """Test --since parsing"""
+
+    def test_relative(self):
+        now = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+        assert parse_since("7d", now) == "2026-10-11T12:00:00"
+        assert parse_since("90m", now) == "2026-10-18T10:30:00"
+
+    def test_absolute(self):
+        assert parse_since("2026-10-01") == "2026-10-01T00:00:00"
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            parse_since("last week")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Unit tests for scripts/mock_backend.py and scripts/benchmark_agent_cli.py
+
+The real WebSocketClient connects to the in-process mock backend, so the
+handshake, event stream and failure injection are exercised end to end.
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+import websockets
+
+# Add parent and scripts directories to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from mock_backend import MockBackend, MockBackendConfig
+from benchmark_agent_cli import BenchmarkResult, regressions
+from agent_cli import (
+    Config, DebugLevel, DebugManager, Environment, WebSocketClient, WebSocketConnectionPool
+)
+
+
+def _client(backend, tmp_path):
+    config = Config(environment=Environment.DEVELOPMENT, custom_backend_url=backend.backend_url, json_mode=True)
+    client = WebSocketClient(config, "mock-token", DebugManager(debug_level=DebugLevel.SILENT))
+    client.thread_cache_file = tmp_path / "thread_cache.json"
+    return client
+
+
+class TestMockBackend:
+    """Test the mock backend against the real client"""
+
+    def test_handshake_and_event_stream(self, tmp_path):
+        """Test that a client connects, sends a message and receives the agent stream"""
+        async def scenario():
+            async with MockBackend(MockBackendConfig(thinking_events=2, max_chunk_connections=3)) as backend:
+                client = _client(backend, tmp_path)
+                connected = await client.connect()
+                start_index = len(client.events)
+                await client.send_message("hello")
+                completed = await client._wait_for_event("agent_completed", timeout=5.0, start_index=start_index)
+                types = [event.type for event in client.events.since(start_index)]
+                await client.close()
+                return connected, client, completed, types, backend.stats
+
+        connected, client, completed, types, stats = asyncio.run(scenario())
+        assert connected
+        assert client.current_thread_id.startswith("thread_")
+        assert client.server_max_connections == 3
+        assert client.server_log_encodings == ["gzip+b64"]
+        assert types == ["agent_started", "agent_thinking", "agent_thinking", "agent_completed"]
+        assert completed.data["result"]["summary"] == "Mock analysis complete"
+        assert stats.messages == 1 and stats.bytes_received > 0
+
+    def test_dropped_messages_get_no_reply(self, tmp_path):
+        """Test that drop_rate=1 leaves a message unanswered"""
+        async def scenario():
+            async with MockBackend(MockBackendConfig(drop_rate=1.0)) as backend:
+                client = _client(backend, tmp_path)
+                await client.connect()
+                start_index = len(client.events)
+                await client.send_message("hello")
+                started = await client._wait_for_event("agent_started", timeout=0.3, start_index=start_index)
+                await client.close()
+                return started, backend.stats
+
+        started, stats = asyncio.run(scenario())
+        assert started is None
+        assert stats.dropped == 1
+
+    def test_rejected_connections_close_before_handshake(self):
+        """Test that reject_rate=1 closes the connection with 1011"""
+        async def scenario():
+            async with MockBackend(MockBackendConfig(reject_rate=1.0)) as backend:
+                async with websockets.connect(backend.ws_url) as ws:
+                    try:
+                        await ws.recv()
+                    except websockets.exceptions.ConnectionClosed as e:
+                        return e.rcvd.code, backend.stats.rejected
+            return None, None
+
+        assert asyncio.run(scenario()) == (1011, 1)
+
+    def test_pool_tracks_the_connect_receiver(self, tmp_path):
+        """Test that pooled connections keep a single live receiver per socket"""
+        async def scenario():
+            async with MockBackend() as backend:
+                pool = WebSocketConnectionPool(lambda: _client(backend, tmp_path), 2, DebugManager(debug_level=DebugLevel.SILENT))
+                await pool.open()
+                await asyncio.sleep(0.05)
+                alive = [not pool._receivers[id(client)].done() for client in pool.clients]
+                await pool.close()
+                return alive
+
+        assert asyncio.run(scenario()) == [True, True]
+
+
+class TestBenchmarkBaseline:
+    """Test baseline comparison"""
+
+    def test_regressions_respect_direction_and_noise_floor(self):
+        """Test that only changes in the worse direction beyond tolerance and noise count"""
+        baseline = {"baselines": {
+            "connect_latency": {"mean": 500.0},
+            "time_to_first_event": {"mean": 1.0},
+            "events_per_second": {"mean": 1000.0},
+        }}
+        results = {
+            "connect_latency": BenchmarkResult("connect_latency", "ms", False, noise_floor=5.0, samples=[700.0]),
+            "time_to_first_event": BenchmarkResult("time_to_first_event", "ms", False, noise_floor=5.0, samples=[2.0]),
+            "events_per_second": BenchmarkResult("events_per_second", "events/s", True, samples=[1500.0]),
+        }
+
+        assert regressions(results, baseline) == ["connect_latency"]
+        assert regressions(results, None) == []
+        assert json.loads(json.dumps(results["connect_latency"].to_dict()))["mean"] == 700.0
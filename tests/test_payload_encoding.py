@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Unit tests for WebSocketClient._encode_payload in scripts/agent_cli.py
+
+The message is encoded once into a single buffer, with the sizes of its log
+sections measured during encoding.
+"""
+
+import json
+import os
+import sys
+
+# Add parent and scripts directories to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from scripts.agent_cli import WebSocketClient, EncodedPayload
+
+
+def _message(**body):
+    return {"type": "user_message", "payload": {"content": "Analyze these logs", "run_id": "r1", **body}}
+
+
+class TestEncodePayload:
+    """Test single-pass payload encoding"""
+
+    def test_round_trip_with_sections(self):
+        """Test that logs and blobs are spliced into valid JSON and measured"""
+        logs = [{"type": "user", "message": {"content": "héllo \"quoted\""}}, {"type": "assistant", "n": 2}]
+        blobs = {"b1": "x" * 100}
+        message = _message(jsonl_logs=logs, jsonl_logs_blobs=blobs)
+
+        encoded = WebSocketClient._encode_payload(message)
+
+        assert json.loads(encoded.data) == message
+        assert encoded.section_sizes == {
+            "jsonl_logs": len(json.dumps(logs).encode("utf-8")),
+            "jsonl_logs_blobs": len(json.dumps(blobs).encode("utf-8")),
+        }
+        assert encoded.logs_size == sum(encoded.section_sizes.values())
+
+    def test_encoded_logs_string(self):
+        """Test that an encoded (compressed) jsonl_logs string is measured as its JSON string"""
+        message = _message(jsonl_logs="H4sIAAAA", jsonl_logs_encoding="gzip+base64")
+
+        encoded = WebSocketClient._encode_payload(message)
+
+        assert json.loads(encoded.data) == message
+        assert encoded.section_sizes == {"jsonl_logs": len('"H4sIAAAA"')}
+
+    def test_message_without_logs(self):
+        """Test that a plain message is encoded as regular JSON"""
+        encoded = WebSocketClient._encode_payload(_message())
+        assert json.loads(encoded.data) == _message()
+        assert encoded.logs_size == 0
+
+    def test_preview_truncates(self):
+        """Test that the diagnostic preview is bounded"""
+        encoded = EncodedPayload(b"a" * 5000)
+        preview = encoded.preview(100)
+        assert preview.startswith("a" * 100)
+        assert preview.endswith("[4,900 more bytes]")
+        assert EncodedPayload(b"short").preview() == "short"
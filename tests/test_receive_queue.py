@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the decoupled receive loop in WebSocketClient.
+
+The socket read loop only queues frames; a consumer task decodes and
+dispatches them in order, so slow rendering never stalls reads.
+"""
+
+import asyncio
+import json
+import os
+import sys
+from unittest.mock import MagicMock
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.agent_cli import WebSocketClient, DebugManager, DebugLevel, Environment
+
+
+class FakeSocket:
+    """Async-iterable socket that records when each frame was read."""
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.read_times = []
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        loop = asyncio.get_running_loop()
+        for frame in self.frames:
+            await asyncio.sleep(0)
+            self.read_times.append(loop.time())
+            yield frame
+
+
+def _client():
+    config = MagicMock()
+    config.ws_url = "ws://localhost:8000/ws"
+    config.environment = Environment.LOCAL
+    config.json_mode = True
+    config.ci_mode = False
+    config.stream_logs = False
+    return WebSocketClient(config, "test_token", DebugManager(debug_level=DebugLevel.SILENT))
+
+
+class TestReceiveQueue:
+    """Test frame queueing and the consumer task"""
+
+    def test_slow_callback_does_not_stall_reads(self):
+        """Test that every frame is read before a slow callback finishes, and events keep order"""
+        frames = [json.dumps({"type": "agent_thinking", "n": n}) for n in range(5)] + ["not json"]
+        socket = FakeSocket(frames)
+        client = _client()
+        client.ws = socket
+        handled = []
+
+        async def slow_callback(event):
+            await asyncio.sleep(0.02)
+            handled.append(event.data["n"])
+
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            await client.receive_events(callback=slow_callback)
+            return start
+
+        start = asyncio.run(scenario())
+
+        # All frames were read well before five 20 ms callbacks could have completed
+        assert socket.read_times[-1] - start < 0.05
+        assert handled == [0, 1, 2, 3, 4]
+        assert [event.data["n"] for event in client.events] == [0, 1, 2, 3, 4]
+        assert client.receive_stats.frames == 6
+        assert client.receive_stats.max_queue_depth >= 2
+        assert client.receive_stats.max_lag >= 0.02
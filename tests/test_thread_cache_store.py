@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared thread state in scripts/agent_cli.py
+
+Clients in one process share the thread cache file (loaded once, written
+atomically and coalesced), positive thread validations for a TTL, and one
+aiohttp session per event loop.
+"""
+
+import asyncio
+import json
+import os
+import sys
+from unittest.mock import MagicMock
+
+# Add parent and scripts directories to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from agent_cli import (
+    DebugLevel, DebugManager, Environment, ThreadCacheStore, WebSocketClient,
+    close_http_session, get_http_session, run_async
+)
+
+
+def _client(cache_file, backend_url="http://backend.test"):
+    config = MagicMock()
+    config.ws_url = "ws://backend.test/ws"
+    config.backend_url = backend_url
+    config.environment = Environment.STAGING
+    client = WebSocketClient(config, "token-1", DebugManager(debug_level=DebugLevel.SILENT))
+    client.thread_cache_file = cache_file
+    return client
+
+
+class TestThreadCacheStore:
+    """Test the process-wide thread cache file"""
+
+    def test_clients_share_one_load(self, tmp_path):
+        """Test that clients on the same file share entries read once"""
+        cache_file = tmp_path / "thread_cache.json"
+        cache_file.write_text(json.dumps({"user": {"thread_id": "thread_1"}}))
+
+        first = _client(cache_file)
+        cache_file.write_text(json.dumps({}))
+        second = _client(cache_file)
+
+        assert second.thread_cache == {"user": {"thread_id": "thread_1"}}
+        assert first.thread_cache is second.thread_cache
+        assert ThreadCacheStore.for_path(cache_file) is first._thread_cache
+
+    def test_updates_in_a_loop_are_coalesced(self, tmp_path, monkeypatch):
+        """Test that a burst of updates becomes one atomic write"""
+        cache_file = tmp_path / "thread_cache.json"
+        store = ThreadCacheStore.for_path(cache_file)
+        monkeypatch.setattr(ThreadCacheStore, "WRITE_DELAY", 0.05)
+        writes = []
+        real_replace = os.replace
+        monkeypatch.setattr(os, "replace", lambda src, dst: (writes.append(dst), real_replace(src, dst)))
+
+        async def scenario():
+            for index in range(5):
+                store.entries[f"user-{index}"] = {"thread_id": f"thread_{index}"}
+                store.mark_dirty()
+            written_early = cache_file.exists()
+            await asyncio.sleep(0.1)
+            return written_early
+
+        assert asyncio.run(scenario()) is False
+        assert writes == [cache_file]
+        assert len(json.loads(cache_file.read_text())) == 5
+        assert not store.dirty
+        assert list(tmp_path.iterdir()) == [cache_file]
+
+    def test_update_outside_a_loop_writes_immediately(self, tmp_path):
+        """Test that synchronous callers still persist right away"""
+        cache_file = tmp_path / "nested" / "thread_cache.json"
+        store = ThreadCacheStore.for_path(cache_file)
+        store.entries["user"] = {"thread_id": "thread_1"}
+        store.mark_dirty()
+        assert json.loads(cache_file.read_text()) == {"user": {"thread_id": "thread_1"}}
+
+
+class TestThreadValidationCache:
+    """Test the TTL-bound validation cache"""
+
+    def test_positive_results_are_shared_until_expiry(self, tmp_path, monkeypatch):
+        """Test that a validated thread skips the backend for other clients until the TTL passes"""
+        WebSocketClient._validated_threads.clear()
+        first = _client(tmp_path / "thread_cache.json")
+        second = _client(tmp_path / "thread_cache.json")
+        other_backend = _client(tmp_path / "thread_cache.json", backend_url="http://other.test")
+        now = [1000.0]
+        monkeypatch.setattr("agent_cli.time.monotonic", lambda: now[0])
+
+        first._remember_valid_thread("thread_1")
+        assert asyncio.run(second._validate_thread_with_backend("thread_1")) is True
+
+        # Different backend and expired entries go back to the backend, which is unreachable here
+        session = MagicMock()
+        session.get.side_effect = OSError("unreachable")
+        monkeypatch.setattr("agent_cli.get_http_session", lambda: session)
+        assert asyncio.run(other_backend._validate_thread_with_backend("thread_1")) is False
+        now[0] += WebSocketClient.THREAD_VALIDATION_TTL + 1
+        assert asyncio.run(second._validate_thread_with_backend("thread_1")) is False
+        assert session.get.call_count == 2
+
+
+class TestSharedHttpSession:
+    """Test the process-wide aiohttp session"""
+
+    def test_one_session_per_loop_closed_by_run_async(self):
+        """Test that calls in a loop reuse the session and run_async closes it"""
+        async def scenario():
+            first = get_http_session()
+            second = get_http_session()
+            return first, second
+
+        first, second = run_async(scenario())
+        assert first is second
+        assert first.closed
+
+        async def another_loop():
+            session = get_http_session()
+            await close_http_session()
+            return session
+
+        assert run_async(another_loop()) is not first
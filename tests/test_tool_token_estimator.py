@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Tests for the calibrated tool token estimator
+
+Covers content classification, coefficient lookup, calibration sample
+extraction from usage deltas, least-squares fitting and the error report.
+"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from token_transparency.tool_token_estimator import (
+    CONTENT_CODE,
+    CONTENT_JSON,
+    CONTENT_PATHS,
+    CONTENT_PROSE,
+    CalibrationSample,
+    ToolTokenEstimator,
+    ToolTokenEstimatorConfig,
+    build_error_report,
+    classify_content,
+    collect_calibration_samples,
+    extract_calibration_samples,
+    fit_coefficients,
+)
+
+
+class TestClassifyContent(unittest.TestCase):
+    """Content classification for tool output"""
+
+    def test_json(self):
+        self.assertEqual(classify_content('{"name": "zen", "items": [1, 2]}'), CONTENT_JSON)
+
+    def test_paths(self):
+        listing = "/repo/src/main.py\n/repo/src/util.py\n/repo/tests/test_main.py\n"
+        self.assertEqual(classify_content(listing), CONTENT_PATHS)
+
+    def test_code(self):
+        source = "def main():\n    value = compute(x)\n    return value\n"
+        self.assertEqual(classify_content(source), CONTENT_CODE)
+
+    def test_prose(self):
+        text = "The build finished without errors and all checks passed as expected."
+        self.assertEqual(classify_content(text), CONTENT_PROSE)
+
+    def test_empty_is_prose(self):
+        self.assertEqual(classify_content("   "), CONTENT_PROSE)
+
+    def test_only_prefix_inspected(self):
+        text = "plain words here " * 10 + "{}();=<>" * 1000
+        self.assertEqual(classify_content(text, sample_chars=100), CONTENT_PROSE)
+
+
+class TestToolTokenEstimator(unittest.TestCase):
+    """Estimates from the precomputed coefficient table"""
+
+    def setUp(self):
+        self.estimator = ToolTokenEstimator()
+
+    def test_json_denser_than_prose(self):
+        json_text = json.dumps({f"key_{i}": i for i in range(200)})
+        prose_text = "word " * (len(json_text) // 5)
+        self.assertGreater(
+            self.estimator.estimate_text(json_text, CONTENT_JSON),
+            self.estimator.estimate_text(prose_text, CONTENT_PROSE)
+        )
+
+    def test_non_ascii_costs_more(self):
+        ascii_text = "a" * 1000
+        cjk_text = "字" * 1000
+        self.assertGreater(
+            self.estimator.estimate_text(cjk_text, CONTENT_PROSE),
+            self.estimator.estimate_text(ascii_text, CONTENT_PROSE)
+        )
+
+    def test_minimum_floors(self):
+        self.assertEqual(self.estimator.estimate_tool_data({"content": ""}), 25)
+        self.assertEqual(self.estimator.estimate_tool_data({"input": {}}, is_tool_use=True), 10)
+        self.assertEqual(self.estimator.estimate_tool_data({"input": "x"}, is_tool_use=True), 10)
+
+    def test_list_content_blocks(self):
+        block_content = [{"type": "text", "text": "hello " * 500}]
+        self.assertGreater(self.estimator.estimate_tool_data({"content": block_content}), 25)
+
+    def test_custom_coefficients(self):
+        estimator = ToolTokenEstimator(coefficients={
+            CONTENT_PROSE: {"chars_per_token": 10.0, "overhead": 0.0}
+        })
+        self.assertEqual(estimator.estimate_text("a" * 100, CONTENT_PROSE), 10)
+
+    def test_calibration_file_roundtrip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "calibration.json"
+            path.write_text(json.dumps({"coefficients": {
+                CONTENT_CODE: {"chars_per_token": 5.0, "overhead": 1.0}
+            }}))
+            estimator = ToolTokenEstimator.from_calibration_file(path)
+            self.assertEqual(estimator.coefficients[CONTENT_CODE]["chars_per_token"], 5.0)
+
+    def test_unreadable_calibration_falls_back(self):
+        estimator = ToolTokenEstimator.from_calibration_file(Path("/nonexistent/calibration.json"))
+        self.assertEqual(estimator.coefficients, ToolTokenEstimatorConfig().COEFFICIENTS)
+
+
+def _assistant(message_id, input_tokens, cache_read, output_tokens):
+    return {"type": "assistant", "message": {
+        "id": message_id,
+        "usage": {"input_tokens": input_tokens, "cache_read_input_tokens": cache_read,
+                  "output_tokens": output_tokens}
+    }}
+
+
+def _tool_result(content):
+    return {"type": "user", "message": {"content": [
+        {"type": "tool_result", "tool_use_id": "toolu_1", "content": content}
+    ]}}
+
+
+class TestCalibration(unittest.TestCase):
+    """Sample extraction, fitting and reporting"""
+
+    def test_extract_sample_from_usage_delta(self):
+        entries = [
+            _assistant("msg_1", 10, 1000, 50),
+            _tool_result("x" * 400),
+            _assistant("msg_2", 10, 1150, 20),
+        ]
+        samples = extract_calibration_samples(entries, "session.jsonl")
+        self.assertEqual(len(samples), 1)
+        self.assertEqual(samples[0].true_tokens, 100)
+        self.assertEqual(samples[0].ascii_chars, 400)
+
+    def test_streamed_blocks_share_usage(self):
+        entries = [
+            _assistant("msg_1", 10, 1000, 5),
+            _assistant("msg_1", 10, 1000, 50),
+            _tool_result("result"),
+            _assistant("msg_2", 10, 1150, 20),
+        ]
+        samples = extract_calibration_samples(entries)
+        self.assertEqual(len(samples), 1)
+        self.assertEqual(samples[0].true_tokens, 100)
+
+    def test_parallel_tool_results_skipped(self):
+        entries = [
+            _assistant("msg_1", 10, 1000, 50),
+            _tool_result("one"),
+            _tool_result("two"),
+            _assistant("msg_2", 10, 1150, 20),
+        ]
+        self.assertEqual(extract_calibration_samples(entries), [])
+
+    def test_collect_from_directory(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            log_file = Path(tmp) / "project" / "session.jsonl"
+            log_file.parent.mkdir()
+            lines = [
+                _assistant("msg_1", 10, 1000, 50),
+                _tool_result("y" * 200),
+                _assistant("msg_2", 10, 1100, 20),
+            ]
+            log_file.write_text("\n".join(json.dumps(line) for line in lines) + "\nnot json\n")
+            samples = collect_calibration_samples([Path(tmp)])
+            self.assertEqual(len(samples), 1)
+            self.assertEqual(samples[0].source_file, "session.jsonl")
+
+    def test_fit_recovers_linear_model(self):
+        config = ToolTokenEstimatorConfig()
+        samples = [
+            CalibrationSample(CONTENT_CODE, chars, 0, int(chars / 2.0 + 30))
+            for chars in range(500, 500 + 100 * config.MIN_SAMPLES_PER_CLASS, 100)
+        ]
+        fitted = fit_coefficients(samples, config)
+        self.assertAlmostEqual(fitted[CONTENT_CODE]["chars_per_token"], 2.0, places=1)
+        self.assertAlmostEqual(fitted[CONTENT_CODE]["overhead"], 30.0, delta=1.0)
+        # Classes without enough samples keep defaults
+        self.assertEqual(fitted[CONTENT_PROSE], config.COEFFICIENTS[CONTENT_PROSE])
+
+    def test_error_report(self):
+        samples = [CalibrationSample(CONTENT_JSON, 2800, 0, 1020) for _ in range(3)]
+        report = build_error_report(samples, ToolTokenEstimator())
+        self.assertEqual(report["total_samples"], 3)
+        json_stats = report["classes"][CONTENT_JSON]
+        self.assertEqual(json_stats["samples"], 3)
+        self.assertLess(json_stats["calibrated"]["mape_pct"], json_stats["legacy"]["mape_pct"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the remembered WebSocket auth method and race mode.
+
+The method a backend accepted is stored per environment and ws_url next to the
+thread cache and tried first on the next connect.
+"""
+
+import asyncio
+import os
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.agent_cli import WebSocketClient, Environment
+
+
+def _client(tmp_path, ws_url="wss://api.example/ws", **kwargs):
+    config = MagicMock()
+    config.ws_url = ws_url
+    config.environment = Environment.STAGING
+    config.json_mode = True
+    config.ci_mode = False
+    client = WebSocketClient(config, "test_token", MagicMock(), **kwargs)
+    client.thread_cache_file = tmp_path / "thread_cache.json"
+    return client
+
+
+def _header_only_backend(opened):
+    """websockets.connect stand-in for a backend that only accepts header auth."""
+    async def connect(url, **options):
+        await asyncio.sleep(0.01)
+        if "additional_headers" not in options:
+            raise ConnectionError("HTTP 403")
+        ws = AsyncMock()
+        opened.append(ws)
+        return ws
+    return connect
+
+
+class TestAuthMethodCache:
+    """Test remembered auth method ordering"""
+
+    def test_default_order(self, tmp_path):
+        """Test that without a remembered method the historical order is used"""
+        assert _client(tmp_path)._auth_method_order() == ["subprotocol", "query_param", "header"]
+
+    def test_remembered_method_first_per_backend(self, tmp_path):
+        """Test that a saved method is tried first only for the backend it worked on"""
+        _client(tmp_path)._save_auth_method("header")
+
+        assert _client(tmp_path)._auth_method_order() == ["header", "subprotocol", "query_param"]
+        assert _client(tmp_path, ws_url="wss://other/ws")._auth_method_order()[0] == "subprotocol"
+        assert (tmp_path / "ws_auth_methods.json").exists()
+
+
+class TestAuthRace:
+    """Test race mode"""
+
+    def test_race_keeps_first_accepted_method(self, tmp_path):
+        """Test that the race keeps the accepted method and records each attempt's latency"""
+        opened = []
+        client = _client(tmp_path, ws_auth_race=True)
+        client.AUTH_RACE_STAGGER = 0.001
+        client.debug.log_connection_attempt = MagicMock()
+
+        async def scenario():
+            with patch('scripts.agent_cli.websockets.connect', side_effect=_header_only_backend(opened)):
+                return await client._connect_with_race()
+
+        assert asyncio.run(scenario()) is True
+        assert client.auth_method_used == "header"
+        assert client.ws is opened[0]
+        latencies = [call.kwargs.get("latency") for call in client.debug.log_connection_attempt.call_args_list]
+        assert sum(1 for latency in latencies if latency is not None) == 3
+
+    def test_race_fails_when_no_method_accepted(self, tmp_path):
+        """Test that the race raises when every method is rejected"""
+        client = _client(tmp_path, ws_auth_race=True)
+        client.AUTH_RACE_STAGGER = 0.001
+
+        async def rejected(url, **options):
+            raise ConnectionError("HTTP 403")
+
+        async def scenario():
+            with patch('scripts.agent_cli.websockets.connect', side_effect=rejected):
+                await client._connect_with_race()
+
+        try:
+            asyncio.run(scenario())
+        except ConnectionError:
+            pass
+        else:
+            raise AssertionError("expected ConnectionError")
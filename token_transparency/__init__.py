@@ -11,10 +11,18 @@ from .claude_pricing_engine import (
     TokenUsageData,
     CostBreakdown
 )
+from .tool_token_estimator import (
+    ToolTokenEstimator,
+    ToolTokenEstimatorConfig,
+    classify_content
+)
 
 __all__ = [
     'ClaudePricingEngine',
     'ClaudePricingConfig',
     'TokenUsageData',
-    'CostBreakdown'
+    'CostBreakdown',
+    'ToolTokenEstimator',
+    'ToolTokenEstimatorConfig',
+    'classify_content'
 ]
\ No newline at end of file
@@ -0,0 +1,523 @@
+#!/usr/bin/env python3
+"""
+Calibrated Tool Token Estimator
+
+Estimates token usage for tool invocations and tool results when the Claude
+stream does not report per-tool usage. Replaces the flat ``len(content) // 4``
+heuristic with per-content-class coefficients (code, prose, JSON, paths).
+
+Key Features:
+- Single bounded classification pass, O(1) table lookup afterwards
+- Coefficients precomputed into a small table, optionally re-fitted from
+  local Claude Code logs where real ``usage`` deltas are known
+- Error-vs-truth report comparing calibrated and legacy estimates
+
+Usage:
+    python -m token_transparency.tool_token_estimator ~/.claude/projects --output calibration.json
+"""
+
+import argparse
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Content classes recognised by the estimator
+CONTENT_CODE = "code"
+CONTENT_PROSE = "prose"
+CONTENT_JSON = "json"
+CONTENT_PATHS = "paths"
+
+CONTENT_CLASSES = (CONTENT_CODE, CONTENT_PROSE, CONTENT_JSON, CONTENT_PATHS)
+
+DEFAULT_CALIBRATION_PATH = Path.home() / ".netra" / "tool_token_calibration.json"
+
+_CODE_SYMBOLS = frozenset("{}()[];=<>")
+_CODE_MARKERS = ("def ", "import ", "class ", "return ", "function ", "const ", "=>", "#include", "public ", "fn ")
+
+
+@dataclass
+class ToolTokenEstimatorConfig:
+    """Precomputed coefficient table for tool token estimation"""
+
+    # Per-class coefficients: characters per token and fixed framing overhead
+    COEFFICIENTS: Dict[str, Dict[str, float]] = field(default_factory=lambda: {
+        CONTENT_CODE: {"chars_per_token": 3.2, "overhead": 20.0},
+        CONTENT_PROSE: {"chars_per_token": 4.2, "overhead": 20.0},
+        CONTENT_JSON: {"chars_per_token": 2.8, "overhead": 20.0},
+        CONTENT_PATHS: {"chars_per_token": 2.6, "overhead": 20.0},
+    })
+
+    # Non-ASCII characters (CJK, emoji, accented text) tokenise far denser than ASCII
+    NON_ASCII_CHAR_WEIGHT = 2.5  # One non-ASCII char counts as this many ASCII chars
+
+    # Classification only inspects a bounded prefix so cost is independent of size
+    CLASSIFY_SAMPLE_CHARS = 2048
+
+    # Floors kept from the original heuristic
+    MIN_TOOL_USE_TOKENS = 10
+    MIN_TOOL_RESULT_TOKENS = 25
+
+    # Minimum observations per class before fitted coefficients replace defaults
+    MIN_SAMPLES_PER_CLASS = 8
+
+
+@dataclass
+class CalibrationSample:
+    """A tool result whose true token cost was recovered from usage deltas"""
+    content_class: str
+    ascii_chars: int
+    non_ascii_chars: int
+    true_tokens: int
+    source_file: str = ""
+
+
+def classify_content(text: str, sample_chars: int = ToolTokenEstimatorConfig.CLASSIFY_SAMPLE_CHARS) -> str:
+    """
+    Classify tool content as code, prose, JSON or paths.
+
+    Only the first ``sample_chars`` characters are inspected so the cost of
+    classification does not grow with the size of the tool output.
+
+    Args:
+        text: Tool content
+        sample_chars: Size of the inspected prefix
+
+    Returns:
+        One of CONTENT_CLASSES
+    """
+    sample = text[:sample_chars].strip()
+    if not sample:
+        return CONTENT_PROSE
+
+    if sample[0] in "{[" and ('":' in sample or '",' in sample or sample in ("{}", "[]")):
+        return CONTENT_JSON
+
+    lines = [line.strip() for line in sample.splitlines() if line.strip()]
+    if lines:
+        path_like = sum(
+            1 for line in lines
+            if " " not in line and ("/" in line or "\\" in line)
+        )
+        if path_like / len(lines) >= 0.6:
+            return CONTENT_PATHS
+
+    symbol_count = sum(1 for char in sample if char in _CODE_SYMBOLS)
+    if symbol_count / len(sample) > 0.04 or any(marker in sample for marker in _CODE_MARKERS):
+        return CONTENT_CODE
+
+    return CONTENT_PROSE
+
+
+def _char_counts(text: str, sample_chars: int) -> Tuple[int, int]:
+    """Split a character count into (ascii_chars, non_ascii_chars)."""
+    total = len(text)
+    if text.isascii():
+        return total, 0
+
+    # Extrapolate the non-ASCII ratio from the classification sample
+    sample = text[:sample_chars]
+    non_ascii_in_sample = len(sample.encode("utf-8")) - len(sample)
+    # Multi-byte chars contribute 1-3 extra bytes; approximate 2 extra per char
+    non_ascii_ratio = min(1.0, (non_ascii_in_sample / 2) / max(1, len(sample)))
+    non_ascii = int(total * non_ascii_ratio)
+    return total - non_ascii, non_ascii
+
+
+def _extract_text(content: Any) -> str:
+    """Flatten tool_result content (string or list of content blocks) into text."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        parts = []
+        for block in content:
+            if isinstance(block, dict):
+                if block.get("type") == "text":
+                    parts.append(str(block.get("text", "")))
+                elif block.get("type") == "image":
+                    # Image blocks are billed separately; count only their framing
+                    continue
+                else:
+                    parts.append(json.dumps(block, separators=(",", ":"), ensure_ascii=False))
+            elif isinstance(block, str):
+                parts.append(block)
+        return "\n".join(parts)
+    if content is None:
+        return ""
+    return json.dumps(content, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def legacy_estimate(char_count: int) -> int:
+    """Original ``len // 4`` heuristic, kept for error reporting comparisons."""
+    overhead = 20
+    if char_count > 5000:
+        overhead += 50
+    elif char_count > 1000:
+        overhead += 20
+    return max(char_count // 4 + overhead, 25)
+
+
+class ToolTokenEstimator:
+    """
+    Content-aware token estimator for tool calls and tool results.
+
+    Uses a precomputed coefficient table; estimates are a single table lookup
+    after one bounded classification pass.
+    """
+
+    def __init__(self, config: Optional[ToolTokenEstimatorConfig] = None,
+                 coefficients: Optional[Dict[str, Dict[str, float]]] = None):
+        self.config = config or ToolTokenEstimatorConfig()
+        self.coefficients = dict(self.config.COEFFICIENTS)
+        if coefficients:
+            for content_class, values in coefficients.items():
+                if content_class in CONTENT_CLASSES:
+                    self.coefficients[content_class] = {
+                        "chars_per_token": float(values["chars_per_token"]),
+                        "overhead": float(values["overhead"]),
+                    }
+
+    @classmethod
+    def from_calibration_file(cls, path: Path) -> "ToolTokenEstimator":
+        """Load fitted coefficients, falling back to defaults if unreadable."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return cls(coefficients=data.get("coefficients", {}))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.debug(f"Tool token calibration not loaded from {path}: {e}")
+            return cls()
+
+    @classmethod
+    def load_default(cls) -> "ToolTokenEstimator":
+        """Load the user calibration if present, otherwise the built-in table."""
+        if DEFAULT_CALIBRATION_PATH.exists():
+            return cls.from_calibration_file(DEFAULT_CALIBRATION_PATH)
+        return cls()
+
+    def estimate_text(self, text: str, content_class: Optional[str] = None) -> int:
+        """
+        Estimate the token count of a piece of tool text.
+
+        Args:
+            text: Tool content
+            content_class: Pre-computed class (skips classification)
+
+        Returns:
+            Estimated token count (without the per-call minimum floor)
+        """
+        content_class = content_class or classify_content(text, self.config.CLASSIFY_SAMPLE_CHARS)
+        ascii_chars, non_ascii_chars = _char_counts(text, self.config.CLASSIFY_SAMPLE_CHARS)
+        return self._estimate_counts(content_class, ascii_chars, non_ascii_chars)
+
+    def _estimate_counts(self, content_class: str, ascii_chars: int, non_ascii_chars: int) -> int:
+        """Table lookup for already-classified content."""
+        coeff = self.coefficients.get(content_class, self.coefficients[CONTENT_PROSE])
+        effective_chars = ascii_chars + non_ascii_chars * self.config.NON_ASCII_CHAR_WEIGHT
+        return int(round(effective_chars / coeff["chars_per_token"] + coeff["overhead"]))
+
+    def estimate_tool_data(self, tool_data: Dict[str, Any], is_tool_use: bool = False) -> int:
+        """
+        Estimate token usage for a tool_use or tool_result content block.
+
+        Args:
+            tool_data: Content block from the Claude stream
+            is_tool_use: True for tool invocations, False for tool results
+
+        Returns:
+            Estimated token count with the legacy minimum floors applied
+        """
+        if is_tool_use:
+            input_data = tool_data.get("input", {})
+            if not isinstance(input_data, dict):
+                return self.config.MIN_TOOL_USE_TOKENS
+            text = json.dumps(input_data, separators=(",", ":"), ensure_ascii=False, default=str)
+            # Invocation inputs are JSON arguments with no tool-result framing overhead
+            ascii_chars, non_ascii_chars = _char_counts(text, self.config.CLASSIFY_SAMPLE_CHARS)
+            effective_chars = ascii_chars + non_ascii_chars * self.config.NON_ASCII_CHAR_WEIGHT
+            tokens = int(round(effective_chars / self.coefficients[CONTENT_JSON]["chars_per_token"]))
+            return max(self.config.MIN_TOOL_USE_TOKENS, tokens)
+
+        text = _extract_text(tool_data.get("content", ""))
+        return max(self.config.MIN_TOOL_RESULT_TOKENS, self.estimate_text(text))
+
+    def estimate_sample(self, sample: CalibrationSample) -> int:
+        """Estimate a calibration sample using the current table."""
+        return self._estimate_counts(sample.content_class, sample.ascii_chars, sample.non_ascii_chars)
+
+
+def _prompt_tokens(usage: Dict[str, Any]) -> int:
+    """Total prompt-side tokens for an assistant turn."""
+    return (int(usage.get("input_tokens", 0) or 0) +
+            int(usage.get("cache_creation_input_tokens", 0) or 0) +
+            int(usage.get("cache_read_input_tokens", 0) or 0))
+
+
+def extract_calibration_samples(entries: Iterable[Dict[str, Any]], source_file: str = "",
+                                config: Optional[ToolTokenEstimatorConfig] = None) -> List[CalibrationSample]:
+    """
+    Recover true tool_result token costs from consecutive assistant usage records.
+
+    For an assistant turn A1 followed by a single tool_result and then the next
+    assistant turn A2, the prompt grows by exactly the tool_result plus framing:
+    ``prompt(A2) - prompt(A1) - output(A1)``.
+
+    Args:
+        entries: Claude Code JSONL entries in file order
+        source_file: Name recorded on each sample
+        config: Estimator configuration (sample size)
+
+    Returns:
+        List of calibration samples
+    """
+    config = config or ToolTokenEstimatorConfig()
+    samples: List[CalibrationSample] = []
+
+    prev_usage: Optional[Dict[str, Any]] = None
+    prev_message_id: Optional[str] = None
+    pending_results: List[Any] = []
+    other_content_seen = False
+
+    for entry in entries:
+        entry_type = entry.get("type")
+        message = entry.get("message")
+        if not isinstance(message, dict):
+            continue
+
+        if entry_type == "assistant":
+            usage = message.get("usage")
+            message_id = message.get("id")
+            if not isinstance(usage, dict):
+                continue
+            if message_id and message_id == prev_message_id:
+                # Streamed content blocks of the same message repeat its usage
+                prev_usage = usage
+                continue
+
+            if prev_usage is not None and len(pending_results) == 1 and not other_content_seen:
+                true_tokens = (_prompt_tokens(usage) - _prompt_tokens(prev_usage) -
+                               int(prev_usage.get("output_tokens", 0) or 0))
+                if true_tokens > 0:
+                    text = _extract_text(pending_results[0])
+                    ascii_chars, non_ascii_chars = _char_counts(text, config.CLASSIFY_SAMPLE_CHARS)
+                    samples.append(CalibrationSample(
+                        content_class=classify_content(text, config.CLASSIFY_SAMPLE_CHARS),
+                        ascii_chars=ascii_chars,
+                        non_ascii_chars=non_ascii_chars,
+                        true_tokens=true_tokens,
+                        source_file=source_file,
+                    ))
+
+            prev_usage = usage
+            prev_message_id = message_id
+            pending_results = []
+            other_content_seen = False
+
+        elif entry_type == "user":
+            content = message.get("content")
+            if isinstance(content, list):
+                for item in content:
+                    if isinstance(item, dict) and item.get("type") == "tool_result":
+                        pending_results.append(item.get("content", ""))
+                    else:
+                        other_content_seen = True
+            else:
+                other_content_seen = True
+
+    return samples
+
+
+def collect_calibration_samples(paths: Iterable[Path],
+                                config: Optional[ToolTokenEstimatorConfig] = None) -> List[CalibrationSample]:
+    """
+    Collect calibration samples from Claude Code JSONL files or directories.
+
+    Args:
+        paths: Files or directories (searched recursively for ``*.jsonl``)
+        config: Estimator configuration
+
+    Returns:
+        All samples found
+    """
+    files: List[Path] = []
+    for path in paths:
+        path = Path(path).expanduser()
+        if path.is_dir():
+            files.extend(sorted(path.rglob("*.jsonl")))
+        elif path.is_file():
+            files.append(path)
+
+    samples: List[CalibrationSample] = []
+    for log_file in files:
+        entries = []
+        try:
+            with open(log_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entries.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+        except OSError as e:
+            logger.warning(f"Could not read {log_file}: {e}")
+            continue
+        samples.extend(extract_calibration_samples(entries, log_file.name, config))
+
+    return samples
+
+
+def fit_coefficients(samples: List[CalibrationSample],
+                     config: Optional[ToolTokenEstimatorConfig] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Fit per-class coefficients by ordinary least squares.
+
+    Model: ``true_tokens = effective_chars / chars_per_token + overhead``.
+    Classes with too few samples keep their default coefficients.
+
+    Args:
+        samples: Calibration samples
+        config: Estimator configuration (defaults, minimum sample counts)
+
+    Returns:
+        Coefficient table keyed by content class
+    """
+    config = config or ToolTokenEstimatorConfig()
+    fitted = {name: dict(values) for name, values in config.COEFFICIENTS.items()}
+
+    for content_class in CONTENT_CLASSES:
+        points = [
+            (s.ascii_chars + s.non_ascii_chars * config.NON_ASCII_CHAR_WEIGHT, float(s.true_tokens))
+            for s in samples if s.content_class == content_class
+        ]
+        if len(points) < config.MIN_SAMPLES_PER_CLASS:
+            continue
+
+        n = len(points)
+        mean_x = sum(x for x, _ in points) / n
+        mean_y = sum(y for _, y in points) / n
+        var_x = sum((x - mean_x) ** 2 for x, _ in points)
+        if var_x <= 0:
+            continue
+
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+        if slope <= 0:
+            continue
+        intercept = max(0.0, mean_y - slope * mean_x)
+
+        fitted[content_class] = {
+            "chars_per_token": round(1.0 / slope, 4),
+            "overhead": round(intercept, 2),
+        }
+
+    return fitted
+
+
+def build_error_report(samples: List[CalibrationSample], estimator: ToolTokenEstimator) -> Dict[str, Any]:
+    """
+    Compare calibrated and legacy estimates against observed token counts.
+
+    Args:
+        samples: Calibration samples with true token counts
+        estimator: Estimator under evaluation
+
+    Returns:
+        Report with per-class sample counts, mean absolute percentage error
+        and signed bias for both the calibrated and the legacy estimator
+    """
+    def _stats(pairs: List[Tuple[int, int]]) -> Dict[str, float]:
+        if not pairs:
+            return {"mape_pct": 0.0, "bias_pct": 0.0}
+        abs_errors = [abs(est - true) / true for est, true in pairs]
+        signed = [(est - true) / true for est, true in pairs]
+        return {
+            "mape_pct": round(100 * sum(abs_errors) / len(abs_errors), 2),
+            "bias_pct": round(100 * sum(signed) / len(signed), 2),
+        }
+
+    report: Dict[str, Any] = {"total_samples": len(samples), "classes": {}}
+    all_calibrated: List[Tuple[int, int]] = []
+    all_legacy: List[Tuple[int, int]] = []
+
+    for content_class in CONTENT_CLASSES:
+        class_samples = [s for s in samples if s.content_class == content_class]
+        calibrated = [(estimator.estimate_sample(s), s.true_tokens) for s in class_samples]
+        legacy = [(legacy_estimate(s.ascii_chars + s.non_ascii_chars), s.true_tokens)
+                  for s in class_samples]
+        all_calibrated.extend(calibrated)
+        all_legacy.extend(legacy)
+        report["classes"][content_class] = {
+            "samples": len(class_samples),
+            "coefficients": estimator.coefficients[content_class],
+            "calibrated": _stats(calibrated),
+            "legacy": _stats(legacy),
+        }
+
+    report["overall"] = {"calibrated": _stats(all_calibrated), "legacy": _stats(all_legacy)}
+    return report
+
+
+def format_error_report(report: Dict[str, Any]) -> str:
+    """Render an error report as a plain-text table."""
+    lines = [
+        f"Tool token estimator error report ({report['total_samples']} samples)",
+        f"{'class':<8} {'n':>6} {'chars/tok':>10} {'overhead':>9} {'MAPE':>8} {'bias':>8} {'legacy MAPE':>12}",
+    ]
+    for content_class, stats in report["classes"].items():
+        lines.append(
+            f"{content_class:<8} {stats['samples']:>6} "
+            f"{stats['coefficients']['chars_per_token']:>10.2f} "
+            f"{stats['coefficients']['overhead']:>9.1f} "
+            f"{stats['calibrated']['mape_pct']:>7.1f}% "
+            f"{stats['calibrated']['bias_pct']:>7.1f}% "
+            f"{stats['legacy']['mape_pct']:>11.1f}%"
+        )
+    overall = report["overall"]
+    lines.append(
+        f"{'overall':<8} {report['total_samples']:>6} {'':>10} {'':>9} "
+        f"{overall['calibrated']['mape_pct']:>7.1f}% "
+        f"{overall['calibrated']['bias_pct']:>7.1f}% "
+        f"{overall['legacy']['mape_pct']:>11.1f}%"
+    )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Fit coefficients from local logs and print the error-vs-truth report."""
+    parser = argparse.ArgumentParser(
+        description="Calibrate the zen tool token estimator from local Claude Code logs"
+    )
+    parser.add_argument("paths", nargs="+", type=Path,
+                        help="JSONL files or directories (e.g. ~/.claude/projects)")
+    parser.add_argument("--output", type=Path, default=DEFAULT_CALIBRATION_PATH,
+                        help=f"Where to write fitted coefficients (default: {DEFAULT_CALIBRATION_PATH})")
+    parser.add_argument("--report-only", action="store_true",
+                        help="Evaluate the current table without writing a calibration file")
+    args = parser.parse_args(argv)
+
+    config = ToolTokenEstimatorConfig()
+    samples = collect_calibration_samples(args.paths, config)
+    if not samples:
+        print("No calibration samples found (need assistant turns with usage around single tool results)")
+        return 1
+
+    if args.report_only:
+        estimator = ToolTokenEstimator.load_default()
+    else:
+        coefficients = fit_coefficients(samples, config)
+        estimator = ToolTokenEstimator(config, coefficients)
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"coefficients": coefficients, "samples": len(samples)}, f, indent=2)
+        print(f"Calibration written to {args.output}")
+
+    print(format_error_report(build_error_report(samples, estimator)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -78,11 +78,12 @@ except ImportError as e:
 
 # Add token transparency imports
 try:
-    from token_transparency import ClaudePricingEngine, TokenUsageData
+    from token_transparency import ClaudePricingEngine, TokenUsageData, ToolTokenEstimator
 except ImportError as e:
     # Graceful fallback if token transparency package is not available
     ClaudePricingEngine = None
     TokenUsageData = None
+    ToolTokenEstimator = None
 
 
 # Setup logging
@@ -269,6 +270,9 @@ class ClaudeInstanceOrchestrator:
             self.pricing_engine = None
             logger.debug("Token transparency pricing engine disabled (module not available)")
 
+        # Content-aware tool token estimator (uses local calibration if present)
+        self.tool_token_estimator = ToolTokenEstimator.load_default() if ToolTokenEstimator else None
+
         # Log budget configuration status
         if self.budget_manager:
             budget_msg = f"Overall: {overall_token_budget:,} tokens" if overall_token_budget else "No overall limit"
@@ -2174,8 +2178,12 @@ class ClaudeInstanceOrchestrator:
         return f"tool_{short_id}"
 
     def _estimate_tool_tokens(self, tool_data: dict, is_tool_use: bool = False) -> int:
-        """Estimate token usage for a tool based on content size"""
+        """Estimate token usage for a tool based on content size and content class"""
         try:
+            if self.tool_token_estimator:
+                # Per-class coefficients (code, prose, JSON, paths) from token_transparency
+                return self.tool_token_estimator.estimate_tool_data(tool_data, is_tool_use=is_tool_use)
+
             if is_tool_use:
                 # For tool_use, estimate based on input parameters
                 input_data = tool_data.get('input', {})
@@ -2991,6 +2999,16 @@ def run():
     # Log version information at startup
     logger.info(f"Starting zen version {__version__}")
 
+    # "zen logs index|query" manages the local log index (scripts/log_index.py)
+    if len(sys.argv) > 1 and sys.argv[1] == 'logs':
+        from scripts.log_index import main as logs_main
+        sys.exit(logs_main(sys.argv[2:]))
+
+    # "zen apex-daemon start|status|stop" manages the warm apex session (scripts/apex_daemon.py)
+    if len(sys.argv) > 1 and sys.argv[1] == 'apex-daemon':
+        from scripts.apex_daemon import main as apex_daemon_main
+        sys.exit(apex_daemon_main(sys.argv[2:]))
+
     # Early check for --apex flag to delegate to agent_cli before main() processing
     if '--apex' in sys.argv or '-a' in sys.argv:
         # Delegate to agent_cli via subprocess to avoid dependency conflicts
@@ -3001,6 +3019,15 @@ def run():
         # Keep all other arguments to pass through to agent_cli
         filtered_argv = [arg for arg in sys.argv[1:] if arg not in ('--apex', '-a')]
 
+        # --daemon: hand the run to a running `zen apex-daemon`, skipping auth and connect;
+        # falls through to the full CLI when no daemon is running or an option needs it
+        if '--daemon' in filtered_argv:
+            filtered_argv = [arg for arg in filtered_argv if arg != '--daemon']
+            from scripts.apex_daemon import run_via_daemon
+            daemon_exit_code = run_via_daemon(filtered_argv)
+            if daemon_exit_code is not None:
+                sys.exit(daemon_exit_code)
+
         # Set PYTHONPATH for optional advanced backend features
         # Note: The minimal shared/ module is vendored in zen repo (no external dependency)
         # PYTHONPATH is only needed for advanced backend features beyond basic agent_cli